@@ -0,0 +1,131 @@
+"""
+ทดสอบ circuit breaker + ข้อมูลล่าสุดที่เคยได้ ด้วยการฉีดความเสียหายให้ stub upstream ทีละสถานการณ์
+(ทอง/น้ำมัน/หวย ผ่าน feed_content ตัวจริงของ main) แต่ละข้อ PASS/FAIL exit 1 ถ้ามีข้อไหนไม่ผ่าน
+
+    python -m benchmarks.breaker_bench
+"""
+import argparse
+import asyncio
+import sys
+import time
+from typing import Callable, List, Tuple
+
+from benchmarks.load_test import start_app
+from benchmarks.stubs import Fault, StubConfig, StubUpstreams
+
+GOLD = "api.chnwt.dev"
+OIL = "oil-price.bangchak.co.th"
+LOTTO = "lotto.api.rayriffy.com"
+
+TIMEOUT = 0.5       # ใช้ค่าสั้นให้รันเร็ว (production = UPSTREAM_TIMEOUT)
+OPEN_FOR = 1.0
+
+
+class Suite:
+    def __init__(self, app, stub: StubUpstreams):
+        self.app = app
+        self.stub = stub
+        self.results: List[Tuple[str, bool, str]] = []
+
+    def check(self, name: str, ok: bool, detail: str = "") -> None:
+        self.results.append((name, ok, detail))
+        print(f"{'PASS' if ok else 'FAIL'}  {name}  {detail}")
+
+    async def fetch(self, name: str, fetch: Callable) -> Tuple[str, float]:
+        """ เรียกแบบ cache หมดอายุ (ลบ feed:{name} ก่อน) คืน (ข้อความ, วินาที) """
+        if self.app.redis_instance is not None:
+            await self.app.redis_instance.delete(f"feed:{name}")
+        started = time.perf_counter()
+        content = await self.app.feed_content(name, fetch)
+        return content, time.perf_counter() - started
+
+
+async def run_suite(app, stub: StubUpstreams) -> Suite:
+    from modules.core import circuit_breaker
+    from modules.core.circuit_breaker import BreakerConfig, get_breaker
+
+    for host in (GOLD, OIL, LOTTO):
+        circuit_breaker.UPSTREAMS[host] = BreakerConfig(timeout=TIMEOUT, open_for=OPEN_FOR, slow_call=TIMEOUT / 2)
+    circuit_breaker.reset()
+    suite = Suite(app, stub)
+    gold = app.get_gold_price_today
+    faults = stub.config.faults
+
+    # 1) ปกติ: ได้ข้อมูลสด เก็บเป็นค่าล่าสุด
+    content, _ = await suite.fetch("gold", gold)
+    suite.check("healthy: ได้ราคาทอง", content.startswith("📅") and "⚠️" not in content)
+
+    # 2) upstream แขวน: timeout ถูกบีบเหลือ TIMEOUT ไม่ใช่ 10s แล้วตอบค่าเก่าพร้อมหมายเหตุ
+    faults[GOLD] = Fault(latency=5.0)
+    content, seconds = await suite.fetch("gold", gold)
+    suite.check("hang: ไม่รอเกิน timeout ของ upstream", seconds < TIMEOUT * 2, f"{seconds * 1e3:.0f} ms")
+    suite.check("hang: ตอบค่าเก่าพร้อมหมายเหตุ", content.startswith("📅") and "แหล่งข้อมูลไม่ตอบ" in content)
+
+    # 3) พลาดติดกันจน open แล้ว fail เร็ว ไม่ยิง upstream เพิ่ม
+    for _ in range(3):
+        await suite.fetch("gold", gold)
+    breaker = get_breaker(GOLD)
+    calls_before = stub.stats.calls[GOLD]
+    content, seconds = await suite.fetch("gold", gold)
+    suite.check("open: breaker เปิด", breaker.state == circuit_breaker.OPEN, breaker.state)
+    suite.check("open: ตอบเร็ว", seconds < 0.05, f"{seconds * 1e3:.1f} ms")
+    suite.check("open: ไม่ยิง upstream", stub.stats.calls[GOLD] == calls_before)
+    suite.check("open: ยังตอบค่าเก่า", "แหล่งข้อมูลไม่ตอบ" in content)
+
+    # 4) ครบเวลา probe พลาด → open นานขึ้นเท่าตัว
+    await asyncio.sleep(OPEN_FOR + 0.1)
+    await suite.fetch("gold", gold)
+    suite.check("half-open fail: กลับไป open", breaker.state == circuit_breaker.OPEN, breaker.state)
+    suite.check("half-open fail: open นานขึ้น", breaker.open_remaining() > OPEN_FOR * 1.5,
+                f"{breaker.open_remaining():.1f}s")
+
+    # 5) upstream กลับมา: probe ผ่าน → closed ได้ข้อมูลสด
+    faults.pop(GOLD)
+    await asyncio.sleep(breaker.open_remaining() + 0.1)
+    content, _ = await suite.fetch("gold", gold)
+    suite.check("recover: closed", breaker.state == circuit_breaker.CLOSED, breaker.state)
+    suite.check("recover: ข้อมูลสด", content.startswith("📅") and "⚠️" not in content)
+
+    # 6) 5xx ทุกครั้งโดยไม่เคยมีค่าเก่า: ได้ ❌ เร็ว ๆ หลัง open
+    faults[OIL] = Fault(error_rate=1.0)
+    for _ in range(3):
+        await suite.fetch("oil", app.get_oil_price_today)
+    content, seconds = await suite.fetch("oil", app.get_oil_price_today)
+    suite.check("5xx: breaker เปิด", get_breaker(OIL).state == circuit_breaker.OPEN, get_breaker(OIL).state)
+    suite.check("5xx ไม่มีค่าเก่า: ตอบ ❌ เร็ว", content.startswith("❌") and seconds < 0.05,
+                f"{seconds * 1e3:.1f} ms")
+
+    # 7) ช้าแต่สำเร็จ (เกิน slow_call) นับเป็นพลาด
+    faults[LOTTO] = Fault(latency=TIMEOUT * 0.7)
+    for _ in range(3):
+        await suite.fetch("lotto", app.get_lottery_results)
+    stats = get_breaker(LOTTO).stats()
+    suite.check("slow: เปิดเพราะช้า", stats["state"] == circuit_breaker.OPEN and stats["slow"] >= 3,
+                f"slow={stats['slow']} failures={stats['failures']}")
+
+    print("\nbreakers:")
+    for host, stats in circuit_breaker.snapshot().items():
+        print(f"  {host:<28} {stats}")
+    return suite
+
+
+async def main_async() -> int:
+    stub = await StubUpstreams(StubConfig(feed_latency=0.02, jitter=0.0)).start()
+    app, stop = await start_app(stub)
+    try:
+        suite = await run_suite(app, stub)
+    finally:
+        await stop()
+        await stub.close()
+    failed = [name for name, ok, _ in suite.results if not ok]
+    print(f"\n{len(suite.results) - len(failed)}/{len(suite.results)} ผ่าน")
+    return 1 if failed else 0
+
+
+def main():
+    argparse.ArgumentParser(description="circuit breaker fault-injection suite").parse_args()
+    sys.exit(asyncio.run(main_async()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+เทียบขนาดแชทที่เก็บใน Redis: json.dumps แบบเดิม vs codec (UTF-8 ตรง / บีบอัด / shared dictionary)
+และ train dictionary จากแชทจริงใน Redis
+
+    python -m benchmarks.codec_bench                                    # corpus สังเคราะห์
+    python -m benchmarks.codec_bench --redis-url redis://localhost --write-dict chat.dict
+    STORAGE_DICT=chat.dict python main.py                               # ใช้ dictionary ที่ train แล้ว
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import List
+
+from modules.core import codec
+
+CONTEXT_TURNS = 20     # turn ที่อ่านต่อการสร้าง context หนึ่งครั้ง (KEEP_TURNS)
+
+QUESTIONS = [
+    "พี่หลาม วันนี้ทองขึ้นหรือลง", "ช่วยสรุปข่าวเศรษฐกิจวันนี้หน่อย", "เขียนแคปชันขายเสื้อผ้าให้หน่อย",
+    "อธิบาย async await ใน python แบบง่าย ๆ", "ไปเที่ยวเชียงใหม่ 3 วัน 2 คืน ควรไปไหนบ้าง",
+    "แฟนงอนต้องทำยังไงดี", "สูตรต้มยำกุ้งน้ำข้น", "ลงทุนกองทุนรวมดีไหม", "อากาศกรุงเทพพรุ่งนี้เป็นยังไง",
+    "แปลประโยคนี้เป็นภาษาอังกฤษให้หน่อย", "วิธีลดน้ำหนักแบบไม่โยโย่", "ดูดวงความรักเดือนนี้",
+]
+SENTENCES = [
+    "ได้เลยครับ พี่หลามสรุปให้แบบสั้น ๆ นะ", "อันดับแรกต้องดูก่อนว่าเป้าหมายของเราคืออะไร",
+    "ราคาทองคำแท่งวันนี้ขยับขึ้นเล็กน้อยตามตลาดโลก", "ถ้ามีงบจำกัดแนะนำให้เริ่มจากจำนวนน้อย ๆ ก่อน",
+    "ในทางเทคนิค async ช่วยให้รองานหลายอย่างพร้อมกันได้โดยไม่ต้องใช้หลาย thread",
+    "ช่วงนี้ฝนตกบ่อย พกร่มติดตัวไว้ด้วยนะ", "ลองคุยกันตรง ๆ ด้วยน้ำเสียงใจเย็น มักจะช่วยได้มาก",
+    "วัตถุดิบหลักมีกุ้ง ตะไคร้ ข่า ใบมะกรูด พริก และน้ำมะนาว", "ความเสี่ยงขึ้นอยู่กับระยะเวลาการลงทุนของแต่ละคน",
+    "วันแรกแนะนำดอยสุเทพ วันที่สองไปแม่แจ่ม วันที่สามเดินถนนคนเดิน", "ออกกำลังกายสม่ำเสมอสำคัญกว่าอดอาหาร",
+    "ถ้าอยากรู้เพิ่มเติมถามต่อได้เลยนะ", "สรุปคือไม่ต้องรีบ ค่อย ๆ ตัดสินใจก็ได้",
+    "1. วางแผนงบประมาณ\n2. เปรียบเทียบตัวเลือก\n3. ตัดสินใจ", "**ข้อควรระวัง:** ข้อมูลนี้เป็นเพียงแนวทางเบื้องต้น",
+    "The main idea is to avoid blocking the event loop.", "ขอบคุณที่ถามนะ เป็นคำถามที่ดีมาก",
+]
+
+
+def synthetic_corpus(count: int, seed: int) -> List[bytes]:
+    rng = random.Random(seed)
+    turns = []
+    for _ in range(count):
+        response = " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(2, 12)))
+        turns.append({"question": rng.choice(QUESTIONS), "response": response})
+    return [json.dumps(turn).encode() for turn in turns]
+
+
+async def redis_corpus(url: str, limit: int) -> List[bytes]:
+    import redis.asyncio as redis
+
+    client = redis.from_url(url, decode_responses=True)
+    samples: List[bytes] = []
+    try:
+        async for key in client.scan_iter(match="chat:*", count=500):
+            if key == "chat:invalidate":
+                continue
+            for raw in await codec.lrange_raw(client, key, 0, -1):
+                try:
+                    samples.append(json.dumps(codec.decode_json(raw)).encode())
+                except ValueError:
+                    continue
+            if len(samples) >= limit:
+                break
+    finally:
+        await client.aclose()
+    return samples[:limit]
+
+
+def measure(label: str, samples: List[bytes], encode) -> None:
+    turns = [json.loads(sample) for sample in samples]
+    start = time.perf_counter()
+    encoded = [encode(turn) for turn in turns]
+    encode_us = (time.perf_counter() - start) / len(turns) * 1e6
+    start = time.perf_counter()
+    for raw in encoded:
+        codec.decode_json(raw)
+    decode_us = (time.perf_counter() - start) / len(turns) * 1e6
+    average = sum(map(len, encoded)) / len(encoded)
+    print(f"{label:<28} {average:>8.0f} B/turn {average * CONTEXT_TURNS / 1024:>7.1f} KiB/context"
+          f"  encode {encode_us:>6.1f} µs  decode {decode_us:>6.1f} µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="chat storage codec benchmark")
+    parser.add_argument("--turns", type=int, default=4000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--redis-url", default="", help="อ่านแชทจริงจาก Redis แทน corpus สังเคราะห์")
+    parser.add_argument("--dict-size", type=int, default=codec.DICT_SIZE)
+    parser.add_argument("--write-dict", default="", help="บันทึก dictionary ที่ train แล้ว (ใช้กับ STORAGE_DICT)")
+    args = parser.parse_args()
+
+    if args.redis_url:
+        samples = asyncio.run(redis_corpus(args.redis_url, args.turns))
+    else:
+        samples = synthetic_corpus(args.turns, args.seed)
+    if len(samples) < 10:
+        raise SystemExit("ตัวอย่างน้อยเกินไป")
+    # train ครึ่งแรก วัดครึ่งหลัง (ไม่ให้ dictionary เห็นข้อมูลที่ใช้วัด)
+    train, test = samples[: len(samples) // 2], samples[len(samples) // 2:]
+    compact = [json.dumps(json.loads(sample), ensure_ascii=False).encode() for sample in train]
+    start = time.perf_counter()
+    trained = codec.train_dictionary(compact, args.dict_size)
+    print(f"train dictionary {len(trained)} B จาก {len(train)} turn ใน {time.perf_counter() - start:.2f}s\n")
+
+    print(f"{'json.dumps (เดิม)':<28} {sum(map(len, test)) / len(test):>8.0f} B/turn "
+          f"{sum(map(len, test)) / len(test) * CONTEXT_TURNS / 1024:>7.1f} KiB/context")
+    saved = codec.COMPRESSION
+    codec.COMPRESSION = "none"
+    measure("codec ไม่บีบอัด", test, codec.encode_json)
+    codec.COMPRESSION = saved
+    codec.use_dictionaries([])
+    measure("codec + deflate", test, codec.encode_json)
+    codec.use_dictionaries([codec.DEFAULT_DICTIONARY])
+    measure("codec + dictionary ตั้งต้น", test, codec.encode_json)
+    codec.use_dictionaries([trained, codec.DEFAULT_DICTIONARY])
+    measure("codec + dictionary ที่ train", test, codec.encode_json)
+
+    if args.write_dict:
+        with open(args.write_dict, "wb") as f:
+            f.write(trained)
+        print(f"\nบันทึก {args.write_dict} (id {codec.dictionary_id(trained):08x}) แล้ว")
+
+
+if __name__ == "__main__":
+    main()
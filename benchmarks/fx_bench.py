@@ -0,0 +1,59 @@
+"""
+วัดความเร็วการแปลงเงินจากตารางอัตราแลกเปลี่ยนในเครื่อง (ไม่เรียก API / GPT)
+
+    python -m benchmarks.fx_bench --amounts 10000
+"""
+import argparse
+import random
+import time
+
+from benchmarks.stubs import FX
+from modules.fx.parser import parse_fx_query
+from modules.fx.rates import RateTable
+from modules.fx.renderer import render_conversion
+
+QUESTIONS = [
+    "100 ดอลลาร์กี่บาท",
+    "1000 บาทเป็นเยน",
+    "USD 1,200 to eur",
+    "10, 25.5, 40 ยูโร เทียบ ดอลลาร์ เยน",
+    "2 แสนวอน กี่บาท",
+]
+
+
+def _bench(label: str, fn, iterations: int, per: int = 1) -> None:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {elapsed / iterations / per * 1e6:>10.2f} µs/op")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="fx conversion benchmark")
+    parser.add_argument("--amounts", type=int, default=10_000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    table = RateTable(FX["rates"])
+    rng = random.Random(1)
+    amounts = [round(rng.uniform(1, 10_000), 2) for _ in range(args.amounts)]
+    targets = ["USD", "EUR", "JPY", "CNY"]
+
+    for question in QUESTIONS:
+        _bench(f"parse+render {question!r}"[:36],
+               lambda q=question: render_conversion(parse_fx_query(q, table.codes), table), args.iterations)
+
+    def per_amount():
+        # แบบแปลงทีละจำนวน ทีละสกุล (หาอัตราใหม่ทุกครั้ง)
+        return {code: [table.convert(amount, "THB", code) for amount in amounts] for code in targets}
+
+    _bench("convert one by one (per amount)", per_amount, 20, len(amounts))
+    _bench("convert_many (per amount)", lambda: table.convert_many(amounts, "THB", targets), 20, len(amounts))
+    batch = table.convert_many(amounts, "THB", targets)
+    single = per_amount()
+    assert all(abs(a - b) < 1e-9 for code in targets for a, b in zip(batch[code], single[code]))
+
+
+if __name__ == "__main__":
+    main()
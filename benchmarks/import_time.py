@@ -0,0 +1,116 @@
+"""
+วัดเวลา import main (cold start) แยกตามโมดูล ด้วย python -X importtime
+
+    python -m benchmarks.import_time --runs 5
+    python -m benchmarks.import_time --top 30 --json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ค่าหลอกให้ Settings ผ่าน validation โดยไม่ต้องมี .env จริง
+DUMMY_ENV = {
+    "DISCORD_TOKEN": "x",
+    "OPENAI_API_KEY": "x",
+    "STARTUP_WARMUP": "0",
+}
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    for key, value in DUMMY_ENV.items():
+        env.setdefault(key, value)
+    return env
+
+
+def run_importtime(module: str) -> List[Tuple[int, int, str]]:
+    """ คืน [(self_us, cumulative_us, ชื่อโมดูล)] จาก stderr ของ -X importtime """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=_env(), capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(self_us), int(cumulative_us), name.strip()))
+    return rows
+
+
+def time_cold_import(module: str, runs: int) -> List[float]:
+    """ เวลา import ทั้งก้อน (ms) ใน process ใหม่ทุกครั้ง """
+    code = f"import time; s = time.perf_counter(); import {module}; print(time.perf_counter() - s)"
+    samples = []
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, env=_env(), capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+        samples.append(float(proc.stdout.strip().splitlines()[-1]) * 1e3)
+    return samples
+
+
+def by_package(rows: List[Tuple[int, int, str]]) -> Dict[str, int]:
+    """ รวมเวลา self ตาม top-level package (เช่น openai, discord, modules) """
+    totals: Dict[str, int] = defaultdict(int)
+    for self_us, _, name in rows:
+        totals[name.split(".")[0]] += self_us
+    return dict(totals)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="import-time benchmark")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", action="store_true", help="พิมพ์ผลเป็น JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = run_importtime(args.module)
+    samples = time_cold_import(args.module, args.runs)
+    top_modules = sorted(rows, key=lambda r: r[1], reverse=True)[: args.top]
+    packages = sorted(by_package(rows).items(), key=lambda kv: kv[1], reverse=True)[: args.top]
+
+    report = {
+        "module": args.module,
+        "runs": args.runs,
+        "median_ms": round(statistics.median(samples), 1),
+        "min_ms": round(min(samples), 1),
+        "max_ms": round(max(samples), 1),
+        "modules_imported": len(rows),
+        "top_cumulative_ms": {name: round(cum / 1e3, 1) for _, cum, name in top_modules},
+        "top_packages_ms": {name: round(us / 1e3, 1) for name, us in packages},
+    }
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+
+    print(f"import {args.module}: median {report['median_ms']} ms "
+          f"(min {report['min_ms']}, max {report['max_ms']}, {args.runs} runs, "
+          f"{report['modules_imported']} modules)")
+    print("\nslowest modules (cumulative):")
+    for name, ms in report["top_cumulative_ms"].items():
+        print(f"  {ms:>8.1f} ms  {name}")
+    print("\nby top-level package (self):")
+    for name, ms in report["top_packages_ms"].items():
+        print(f"  {ms:>8.1f} ms  {name}")
+    print(f"\n(benchmark took {time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
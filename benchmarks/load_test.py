@@ -0,0 +1,572 @@
+"""
+load test แบบ offline: ยิงข้อความภาษาไทยสังเคราะห์เข้า on_message ตัวจริง โดยให้ทุก upstream เป็นของปลอม
+(เซิร์ฟเวอร์ stub ในเครื่อง + fakeredis หรือ Redis ในเครื่อง) แล้วรายงาน throughput, latency แต่ละขั้น และจำนวนครั้งที่เรียก upstream
+
+    python -m benchmarks.load_test --messages 500 --concurrency 32
+    python -m benchmarks.load_test --openai-latency-ms 800 --mix chat=1
+    python -m benchmarks.load_test --mix chat=1 --openai-token-ms 10    # เวลาตอบขึ้นกับจำนวน output token
+    python -m benchmarks.load_test --redis-url redis://localhost:6379/15 --json
+    python -m benchmarks.load_test --max-p99-ms 1500    # exit 1 ถ้า p99 เกิน (ใช้ใน CI ก่อน deploy)
+    python -m benchmarks.load_test --no-redis            # Redis ต่อไม่ได้ บอทต้องยังตอบได้ครบ
+    python -m benchmarks.load_test --slash               # ยิงเป็น slash command (/gold /ask ...) แทนข้อความ
+    python -m benchmarks.load_test --fault api.chnwt.dev=1 --fault oil-price.bangchak.co.th=0:8000   # upstream ล่ม / แขวน
+    python -m benchmarks.load_test --mix chat=1 --fault model:gpt-4o-mini=0:8000:0.1   # โมเดลหลักช้าเป็นพัก ๆ → สลับตัวสำรอง
+    python -m benchmarks.load_test --processes 1,2,4 --redis-url redis://localhost:6379/15   # หลาย shard process ใช้ Redis ร่วมกัน
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.stubs import (
+    Fault,
+    MessageTrace,
+    RedirectTransport,
+    StubConfig,
+    StubUpstreams,
+    make_interaction,
+    make_message,
+    stub_env,
+)
+
+# ✅ ข้อความตัวอย่างต่อหัวข้อ (ต้อง match กับ message_matcher) และสัดส่วน default
+WORKLOAD: Dict[str, List[str]] = {
+    "gold": ["ราคาทองวันนี้เท่าไหร่", "ทองขึ้นไหมวันนี้", "ราคาทองคำแท่งล่าสุด"],
+    "oil": ["ราคาน้ำมันวันนี้", "ดีเซลลิตรละเท่าไหร่", "น้ำมันเท่าไหร่แล้ว"],
+    "lotto": ["ตรวจหวยงวดนี้", "ผลหวยล่าสุด", "หวยออกอะไร", "ตรวจหวย 123456 654321 111111",
+              "เลข 482913 กับ 000178 ถูกไหม ย้อนหลัง 6 งวด"],
+    "exchange": ["อัตราแลกเปลี่ยนวันนี้", "ค่าเงินบาทตอนนี้", "เรทเงินวันนี้", "100 ดอลลาร์กี่บาท",
+                 "1000 บาทเป็นเยน", "10, 25.5, 40 ยูโร เทียบ ดอลลาร์ เยน"],
+    "news": ["ข่าววันนี้มีอะไรบ้าง", "ขอสรุปข่าวหน่อย"],
+    "global_news": ["ข่าวต่างประเทศวันนี้", "ข่าวโลกล่าสุด"],
+    "weather": ["อากาศเชียงใหม่วันนี้เป็นไง", "กรุงเทพฝนตกไหม", "อุณหภูมิภูเก็ตตอนนี้"],
+    "tarot": ["ดูไพ่ยิปซีความรัก", "เปิดไพ่ 5 ใบ การงาน", "ไพ่ประจำวัน", "เซลติกครอส การเงิน"],
+    "chat": [
+        "สวัสดีพี่หลาม",
+        "ช่วยแนะนำหนังสนุก ๆ หน่อย",
+        "ทำไมแมวชอบนอนทั้งวัน",
+        "ช่วยคิดชื่อร้านกาแฟให้หน่อย",
+        "อธิบาย async ใน python แบบง่าย ๆ",
+        "เหนื่อยงานมากเลย ทำไงดี",
+    ],
+}
+DEFAULT_MIX = {
+    "chat": 45, "gold": 10, "oil": 6, "lotto": 8, "exchange": 5,
+    "news": 3, "global_news": 2, "weather": 11, "tarot": 10,
+}
+
+
+def parse_mix(raw: str) -> Dict[str, float]:
+    if not raw:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for part in raw.split(","):
+        name, _, weight = part.partition("=")
+        if name not in WORKLOAD:
+            raise SystemExit(f"ไม่รู้จักหัวข้อ {name!r} (มี {', '.join(WORKLOAD)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def parse_faults(raw: List[str]) -> Dict[str, Fault]:
+    """
+    ["api.chnwt.dev=1", "lotto.api.rayriffy.com=0:8000", "www.googleapis.com=0:2000:0.05", "model:gpt-4o=1"]
+    → host (หรือ model:<ชื่อ>) → Fault
+    """
+    faults = {}
+    for part in raw:
+        host, _, spec = part.partition("=")
+        rate, _, rest = spec.partition(":")
+        latency_ms, _, latency_rate = rest.partition(":")
+        faults[host] = Fault(latency=float(latency_ms or 0) / 1e3, error_rate=float(rate or 1),
+                             latency_rate=float(latency_rate or 1))
+    return faults
+
+
+def build_workload(count: int, mix: Dict[str, float], users: int, seed: int) -> List[Tuple[str, int, str]]:
+    """ [(หัวข้อ, user_id, ข้อความ)] สุ่มแบบกำหนด seed ได้ ให้รันซ้ำได้ชุดเดิม """
+    rng = random.Random(seed)
+    topics = list(mix)
+    weights = [mix[t] for t in topics]
+    workload = []
+    for _ in range(count):
+        topic = rng.choices(topics, weights)[0]
+        workload.append((topic, 10_000 + rng.randrange(users), rng.choice(WORKLOAD[topic])))
+    return workload
+
+
+def slash_call(app, topic: str, text: str):
+    """ ข้อความตัวอย่าง → (slash command, argument) ที่ผู้ใช้จะกรอกแทนการพิมพ์ข้อความ """
+    from discord import app_commands
+
+    from modules.fx.parser import parse_fx_query
+    from modules.lottery.index import parse_tickets
+    from modules.tarot.spreads import parse_spread_request
+
+    if topic == "chat":
+        return app.slash_ask, {"question": text}
+    if topic in ("gold", "oil"):
+        return (app.slash_gold if topic == "gold" else app.slash_oil), {}
+    if topic == "lotto":
+        tickets = parse_tickets(text)
+        return app.slash_lotto, ({"numbers": " ".join(tickets)} if tickets else {})
+    if topic == "exchange":
+        query = parse_fx_query(text)
+        if query is None:
+            return app.slash_fx, {}
+        amounts = ", ".join(f"{amount:g}" for amount in query.amounts) if query.explicit_amount else None
+        return app.slash_fx, {"amount": amounts, "source": query.source, "targets": ",".join(query.targets)}
+    if topic in ("news", "global_news"):
+        return app.slash_news, {"scope": app_commands.Choice(name=topic, value=topic)}
+    if topic == "weather":
+        return app.slash_weather, {"place": text}
+    if topic == "tarot":
+        spread, tarot_topic = parse_spread_request(text)
+        key = next((k for k, v in app.TAROT_SPREADS.items() if v == spread), "three")
+        return app.slash_tarot, {
+            "topic": app_commands.Choice(name=tarot_topic, value=tarot_topic) if tarot_topic else None,
+            "spread": app_commands.Choice(name=key, value=key),
+        }
+    raise ValueError(f"ไม่มี slash command ของหัวข้อ {topic!r}")
+
+
+async def start_app(stub: StubUpstreams, redis_url: str = "", no_redis: bool = False, hedge: bool = True,
+                    flush: bool = True):
+    """ import main แล้วตั้ง app context ให้ HTTP ขาออกทั้งหมด (รวม OpenAI) วิ่งเข้า stub """
+    for key, value in stub_env().items():
+        os.environ.setdefault(key, value)
+    for key in ("SHARD_COUNT", "SHARD_IDS", "OPENAI_BASE_URL"):
+        os.environ.pop(key, None)
+
+    import httpx
+    from openai import AsyncOpenAI
+
+    import main as app
+    from modules.core.app_context import AppContext, get_context, set_context
+    from modules.core.circuit_breaker import CircuitBreakerTransport
+    from modules.core.hedging import HedgingTransport
+    from modules.core.traffic_capture import http_event_hooks
+
+    # ✅ ขนาด pool เท่ากับ production (จาก Settings) ต่างแค่ปลายทาง และ Redis อาจเป็น fakeredis
+    config = get_context().config
+
+    def stub_client(max_connections: int, keepalive: int, timeout: float, breaker: bool = False) -> httpx.AsyncClient:
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=keepalive)
+        transport = RedirectTransport(stub.base_url, limits=limits)
+        return httpx.AsyncClient(
+            transport=CircuitBreakerTransport(HedgingTransport(transport, None if hedge else {})) if breaker else transport,
+            timeout=timeout,
+            event_hooks=http_event_hooks(),
+        )
+
+    http = stub_client(config.http_max_connections, config.http_max_keepalive, config.http_timeout, breaker=True)
+    openai_http = stub_client(config.openai_max_connections, config.openai_max_connections, 60)
+    openai = AsyncOpenAI(api_key="stub", http_client=openai_http)
+
+    redis_client = None
+    if no_redis:
+        config.redis_url = "redis://127.0.0.1:1/0"     # ต่อไม่ติด → บอททำงานแบบไม่มี Redis
+    elif not redis_url:
+        import fakeredis.aioredis
+
+        redis_client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    else:
+        config.redis_url = redis_url
+    set_context(AppContext(config, http=http, openai=openai, redis_client=redis_client))
+    await app.setup_connection()
+    if flush and redis_url and app.redis_instance is not None:
+        await app.redis_instance.flushdb()
+
+    async def stop():
+        await app.shutdown()
+        await http.aclose()
+        await openai.close()
+        if redis_client is not None:
+            await redis_client.aclose()
+
+    return app, stop
+
+
+def build_report(
+    traces: List[Tuple[str, MessageTrace]], elapsed: float, concurrency: int, errors: int,
+    stages: dict, upstream_calls: dict, upstream_tokens: Optional[dict] = None,
+) -> dict:
+    from modules.core import circuit_breaker, hedging, metrics, model_router
+
+    by_topic: Dict[str, List[float]] = defaultdict(list)
+    first_reply: List[float] = []
+    for topic, trace in traces:
+        by_topic[topic].append(trace.finished - trace.started)
+        if trace.first_reply is not None:
+            first_reply.append(trace.first_reply - trace.started)
+    all_latencies = [lat for values in by_topic.values() for lat in values]
+    unanswered = sum(1 for _, trace in traces if trace.sends == 0)
+
+    return {
+        "messages": len(traces),
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_msg_s": round(len(traces) / elapsed, 1) if elapsed else 0.0,
+        "errors": errors,
+        "unanswered": unanswered,
+        "end_to_end": metrics.summarize(all_latencies),
+        "first_reply": metrics.summarize(first_reply),
+        "by_topic": {topic: metrics.summarize(values) for topic, values in sorted(by_topic.items())},
+        "stages": stages,
+        "upstream_calls": dict(sorted(upstream_calls.items())),
+        "upstream_tokens": dict(sorted((upstream_tokens or {}).items())),
+        "breakers": circuit_breaker.snapshot(),
+        "hedging": hedging.snapshot(),
+        "models": model_router.snapshot(),
+    }
+
+
+CHAT_ORDER = ["q1", "q2", "q3", "q4"]
+
+
+class _DownPipeline:
+    """ pipeline ของ Redis ที่ล่ม: สั่งอะไรก็ได้ แต่ execute แล้วพัง """
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    async def execute(self):
+        raise ConnectionError("redis down (load test)")
+
+
+class _DownRedis:
+    def pipeline(self, transaction: bool = True) -> _DownPipeline:
+        return _DownPipeline()
+
+
+async def check_chat_order(redis_instance) -> Optional[List[str]]:
+    """
+    ความจำแชทต้องคงลำดับเมื่อ Redis ล่มกลางบทสนทนาแล้วกลับมา: q1 → (ล่ม) q2, q3 → (กลับมา) q4
+    คืนลำดับคำถามใน Redis (None = ไม่มี Redis ให้เช็ค)
+    """
+    if redis_instance is None:
+        return None
+    from modules.memory import chat_memory
+
+    user_id = 999_999_999
+    key = chat_memory.CHAT_KEY.format(user_id=user_id)
+    await redis_instance.delete(key)
+    await chat_memory.store_chat(redis_instance, user_id, {"question": "q1", "response": "r1"})
+    await chat_memory.store_chat(_DownRedis(), user_id, {"question": "q2", "response": "r2"})
+    await chat_memory.store_chat(redis_instance, user_id, {"question": "q3", "response": "r3"})
+    chat_memory._retry_at = 0.0    # ครบเวลา RETRY_AFTER แล้ว Redis กลับมา
+    await chat_memory.store_chat(redis_instance, user_id, {"question": "q4", "response": "r4"})
+    from modules.core import codec
+
+    turns = chat_memory._parse(list(await codec.lrange_raw(redis_instance, key, 0, -1)))[0]
+    await redis_instance.delete(key)
+    chat_memory.get_cache().invalidate(user_id)
+    return [turn.get("question") for turn in turns]
+
+
+async def run(args) -> dict:
+    stub = await StubUpstreams(StubConfig(
+        openai_latency=args.openai_latency_ms / 1e3,
+        feed_latency=args.feed_latency_ms / 1e3,
+        openai_token_latency=args.openai_token_ms / 1e3,
+        openai_reply_tokens=args.openai_reply_tokens,
+        prompt_cache_min_tokens=args.prompt_cache_min_tokens,
+        search_ratio=args.search_ratio,
+        seed=args.seed,
+        faults=parse_faults(args.fault),
+    )).start()
+    worker = args.worker is not None
+    app, stop = await start_app(stub, args.redis_url, args.no_redis, not args.no_hedge, flush=not worker)
+    from modules.core import metrics
+
+    workload = build_workload(args.messages, parse_mix(args.mix), args.users, args.seed)
+    if worker:
+        # ✅ process ลูกของ --processes: บอก ready แล้วรอ go ให้ทุก process เริ่มยิงพร้อมกัน (ไม่นับเวลา import / warm up)
+        print("ready", flush=True)
+        await asyncio.get_running_loop().run_in_executor(None, sys.stdin.readline)
+    traces: List[Tuple[str, MessageTrace]] = []
+    queue: asyncio.Queue = asyncio.Queue()
+    for i, item in enumerate(workload):
+        queue.put_nowait((i, item))
+
+    channel_id = app.CHANNEL_ID[0]
+    # id ข้อความไม่ซ้ำข้าม process ลูก (Redis ร่วมกัน ข้อความ id เดียวกันจะถูกมองว่า shard อื่นตอบไปแล้ว)
+    first_id = 1_000_000 + (args.worker or 0) * args.messages
+    errors = 0
+
+    async def client_loop():
+        nonlocal errors
+        while True:
+            try:
+                i, (topic, user_id, text) = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            trace = MessageTrace(started=time.perf_counter())
+            try:
+                if args.slash:
+                    command, kwargs = slash_call(app, topic, text)
+                    interaction = make_interaction(first_id + i, user_id, channel_id, trace)
+                    await command.callback(interaction, **kwargs)
+                else:
+                    await app.on_message(make_message(first_id + i, user_id, channel_id, text, trace))
+            except Exception as e:
+                errors += 1
+                logging.getLogger("load_test").warning("%s error: %s", "slash" if args.slash else "on_message", e)
+            trace.finished = time.perf_counter()
+            traces.append((topic, trace))
+
+    metrics.reset()
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    stages = metrics.snapshot()
+    # เช็คลำดับความจำแชทแค่ process แรก (user เดียวกัน ถ้าหลาย process ทำพร้อมกันจะชนกันเอง)
+    chat_order = await check_chat_order(app.redis_instance) if not args.worker else None
+    await stop()
+    await stub.close()
+    report = build_report(traces, elapsed, args.concurrency, errors, stages, stub.stats.calls, stub.stats.tokens)
+    report["chat_order"] = chat_order
+    return report
+
+
+def parse_processes(raw: str) -> List[int]:
+    try:
+        counts = [int(part) for part in raw.split(",") if part.strip()]
+    except ValueError:
+        raise SystemExit(f"--processes ต้องเป็นตัวเลขคั่นด้วย , เช่น 1,2,4 (ได้ {raw!r})")
+    if not counts or min(counts) < 1:
+        raise SystemExit("--processes ต้องมีอย่างน้อย 1 process")
+    return counts
+
+
+def worker_args(args, index: int, redis_url: str) -> List[str]:
+    """ argument ของ process ลูก: โหลดเท่ากันทุกตัว (ต่างแค่ seed) ใช้ Redis ตัวเดียวกัน """
+    argv = [
+        "--messages", str(args.messages), "--concurrency", str(args.concurrency), "--users", str(args.users),
+        "--openai-latency-ms", str(args.openai_latency_ms), "--openai-token-ms", str(args.openai_token_ms),
+        "--openai-reply-tokens", str(args.openai_reply_tokens),
+        "--prompt-cache-min-tokens", str(args.prompt_cache_min_tokens),
+        "--feed-latency-ms", str(args.feed_latency_ms), "--search-ratio", str(args.search_ratio),
+        "--seed", str(args.seed + index), "--redis-url", redis_url, "--worker", str(index),
+    ]
+    if args.mix:
+        argv += ["--mix", args.mix]
+    for fault in args.fault:
+        argv += ["--fault", fault]
+    if args.slash:
+        argv.append("--slash")
+    if args.no_hedge:
+        argv.append("--no-hedge")
+    return argv
+
+
+def shared_redis(redis_url: str):
+    """ Redis ที่ทุก process ต่อร่วมกัน: ถ้าไม่ได้ให้ --redis-url ใช้ fakeredis แบบ TCP ใน process แม่ """
+    if redis_url:
+        return redis_url, None
+    from fakeredis import TcpFakeServer
+
+    server = TcpFakeServer(("127.0.0.1", 0))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"redis://127.0.0.1:{server.server_address[1]}/0", server
+
+
+async def run_processes(args) -> List[dict]:
+    """
+    รัน N process พร้อมกัน (แบบ launcher.py: process ละ shard) ต่อ Redis ตัวเดียวกัน แต่ละ process ยิง
+    --messages ข้อความที่ --concurrency เท่าเดิม แล้วรวม throughput ของทุก process ต่อจำนวน process
+    """
+    import redis.asyncio as redis
+
+    redis_url, server = shared_redis(args.redis_url)
+    results = []
+    try:
+        for count in parse_processes(args.processes):
+            client = redis.from_url(redis_url)
+            await client.flushdb()
+            await client.aclose()
+
+            procs = [
+                await asyncio.create_subprocess_exec(
+                    sys.executable, "-m", "benchmarks.load_test", *worker_args(args, i, redis_url),
+                    stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                )
+                for i in range(count)
+            ]
+            for proc in procs:
+                if (await proc.stdout.readline()).strip() != b"ready":
+                    raise SystemExit(f"process ลูกเริ่มไม่สำเร็จ (exit {await proc.wait()})")
+            for proc in procs:
+                proc.stdin.write(b"go\n")
+                await proc.stdin.drain()
+            reports = []
+            for proc in procs:
+                out, _ = await proc.communicate()
+                lines = out.decode().strip().splitlines()
+                if not lines:
+                    raise SystemExit(f"process ลูกไม่ส่งผลกลับ (exit {proc.returncode})")
+                reports.append(json.loads(lines[-1]))
+
+            # ทุก process เริ่มพร้อมกันหลัง go → ช่วงเวลารวมคือ process ที่เสร็จช้าสุด
+            elapsed = max(r["elapsed_s"] for r in reports)
+            messages = sum(r["messages"] for r in reports)
+            results.append({
+                "processes": count,
+                "messages": messages,
+                "elapsed_s": elapsed,
+                "throughput_msg_s": round(messages / elapsed, 1) if elapsed else 0.0,
+                "errors": sum(r["errors"] for r in reports),
+                "unanswered": sum(r["unanswered"] for r in reports),
+                "p50_ms": max(r["end_to_end"]["p50_ms"] for r in reports),
+                "p99_ms": max(r["end_to_end"]["p99_ms"] for r in reports),
+                "chat_order": reports[0].get("chat_order"),
+            })
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+    base = results[0]["throughput_msg_s"] / results[0]["processes"] if results and results[0]["throughput_msg_s"] else 0
+    for result in results:
+        result["speedup"] = round(result["throughput_msg_s"] / base, 2) if base else 0.0
+        result["efficiency"] = round(result["speedup"] / result["processes"], 2)
+    return results
+
+
+def print_scaling(results: List[dict], shared_fake: bool) -> None:
+    cores = os.cpu_count() or 1
+    print(f"cores={cores} redis={'fakeredis (TCP ใน process แม่)' if shared_fake else 'ตาม --redis-url'}")
+    print(f"  {'processes':>9} {'messages':>9} {'elapsed':>9} {'msg/s':>8} {'speedup':>8} {'eff.':>6} "
+          f"{'p50':>8} {'p99':>8} {'errors':>7}")
+    for r in results:
+        print(f"  {r['processes']:>9} {r['messages']:>9} {r['elapsed_s']:>8.2f}s {r['throughput_msg_s']:>8.1f} "
+              f"{r['speedup']:>7.2f}x {r['efficiency']:>6.2f} {r['p50_ms']:>6.1f}ms {r['p99_ms']:>6.1f}ms "
+              f"{r['errors'] + r['unanswered']:>7}")
+    if any(r["processes"] > cores for r in results):
+        print(f"\n⚠️ เครื่องนี้มี {cores} core: แถวที่ process เกินจำนวน core ไม่ได้วัดการ scale ตาม core "
+              "(process แย่ง CPU กันเอง)")
+    if shared_fake:
+        print("⚠️ fakeredis ตัวเดียวรันเป็นเธรด Python ใน process แม่ อาจเป็นคอขวดเอง วัดจริงให้ใช้ --redis-url")
+
+
+def print_report(report: dict) -> None:
+    print(f"messages={report['messages']} concurrency={report['concurrency']} "
+          f"elapsed={report['elapsed_s']}s throughput={report['throughput_msg_s']} msg/s "
+          f"errors={report['errors']} unanswered={report['unanswered']}")
+
+    def row(label: str, s: dict) -> str:
+        return (f"  {label:<18} n={s['count']:<6} p50={s['p50_ms']:>8.1f}  p90={s['p90_ms']:>8.1f}  "
+                f"p99={s['p99_ms']:>8.1f}  max={s['max_ms']:>8.1f} ms")
+
+    print("\nlatency:")
+    print(row("end-to-end", report["end_to_end"]))
+    print(row("first reply", report["first_reply"]))
+    print("\nby topic (end-to-end):")
+    for topic, s in report["by_topic"].items():
+        print(row(topic, s))
+    print("\nstages:")
+    for stage, s in report["stages"].items():
+        print(row(stage, s))
+    print("\nupstream calls:")
+    for name, count in report["upstream_calls"].items():
+        print(f"  {name:<28} {count}")
+    if report.get("breakers"):
+        print("\ncircuit breakers:")
+        for host, b in report["breakers"].items():
+            print(f"  {host:<28} {b['state']:<9} calls={b['calls']} failures={b['failures']} slow={b['slow']} "
+                  f"rejected={b['rejected']} opened={b['opened']}")
+    if report.get("hedging"):
+        print("\nhedged requests:")
+        for host, h in report["hedging"].items():
+            print(f"  {host:<28} hedged={h['hedged']} wins={h['wins']} delay={h['delay_ms']}ms samples={h['samples']}")
+    if report.get("models", {}).get("models"):
+        models = report["models"]
+        print(f"\nmodel router: routed={models['routed']} failovers={models['failovers']}")
+        for model, m in models["models"].items():
+            print(f"  {model:<28} calls={m['calls']} errors={m['errors']} slow={m['slow']} wins={m['wins']} "
+                  f"healthy={m['healthy']} p50={m['p50_ms']:.1f} p99={m['p99_ms']:.1f} ms")
+    if report.get("chat_order") is not None:
+        ok = report["chat_order"] == CHAT_ORDER
+        print(f"\nchat order หลัง Redis ล่มแล้วกลับมา: {report['chat_order']} {'✅' if ok else '❌'}")
+    if report.get("upstream_tokens"):
+        print("\nstub OpenAI tokens (โดยประมาณ):")
+        for name, count in report["upstream_tokens"].items():
+            print(f"  {name:<28} {count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="offline load test ของ on_message")
+    parser.add_argument("--messages", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=16, help="จำนวนผู้ใช้ที่ส่งข้อความพร้อมกัน")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--mix", default="", help="เช่น chat=5,gold=1,tarot=2 (default = สัดส่วนจริงโดยประมาณ)")
+    parser.add_argument("--openai-latency-ms", type=float, default=300)
+    parser.add_argument("--openai-token-ms", type=float, default=0, help="เวลาต่อ output token (เช่น 10) ให้คำตอบยาวช้ากว่า")
+    parser.add_argument("--openai-reply-tokens", type=int, default=300, help="ความยาวคำตอบเฉลี่ยถ้าไม่โดน max_tokens ตัด")
+    parser.add_argument("--prompt-cache-min-tokens", type=int, default=1024,
+                        help="prefix สั้นสุดที่ stub นับเป็น cached_tokens (0 = ดูการใช้ prefix ซ้ำทุกขนาด)")
+    parser.add_argument("--feed-latency-ms", type=float, default=80)
+    parser.add_argument("--search-ratio", type=float, default=0.2)
+    parser.add_argument("--slash", action="store_true", help="เรียกผ่าน slash command แทน on_message")
+    parser.add_argument("--redis-url", default="", help="ใช้ Redis จริง (จะ FLUSHDB!) แทน fakeredis")
+    parser.add_argument("--no-redis", action="store_true", help="รันแบบไม่มี Redis (ความจำ / cache ในเครื่องอย่างเดียว)")
+    parser.add_argument("--no-hedge", action="store_true", help="ปิด hedged request (ไว้เทียบ p99)")
+    parser.add_argument("--fault", action="append", default=[],
+                        help="ฉีดความเสียหาย host=error_rate[:latency_ms[:latency_rate]] เช่น api.chnwt.dev=1 "
+                             "หรือ www.googleapis.com=0:2000:0.05 (5%% ช้า 2 วินาที)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--max-p99-ms", type=float, default=0, help="exit 1 ถ้า p99 end-to-end เกินค่านี้")
+    parser.add_argument("--verbose", action="store_true", help="แสดง log ของบอท")
+    parser.add_argument("--processes", default="",
+                        help="เช่น 1,2,4: รันทีละชุด N process พร้อมกันต่อ Redis ตัวเดียวกัน แล้วเทียบ throughput "
+                             "(--messages / --concurrency เป็นของแต่ละ process)")
+    parser.add_argument("--worker", type=int, default=None, help=argparse.SUPPRESS)   # ใช้ภายใน --processes
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.WARNING)
+
+    if args.processes:
+        results = asyncio.run(run_processes(args))
+        if args.json:
+            print(json.dumps(results, ensure_ascii=False, indent=2))
+        else:
+            print_scaling(results, shared_fake=not args.redis_url)
+        if any(r["errors"] or r["unanswered"] for r in results):
+            sys.exit(1)
+        if any(r["chat_order"] is not None and r["chat_order"] != CHAT_ORDER for r in results):
+            print("\n❌ ความจำแชทสลับลำดับ", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    report = asyncio.run(run(args))
+    if args.worker is not None:
+        print(json.dumps(report, ensure_ascii=False), flush=True)
+        return
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+
+    p99 = report["end_to_end"]["p99_ms"]
+    if args.max_p99_ms and p99 > args.max_p99_ms:
+        print(f"\n❌ p99 {p99:.1f} ms เกินเกณฑ์ {args.max_p99_ms:.1f} ms", file=sys.stderr)
+        sys.exit(1)
+    if report["chat_order"] is not None and report["chat_order"] != CHAT_ORDER:
+        print(f"\n❌ ความจำแชทสลับลำดับ: {report['chat_order']}", file=sys.stderr)
+        sys.exit(1)
+    if report["errors"] or report["unanswered"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
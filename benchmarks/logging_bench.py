@@ -0,0 +1,110 @@
+"""
+วัดว่า log ทำให้ event loop สะดุดแค่ไหน เมื่อปลายทาง (stderr / docker log) เขียนช้า
+เทียบ StreamHandler ตรง ๆ แบบเดิม กับคิว + เธรดเขียนของ modules.core.logger และต้นทุนของ f-string ที่ระดับ log ไม่ผ่าน
+
+    python -m benchmarks.logging_bench --lines 2000 --sink-ms 1
+"""
+import argparse
+import asyncio
+import io
+import logging
+import logging.handlers
+import queue
+import time
+
+from modules.core import logger as log_module
+from modules.core.metrics import summarize
+
+
+class SlowStream(io.StringIO):
+    """ stream ที่ write ช้า (pipe เต็ม / ดิสก์ช้า) """
+
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+        self.lines = 0
+
+    def write(self, text: str) -> int:
+        time.sleep(self.delay)
+        self.lines += 1
+        return len(text)
+
+
+async def loop_lag(log: logging.Logger, lines: int, per_tick: int) -> dict:
+    """ log ทีละ per_tick บรรทัดต่อรอบของ loop แล้ววัดว่ารอบหนึ่งช้ากว่าที่ควรเท่าไหร่ """
+    lags = []
+    for i in range(0, lines, per_tick):
+        started = time.perf_counter()
+        for j in range(per_tick):
+            log.info("📨 ข้อความ %s จาก %s", i + j, "user", extra={"user": i + j})
+        await asyncio.sleep(0)
+        lags.append(time.perf_counter() - started)
+    return summarize(lags)
+
+
+def build(kind: str, sink: SlowStream) -> tuple:
+    log = logging.getLogger(f"bench.{kind}")
+    log.propagate = False
+    log.handlers.clear()
+    listener = None
+    if kind == "stream":
+        handler = logging.StreamHandler(sink)
+        handler.setFormatter(logging.Formatter(log_module.TEXT_FORMAT.replace("%(cid_tag)s", "")))
+        log.addHandler(handler)
+    else:
+        handler = log_module.NonBlockingQueueHandler(queue.Queue(log_module.LOG_QUEUE_SIZE))
+        handler.addFilter(log_module.CorrelationFilter())
+        stream = logging.StreamHandler(sink)
+        stream.setFormatter(log_module.JsonFormatter() if kind == "json" else log_module.TextFormatter(log_module.TEXT_FORMAT))
+        listener = logging.handlers.QueueListener(handler.queue, stream)
+        listener.start()
+        log.addHandler(handler)
+    log.setLevel(logging.INFO)
+    return log, listener
+
+
+def filtered_cost(calls: int) -> dict:
+    """ ต้นทุนต่อครั้งของ debug ที่ระดับไม่ผ่าน: f-string (สร้างข้อความทุกครั้ง) vs lazy % """
+    log = logging.getLogger("bench.filtered")
+    log.setLevel(logging.INFO)
+    plan = {"class": "chat", "tokens": 1234, "messages": list(range(20))}
+    started = time.perf_counter()
+    for i in range(calls):
+        log.debug(f"🧩 plan={plan} i={i} ratio={i / calls:.0%}")
+    eager = time.perf_counter() - started
+    started = time.perf_counter()
+    for i in range(calls):
+        log.debug("🧩 plan=%s i=%s ratio=%.0f%%", plan, i, 100 * i / calls)
+    lazy = time.perf_counter() - started
+    return {"fstring_us": round(eager / calls * 1e6, 3), "lazy_us": round(lazy / calls * 1e6, 3)}
+
+
+async def main_async(args) -> None:
+    print(f"{args.lines} บรรทัด, sink ช้า {args.sink_ms} ms/บรรทัด, {args.per_tick} บรรทัดต่อรอบ loop")
+    for kind in ("stream", "queue", "json"):
+        sink = SlowStream(args.sink_ms / 1e3)
+        log, listener = build(kind, sink)
+        lag = await loop_lag(log, args.lines, args.per_tick)
+        if listener is not None:
+            flush_started = time.perf_counter()
+            listener.stop()
+            flush = f" (เธรดเขียนตามหลังอีก {time.perf_counter() - flush_started:.2f}s)"
+        else:
+            flush = ""
+        print(f"  {kind:<7} loop tick p50={lag['p50_ms']:>7.2f} p99={lag['p99_ms']:>7.2f} "
+              f"max={lag['max_ms']:>7.2f} ms  เขียนแล้ว {sink.lines} บรรทัด{flush}")
+    cost = filtered_cost(args.calls)
+    print(f"\ndebug ที่ไม่ผ่านระดับ: f-string {cost['fstring_us']} µs/ครั้ง, lazy {cost['lazy_us']} µs/ครั้ง")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="event-loop stall จาก logging")
+    parser.add_argument("--lines", type=int, default=2000)
+    parser.add_argument("--per-tick", type=int, default=10, help="log กี่บรรทัดต่อรอบ loop (เช่น ต่อข้อความ)")
+    parser.add_argument("--sink-ms", type=float, default=1.0, help="เวลาเขียนต่อบรรทัดของปลายทาง")
+    parser.add_argument("--calls", type=int, default=200_000)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+วัดความเร็วการตรวจสลากหลายใบกับหลายงวด (ไม่เรียก GPT / network) เทียบ index กับการไล่ดูทีละงวด
+
+    python -m benchmarks.lottery_bench --tickets 10000 --draws 24
+"""
+import argparse
+import random
+import time
+from typing import Dict, List
+
+from benchmarks.stubs import lotto_draw, lotto_draw_ids
+from modules.lottery.draws import PRIZE_TIERS, Draw, parse_draw
+from modules.lottery.index import LotteryIndex
+
+
+def naive_check(draws: List[Draw], ticket: str) -> List[tuple]:
+    """ แบบเดิม ๆ: ไล่ทุกงวด ทุกรางวัล """
+    wins = []
+    for draw in draws:
+        for tier in PRIZE_TIERS:
+            if any(draw.format_number(tier.key, n) == ticket for n in draw.numbers.get(tier.key, ())):
+                wins.append((draw.id, tier.key))
+        for tier_key, part in (("front3", ticket[:3]), ("back3", ticket[3:]), ("back2", ticket[4:])):
+            if any(draw.format_number(tier_key, n) == part for n in draw.numbers.get(tier_key, ())):
+                wins.append((draw.id, tier_key))
+    return wins
+
+
+def _timed(label: str, fn, checks: int):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed * 1e3:>10.2f} ms  {checks / elapsed:>14,.0f} checks/s  "
+          f"{elapsed / checks * 1e9:>8.0f} ns/check")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="lottery bulk-check benchmark")
+    parser.add_argument("--tickets", type=int, default=10_000)
+    parser.add_argument("--draws", type=int, default=24)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--skip-naive", action="store_true")
+    args = parser.parse_args()
+
+    draws = [parse_draw(lotto_draw(draw_id)["response"]) for draw_id in lotto_draw_ids(args.draws)]
+    rng = random.Random(args.seed)
+    tickets = [f"{rng.randrange(1_000_000):06d}" for _ in range(args.tickets)]
+    # ใส่เลขที่ถูกรางวัลแน่ ๆ ปนไปด้วย
+    tickets[: len(draws)] = [draw.format_number("first", draw.numbers["first"][0]) for draw in draws]
+    checks = len(tickets) * len(draws)
+
+    compact = sum(len(draw.to_compact().encode()) for draw in draws)
+    print(f"draws={len(draws)} tickets={len(tickets)} compact store={compact / 1024:.1f} KiB "
+          f"({compact / len(draws):.0f} B/draw)")
+    assert all(Draw.from_compact(d.to_compact()) == d for d in draws), "compact round-trip ต้องได้ของเดิม"
+
+    start = time.perf_counter()
+    index = LotteryIndex(draws)
+    print(f"index build: {(time.perf_counter() - start) * 1e3:.2f} ms")
+
+    indexed: Dict[str, list] = _timed("indexed check_many", lambda: index.check_many(tickets), checks)
+    winners = sum(1 for wins in indexed.values() if wins)
+    prizes = sum(len(wins) for wins in indexed.values())
+    print(f"winning tickets={winners} prizes={prizes}")
+
+    if not args.skip_naive:
+        naive = _timed("naive scan", lambda: {t: naive_check(index.draws, t) for t in tickets}, checks)
+        for ticket in tickets:
+            got = sorted((w.draw.id, w.tier) for w in indexed[ticket])
+            assert got == sorted(naive[ticket]), f"ผลไม่ตรงกันที่ {ticket}: {got} != {naive[ticket]}"
+        print("✅ index ให้ผลเหมือนการไล่ทีละงวดทุกใบ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+replay traffic ที่บันทึกไว้ (TRAFFIC_CAPTURE_PATH) ผ่านบอทอีกรอบ กับ upstream ที่ตอบด้วยคำตอบที่บันทึกไว้
+ใช้เทียบ 2 เวอร์ชันของ generate_reply / cleaner / cache บน traffic ชุดเดียวกัน
+
+    TRAFFIC_CAPTURE_PATH=traffic.jsonl.gz python main.py             # เก็บ traffic จริง
+    python -m benchmarks.replay traffic.jsonl.gz                       # เร็วตามจริง
+    python -m benchmarks.replay traffic.jsonl.gz --speed 10            # เร่ง 10 เท่า
+    python -m benchmarks.replay traffic.jsonl.gz --speed 0 --concurrency 32 --json > b.json
+    python -m benchmarks.replay traffic.jsonl.gz --baseline a.json --replies b-replies.jsonl
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+from benchmarks.load_test import build_report, print_report, start_app
+from benchmarks.stubs import MESSAGE_HEADER, UPSTREAM_HEADER, MessageTrace, StubConfig, StubUpstreams, make_message
+from modules.core.traffic_capture import current_message, read_events
+
+UpstreamKey = Tuple[str, str]
+
+
+class ReplayUpstreams(StubUpstreams):
+    """
+    ตอบด้วยคำตอบที่บันทึกไว้: หาจาก (ข้อความเดิม, host, path) ก่อน ไม่เจอค่อยใช้ตัวถัดไปของ (host, path)
+    ไม่มีบันทึกเลยค่อยถอยไปใช้ stub ปกติ
+    """
+
+    def __init__(self, events: List[dict], latency_scale: float = 1.0, config: Optional[StubConfig] = None):
+        super().__init__(config)
+        self.latency_scale = latency_scale
+        self.by_message: Dict[Tuple[int, str, str], Deque[dict]] = defaultdict(deque)
+        self.by_endpoint: Dict[UpstreamKey, List[dict]] = defaultdict(list)
+        self._cursor: Dict[UpstreamKey, int] = defaultdict(int)
+        for event in events:
+            if event.get("e") != "up" or event.get("body") is None:
+                continue
+            self.by_endpoint[(event["host"], event["path"])].append(event)
+            if event.get("msg") is not None:
+                self.by_message[(event["msg"], event["host"], event["path"])].append(event)
+        self.misses = 0
+
+    def _recorded(self, request: web.Request) -> Optional[dict]:
+        host = request.headers.get(UPSTREAM_HEADER, "api.openai.com")
+        path = request.path
+        message = request.headers.get(MESSAGE_HEADER)
+        if message is not None:
+            queue = self.by_message.get((int(message), host, path))
+            if queue:
+                return queue.popleft()
+        recorded = self.by_endpoint.get((host, path))
+        if recorded:
+            index = self._cursor[(host, path)]
+            self._cursor[(host, path)] = index + 1
+            return recorded[index % len(recorded)]
+        return None
+
+    async def _dispatch(self, request: web.Request) -> web.StreamResponse:
+        event = self._recorded(request)
+        if event is None:
+            self.misses += 1
+            return await super()._dispatch(request)
+
+        self.stats.calls[event["host"]] += 1
+        if self.latency_scale > 0:
+            await asyncio.sleep(event["ms"] / 1e3 * self.latency_scale)
+        return web.Response(
+            text=event["body"], status=event["status"], content_type=event.get("type") or "application/json"
+        )
+
+
+def load_capture(path: str) -> Tuple[List[dict], List[dict]]:
+    events = list(read_events(path))
+    messages = sorted((e for e in events if e.get("e") == "msg"), key=lambda e: e["ts"])
+    return events, messages
+
+
+def user_id_for(anonymized: str) -> int:
+    # hash ที่บันทึกไว้ → user id ปลอมที่คงที่ (ผู้ใช้เดิมมีประวัติแชทต่อเนื่องเหมือนตอนบันทึก)
+    return int(anonymized[:12], 16)
+
+
+async def replay(args) -> Tuple[dict, List[dict]]:
+    events, messages = load_capture(args.capture)
+    if args.limit:
+        messages = messages[: args.limit]
+    if not messages:
+        raise SystemExit("ไฟล์นี้ไม่มีข้อความให้ replay")
+
+    stub = await ReplayUpstreams(events, latency_scale=args.upstream_latency, config=StubConfig(seed=args.seed)).start()
+    app, stop = await start_app(stub, args.redis_url)
+    from modules.core import metrics
+
+    channel_id = app.CHANNEL_ID[0]
+    semaphore = asyncio.Semaphore(args.concurrency) if args.concurrency else None
+    traces: List[Tuple[str, MessageTrace]] = []
+    replies: List[dict] = []
+    errors = 0
+
+    async def send(event: dict) -> None:
+        nonlocal errors
+        trace = MessageTrace(started=time.perf_counter())
+        message = make_message(event["id"], user_id_for(event["u"]), channel_id, event["text"], trace)
+        token = current_message.set(event["id"])
+        try:
+            await app.on_message(message)
+        except Exception as e:
+            errors += 1
+            logging.getLogger("replay").warning("on_message error: %s", e)
+        finally:
+            current_message.reset(token)
+        trace.finished = time.perf_counter()
+        traces.append((event.get("topic") or "chat", trace))
+        replies.append({"id": event["id"], "topic": event.get("topic"), "text": event["text"], "replies": trace.replies})
+
+    async def limited(event: dict) -> None:
+        if semaphore is None:
+            return await send(event)
+        async with semaphore:
+            await send(event)
+
+    metrics.reset()
+    started = time.perf_counter()
+    first_ts = messages[0]["ts"]
+    tasks = []
+    for event in messages:
+        if args.speed > 0:
+            delay = (event["ts"] - first_ts) / args.speed - (time.perf_counter() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(limited(event)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    stages = metrics.snapshot()
+    await stop()
+    await stub.close()
+
+    report = build_report(traces, elapsed, args.concurrency, errors, stages, stub.stats.calls, stub.stats.tokens)
+    report["upstream_misses"] = stub.misses
+    recorded_ms = [e["ms"] / 1e3 for e in events if e.get("e") == "done"]
+    report["recorded_end_to_end"] = metrics.summarize(recorded_ms)
+    return report, sorted(replies, key=lambda r: r["id"])
+
+
+def print_baseline_diff(report: dict, baseline: dict) -> None:
+    print("\nvs baseline:")
+    rows = [
+        ("throughput msg/s", report["throughput_msg_s"], baseline["throughput_msg_s"]),
+        ("end-to-end p50 ms", report["end_to_end"]["p50_ms"], baseline["end_to_end"]["p50_ms"]),
+        ("end-to-end p99 ms", report["end_to_end"]["p99_ms"], baseline["end_to_end"]["p99_ms"]),
+        ("first reply p99 ms", report["first_reply"]["p99_ms"], baseline["first_reply"]["p99_ms"]),
+    ]
+    for stage, stats in report["stages"].items():
+        if stage in baseline.get("stages", {}):
+            rows.append((f"{stage} p99 ms", stats["p99_ms"], baseline["stages"][stage]["p99_ms"]))
+    for name, now, before in rows:
+        change = f"{(now - before) / before * 100:+.1f}%" if before else "n/a"
+        print(f"  {name:<28} {before:>10.1f} → {now:>10.1f}  ({change})")
+    for name in sorted(set(report["upstream_calls"]) | set(baseline.get("upstream_calls", {}))):
+        now = report["upstream_calls"].get(name, 0)
+        before = baseline.get("upstream_calls", {}).get(name, 0)
+        if now != before:
+            print(f"  calls {name:<22} {before:>10} → {now:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="replay traffic ที่บันทึกไว้ผ่านบอท")
+    parser.add_argument("capture", help="ไฟล์จาก TRAFFIC_CAPTURE_PATH")
+    parser.add_argument("--speed", type=float, default=1.0, help="1 = เร็วตามจริง, 10 = เร่ง 10 เท่า, 0 = ส่งรวดเดียว")
+    parser.add_argument("--concurrency", type=int, default=0, help="จำกัดข้อความที่ทำพร้อมกัน (0 = ไม่จำกัด)")
+    parser.add_argument("--upstream-latency", type=float, default=1.0, help="คูณ latency ที่บันทึกไว้ (0 = ตอบทันที)")
+    parser.add_argument("--limit", type=int, default=0)
+    parser.add_argument("--redis-url", default="", help="ใช้ Redis จริง (จะ FLUSHDB!) แทน fakeredis")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--replies", help="เขียนคำตอบของบอททุกข้อความลงไฟล์ JSONL ไว้ diff กับอีกเวอร์ชัน")
+    parser.add_argument("--baseline", help="รายงาน --json ของอีกเวอร์ชัน เพื่อแสดงส่วนต่าง")
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.WARNING)
+
+    report, replies = asyncio.run(replay(args))
+
+    if args.replies:
+        with open(args.replies, "w", encoding="utf-8") as f:
+            for row in replies:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+        print(f"\nupstream misses (ไม่มีคำตอบที่บันทึกไว้): {report['upstream_misses']}")
+        if report["recorded_end_to_end"]["count"]:
+            s = report["recorded_end_to_end"]
+            print(f"recorded end-to-end: p50={s['p50_ms']:.1f}  p99={s['p99_ms']:.1f} ms")
+        if args.baseline:
+            with open(args.baseline, encoding="utf-8") as f:
+                print_baseline_diff(report, json.load(f))
+
+    if report["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
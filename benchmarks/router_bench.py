@@ -0,0 +1,155 @@
+"""
+ทดสอบ model router กับ stub OpenAI แบบ offline: ส่งงานแต่ละประเภทไปโมเดลที่ถูก, โมเดลหลักช้า/ล่มแล้วสลับตัวสำรอง,
+เลื่อนโมเดลที่พลาดบ่อยไปท้ายแถวแล้วกลับมาเมื่อหาย แต่ละข้อ PASS/FAIL exit 1 ถ้ามีข้อไหนไม่ผ่าน
+
+    python -m benchmarks.router_bench
+"""
+import argparse
+import asyncio
+import sys
+import time
+from dataclasses import replace
+from typing import List, Tuple
+
+from benchmarks.load_test import start_app
+from benchmarks.stubs import Fault, StubConfig, StubUpstreams
+
+SMALL = "stub-small"
+BACKUP = "stub-backup"
+LARGE = "stub-large"
+
+FAILOVER_AFTER = 0.3    # ใช้ค่าสั้นให้รันเร็ว (production ดู ROUTES)
+WINDOW = 2.0
+
+
+class Suite:
+    def __init__(self, stub: StubUpstreams):
+        self.stub = stub
+        self.results: List[Tuple[str, bool, str]] = []
+
+    def check(self, name: str, ok: bool, detail: str = "") -> None:
+        self.results.append((name, ok, detail))
+        print(f"{'PASS' if ok else 'FAIL'}  {name}  {detail}")
+
+    def calls(self, model: str) -> int:
+        return self.stub.stats.calls[f"openai:model:{model}"]
+
+
+async def timed_call(awaitable):
+    started = time.perf_counter()
+    result = await awaitable
+    return result, time.perf_counter() - started
+
+
+async def run_suite(app, stub: StubUpstreams) -> Suite:
+    from modules.core import model_router
+    from modules.core.model_router import CHAT, CLASSIFY, COMPLEX, SUMMARY, HealthPolicy, Route
+    from modules.nlp.openai_utils import summarize_with_gpt
+    from modules.utils.query_utils import get_openai_response
+
+    model_router.ROUTES.update({
+        CLASSIFY: Route((SMALL, BACKUP), failover_after=FAILOVER_AFTER, params={"temperature": 0, "max_tokens": 5}),
+        SUMMARY: Route((SMALL, BACKUP), failover_after=FAILOVER_AFTER, params={"max_tokens": 500}),
+        CHAT: Route((SMALL, BACKUP), failover_after=FAILOVER_AFTER),
+        COMPLEX: Route((LARGE, SMALL), failover_after=FAILOVER_AFTER),
+    })
+    model_router.HEALTH = HealthPolicy(window_seconds=WINDOW, min_calls=3)
+    model_router.reset()
+    suite = Suite(stub)
+    faults = stub.config.faults
+    chat = [{"role": "user", "content": "สวัสดีพี่หลาม วันนี้กินอะไรดี"}]
+
+    # 1) แยกประเภทงาน → โมเดลตาม route
+    suite.check("rule: แชทสั้น = chat", model_router.chat_class("กินข้าวยัง") == CHAT)
+    suite.check("rule: วิเคราะห์ = complex", model_router.chat_class("ช่วยวิเคราะห์ข้อดีข้อเสียของ EV หน่อย") == COMPLEX)
+    suite.check("rule: ยาวมาก = complex", model_router.chat_class("ก" * 400) == COMPLEX)
+    before = suite.calls(SMALL)
+    await app.should_search("ราคาทองวันนี้")
+    suite.check("classify → โมเดลเล็ก", suite.calls(SMALL) == before + 1)
+    before = suite.calls(LARGE)
+    reply = await get_openai_response(chat, request_class=COMPLEX, max_tokens=200)
+    suite.check("complex → โมเดลใหญ่", suite.calls(LARGE) == before + 1 and not reply.startswith("⚠️"))
+    before = suite.calls(SMALL)
+    summary = await summarize_with_gpt("ข่าวทดสอบ " * 50)
+    suite.check("summary → โมเดลเล็ก", suite.calls(SMALL) == before + 1 and not summary.startswith("⚠️"))
+
+    # 2) โมเดลหลักช้า: ยิงตัวสำรองหลัง failover_after ได้คำตอบไม่ต้องรอตัวหลัก
+    faults[f"model:{SMALL}"] = Fault(latency=3.0)
+    reply, seconds = await timed_call(get_openai_response(chat, max_tokens=200))
+    suite.check("slow: ได้คำตอบ", not reply.startswith("⚠️"), reply[:30])
+    suite.check("slow: ไม่รอโมเดลหลัก", seconds < 1.5, f"{seconds * 1e3:.0f} ms")
+    suite.check("slow: ตัวสำรองชนะ", model_router.snapshot()["models"][BACKUP]["wins"] >= 1)
+
+    # 3) โมเดลหลักล่ม (5xx): สลับทันที ไม่รอ retry ของ SDK และไม่รอ failover_after
+    faults[f"model:{SMALL}"] = Fault(error_rate=1.0)
+    reply, seconds = await timed_call(get_openai_response(chat, max_tokens=200))
+    suite.check("5xx: ได้คำตอบจากตัวสำรอง", not reply.startswith("⚠️"))
+    suite.check("5xx: สลับเร็ว", seconds < FAILOVER_AFTER + 0.3, f"{seconds * 1e3:.0f} ms")
+
+    # 4) พลาดบ่อย → เลื่อนไปท้ายแถว ไม่ถูกเรียกก่อนอีก
+    for _ in range(3):
+        await get_openai_response(chat, max_tokens=200)
+    suite.check("demote: ตัวสำรองขึ้นก่อน", model_router.candidates(CHAT)[0] == BACKUP, str(model_router.candidates(CHAT)))
+    before = suite.calls(SMALL)
+    reply, seconds = await timed_call(get_openai_response(chat, max_tokens=200))
+    suite.check("demote: ไม่ยิงโมเดลที่ล่ม", suite.calls(SMALL) == before and not reply.startswith("⚠️"))
+
+    # 5) ทุกตัวล่ม: ผู้ใช้ได้ข้อความขัดข้อง ไม่ค้าง
+    faults[f"model:{BACKUP}"] = Fault(error_rate=1.0)
+    reply, seconds = await timed_call(get_openai_response(chat, max_tokens=200))
+    suite.check("all down: ตอบขัดข้อง", reply.startswith("⚠️"), f"{seconds * 1e3:.0f} ms")
+
+    # 6) หายแล้ว: สถิติเก่าหมดอายุ → กลับมาใช้โมเดลหลัก
+    faults.clear()
+    await asyncio.sleep(WINDOW + 0.1)
+    before = suite.calls(SMALL)
+    reply = await get_openai_response(chat, max_tokens=200)
+    suite.check("recover: กลับมาใช้โมเดลหลัก", suite.calls(SMALL) == before + 1 and not reply.startswith("⚠️"))
+
+    # 7) ตัวสำรองที่ยิงทีหลังแล้วแพ้ตัวหลัก (ถูกยกเลิก) ไม่ถูกนับว่าช้า
+    faults[f"model:{SMALL}"] = Fault(latency=0.5)
+    faults[f"model:{BACKUP}"] = Fault(latency=2.0)
+    slow_before = model_router.snapshot()["models"][BACKUP]["slow"]
+    await get_openai_response(chat, max_tokens=200)
+    suite.check("late loser: ไม่นับว่าช้า", model_router.snapshot()["models"][BACKUP]["slow"] == slow_before)
+
+    # 8) failover ตามงบ token: คำตอบยาวได้เวลารอมากขึ้น ไม่ยิงตัวสำรองเร็วเกิน
+    model_router.ROUTES[CHAT] = replace(model_router.ROUTES[CHAT], per_token=0.004)
+    before = suite.calls(BACKUP)
+    await get_openai_response(chat, max_tokens=200)      # รอได้ 0.3 + 0.8 s ตัวหลักตอบใน 0.5 s
+    suite.check("per_token: คำตอบยาวไม่ failover", suite.calls(BACKUP) == before)
+    before = suite.calls(BACKUP)
+    await get_openai_response(chat, max_tokens=10)       # รอได้ 0.34 s
+    suite.check("per_token: คำตอบสั้นยัง failover", suite.calls(BACKUP) == before + 1)
+    model_router.ROUTES[CHAT] = replace(model_router.ROUTES[CHAT], per_token=0.0)
+    faults.clear()
+
+    print("\nmodel router:")
+    report = model_router.snapshot()
+    print(f"  routed={report['routed']} failovers={report['failovers']}")
+    for model, m in report["models"].items():
+        print(f"  {model:<14} calls={m['calls']} errors={m['errors']} slow={m['slow']} wins={m['wins']} "
+              f"healthy={m['healthy']}")
+    return suite
+
+
+async def main_async() -> int:
+    stub = await StubUpstreams(StubConfig(openai_latency=0.05, jitter=0.0)).start()
+    app, stop = await start_app(stub)
+    try:
+        suite = await run_suite(app, stub)
+    finally:
+        await stop()
+        await stub.close()
+    failed = [name for name, ok, _ in suite.results if not ok]
+    print(f"\n{len(suite.results) - len(failed)}/{len(suite.results)} ผ่าน")
+    return 1 if failed else 0
+
+
+def main():
+    argparse.ArgumentParser(description="model router failover suite").parse_args()
+    sys.exit(asyncio.run(main_async()))
+
+
+if __name__ == "__main__":
+    main()
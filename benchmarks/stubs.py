@@ -0,0 +1,484 @@
+"""
+ของปลอมสำหรับ benchmark แบบ offline: เซิร์ฟเวอร์ upstream จำลอง (feed ต่าง ๆ + OpenAI), transport ที่ย้าย
+request ทุกตัวมาที่เซิร์ฟเวอร์นี้ และ object ของ Discord ที่ on_message ใช้
+"""
+import asyncio
+import itertools
+import json
+import os
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import httpx
+from aiohttp import web
+
+from modules.core.traffic_capture import current_message
+
+UPSTREAM_HEADER = "x-stub-upstream"
+MESSAGE_HEADER = "x-stub-message"
+
+# ✅ ข้อมูลตอบกลับตามรูปแบบของ API จริงที่ฟีเจอร์แต่ละตัวเรียก
+GOLD = {"response": {
+    "date": "1 มกราคม 2568", "update_time": "09:30",
+    "price": {"gold_bar": {"buy": "41,000.00", "sell": "41,100.00"}},
+}}
+OIL = [{"OilList": json.dumps([
+    {"OilName": "แก๊สโซฮอล์ 95 S EVO", "PriceToday": "35.05"},
+    {"OilName": "แก๊สโซฮอล์ 91 S EVO", "PriceToday": "34.68"},
+    {"OilName": "ไฮดีเซล S", "PriceToday": "32.94"},
+], ensure_ascii=False)}]
+THAI_MONTHS = ["", "มกราคม", "กุมภาพันธ์", "มีนาคม", "เมษายน", "พฤษภาคม", "มิถุนายน",
+               "กรกฎาคม", "สิงหาคม", "กันยายน", "ตุลาคม", "พฤศจิกายน", "ธันวาคม"]
+LOTTO_TIERS = [   # (id, reward, จำนวนเลข, จำนวนหลัก)
+    ("prizeFirst", "6000000", 1, 6), ("prizeFirstNear", "100000", 2, 6), ("prizeSecond", "200000", 5, 6),
+    ("prizeThird", "80000", 10, 6), ("prizeForth", "40000", 50, 6), ("prizeFifth", "20000", 100, 6),
+]
+LOTTO_RUNNING = [
+    ("runningNumberFrontThree", "4000", 2, 3), ("runningNumberBackThree", "4000", 2, 3),
+    ("runningNumberBackTwo", "2000", 1, 2),
+]
+
+
+def lotto_draw_ids(count: int) -> List[str]:
+    """ id งวด (DDMMYYYY พ.ศ.) ย้อนหลัง วันที่ 1 และ 16 ของทุกเดือน ใหม่ → เก่า """
+    ids, year, month, day = [], 2568, 1, 1
+    while len(ids) < count:
+        ids.append(f"{day:02d}{month:02d}{year}")
+        if day == 16:
+            day = 1
+        else:
+            day, month = 16, month - 1
+            if month == 0:
+                month, year = 12, year - 1
+    return ids
+
+
+def lotto_draw(draw_id: str) -> dict:
+    """ ผลสลากปลอมหน้าตาเหมือน lotto.api.rayriffy.com/lotto/{id} (สุ่มคงที่ตาม id) """
+    rng = random.Random(draw_id)
+    first = rng.randrange(1_000_000)
+    date = f"{int(draw_id[:2])} {THAI_MONTHS[int(draw_id[2:4])]} {draw_id[4:]}"
+
+    def numbers(amount: int, digits: int) -> List[str]:
+        return [f"{n:0{digits}d}" for n in rng.sample(range(10 ** digits), amount)]
+
+    prizes = []
+    for tier, reward, amount, digits in LOTTO_TIERS:
+        if tier == "prizeFirst":
+            values = [f"{first:06d}"]
+        elif tier == "prizeFirstNear":
+            values = [f"{(first - 1) % 1_000_000:06d}", f"{(first + 1) % 1_000_000:06d}"]
+        else:
+            values = numbers(amount, digits)
+        prizes.append({"id": tier, "reward": reward, "amount": amount, "number": values})
+    running = [
+        {"id": tier, "reward": reward, "amount": amount, "number": numbers(amount, digits)}
+        for tier, reward, amount, digits in LOTTO_RUNNING
+    ]
+    return {"status": "success", "response": {
+        "date": date, "endpoint": f"https://lotto.api.rayriffy.com/lotto/{draw_id}",
+        "prizes": prizes, "runningNumbers": running,
+    }}
+
+
+LOTTO_PAGE_SIZE = 10
+LOTTO = lotto_draw(lotto_draw_ids(1)[0])
+FX = {"result": "success", "base_code": "THB", "rates": {
+    "THB": 1.0, "USD": 0.0294, "EUR": 0.0271, "JPY": 4.41, "CNY": 0.212, "GBP": 0.0232, "KRW": 40.1,
+}}
+RSS = (
+    '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+    + "".join(
+        f"<item><title>ข่าวทดสอบ {i}</title><link>https://example.com/{i}</link>"
+        f"<description>&lt;p&gt;รายละเอียดข่าวทดสอบลำดับที่ {i}&lt;/p&gt;</description></item>"
+        for i in range(5)
+    )
+    + "</channel></rss>"
+)
+CSE = {"items": [
+    {"title": f"ผลค้นหา {i}", "snippet": f"ข้อความตัวอย่างจากผลค้นหาอันดับ {i}"} for i in range(3)
+]}
+WEATHER = {
+    "weather": [{"main": "Clouds", "description": "เมฆเป็นบางส่วน", "icon": "03d"}],
+    "main": {"temp": 31.2, "feels_like": 36.0, "humidity": 64},
+    "wind": {"speed": 2.6},
+    "coord": {"lat": 13.75, "lon": 100.5},
+    "name": "Stub",
+}
+CHAT_REPLY = (
+    "ได้เลยจ้า พี่หลามสรุปให้สั้น ๆ นะ เรื่องนี้มีหลายมุมให้คิด ลองดูทีละข้อ "
+    "แล้วค่อยตัดสินใจก็ได้ ไม่ต้องรีบ ถ้าอยากรู้เพิ่มถามต่อได้เลย"
+)
+
+
+@dataclass
+class Fault:
+    """ ความเสียหายที่ฉีดให้ upstream ตัวหนึ่ง (แก้ค่าได้ระหว่างรัน) """
+    latency: float = 0.0      # วินาที หน่วงเพิ่มก่อนตอบ (มากกว่า timeout = แขวน)
+    latency_rate: float = 1.0  # สัดส่วน request ที่โดนหน่วง (< 1 = ช้าเป็นพัก ๆ แบบ tail latency)
+    error_rate: float = 0.0   # สัดส่วนที่ตอบ status error
+    status: int = 503
+
+
+@dataclass
+class StubConfig:
+    openai_latency: float = 0.3       # วินาที ก่อนได้ token แรก / คำตอบทั้งก้อน
+    openai_stream_chunks: int = 8     # จำนวน chunk เมื่อ stream=True
+    openai_chunk_interval: float = 0.02
+    openai_token_latency: float = 0.0  # วินาทีต่อ output token (0 = คำตอบสำเร็จรูปความยาวคงที่)
+    openai_reply_tokens: int = 300    # ความยาวคำตอบ "ตามใจโมเดล" โดยเฉลี่ย ถูกตัดด้วย max_tokens
+    feed_latency: float = 0.08        # วินาที ของ feed / CSE / อากาศ
+    search_ratio: float = 0.2         # สัดส่วนที่ตอบ need_search ตอน should_search
+    jitter: float = 0.2               # สุ่ม ±20% ของ latency
+    seed: int = 0
+    prompt_cache_min_tokens: int = 1024   # เหมือน OpenAI: cache เฉพาะ prefix ที่ยาวตั้งแต่ 1024 token ทีละ 128
+    faults: Dict[str, Fault] = field(default_factory=dict)   # host หรือ "model:<ชื่อโมเดล>" → fault
+
+
+@dataclass
+class StubStats:
+    calls: Counter = field(default_factory=Counter)
+    tokens: Counter = field(default_factory=Counter)   # "openai:chat:prompt" → รวม token
+
+
+class StubUpstreams:
+    """ เซิร์ฟเวอร์ HTTP จริงบน 127.0.0.1 ตอบแทนทุก upstream (แยกตาม header ที่ RedirectTransport ใส่) """
+
+    def __init__(self, config: Optional[StubConfig] = None):
+        self.config = config or StubConfig()
+        self.stats = StubStats()
+        self._random = random.Random(self.config.seed)
+        self._ids = itertools.count(1)
+        self._prompts: Dict[str, List[str]] = {}   # prompt_cache_key → prompt ล่าสุด ๆ (จำลอง prompt cache)
+        self._runner: Optional[web.AppRunner] = None
+        self.port: Optional[int] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    async def start(self) -> "StubUpstreams":
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self._dispatch)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+
+    async def _sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            spread = self.config.jitter
+            await asyncio.sleep(seconds * self._random.uniform(1 - spread, 1 + spread))
+
+    async def _dispatch(self, request: web.Request) -> web.StreamResponse:
+        host = request.headers.get(UPSTREAM_HEADER, "openai")
+        path = request.path
+
+        if host in ("openai", "api.openai.com") or path.startswith("/v1/"):
+            return await self._openai(request)
+
+        self.stats.calls[host] += 1
+        await self._sleep(self.config.feed_latency)
+        fault = self.config.faults.get(host)
+        if fault is not None:
+            if fault.latency > 0 and self._random.random() < fault.latency_rate:
+                await asyncio.sleep(fault.latency)
+            if self._random.random() < fault.error_rate:
+                self.stats.calls[f"{host}:fault"] += 1
+                return web.Response(status=fault.status, text="stub fault")
+        if host == "api.chnwt.dev":
+            return web.json_response(GOLD)
+        if host == "oil-price.bangchak.co.th":
+            return web.json_response(OIL)
+        if host == "lotto.api.rayriffy.com":
+            if path.startswith("/list/"):
+                page = int(path.rsplit("/", 1)[-1] or 1)
+                ids = lotto_draw_ids(page * LOTTO_PAGE_SIZE)[(page - 1) * LOTTO_PAGE_SIZE:]
+                return web.json_response({"status": "success", "response": [
+                    {"id": i, "url": f"/lotto/{i}", "date": lotto_draw(i)["response"]["date"]} for i in ids
+                ]})
+            if path.startswith("/lotto/"):
+                return web.json_response(lotto_draw(path.rsplit("/", 1)[-1]))
+            return web.json_response(LOTTO)
+        if host == "open.er-api.com":
+            return web.json_response(FX)
+        if host == "news.google.com":
+            return web.Response(text=RSS, content_type="application/rss+xml")
+        if host == "www.googleapis.com":
+            return web.json_response(CSE)
+        if host == "api.openweathermap.org":
+            city = request.query.get("q")
+            if city is not None:
+                # หาจากชื่อ: ชื่อไทยที่แปลงไม่ได้ OpenWeather ไม่รู้จัก
+                if not city.isascii():
+                    return web.json_response({"cod": "404", "message": "city not found"}, status=404)
+                return web.json_response({**WEATHER, "name": city.title()})
+            return web.json_response(WEATHER)
+        return web.json_response({"error": f"no stub for {host}{path}"}, status=404)
+
+    def _cached_prefix(self, body: dict) -> int:
+        """ จำนวน token ต้น prompt ที่ตรงกับ prompt ก่อน ๆ ของ key เดียวกัน (ปัดลงทีละ 128 ต่ำกว่าขั้นต่ำ = 0) """
+        key = body.get("prompt_cache_key") or body.get("model", "")
+        prompt = "".join(f"{m.get('role')}\x00{m.get('content')}\x01" for m in body.get("messages", []))
+        seen = self._prompts.setdefault(key, [])
+        common = max((len(os.path.commonprefix([prompt, old])) for old in seen), default=0)
+        seen.append(prompt)
+        del seen[:-8]
+        tokens = common // 3
+        if tokens < self.config.prompt_cache_min_tokens:
+            return 0
+        return tokens // 128 * 128
+
+    async def _openai(self, request: web.Request) -> web.StreamResponse:
+        if request.path.endswith("/models"):
+            self.stats.calls["openai:models"] += 1
+            return web.json_response({"object": "list", "data": [{"id": "gpt-4o-mini", "object": "model"}]})
+
+        body = await request.json()
+        max_tokens = body.get("max_tokens") or 0
+        if 0 < max_tokens <= 5:
+            kind = "openai:decide"
+            text = "need_search" if self._random.random() < self.config.search_ratio else "no_search"
+        else:
+            kind = "openai:chat"
+            text = CHAT_REPLY
+        model = body.get("model", "gpt-4o-mini")
+        self.stats.calls[kind] += 1
+        self.stats.calls[f"openai:model:{model}"] += 1
+
+        finish_reason = "stop"
+        generation = 0.0
+        if kind == "openai:chat" and self.config.openai_token_latency > 0:
+            # ✅ จำลองว่ายิ่งตอบยาวยิ่งช้า และชน max_tokens แล้วโดนตัดกลางประโยค
+            wanted = round(self.config.openai_reply_tokens * self._random.uniform(0.5, 1.5))
+            limit = max_tokens or wanted
+            if wanted > limit:
+                finish_reason = "length"
+            words = CHAT_REPLY.split()
+            text = " ".join(words[i % len(words)] for i in range(max(1, min(wanted, limit) * 3 // 10)))
+            generation = min(wanted, limit) * self.config.openai_token_latency
+
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in body.get("messages", [])) // 3
+        completion_tokens = max(1, len(text) // 3)
+        cached_tokens = self._cached_prefix(body)
+        self.stats.tokens[f"{kind}:prompt"] += prompt_tokens
+        self.stats.tokens[f"{kind}:cached"] += cached_tokens
+        self.stats.tokens[f"{kind}:completion"] += completion_tokens
+        completion_id = f"chatcmpl-stub-{next(self._ids)}"
+        await self._sleep(self.config.openai_latency)
+        await asyncio.sleep(generation)
+        fault = self.config.faults.get(f"model:{model}")
+        if fault is not None:
+            if fault.latency > 0 and self._random.random() < fault.latency_rate:
+                await asyncio.sleep(fault.latency)
+            if self._random.random() < fault.error_rate:
+                self.stats.calls[f"openai:model:{model}:fault"] += 1
+                return web.json_response({"error": {"message": "stub fault", "type": "server_error"}},
+                                         status=fault.status)
+
+        if not body.get("stream"):
+            return web.json_response({
+                "id": completion_id, "object": "chat.completion", "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "finish_reason": finish_reason,
+                             "message": {"role": "assistant", "content": text}}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                          "total_tokens": prompt_tokens + completion_tokens,
+                          "prompt_tokens_details": {"cached_tokens": cached_tokens}},
+            })
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        chunks = max(1, self.config.openai_stream_chunks)
+        step = max(1, -(-len(text) // chunks))
+        for start in range(0, len(text), step):
+            chunk = {
+                "id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": text[start:start + step]}, "finish_reason": None}],
+            }
+            await response.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode())
+            await asyncio.sleep(self.config.openai_chunk_interval)
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+
+class RedirectTransport(httpx.AsyncBaseTransport):
+    """ ส่ง request ทุกตัว (URL จริงที่ฟีเจอร์ hardcode ไว้) ไปที่ StubUpstreams แทน โดยบอก host เดิมใน header """
+
+    def __init__(self, base_url: str, **transport_kwargs):
+        self._target = httpx.URL(base_url)
+        self._transport = httpx.AsyncHTTPTransport(**transport_kwargs)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        # สร้าง request ใหม่ ไม่แก้ตัวเดิม (event hook อย่าง traffic capture ต้องเห็น URL จริง)
+        headers = request.headers.copy()
+        headers[UPSTREAM_HEADER] = request.url.host
+        message_id = current_message.get()
+        if message_id is not None:
+            headers[MESSAGE_HEADER] = str(message_id)
+        redirected = httpx.Request(
+            request.method,
+            request.url.copy_with(scheme=self._target.scheme, host=self._target.host, port=self._target.port),
+            headers=headers,
+            stream=request.stream,
+            extensions=request.extensions,
+        )
+        return await self._transport.handle_async_request(redirected)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+# ✅ object ของ Discord เท่าที่ on_message / smart_reply / handle_tarot / slash command ใช้จริง
+
+class FakeSentMessage:
+    def __init__(self, channel: "FakeChannel", content: str):
+        self.channel = channel
+        self.content = content
+
+    async def edit(self, content: str = None, **_):
+        self.content = content
+        self.channel.on_event("edit", content)
+        return self
+
+
+class _Typing:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int, on_event: Optional[Callable[[str, str], None]] = None):
+        self.id = channel_id
+        self.on_event = on_event or (lambda kind, content: None)
+
+    async def send(self, content: str = None, **_):
+        self.on_event("send", content)
+        return FakeSentMessage(self, content)
+
+    def typing(self):
+        return _Typing()
+
+
+@dataclass
+class FakeAuthor:
+    id: int
+    bot: bool = False
+
+
+@dataclass
+class FakeGuild:
+    id: int = 1
+
+
+class FakeMessage:
+    def __init__(self, message_id: int, content: str, author: FakeAuthor, channel: FakeChannel):
+        self.id = message_id
+        self.content = content
+        self.author = author
+        self.channel = channel
+        self.guild = FakeGuild()
+
+    async def reply(self, content: str = None, **_):
+        return await self.channel.send(content)
+
+
+class FakeInteractionResponse:
+    def __init__(self, channel: FakeChannel):
+        self.channel = channel
+        self.message: Optional[FakeSentMessage] = None
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def send_message(self, content: str = None, **_):
+        self._done = True
+        self.message = await self.channel.send(content)
+
+    async def defer(self, **_):
+        self._done = True
+        self.channel.on_event("defer", None)
+
+
+class FakeFollowup:
+    def __init__(self, channel: FakeChannel):
+        self.channel = channel
+
+    async def send(self, content: str = None, **_):
+        return await self.channel.send(content)
+
+
+class FakeInteraction:
+    def __init__(self, interaction_id: int, user: FakeAuthor, channel: FakeChannel):
+        self.id = interaction_id
+        self.user = user
+        self.channel = channel
+        self.channel_id = channel.id
+        self.guild = FakeGuild()
+        self.command = None
+        self.response = FakeInteractionResponse(channel)
+        self.followup = FakeFollowup(channel)
+
+    async def original_response(self):
+        return self.response.message
+
+
+@dataclass
+class MessageTrace:
+    """ เวลาของข้อความหนึ่ง: ตอบข้อความแรกเมื่อไหร่ เสร็จเมื่อไหร่ ส่ง/แก้ไปกี่ครั้ง """
+    started: float
+    first_reply: Optional[float] = None
+    finished: Optional[float] = None
+    sends: int = 0
+    edits: int = 0
+    deferrals: int = 0
+    replies: List[str] = field(default_factory=list)
+
+    def on_event(self, kind: str, content: str) -> None:
+        if self.first_reply is None:
+            self.first_reply = time.perf_counter()
+        if kind == "defer":
+            self.deferrals += 1     # ผู้ใช้เห็น "กำลังคิด..." นับเป็นการตอบครั้งแรก แต่ยังไม่ใช่ข้อความ
+            return
+        if kind == "edit":
+            self.edits += 1
+        else:
+            self.sends += 1
+        self.replies.append(content or "")
+
+
+def make_message(message_id: int, user_id: int, channel_id: int, text: str, trace: MessageTrace) -> FakeMessage:
+    channel = FakeChannel(channel_id, trace.on_event)
+    return FakeMessage(message_id, text, FakeAuthor(user_id), channel)
+
+
+def make_interaction(interaction_id: int, user_id: int, channel_id: int, trace: MessageTrace) -> FakeInteraction:
+    return FakeInteraction(interaction_id, FakeAuthor(user_id), FakeChannel(channel_id, trace.on_event))
+
+
+def stub_env() -> Dict[str, str]:
+    """ environment ที่ต้องตั้งก่อน import main ให้ทุกฟีเจอร์เปิดใช้งาน (ค่า key เป็นของปลอม) """
+    return {
+        "DISCORD_TOKEN": "stub",
+        "OPENAI_API_KEY": "stub",
+        "OPENWEATHER_API_KEY": "stub",
+        "GOOGLE_API_KEY": "stub",
+        "GOOGLE_CSE_ID": "stub",
+        "STARTUP_WARMUP": "0",
+        "CHAT_QUEUE_MODE": "0",
+    }
@@ -0,0 +1,55 @@
+"""
+วัดความเร็วการจั่วไพ่และ render คำทำนาย (ไม่เรียก GPT / network)
+
+    python -m benchmarks.tarot_bench --iterations 20000
+"""
+import argparse
+import time
+from datetime import date
+
+from modules.tarot.spreads import CELTIC_CROSS, DAILY, THREE_CARD, custom_spread, daily_seed
+from modules.tarot.tarot_deck import get_deck
+from modules.tarot.tarot_reading import create_reading, draw_multiple_cards, render_reading
+
+
+def _bench(label: str, fn, iterations: int) -> None:
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    per_call_us = elapsed / iterations * 1e6
+    print(f"{label:<32} {iterations / elapsed:>12,.0f} ops/s  {per_call_us:>8.2f} µs/op")
+
+
+def check_determinism() -> None:
+    seed = daily_seed(1234, date(2025, 1, 1), CELTIC_CROSS.key, "ความรัก")
+    first = [(c.name, r) for c, r in draw_multiple_cards(CELTIC_CROSS.size, seed)]
+    second = [(c.name, r) for c, r in draw_multiple_cards(CELTIC_CROSS.size, seed)]
+    assert first == second, "seed เดิมต้องได้ไพ่ชุดเดิม"
+    assert len({name for name, _ in first}) == CELTIC_CROSS.size, "ห้ามได้ไพ่ซ้ำในสเปรดเดียว"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="tarot draw/render benchmark")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    n = args.iterations
+
+    start = time.perf_counter()
+    get_deck()
+    print(f"deck load: {(time.perf_counter() - start) * 1e3:.2f} ms")
+    check_determinism()
+
+    seeded = lambda spread: (lambda i: draw_multiple_cards(spread.size, i))
+    _bench("draw daily (1)", seeded(DAILY), n)
+    _bench("draw three (3)", seeded(THREE_CARD), n)
+    _bench("draw celtic cross (10)", seeded(CELTIC_CROSS), n)
+    _bench("draw n=7", seeded(custom_spread(7)), n)
+    _bench("seed per user/day", lambda i: daily_seed(i, date.today(), "three", "การงาน"), n)
+    _bench("reading three + render", lambda i: render_reading(create_reading("การเงิน", THREE_CARD, i)), n)
+    _bench("reading celtic + render", lambda i: render_reading(create_reading("ความรัก", CELTIC_CROSS, i)), n)
+    _bench("daily all-topic + render", lambda i: render_reading(create_reading(None, DAILY, i)), n)
+
+
+if __name__ == "__main__":
+    main()
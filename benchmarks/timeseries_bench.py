@@ -0,0 +1,62 @@
+"""
+วัดความเร็ว query แนวโน้มราคา (ทอง / น้ำมัน / ค่าเงิน) บน time series ในเครื่อง
+
+    python -m benchmarks.timeseries_bench --days 365 --interval-min 5
+"""
+import argparse
+import random
+import tempfile
+import time
+
+from modules.timeseries.store import SeriesStore
+from modules.timeseries.trend import DAY, answer_trend
+
+
+def _bench(label: str, fn, iterations: int) -> None:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed / iterations * 1e6:>10.1f} µs/op")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="time series query benchmark")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--interval-min", type=float, default=5)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="timeseries-bench-")
+    store = SeriesStore(directory)
+    rng = random.Random(1)
+    now = time.time()
+    step = args.interval_min * 60
+    points = int(args.days * DAY / step)
+
+    start = time.perf_counter()
+    value = 41_000.0
+    for i in range(points):
+        value += rng.uniform(-20, 21)
+        store.record("gold:bar_sell", round(value, 0), now - (points - i) * step)
+    print(f"points={points:,} append: {(time.perf_counter() - start) / points * 1e6:.1f} µs/point (รวมเขียนไฟล์)")
+
+    start = time.perf_counter()
+    reloaded = SeriesStore(directory).series("gold:bar_sell")
+    print(f"load from disk (mmap): {(time.perf_counter() - start) * 1e3:.2f} ms")
+    assert len(reloaded) == points
+
+    series = store.series("gold:bar_sell")
+    n = args.iterations
+    _bench("stats 1 day", lambda: series.stats(DAY, now), n)
+    _bench("stats 30 days", lambda: series.stats(30 * DAY, now), n)
+    _bench("stats 365 days", lambda: series.stats(365 * DAY, now), n)
+    _bench("delta 7 days", lambda: series.delta(7 * DAY, now), n)
+    _bench("moving average 5 pts / 1 day", lambda: series.moving_average(5, since=now - DAY), n)
+    _bench("answer 'ทองขึ้นหรือลงเดือนนี้'", lambda: answer_trend("gold", "ทองขึ้นหรือลงเดือนนี้", store, now), n)
+    print()
+    print(answer_trend("gold", "ทองขึ้นหรือลงเดือนนี้", store, now))
+
+
+if __name__ == "__main__":
+    main()
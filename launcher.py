@@ -0,0 +1,115 @@
+"""
+รันพี่หลามแบบหลาย process โดยแบ่ง shard ให้แต่ละ process และคอย restart ถ้า process ตาย
+
+    python launcher.py --processes 4
+    python launcher.py --processes 2 --total-shards 8
+"""
+import argparse
+import asyncio
+import os
+import signal
+import sys
+import time
+from typing import List, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+from modules.core.logger import logger
+
+MAX_BACKOFF = 60        # วินาที
+HEALTHY_RUNTIME = 120   # ถ้ารันได้นานกว่านี้ ถือว่าหายดี รีเซ็ต backoff
+
+
+async def recommended_shard_count(token: str) -> int:
+    """ ถาม Discord ว่าบอทนี้ควรใช้กี่ shard """
+    async with httpx.AsyncClient(timeout=10) as client:
+        res = await client.get(
+            "https://discord.com/api/v10/gateway/bot",
+            headers={"Authorization": f"Bot {token}"},
+        )
+        res.raise_for_status()
+        return int(res.json()["shards"])
+
+
+def split_shards(total_shards: int, processes: int) -> List[List[int]]:
+    """ แบ่ง shard 0..total-1 เป็นช่วงต่อเนื่องให้แต่ละ process (process ละอย่างน้อย 1 shard) """
+    processes = max(1, min(processes, total_shards))
+    base, extra = divmod(total_shards, processes)
+    groups, start = [], 0
+    for i in range(processes):
+        size = base + (1 if i < extra else 0)
+        groups.append(list(range(start, start + size)))
+        start += size
+    return groups
+
+
+class ShardProcess:
+    def __init__(self, index: int, shard_ids: List[int], total_shards: int, script: str):
+        self.index = index
+        self.shard_ids = shard_ids
+        self.total_shards = total_shards
+        self.script = script
+        self.proc: Optional[asyncio.subprocess.Process] = None
+        self.stopping = False
+
+    @property
+    def label(self) -> str:
+        return f"worker-{self.index} (shards {self.shard_ids[0]}-{self.shard_ids[-1]}/{self.total_shards})"
+
+    async def supervise(self):
+        backoff = 1
+        while not self.stopping:
+            env = dict(os.environ)
+            env["SHARD_COUNT"] = str(self.total_shards)
+            env["SHARD_IDS"] = ",".join(map(str, self.shard_ids))
+
+            started = time.monotonic()
+            self.proc = await asyncio.create_subprocess_exec(sys.executable, self.script, env=env)
+            logger.info("🚀 %s started pid=%s", self.label, self.proc.pid)
+            code = await self.proc.wait()
+
+            if self.stopping:
+                break
+            if time.monotonic() - started > HEALTHY_RUNTIME:
+                backoff = 1
+            logger.warning("💥 %s exited code=%s, restart in %ss", self.label, code, backoff)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, MAX_BACKOFF)
+
+    def stop(self):
+        self.stopping = True
+        if self.proc and self.proc.returncode is None:
+            self.proc.terminate()
+
+
+async def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="รันพี่หลามแบบ sharded หลาย process")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--total-shards", type=int, default=0, help="0 = ใช้จำนวนที่ Discord แนะนำ")
+    parser.add_argument("--script", default=os.path.join(os.path.dirname(__file__), "main.py"))
+    args = parser.parse_args()
+
+    total_shards = args.total_shards
+    if total_shards <= 0:
+        recommended = await recommended_shard_count(os.environ["DISCORD_TOKEN"])
+        # อย่างน้อยให้ทุก process มี shard ของตัวเอง
+        total_shards = max(recommended, args.processes)
+        logger.info("🧩 Discord แนะนำ %s shard → ใช้ %s", recommended, total_shards)
+
+    workers = [
+        ShardProcess(i, shard_ids, total_shards, args.script)
+        for i, shard_ids in enumerate(split_shards(total_shards, args.processes))
+    ]
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, lambda: [w.stop() for w in workers])
+
+    await asyncio.gather(*(w.supervise() for w in workers))
+    logger.info("👋 launcher stopped")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
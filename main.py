@@ -4,39 +4,53 @@ import json
 import asyncio
 import random
 import re
+import time
 from datetime import datetime
 from typing import List, Optional
-from concurrent.futures import ThreadPoolExecutor
 
 # 🔹 Third-Party Packages
-import asyncpg
+# (asyncpg, httpx, openai, tiktoken, bs4 ถูก import ตอนใช้ครั้งแรก เพื่อให้บอทเริ่มเร็ว)
 import discord
-import pytz
-import httpx
-import requests
-import redis.asyncio as redis
 from discord.ext import commands
 from discord import app_commands
 from dotenv import load_dotenv
 from pydantic import Field
 from pydantic_settings import BaseSettings
-from openai import AsyncOpenAI
 
 # 🔹 Local Modules
-from modules.features.oil_price import get_oil_price_today
-from modules.features.gold_price import get_gold_price_today
-from modules.features.lottery_checker import get_lottery_results
-from modules.features.exchange_rate import get_exchange_rate
-from modules.features.weather_forecast import get_weather
-from modules.features.daily_news import get_daily_news
-from modules.features.global_news import get_global_news
-from modules.tarot.tarot_reading import draw_cards_and_interpret_by_topic
+from modules.core.app_context import AppContext, ResourceConfig, get_context, set_context
+from modules.core.lazy_import import lazy_function, preload
+from modules.core.openai_client import get_client
+from modules.lottery.draws import MAX_DRAWS
+from modules.lottery.index import parse_draw_count, parse_tickets
+from modules.fx.currencies import CURRENCIES
+from modules.tarot.spreads import CELTIC_CROSS, DAILY, THREE_CARD, Spread, custom_spread, daily_seed, parse_spread_request
+from modules.tarot.tarot_card import TOPICS as TAROT_TOPICS
 from modules.nlp.message_matcher import match_topic
 from modules.memory.chat_memory import store_chat, build_chat_context_smart, get_previous_message
+from modules.memory.context_planner import (
+    ContextBlock,
+    drop_repeated_previous,
+    pack_blocks,
+    plan_context,
+    prompt_cache_key,
+    render_user_message,
+)
+from modules.memory.invalidation import start_invalidation_listener, stop_invalidation_listener
+from modules.memory.user_profile import DEFAULT_TIMEZONE, get_profile, get_tzinfo
+from modules.nlp.reply_length import choose_reply_length, learn_user_preference
 from modules.utils.cleaner import clean_output_text
-from modules.utils.thai_to_eng_city import convert_thai_to_english_city
+from modules.utils.discord_utils import format_reply, split_message
 from modules.utils.thai_datetime import get_thai_datetime_now, format_thai_datetime
-from modules.core.logger import logger
+from modules.utils.token_counter import warm_tokenizer
+from modules.core.logger import log_context, logger, sample
+from modules.core.metrics import timed
+from modules.core.deadline import DeadlineExceeded, deadline, stage_budget, within
+from modules.core import model_router
+from modules.core import traffic_capture
+from modules.core.traffic_capture import capture_message
+from modules.core.shared_state import allow_rate, cached_feed, claim_message
+from modules.jobs.chat_jobs import enqueue_chat_job
 from modules.utils.query_utils import (
     is_greeting, 
     is_about_bot, 
@@ -44,6 +58,44 @@ from modules.utils.query_utils import (
     get_openai_response, 
 )
 
+# 🔹 ฟีเจอร์: import ตอนถูกเรียกครั้งแรก (หรือตอน warm-up หลังบอทพร้อม)
+get_oil_price_today = lazy_function("modules.features.oil_price", "get_oil_price_today")
+get_gold_price_today = lazy_function("modules.features.gold_price", "get_gold_price_today")
+get_lottery_results = lazy_function("modules.features.lottery_checker", "get_lottery_results")
+get_lottery_store = lazy_function("modules.lottery.store", "get_store")
+render_lottery_check = lazy_function("modules.lottery.renderer", "render_check")
+answer_trend = lazy_function("modules.timeseries.trend", "answer_trend")
+is_trend_question = lazy_function("modules.timeseries.trend", "is_trend_question")
+get_exchange_rate = lazy_function("modules.features.exchange_rate", "get_exchange_rate")
+get_rate_table = lazy_function("modules.fx.rates", "get_rate_table")
+parse_fx_query = lazy_function("modules.fx.parser", "parse_fx_query")
+build_fx_query = lazy_function("modules.fx.parser", "build_fx_query")
+render_conversion = lazy_function("modules.fx.renderer", "render_conversion")
+get_weather_for_text = lazy_function("modules.features.weather_forecast", "get_weather_for_text")
+get_daily_news = lazy_function("modules.features.daily_news", "get_daily_news")
+get_global_news = lazy_function("modules.features.global_news", "get_global_news")
+create_reading = lazy_function("modules.tarot.tarot_reading", "create_reading")
+render_reading = lazy_function("modules.tarot.tarot_reading", "render_reading")
+render_summary = lazy_function("modules.tarot.tarot_reading", "render_summary")
+summarize_reading = lazy_function("modules.tarot.tarot_reading", "summarize_reading")
+rephrase_weather_report = lazy_function("modules.nlp.openai_utils", "rephrase_weather_report")
+
+WARMUP_MODULES = [
+    "modules.features.oil_price",
+    "modules.features.gold_price",
+    "modules.features.lottery_checker",
+    "modules.lottery.store",
+    "modules.lottery.renderer",
+    "modules.features.exchange_rate",
+    "modules.fx.renderer",
+    "modules.features.weather_forecast",
+    "modules.features.daily_news",
+    "modules.features.global_news",
+    "modules.tarot.tarot_reading",
+    "modules.nlp.openai_utils",
+    "modules.timeseries.trend",
+]
+
 
 # ✅ Load environment variables
 load_dotenv()
@@ -51,6 +103,7 @@ load_dotenv()
 class Settings(BaseSettings):
     DISCORD_TOKEN: str = Field(..., env='DISCORD_TOKEN')
     OPENAI_API_KEY: str = Field(..., env='OPENAI_API_KEY')
+    OPENAI_BASE_URL: Optional[str] = Field(None, env='OPENAI_BASE_URL')
     DATABASE_URL: Optional[str] = Field(None, env='DATABASE_URL')
     PG_USER: Optional[str] = Field(None, env='PGUSER')
     PG_PW: Optional[str] = Field(None, env='PGPASSWORD')
@@ -60,56 +113,95 @@ class Settings(BaseSettings):
     GOOGLE_API_KEY: Optional[str] = Field(None, env='GOOGLE_API_KEY')
     GOOGLE_CSE_ID: Optional[str] = Field(None, env='GOOGLE_CSE_ID')
     REDIS_URL: str = Field('redis://localhost', env='REDIS_URL')
+    SHARD_COUNT: Optional[int] = Field(None, env='SHARD_COUNT')
+    SHARD_IDS: Optional[str] = Field(None, env='SHARD_IDS')  # เช่น "0,1,2" (launcher.py กำหนดให้)
+    USER_RATE_LIMIT: int = Field(20, env='USER_RATE_LIMIT')  # ข้อความที่ส่งเข้า GPT ต่อคนต่อนาที
+    CHAT_QUEUE_MODE: bool = Field(False, env='CHAT_QUEUE_MODE')  # True = ส่งงานแชทเข้าคิวให้ worker.py ทำ
+    MESSAGE_COMMANDS: bool = Field(True, env='MESSAGE_COMMANDS')  # False = ตอบเฉพาะ slash command ไม่อ่านข้อความในห้อง
+    REPLY_DEADLINE: float = Field(20.0, env='REPLY_DEADLINE')  # วินาที งบรวมของ generate_reply ทุกขั้น
+    HTTP_MAX_CONNECTIONS: int = Field(50, env='HTTP_MAX_CONNECTIONS')
+    HTTP_MAX_KEEPALIVE: int = Field(20, env='HTTP_MAX_KEEPALIVE')
+    OPENAI_MAX_CONNECTIONS: int = Field(20, env='OPENAI_MAX_CONNECTIONS')
+    REDIS_MAX_CONNECTIONS: int = Field(50, env='REDIS_MAX_CONNECTIONS')
+    PG_POOL_MIN: int = Field(1, env='PG_POOL_MIN')
+    PG_POOL_MAX: int = Field(5, env='PG_POOL_MAX')
 
 settings = Settings()
 
+# ✅ client ทั้งหมด (OpenAI / Redis / PostgreSQL / HTTP) อยู่ใน context นี้ที่เดียว
+set_context(AppContext(ResourceConfig(
+    openai_api_key=settings.OPENAI_API_KEY,
+    openai_base_url=settings.OPENAI_BASE_URL,
+    redis_url=settings.REDIS_URL,
+    database_url=settings.DATABASE_URL,
+    pg_user=settings.PG_USER,
+    pg_password=settings.PG_PW,
+    pg_host=settings.PG_HOST,
+    pg_port=settings.PG_PORT,
+    pg_database=settings.PG_DB,
+    http_max_connections=settings.HTTP_MAX_CONNECTIONS,
+    http_max_keepalive=settings.HTTP_MAX_KEEPALIVE,
+    openai_max_connections=settings.OPENAI_MAX_CONNECTIONS,
+    redis_max_connections=settings.REDIS_MAX_CONNECTIONS,
+    pg_min_size=settings.PG_POOL_MIN,
+    pg_max_size=settings.PG_POOL_MAX,
+)))
+
 CHANNEL_ID = [
     1350812185001066538,  # เดิม
     1409151929296224386,  # อันใหม่
 ]
 
+# ⏱️ อายุ cache ของ feed ที่แชร์กันทุก shard (วินาที)
+FEED_TTL = {
+    "lotto": 600,
+    "exchange": 600,
+    "gold": 300,
+    "oil": 600,
+    "news": 900,
+    "global_news": 900,
+}
+
+def parse_shard_ids(raw: Optional[str]) -> Optional[List[int]]:
+    if not raw:
+        return None
+    return [int(part) for part in raw.split(",") if part.strip()]
+
 intents = discord.Intents.default()
-intents.message_content = True
-bot = commands.Bot(command_prefix="$", intents=intents)
-openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-redis_instance = None
+intents.message_content = settings.MESSAGE_COMMANDS
+if settings.SHARD_COUNT:
+    # ✅ โหมดหลาย process: แต่ละ process ถือ shard ของตัวเอง state ที่แชร์อยู่ใน Redis
+    bot = commands.AutoShardedBot(
+        command_prefix="$",
+        intents=intents,
+        shard_count=settings.SHARD_COUNT,
+        shard_ids=parse_shard_ids(settings.SHARD_IDS),
+    )
+else:
+    bot = commands.Bot(command_prefix="$", intents=intents)
+redis_instance = None  # = get_context().redis หลัง setup_connection (ใช้ร่วมกับ worker.py)
+
+# 🌦️ ถ้าเปิดไว้ จะส่ง template ก่อน แล้วค่อยแก้ข้อความเป็นเวอร์ชันที่ GPT เรียบเรียง
+WEATHER_LLM_PHRASING = os.getenv("WEATHER_LLM_PHRASING", "0") == "1"
+_background_tasks = set()
 
 async def setup_connection():
+    """ ต่อ Redis / PostgreSQL ผ่าน app context (เรียกซ้ำได้ ไม่เปิด pool ใหม่) """
     global redis_instance
 
-    for _ in range(3):
-        try:
-            redis_instance = await redis.from_url(settings.REDIS_URL, decode_responses=True)
-            await redis_instance.ping()
-            logger.info("✅ Redis connected")
-            break
-        except Exception as e:
-            logger.warning(f"🔁 Redis retry failed: {e}")
-            await asyncio.sleep(2)
-    else:
-        logger.error("❌ Redis connection failed")
-        redis_instance = None
+    context = await get_context().start()
+    redis_instance = context.redis
+    bot.pool = context.db
+    start_invalidation_listener(redis_instance)
 
-    try:
-        if settings.DATABASE_URL:
-            bot.pool = await asyncpg.create_pool(settings.DATABASE_URL)
-            logger.info("✅ PostgreSQL connected (DATABASE_URL)")
-        elif settings.PG_USER and settings.PG_PW and settings.PG_HOST and settings.PG_DB:
-            bot.pool = await asyncpg.create_pool(
-                user=settings.PG_USER,
-                password=settings.PG_PW,
-                host=settings.PG_HOST,
-                port=settings.PG_PORT,
-                database=settings.PG_DB
-            )
-            logger.info("✅ PostgreSQL connected (manual credentials)")
-        else:
-            bot.pool = None
-            logger.warning("⚠️ PostgreSQL credentials not provided. Skipping DB setup.")
+async def shutdown():
+    global redis_instance
 
-    except Exception as e:
-        logger.error(f"❌ PostgreSQL connection failed: {e}")
-        bot.pool = None
+    await stop_invalidation_listener()
+    await get_context().close()
+    traffic_capture.close()
+    redis_instance = None
+    bot.pool = None
 
 async def create_table():
     if not bot.pool:
@@ -126,32 +218,29 @@ async def create_table():
             """)
             logger.info("✅ context table ensured")
     except Exception as e:
-        logger.error(f"❌ create_table error: {e}")
+        logger.error("❌ create_table error: %s", e)
 
-async def send_long_reply(message: discord.Message, content: str):
-    chunks = re.split(r'(?<=\n\n)', content)
-    current_chunk = ""
+async def feed_content(name: str, fetch) -> str:
+    with timed(f"feed:{name}"):
+        return await cached_feed(redis_instance, name, FEED_TTL[name], fetch, stale=True)
 
-    for paragraph in chunks:
-        if len(current_chunk) + len(paragraph) < 2000:
-            current_chunk += paragraph
-        else:
-            if current_chunk:
-                await message.channel.send(current_chunk.strip())
-            current_chunk = paragraph
+async def send_feed(message: discord.Message, name: str, fetch):
+    content = await feed_content(name, fetch)
+    with timed("send"):
+        return await message.channel.send(content)
 
-    if current_chunk.strip():
-        await message.channel.send(current_chunk.strip())
+async def send_parts(send, content: str):
+    """ ส่งข้อความยาวทีละไม่เกิน 2000 ตัวอักษร คืนข้อความสุดท้ายที่ส่ง (ไว้ edit ต่อ) """
+    sent = None
+    for part in split_message(content):
+        sent = await send(part)
+    return sent
 
-async def smart_reply(message: discord.Message, content: str):
-    content = clean_output_text(content)
+async def send_long_reply(message: discord.Message, content: str):
+    return await send_parts(message.channel.send, content)
 
-    # ลบ markdown [text](url) -> text <url>
-    content = re.sub(r'\[([^\]]+)\]\((https?://[^\)]+)\)', r'\1 <\2>', content)
-    # ลบลิงก์เปล่า ๆ
-    content = re.sub(r'(?<!<)(https?://\S+)(?!>)', r'<\1>', content)
-    # ลบ ** เดี่ยว ๆ ที่หลงมา
-    content = re.sub(r'(?<!\*)\*\*(?!\*)', '', content)
+async def smart_reply(message: discord.Message, content: str):
+    content = format_reply(content)
 
     if len(content) > 2000:
         await send_long_reply(message, content)
@@ -194,11 +283,10 @@ async def should_search(question: str) -> bool:
 ตอบสั้น ๆ ว่า:
 """.strip()
 
-    response = await openai_client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0,
-        max_tokens=5,
+    response = await model_router.complete(
+        model_router.CLASSIFY,
+        [{"role": "user", "content": prompt}],
+        prompt_cache_key="pheelarm:should_search",
     )
 
     decision = response.choices[0].message.content.strip().lower()
@@ -213,9 +301,8 @@ async def search_google_cse(query: str) -> List[str]:
         "q": query,
         "num": 3,
     }
-    async with httpx.AsyncClient(timeout=10) as client:
-        response = await client.get(url, params=params)
-        response.raise_for_status()
+    response = await get_context().http.get(url, params=params, timeout=10)
+    response.raise_for_status()
 
     data = response.json()
 
@@ -229,100 +316,409 @@ async def search_google_cse(query: str) -> List[str]:
 
     return results
 
-from modules.features.weather_forecast import get_weather
-
-async def generate_reply(user_id: int, text: str) -> str:
-    # ✅ สร้าง system prompt (ดิบ ไม่ต้อง clean)
-    system_prompt = await process_message(user_id, text)
+# ⏱️ งบเวลาของแต่ละขั้นใน generate_reply (ทุกขั้นได้ไม่เกินเวลาที่เหลือของ REPLY_DEADLINE)
+LLM_RESERVE = 8.0          # กันไว้ให้ LLM เสมอ ขั้นเสริมใช้ได้แค่เวลาที่เกินจากนี้
+SEARCH_DECIDE_TIMEOUT = 3.0
+SEARCH_TIMEOUT = 4.0
+WEATHER_TIMEOUT = 4.0
+MIN_STAGE_TIME = 0.5       # เหลือน้อยกว่านี้ไม่ต้องเริ่มขั้นเสริม
 
-    # ✅ รับ timezone จาก Redis (ถ้าไม่มี ใช้ Asia/Bangkok)
-    tz_key = f"timezone:{user_id}"
-    user_tz = None
-    try:
-        if redis_instance:
-            user_tz = await redis_instance.get(tz_key)
-    except Exception as e:
-        logger.warning(f"⚠️ Redis read failed for {tz_key}: {e}")
+async def generate_reply(user_id: int, text: str, channel_id: Optional[int] = None) -> str:
+    with deadline(settings.REPLY_DEADLINE):
+        return await _generate_reply(user_id, text, channel_id)
 
-    timezone = user_tz or "Asia/Bangkok"
-    now = datetime.now(pytz.timezone(timezone))
+async def _generate_reply(user_id: int, text: str, channel_id: Optional[int] = None) -> str:
+    question = text
 
-    # ✅ เพิ่มข้อมูลบริบทเวลา (แยกจากคำสั่งหลัก แต่ยังคงอยู่ใน system)
-    system_prompt = (
-        system_prompt.strip()
-        + f"\n\n⏰ timezone: {timezone}\n🕒 {format_thai_datetime(now)}"
-    ).strip()
+    # ✅ สร้าง system prompt (ดิบ ไม่ต้อง clean) ต้องเหมือนเดิมทุก byte ทุกข้อความ → OpenAI ใช้ prompt cache ได้
+    #    ของที่เปลี่ยนทุกครั้ง (เวลา, timezone, ความยาวคำตอบ, ข้อมูลเสริม) ไปอยู่ท้ายข้อความ user สุดท้ายแทน
+    system_prompt = await process_message(user_id, text)
 
-    # 🧠 เอา context จากคำถามเก่า (ต่อประโยคให้เป็นธรรมชาติ)
-    previous_question = await get_previous_message(redis_instance, user_id)
-    if previous_question and not is_greeting(text):
-        text = f"ต่อจากที่ก่อนหน้านี้ถามว่า: \"{previous_question}\"\n\nตอนนี้: {text}"
+    # 🧠 วางแผน context ตามประเภทข้อความ (ทักทาย / ถามต่อ / ถามทั่วไป ...)
+    with timed("history"):
+        # ✅ timezone / โทน / ความยาวที่ชอบ มาจาก cache ในเครื่อง (ไม่ต้องรอ Redis ถ้าเคยเห็นผู้ใช้นี้แล้ว)
+        previous_question, profile = await asyncio.gather(
+            get_previous_message(redis_instance, user_id),
+            get_profile(redis_instance, user_id),
+        )
+    plan = plan_context(question, previous_question)
+    now = datetime.now(profile.tzinfo)
 
-    # 🌐 ต้องค้นเว็บไหม
-    if await should_search(text):
+    # 📏 ความยาวคำตอบตามประเภทคำถาม / ห้อง / ที่ผู้ใช้เคยขอให้สั้นลงหรือยาวขึ้น
+    user_scale = await learn_user_preference(
+        redis_instance, user_id, question, profile.reply_scale, replied_before=previous_question is not None
+    )
+    length = choose_reply_length(question, channel_id, user_scale)
+    footer = f"⏰ timezone: {profile.timezone}\n🕒 {format_thai_datetime(now)}\n{length.hint}"
+    if profile.tone:
+        footer += f"\n🎭 โทนที่ผู้ใช้ชอบ: {profile.tone}"
+    blocks = []
+    if plan.budget.include_previous and previous_question:
+        blocks.append(ContextBlock("previous", previous_question))
+
+    # 🌐 ต้องค้นเว็บไหม (ทักทาย / ถามเรื่องบอท ไม่ต้องเสียเวลาถามโมเดล)
+    search_query = f"{previous_question} {question}" if plan.message_class == "followup" else question
+    need_search = False
+    if plan.budget.search:
+        decide_budget = stage_budget(SEARCH_DECIDE_TIMEOUT, reserve=LLM_RESERVE, minimum=MIN_STAGE_TIME)
+        if decide_budget:
+            try:
+                with timed("should_search"):
+                    need_search = await within(should_search(search_query), decide_budget)
+            except DeadlineExceeded:
+                logger.warning("⏱️ ตัดสินใจค้นเว็บไม่ทัน ตอบจากความรู้ไปก่อน")
+        else:
+            logger.info("⏱️ เวลาเหลือน้อย ข้ามการค้นเว็บ")
+    search_budget = stage_budget(SEARCH_TIMEOUT, reserve=LLM_RESERVE, minimum=MIN_STAGE_TIME) if need_search else 0.0
+    if search_budget:
         logger.info("🌐 ต้องค้นหาเว็บ")
         try:
-            search_results = await search_google_cse(text)
+            with timed("web_search"):
+                search_results = await within(search_google_cse(search_query), search_budget)
         except Exception as e:
-            logger.error(f"❌ Web search error: {e}")
+            logger.error("❌ Web search error: %r", e)
             search_results = []
         if search_results:
-            search_context = "\n".join(search_results)
-            text = f"ข้อมูลจากการค้นหาเว็บ:\n{search_context}\n\nคำถาม: {text}"
+            blocks.append(ContextBlock("search", items=search_results))
     else:
-        logger.info("🧠 ตอบได้เลย ไม่ต้องค้นหา")
+        logger.info("🧠 ตอบได้เลย ไม่ต้องค้นหา", extra=sample(50))
 
     # 🌦️ ตรวจสอบคำที่เกี่ยวกับสภาพอากาศอย่างง่าย
-    if ("สภาพอากาศ" in text) or ("อากาศ" in text):
+    if plan.message_class == "weather":
         logger.info("🌦️ ดึงข้อมูลสภาพอากาศ")
-        city = None
-        if "กรุงเทพ" in text:
-            city = "กรุงเทพฯ"
-        elif "เชียงใหม่" in text:
-            city = "เชียงใหม่"
-        # TODO: เพิ่ม mapping เมืองอื่น ๆ ตามต้องการ
-
-        if not city:
-            city = "กรุงเทพฯ"
-
         try:
-            weather_info = await get_weather(city)
-            text = f"🌦️ ข้อมูลสภาพอากาศใน {city}: {weather_info}\n\nคำถาม: {text}"
+            # ✅ หาเมืองจากคำถามของผู้ใช้เอง (ไม่เอาจากผลค้นเว็บ) รองรับหลายเมืองในคำถามเดียว
+            weather_budget = stage_budget(WEATHER_TIMEOUT, reserve=LLM_RESERVE, minimum=MIN_STAGE_TIME)
+            if not weather_budget:
+                raise DeadlineExceeded("เวลาเหลือไม่พอดึงอากาศ")
+            with timed("weather"):
+                weather_info = await within(get_weather_for_text(question, redis_instance), weather_budget)
+            blocks.insert(0, ContextBlock("weather", weather_info))
         except Exception as e:
-            logger.error(f"❌ Error while fetching weather: {e}")
-            text = f"⚠️ ขอโทษครับ ไม่สามารถดึงข้อมูลสภาพอากาศได้ตอนนี้\n\nคำถาม: {text}"
-
-    # ✅ context 600 tokens
-    messages = await build_chat_context_smart(
-        redis_instance,
-        user_id,
-        text,
-        system_prompt=system_prompt,
-        model="gpt-4o-mini",
-        max_tokens_context=600,
-        initial_limit=6
+            logger.error("❌ Error while fetching weather: %r", e)
+            blocks.insert(0, ContextBlock("note", "⚠️ ขอโทษครับ ไม่สามารถดึงข้อมูลสภาพอากาศได้ตอนนี้"))
+
+    # ✅ ข้อมูลเสริมทุกก้อนใช้งบเดียวกัน ที่เหลือยกให้ประวัติแชท
+    with timed("build_context"):
+        pack_blocks(plan, blocks)
+        messages = await build_chat_context_smart(
+            redis_instance,
+            user_id,
+            render_user_message(question, plan.blocks, footer),
+            system_prompt=system_prompt,
+            model="gpt-4o-mini",
+            initial_limit=plan.budget.history_turns,
+            history_tokens=plan.history_tokens,
+        )
+        # คำถามก่อนหน้าอยู่ในประวัติแชทแล้ว ไม่ต้องแปะซ้ำ
+        if drop_repeated_previous(plan, messages[1:-1]):
+            messages[-1]["content"] = render_user_message(question, plan.blocks, footer)
+    logger.info(
+        "🧩 context plan=%s injected=%s/%s history_budget=%s messages=%s reply=%s/%s",
+        plan.message_class, plan.injected_used, plan.budget.injected_tokens,
+        plan.history_tokens, len(messages), length.kind, length.max_tokens, extra=sample(10),
     )
 
-    # ✅ ขอคำตอบจากโมเดล
-    response = await get_openai_response(
-        messages,
-        model="gpt-4o-mini",
-        temperature=0.5,
-    )
+    # ✅ ขอคำตอบจากโมเดล (คำถามที่ต้องคิดเยอะใช้โมเดลใหญ่กว่า)
+    request_class = model_router.chat_class(question)
+    with timed("openai"):
+        response = await get_openai_response(
+            messages,
+            request_class=request_class,
+            max_tokens=length.max_tokens,
+            temperature=0.5,
+            usage_label=f"{request_class}:{length.kind}",
+            prompt_cache_key=prompt_cache_key("chat", system_prompt, user_id),
+            trim_incomplete=True,
+        )
 
     # ✅ clean เฉพาะ output ของบอท (ไม่แตะ system prompt)
     return clean_output_text(response).strip()
 
     
+async def _rephrase_weather_later(sent: discord.Message, question: str, report: str):
+    phrased = await rephrase_weather_report(report, question)
+    if not phrased:
+        return
+    try:
+        await sent.edit(content=f"{phrased}\n\n{report}"[:2000])
+    except discord.HTTPException as e:
+        logger.warning("⚠️ แก้ข้อความอากาศไม่สำเร็จ: %s", e)
+
+async def handle_weather(message: discord.Message, text: str):
+    # ✅ ตอบจาก cache + template ทันที ไม่ผ่าน should_search / GPT
+    with timed("weather"):
+        report = await get_weather_for_text(text, redis_instance)
+    with timed("send"):
+        sent = await message.channel.send(report)
+
+    if WEATHER_LLM_PHRASING and not report.startswith("❌"):
+        task = asyncio.create_task(_rephrase_weather_later(sent, text, report))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+    return sent
+
+async def check_lotto_tickets(tickets: List[str], count: int) -> str:
+    # ✅ ตรวจเลขสลากกับผลที่เก็บไว้ในเครื่อง ไม่ผ่าน GPT
+    with timed("lotto:check"):
+        index = await get_lottery_store().ensure(redis_instance, count)
+        results = index.check_many(tickets, count)
+        return render_lottery_check(results, [draw.date or draw.id for draw in index.draws[:count]])
+
+async def handle_lotto_check(message: discord.Message, text: str, tickets: List[str]):
+    content = await check_lotto_tickets(tickets, parse_draw_count(text, MAX_DRAWS))
+    with timed("send"):
+        return await send_long_reply(message, content)
+
+async def run_tarot(send, user_id: int, topic: Optional[str], spread: Spread = THREE_CARD):
+    """ เปิดไพ่แล้วส่งผ่าน send(content) → ข้อความที่ edit ได้ (ใช้ทั้งข้อความในห้องและ slash command) """
+    # ✅ seed ตามผู้ใช้ + วัน (เวลาไทย): ถามซ้ำในวันเดียวกันได้ไพ่ชุดเดิม
+    today = datetime.now(get_tzinfo(DEFAULT_TIMEZONE)).date()
+    with timed("tarot:draw"):
+        reading = create_reading(topic, spread, daily_seed(user_id, today, spread.key, topic))
+
+    if reading.summary or reading.topic is None:
+        # ✅ มีสรุปที่เตรียมไว้แล้ว (หรือไม่ต้องสรุป) ส่งครบทีเดียว
+        await summarize_reading(reading, redis_instance)
+        return await send_parts(send, render_reading(reading))
+
+    content = render_reading(reading)
+    if len(content) <= 2000:
+        # ✅ ส่งไพ่ให้ดูก่อน แล้วค่อยแก้ข้อความเติมสรุปตามมา
+        sent = await send(content)
+        with timed("tarot:summary"):
+            await summarize_reading(reading, redis_instance)
+        new_content = render_reading(reading)
+    else:
+        # ✅ สเปรดใหญ่ ส่งไพ่แยกหลายข้อความ แล้วให้ข้อความสรุปเป็นตัวที่ถูกแก้ทีหลัง
+        await send_parts(send, render_reading(reading, include_summary=False))
+        sent = await send(render_summary(reading))
+        with timed("tarot:summary"):
+            await summarize_reading(reading, redis_instance)
+        new_content = render_summary(reading)
+
+    try:
+        await sent.edit(content=new_content[:2000])
+    except discord.HTTPException as e:
+        logger.warning("⚠️ แก้ข้อความไพ่ยิปซีไม่สำเร็จ: %s", e)
+        await send(render_summary(reading))
+    return sent
+
+async def handle_tarot(message: discord.Message, topic: Optional[str], spread: Spread = THREE_CARD):
+    return await run_tarot(message.channel.send, message.author.id, topic, spread)
+
+# ⚡ Slash commands: ไม่ต้องสแกนข้อความ / ไม่ผ่าน pipeline แชท
+#    ของที่มีใน cache ตอบทันที ถ้าเกิน DEFER_AFTER วินาทีค่อย defer (Discord ให้เวลาตอบครั้งแรกแค่ 3 วินาที)
+DEFER_AFTER = 1.5
+TAROT_SPREADS = {"daily": DAILY, "three": THREE_CARD, "five": custom_spread(5), "celtic": CELTIC_CROSS}
+
+def interaction_sender(interaction: discord.Interaction):
+    """ send(content) ของ interaction: ครั้งแรกเป็นคำตอบหลัก ครั้งต่อไปเป็น followup คืนข้อความที่ edit ได้ """
+    async def send(content: str):
+        if not interaction.response.is_done():
+            await interaction.response.send_message(content)
+            return await interaction.original_response()
+        return await interaction.followup.send(content, wait=True)
+    return send
+
+async def respond(interaction: discord.Interaction, work):
+    """ รอผลของ work ไม่เกิน DEFER_AFTER วินาที ไม่ทันก็ defer ("กำลังคิด...") แล้วส่งเป็น followup """
+    with log_context(interaction.id):   # task ที่สร้างตรงนี้ได้ cid ของ interaction ไปด้วย
+        task = asyncio.ensure_future(work)
+    try:
+        content = await asyncio.wait_for(asyncio.shield(task), DEFER_AFTER)
+    except asyncio.TimeoutError:
+        await interaction.response.defer(thinking=True)
+        content = await task
+    parts = split_message(content)
+    if not interaction.response.is_done():
+        await interaction.response.send_message(parts[0])
+        parts = parts[1:]
+    for part in parts:
+        await interaction.followup.send(part)
+
+async def reject(interaction: discord.Interaction, text: str):
+    await interaction.response.send_message(text, ephemeral=True)
+
+async def price_content(topic: str, fetch, days: Optional[int]) -> str:
+    if days:
+        with timed("trend"):
+            answer = answer_trend(topic, f"{days} วัน")
+        if answer:
+            return answer
+    return await feed_content(topic, fetch)
+
+async def fx_content(amount: Optional[str], source: Optional[str], targets: Optional[str]) -> str:
+    with timed("fx"):
+        table = await get_rate_table(redis_instance)
+    if table is None:
+        return "❌ พี่หลามดึงอัตราแลกเปลี่ยนไม่ได้ ลองใหม่อีกทีนะ"
+    try:
+        query = build_fx_query(amount, source, targets, table.codes)
+    except ValueError as e:
+        return str(e)
+    return render_conversion(query, table)
+
+@bot.tree.command(name="gold", description="ราคาทองคำวันนี้ หรือแนวโน้มย้อนหลัง")
+@app_commands.describe(days="ดูแนวโน้มย้อนหลังกี่วัน (ไม่ใส่ = ราคาล่าสุด)")
+async def slash_gold(interaction: discord.Interaction, days: Optional[app_commands.Range[int, 1, 365]] = None):
+    await respond(interaction, price_content("gold", get_gold_price_today, days))
+
+@bot.tree.command(name="oil", description="ราคาน้ำมันวันนี้ หรือแนวโน้มย้อนหลัง")
+@app_commands.describe(days="ดูแนวโน้มย้อนหลังกี่วัน (ไม่ใส่ = ราคาล่าสุด)")
+async def slash_oil(interaction: discord.Interaction, days: Optional[app_commands.Range[int, 1, 365]] = None):
+    await respond(interaction, price_content("oil", get_oil_price_today, days))
+
+@bot.tree.command(name="lotto", description="ผลสลากกินแบ่งงวดล่าสุด หรือตรวจเลขสลาก")
+@app_commands.describe(numbers="เลขสลาก 6 หลัก คั่นด้วยช่องว่างหรือจุลภาค", draws="ตรวจย้อนหลังกี่งวด")
+async def slash_lotto(
+    interaction: discord.Interaction,
+    numbers: Optional[str] = None,
+    draws: Optional[app_commands.Range[int, 1, MAX_DRAWS]] = None,
+):
+    if numbers is None:
+        return await respond(interaction, feed_content("lotto", get_lottery_results))
+    tickets = parse_tickets(numbers)
+    if not tickets:
+        return await reject(interaction, "❌ ใส่เลขสลาก 6 หลักด้วยนะ เช่น `123456 654321`")
+    await respond(interaction, check_lotto_tickets(tickets, draws or 1))
+
+@bot.tree.command(name="fx", description="อัตราแลกเปลี่ยน / แปลงค่าเงิน")
+@app_commands.rename(source="from", targets="to")
+@app_commands.describe(
+    amount="จำนวนเงิน เช่น 100 หรือ 10, 20, 1.5k",
+    source="สกุลต้นทาง (default USD)",
+    targets="สกุลปลายทาง คั่นด้วยจุลภาค (default THB)",
+)
+async def slash_fx(
+    interaction: discord.Interaction,
+    amount: Optional[str] = None,
+    source: Optional[str] = None,
+    targets: Optional[str] = None,
+):
+    if amount is None and source is None and targets is None:
+        return await respond(interaction, feed_content("exchange", get_exchange_rate))
+    try:
+        build_fx_query(amount, None, None)   # เช็คจำนวนเงินก่อน สกุลเงินต้องรอตาราง (อาจมีสกุลนอกรายการในเครื่อง)
+    except ValueError as e:
+        return await reject(interaction, str(e))
+    await respond(interaction, fx_content(amount, source, targets))
+
+@slash_fx.autocomplete("source")
+@slash_fx.autocomplete("targets")
+async def fx_currency_autocomplete(interaction: discord.Interaction, current: str):
+    current = current.strip().lower()
+    return [
+        app_commands.Choice(name=f"{currency.code} · {currency.name}", value=currency.code)
+        for currency in CURRENCIES
+        if current in currency.code.lower() or any(current in alias for alias in currency.aliases)
+    ][:25]
+
+@bot.tree.command(name="news", description="สรุปข่าวล่าสุด")
+@app_commands.choices(scope=[
+    app_commands.Choice(name="ข่าวในประเทศ", value="news"),
+    app_commands.Choice(name="ข่าวต่างประเทศ", value="global_news"),
+])
+async def slash_news(interaction: discord.Interaction, scope: Optional[app_commands.Choice[str]] = None):
+    name = scope.value if scope else "news"
+    await respond(interaction, feed_content(name, get_global_news if name == "global_news" else get_daily_news))
+
+@bot.tree.command(name="tarot", description="เปิดไพ่ยิปซี")
+@app_commands.describe(topic="อยากดูเรื่องอะไร", spread="รูปแบบการเปิดไพ่")
+@app_commands.choices(
+    topic=[app_commands.Choice(name=topic, value=topic) for topic in TAROT_TOPICS],
+    spread=[app_commands.Choice(name=spread.name, value=key) for key, spread in TAROT_SPREADS.items()],
+)
+async def slash_tarot(
+    interaction: discord.Interaction,
+    topic: Optional[app_commands.Choice[str]] = None,
+    spread: Optional[app_commands.Choice[str]] = None,
+):
+    chosen = TAROT_SPREADS[spread.value] if spread else (DAILY if topic is None else THREE_CARD)
+    if topic is None and chosen is not DAILY:
+        return await reject(interaction, f"🔮 เลือกเรื่องที่อยากดูด้วยนะ: {', '.join(TAROT_TOPICS)}")
+    await run_tarot(interaction_sender(interaction), interaction.user.id, topic.value if topic else None, chosen)
+
+@bot.tree.command(name="weather", description="พยากรณ์อากาศ")
+@app_commands.describe(place="จังหวัด / อำเภอ / เมือง (ใส่ได้หลายที่)")
+async def slash_weather(interaction: discord.Interaction, place: app_commands.Range[str, 1, 200]):
+    async def report() -> str:
+        with timed("weather"):
+            return await get_weather_for_text(place, redis_instance, default=None)
+    await respond(interaction, report())
+
+@bot.tree.command(name="ask", description="ถามพี่หลาม")
+@app_commands.describe(question="คำถาม")
+async def slash_ask(interaction: discord.Interaction, question: app_commands.Range[str, 1, 1500]):
+    user_id = interaction.user.id
+    if not await allow_rate(redis_instance, f"user:{user_id}", settings.USER_RATE_LIMIT, 60):
+        return await reject(interaction, "⏳ ใจเย็น ๆ ก่อนน้า พี่หลามตอบไม่ทันแล้ว ลองใหม่อีกแป๊บนึง")
+
+    # ✅ GPT ใช้เวลาหลายวินาทีเสมอ defer ก่อนเลย แล้วตอบเป็น followup
+    await interaction.response.defer(thinking=True)
+    with timed("generate_reply"):
+        reply = await generate_reply(user_id, question, interaction.channel_id)
+    with timed("send"):
+        await send_parts(interaction.followup.send, format_reply(reply))
+    with timed("store_chat"):
+        await store_chat(redis_instance, user_id, {"question": question, "response": reply})
+
+@bot.tree.error
+async def on_app_command_error(interaction: discord.Interaction, error: app_commands.AppCommandError):
+    name = interaction.command.name if interaction.command else "?"
+    logger.error("❌ /%s error: %s", name, error)
+    text = "⚠️ พี่หลามงงเลย ทำคำสั่งนี้ไม่สำเร็จ ลองใหม่อีกทีนะ"
+    try:
+        if interaction.response.is_done():
+            await interaction.followup.send(text, ephemeral=True)
+        else:
+            await interaction.response.send_message(text, ephemeral=True)
+    except discord.HTTPException:
+        pass
+
+async def warm_up():
+    """ โหลดโมดูลฟีเจอร์, tokenizer และเปิด connection ไป OpenAI ไว้ก่อน หลังบอทพร้อมแล้ว """
+    started = time.perf_counter()
+    try:
+        await asyncio.to_thread(preload, WARMUP_MODULES)
+        await asyncio.to_thread(warm_tokenizer)
+        await get_client().models.list()
+    except Exception as e:
+        logger.warning("⚠️ warm-up ไม่ครบ: %s", e)
+    logger.info("🔥 warm-up เสร็จใน %.2fs", time.perf_counter() - started)
+
+_commands_synced = False
+
+async def sync_commands():
+    """ ส่งรายการ slash command ให้ Discord ครั้งเดียวต่อ process และเฉพาะ process ที่ถือ shard 0 (sync มี rate limit) """
+    global _commands_synced
+    shard_ids = getattr(bot, "shard_ids", None)
+    if _commands_synced or (shard_ids is not None and 0 not in shard_ids):
+        return
+    try:
+        synced = await bot.tree.sync()
+        _commands_synced = True
+        logger.info("⚡ sync slash command แล้ว %s คำสั่ง", len(synced))
+    except discord.HTTPException as e:
+        logger.warning("⚠️ sync slash command ไม่สำเร็จ: %s", e)
+
 @bot.event
 async def on_ready():
     await setup_connection()
     await create_table()
-    await bot.tree.sync()
-    logger.info(f"🚀 {bot.user} is ready!")
+    await sync_commands()
+    logger.info("🚀 %s is ready!", bot.user)
+
+    if os.getenv("STARTUP_WARMUP", "1") == "1":
+        task = asyncio.create_task(warm_up())
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
 
 @bot.event
 async def on_message(message: discord.Message):
+    if not settings.MESSAGE_COMMANDS:
+        return  # ⚡ โหมด slash command อย่างเดียว
+
     # ข้ามบอท, DM, และข้อความที่ขึ้นต้นด้วย "!"
     if message.author.bot or message.guild is None or message.content.startswith("!"):
         return
@@ -331,60 +727,117 @@ async def on_message(message: discord.Message):
     if message.channel.id not in CHANNEL_ID:
         return
 
-    text = message.content.strip()
-    lowered = text.lower()
-
-    topic = match_topic(lowered)
+    # ✅ log ทุกบรรทัดของข้อความนี้ (รวมใน worker) มี cid = id ของข้อความ
+    with log_context(message.id):
+        # กันข้อความเดียวกันถูกตอบซ้ำจากหลาย shard/process
+        with timed("claim"):
+            if not await claim_message(redis_instance, message.id):
+                return
+
+        text = message.content.strip()
+        lowered = text.lower()
+
+        with timed("route"):
+            topic = match_topic(lowered)
+
+        with capture_message(message.author.id, text, topic):
+            return await dispatch_message(message, text, lowered, topic)
+
+async def dispatch_message(message: discord.Message, text: str, lowered: str, topic: Optional[str]):
+    if topic == "exchange":
+        # 💱 มีจำนวนเงิน / สกุลเงินในข้อความ แปลงจากตารางอัตราแลกเปลี่ยนที่ cache ไว้ ไม่ผ่าน GPT
+        with timed("fx"):
+            table = await get_rate_table(redis_instance)
+            query = parse_fx_query(text, table.codes) if table else None
+        if query and (query.explicit_amount or not is_trend_question(lowered)):
+            with timed("send"):
+                return await send_long_reply(message, render_conversion(query, table))
+
+    if topic in ("gold", "oil", "exchange") and is_trend_question(lowered):
+        # 📊 ถามแนวโน้ม ตอบจาก time series ในเครื่อง (ยังมีข้อมูลไม่พอค่อยส่งราคาล่าสุดตามปกติ)
+        with timed("trend"):
+            answer = answer_trend(topic, lowered)
+        if answer:
+            with timed("send"):
+                return await message.channel.send(answer[:2000])
 
     if topic == "lotto":
-        return await message.channel.send(await get_lottery_results())
+        tickets = parse_tickets(text)
+        if tickets:
+            return await handle_lotto_check(message, text, tickets)
+        return await send_feed(message, "lotto", get_lottery_results)
 
     elif topic == "exchange":
-        return await message.channel.send(await get_exchange_rate())
+        return await send_feed(message, "exchange", get_exchange_rate)
 
     elif topic == "gold":
-        return await message.channel.send(await get_gold_price_today())
+        return await send_feed(message, "gold", get_gold_price_today)
 
     elif topic == "oil":
-        return await message.channel.send(await get_oil_price_today())
+        return await send_feed(message, "oil", get_oil_price_today)
+
+    elif topic == "weather":
+        return await handle_weather(message, text)
 
     elif topic == "news":
-        return await message.channel.send(await get_daily_news())
+        return await send_feed(message, "news", get_daily_news)
 
     elif topic == "global_news":
-        return await message.channel.send(await get_global_news())
+        return await send_feed(message, "global_news", get_global_news)
 
     elif topic == "tarot":
+        spread, tarot_topic = parse_spread_request(lowered)
+        if tarot_topic or spread.key == "daily":
+            return await handle_tarot(message, tarot_topic, spread)
         return await message.channel.send(
-            "🔮 อยากดูดวงเรื่องอะไรดี? พิมพ์: ความรัก, การงาน, การเงิน, สุขภาพ"
+            "🔮 อยากดูดวงเรื่องอะไรดี? พิมพ์: ความรัก, การงาน, การเงิน, สุขภาพ\n"
+            "🃏 เลือกสเปรดได้ เช่น \"ไพ่ประจำวัน\", \"เปิดไพ่ 5 ใบ การงาน\", \"เซลติกครอส ความรัก\""
         )
 
     elif lowered in ["ความรัก", "การงาน", "การเงิน", "สุขภาพ"]:
-        return await message.channel.send(await draw_cards_and_interpret_by_topic(lowered))
+        return await handle_tarot(message, lowered)
+
+    if not await allow_rate(redis_instance, f"user:{message.author.id}", settings.USER_RATE_LIMIT, 60):
+        return await message.channel.send("⏳ ใจเย็น ๆ ก่อนน้า พี่หลามตอบไม่ทันแล้ว ลองใหม่อีกแป๊บนึง")
+
+    # 📨 โหมดแยก gateway/worker: ส่งงานเข้า Redis Stream แล้วจบเลย worker จะตอบเอง
+    if settings.CHAT_QUEUE_MODE and redis_instance:
+        try:
+            await enqueue_chat_job(redis_instance, message.id, message.channel.id, message.author.id, text)
+            return
+        except Exception as e:
+            logger.warning("⚠️ ส่งงานเข้าคิวไม่ได้ ตอบเองแทน: %s", e)
 
     async with message.channel.typing():
         try:
-            reply = await generate_reply(message.author.id, text)
+            with timed("generate_reply"):
+                reply = await generate_reply(message.author.id, text, message.channel.id)
         except Exception as e:
-            logger.error(f"❌ GPT Error: {e}")
+            logger.error("❌ GPT Error: %s", e)
             return await message.channel.send("⚠️ พี่หลามงงเลย ตอบไม่ได้จริง ๆ จ้า")
 
         # ✅ ใช้ smart_reply เป็นคน clean
-        await smart_reply(message, reply)
+        with timed("send"):
+            await smart_reply(message, reply)
 
-        await store_chat(redis_instance, message.author.id, {
-            "question": text,
-            "response": reply
-        })
+        with timed("store_chat"):
+            await store_chat(redis_instance, message.author.id, {
+                "question": text,
+                "response": reply
+            })
 
 async def main():
     await setup_connection()
-    if redis_instance:
-        if bot.pool is None:
+    try:
+        if redis_instance is None:
+            # ✅ ยังตอบได้: ความจำแชท / cache / rate limit อยู่ในเครื่อง (ไม่แชร์ข้าม process และหายเมื่อรีสตาร์ต)
+            logger.warning("⚠️ เชื่อมต่อ Redis ไม่สำเร็จ เริ่มบอทแบบใช้หน่วยความจำในเครื่องแทน")
+        elif bot.pool is None:
             logger.warning("⚠️ PostgreSQL ไม่เชื่อมต่อ แต่ Redis ติดตั้งแล้ว จะเริ่มบอทแบบใช้เฉพาะ Redis")
-        await bot.start(settings.DISCORD_TOKEN)
-    else:
-        logger.error("❌ ไม่สามารถเริ่มบอทได้ เพราะเชื่อมต่อ Redis ไม่สำเร็จ")
+        async with bot:
+            await bot.start(settings.DISCORD_TOKEN)
+    finally:
+        await shutdown()
 
 if __name__ == "__main__":
     asyncio.run(main())
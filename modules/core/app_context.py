@@ -0,0 +1,229 @@
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import redis.asyncio as redis
+
+from modules.core.logger import logger
+from modules.core.traffic_capture import http_event_hooks
+
+# ✅ ที่เดียวที่สร้างและปิด client ทุกตัว (OpenAI, Redis, PostgreSQL, HTTP)
+#    โมดูลอื่นรับ client ผ่าน parameter หรือขอจาก get_context() ห้ามสร้างเอง
+#    (asyncpg / httpx / openai ถูก import ตอนสร้าง client ครั้งแรก ให้บอทเริ่มเร็ว)
+
+
+@dataclass
+class ResourceConfig:
+    openai_api_key: Optional[str] = None
+    openai_base_url: Optional[str] = None   # None = api.openai.com (ตั้งเป็น proxy / stub server ได้)
+    redis_url: str = "redis://localhost"
+    database_url: Optional[str] = None
+    pg_user: Optional[str] = None
+    pg_password: Optional[str] = None
+    pg_host: Optional[str] = None
+    pg_port: str = "5432"
+    pg_database: Optional[str] = None
+
+    # ขนาด pool
+    http_max_connections: int = 50
+    http_max_keepalive: int = 20
+    http_timeout: float = 10.0
+    openai_max_connections: int = 20
+    redis_max_connections: int = 50
+    pg_min_size: int = 1
+    pg_max_size: int = 5
+
+    @property
+    def has_postgres(self) -> bool:
+        return bool(self.database_url or (self.pg_user and self.pg_password and self.pg_host and self.pg_database))
+
+    @classmethod
+    def from_env(cls) -> "ResourceConfig":
+        """ สำหรับสคริปต์ที่ไม่ได้โหลด Settings ของ main (เช่น CLI, benchmark) """
+        return cls(
+            openai_api_key=os.getenv("OPENAI_API_KEY"),
+            openai_base_url=os.getenv("OPENAI_BASE_URL"),
+            redis_url=os.getenv("REDIS_URL", "redis://localhost"),
+            database_url=os.getenv("DATABASE_URL"),
+            pg_user=os.getenv("PGUSER"),
+            pg_password=os.getenv("PGPASSWORD"),
+            pg_host=os.getenv("PGHOST"),
+            pg_port=os.getenv("PGPORT", "5432"),
+            pg_database=os.getenv("PGDATABASE"),
+            http_max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "50")),
+            http_max_keepalive=int(os.getenv("HTTP_MAX_KEEPALIVE", "20")),
+            openai_max_connections=int(os.getenv("OPENAI_MAX_CONNECTIONS", "20")),
+            redis_max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "50")),
+            pg_min_size=int(os.getenv("PG_POOL_MIN", "1")),
+            pg_max_size=int(os.getenv("PG_POOL_MAX", "5")),
+        )
+
+
+class AppContext:
+    """
+    เจ้าของ client ทั้งหมดของแอป
+    ส่ง client ปลอมเข้ามาแทนได้ (เช่น fakeredis, httpx.MockTransport) ตัวที่ส่งเข้ามาเองจะไม่ถูกปิดให้
+    """
+
+    def __init__(
+        self,
+        config: Optional[ResourceConfig] = None,
+        *,
+        openai: Any = None,
+        redis_client: Any = None,
+        db: Any = None,
+        http: Any = None,
+    ):
+        self.config = config or ResourceConfig()
+        self._openai = openai
+        self._redis = redis_client
+        self._db = db
+        self._http = http
+        self._injected = {
+            name for name, value in
+            (("openai", openai), ("redis", redis_client), ("db", db), ("http", http))
+            if value is not None
+        }
+        self._started = False
+        self._start_lock = asyncio.Lock()
+
+    # 🔹 client ที่สร้างตอนใช้ครั้งแรก (ไม่ต้องรอ start)
+    @property
+    def openai(self):
+        if self._openai is None:
+            import httpx
+            from openai import AsyncOpenAI
+
+            limits = httpx.Limits(
+                max_connections=self.config.openai_max_connections,
+                max_keepalive_connections=self.config.openai_max_connections,
+            )
+            self._openai = AsyncOpenAI(
+                api_key=self.config.openai_api_key,
+                base_url=self.config.openai_base_url,
+                http_client=httpx.AsyncClient(limits=limits, timeout=60, event_hooks=http_event_hooks()),
+            )
+        return self._openai
+
+    @property
+    def http(self):
+        """ httpx client ตัวเดียวที่ทุกฟีเจอร์ใช้ร่วมกัน (keep-alive ข้าม request, circuit breaker + hedged GET ต่อ upstream) """
+        if self._http is None or self._http.is_closed:
+            import httpx
+
+            from modules.core.circuit_breaker import CircuitBreakerTransport
+            from modules.core.hedging import HedgingTransport
+
+            limits = httpx.Limits(
+                max_connections=self.config.http_max_connections,
+                max_keepalive_connections=self.config.http_max_keepalive,
+            )
+            self._http = httpx.AsyncClient(
+                timeout=self.config.http_timeout,
+                transport=CircuitBreakerTransport(HedgingTransport(httpx.AsyncHTTPTransport(limits=limits))),
+                follow_redirects=True,
+                event_hooks=http_event_hooks(),
+            )
+        return self._http
+
+    # 🔹 client ที่ต้องต่อก่อนใช้ (ผ่าน start) — เป็น None ถ้าต่อไม่ได้
+    @property
+    def redis(self):
+        return self._redis
+
+    @property
+    def db(self):
+        return self._db
+
+    async def start(self, redis_retries: int = 3) -> "AppContext":
+        """ ต่อ Redis และ PostgreSQL (เรียกซ้ำได้ ไม่เปิด pool ใหม่) """
+        async with self._start_lock:
+            if self._started:
+                return self
+            if self._redis is None:
+                self._redis = await self._connect_redis(redis_retries)
+            if self._db is None and self.config.has_postgres:
+                self._db = await self._connect_postgres()
+            elif self._db is None:
+                logger.warning("⚠️ PostgreSQL credentials not provided. Skipping DB setup.")
+            self._started = True
+        return self
+
+    async def _connect_redis(self, retries: int):
+        for _ in range(retries):
+            client = redis.from_url(
+                self.config.redis_url,
+                decode_responses=True,
+                max_connections=self.config.redis_max_connections,
+            )
+            try:
+                await client.ping()
+                logger.info("✅ Redis connected")
+                return client
+            except Exception as e:
+                logger.warning("🔁 Redis retry failed: %s", e)
+                await client.aclose()
+                await asyncio.sleep(2)
+        logger.error("❌ Redis connection failed")
+        return None
+
+    async def _connect_postgres(self):
+        try:
+            import asyncpg
+
+            sizes = {"min_size": self.config.pg_min_size, "max_size": self.config.pg_max_size}
+            if self.config.database_url:
+                pool = await asyncpg.create_pool(self.config.database_url, **sizes)
+                logger.info("✅ PostgreSQL connected (DATABASE_URL)")
+            else:
+                pool = await asyncpg.create_pool(
+                    user=self.config.pg_user,
+                    password=self.config.pg_password,
+                    host=self.config.pg_host,
+                    port=self.config.pg_port,
+                    database=self.config.pg_database,
+                    **sizes,
+                )
+                logger.info("✅ PostgreSQL connected (manual credentials)")
+            return pool
+        except Exception as e:
+            logger.error("❌ PostgreSQL connection failed: %s", e)
+            return None
+
+    async def close(self) -> None:
+        """ ปิดตามลำดับ: HTTP ขาออก → OpenAI → PostgreSQL → Redis (Redis ปิดท้ายสุด เผื่อยังมีงานเขียน state) """
+        steps = (
+            ("http", lambda c: c.aclose()),
+            ("openai", lambda c: c.close()),
+            ("db", lambda c: c.close()),
+            ("redis", lambda c: c.aclose()),
+        )
+        for name, closer in steps:
+            client = getattr(self, f"_{name}")
+            setattr(self, f"_{name}", None)
+            if client is None or name in self._injected:
+                continue
+            try:
+                await closer(client)
+            except Exception as e:
+                logger.warning("⚠️ ปิด %s ไม่สำเร็จ: %s", name, e)
+        self._started = False
+
+
+_context: Optional[AppContext] = None
+
+
+def get_context() -> AppContext:
+    """ context ปัจจุบันของ process (ถ้ายังไม่มีใครตั้ง สร้างจาก environment) """
+    global _context
+    if _context is None:
+        _context = AppContext(ResourceConfig.from_env())
+    return _context
+
+
+def set_context(context: AppContext) -> AppContext:
+    """ ตั้ง context ของ process (main / worker / benchmark ใส่ตัวที่มี client ปลอมได้) """
+    global _context
+    _context = context
+    return context
@@ -0,0 +1,205 @@
+import asyncio
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Tuple
+
+import httpx
+
+from modules.core import deadline
+from modules.core.logger import logger
+
+# ✅ circuit breaker ต่อ upstream (แยกตาม host) ครอบ HTTP ขาออกของทุกฟีเจอร์ที่ transport
+#    closed    ปกติ นับผลล่าสุด ถ้าพลาด/ช้าเกิน failure_rate หรือติดกัน consecutive ครั้ง → open
+#    open      ไม่ยิงเลย fail ทันที (ฟีเจอร์ได้ error เร็ว แล้ว cached_feed เสิร์ฟข้อมูลล่าสุดที่เคยได้แทน)
+#    half_open ครบเวลา open_for แล้วปล่อย probe ทีละตัว สำเร็จ → closed / พลาด → open นานขึ้นเท่าตัว
+#    timeout ของ request ถูกบีบให้ไม่เกิน timeout ของ upstream (ไม่ต้องรอเต็ม 10s ที่ฟีเจอร์ตั้งไว้)
+#    และไม่เกินเวลาที่เหลือของข้อความ (modules.core.deadline) timeout เพราะงบข้อความหมดไม่นับเป็นความผิดของ upstream
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+UPSTREAM_TIMEOUT = float(os.getenv("UPSTREAM_TIMEOUT", "5"))
+
+
+@dataclass(frozen=True)
+class BreakerConfig:
+    window: int = 20               # ผลล่าสุดกี่ครั้งที่ใช้คิดอัตราพลาด
+    window_seconds: float = 60.0   # ผลที่เก่ากว่านี้ไม่นับ
+    min_calls: int = 5             # เรียกน้อยกว่านี้ในหน้าต่าง ยังไม่ตัดสิน
+    failure_rate: float = 0.5      # (พลาด + ช้า) / ทั้งหมด ถึงเท่านี้ → open
+    consecutive: int = 3           # พลาด/ช้าติดกันเท่านี้ → open เลย (feed ที่เรียกไม่บ่อยไม่ต้องรอครบ min_calls)
+    slow_call: float = 3.0         # วินาที สำเร็จแต่ช้ากว่านี้นับเป็นพลาด
+    timeout: float = UPSTREAM_TIMEOUT
+    open_for: float = 15.0         # วินาที ก่อนลอง probe ครั้งแรก
+    max_open_for: float = 300.0
+
+
+DEFAULT_CONFIG = BreakerConfig()
+UPSTREAMS: Dict[str, BreakerConfig] = {
+    "news.google.com": BreakerConfig(slow_call=5.0, timeout=8.0),   # RSS ใหญ่ ช้ากว่าตัวอื่นเป็นปกติ
+}
+
+
+class CircuitOpenError(httpx.TransportError):
+    """ upstream ถูกตัดอยู่ ไม่ได้ยิงจริง """
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, config: BreakerConfig = DEFAULT_CONFIG):
+        self.name = name
+        self.config = config
+        self.state = CLOSED
+        self._results: Deque[Tuple[float, bool]] = deque(maxlen=config.window)   # (เวลา, ดีไหม)
+        self._open_until = 0.0
+        self._open_for = config.open_for
+        self._probing = False
+        self._streak = 0
+        self.calls = 0
+        self.failures = 0
+        self.slow = 0
+        self.rejected = 0
+        self.opened = 0
+
+    def open_remaining(self) -> float:
+        return max(0.0, self._open_until - time.monotonic()) if self.state == OPEN else 0.0
+
+    def before_call(self) -> None:
+        """ raise CircuitOpenError ถ้ายังไม่ควรยิง """
+        if self.state == OPEN and time.monotonic() >= self._open_until:
+            self.state = HALF_OPEN
+        if self.state == CLOSED:
+            return
+        if self.state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+        self.rejected += 1
+        wait = f" อีก {self.open_remaining():.0f}s" if self.state == OPEN else ""
+        raise CircuitOpenError(f"{self.name} ถูกพักไว้ (circuit {self.state}{wait})")
+
+    def release(self) -> None:
+        """ call ถูกยกเลิกกลางทาง (ไม่นับผล) """
+        self._probing = False
+
+    def record(self, ok: bool, seconds: float) -> None:
+        now = time.monotonic()
+        slow = ok and seconds > self.config.slow_call
+        self.calls += 1
+        self.failures += not ok
+        self.slow += slow
+        good = ok and not slow
+
+        if self.state == HALF_OPEN:
+            self._probing = False
+            if good:
+                self._close()
+            else:
+                self._open(now, self._open_for * 2)
+            return
+
+        self._results.append((now, good))
+        self._streak = 0 if good else self._streak + 1
+        if self.state != CLOSED:
+            return
+        while self._results and self._results[0][0] < now - self.config.window_seconds:
+            self._results.popleft()
+        if self._streak >= self.config.consecutive or (
+            len(self._results) >= self.config.min_calls and self.failure_rate() >= self.config.failure_rate
+        ):
+            self._open(now, self.config.open_for)
+
+    def failure_rate(self) -> float:
+        if not self._results:
+            return 0.0
+        return sum(1 for _, good in self._results if not good) / len(self._results)
+
+    def _open(self, now: float, duration: float) -> None:
+        self._open_for = min(duration, self.config.max_open_for)
+        self._open_until = now + self._open_for
+        self.state = OPEN
+        self.opened += 1
+        logger.warning("🔌 ตัดการเรียก %s %.0fs (พลาด/ช้า %.0f%%)", self.name, self._open_for, 100 * self.failure_rate())
+
+    def _close(self) -> None:
+        self.state = CLOSED
+        self._results.clear()
+        self._streak = 0
+        self._open_for = self.config.open_for
+        logger.info("🔌 %s กลับมาใช้ได้แล้ว", self.name)
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "failure_rate": round(self.failure_rate(), 3),
+            "open_remaining_s": round(self.open_remaining(), 1),
+            "calls": self.calls,
+            "failures": self.failures,
+            "slow": self.slow,
+            "rejected": self.rejected,
+            "opened": self.opened,
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    breaker = _breakers.get(host)
+    if breaker is None:
+        breaker = _breakers[host] = CircuitBreaker(host, UPSTREAMS.get(host, DEFAULT_CONFIG))
+    return breaker
+
+
+def snapshot() -> Dict[str, dict]:
+    """ สถานะ breaker ทุกตัว (สำหรับ metrics / รายงาน load test) """
+    return {host: breaker.stats() for host, breaker in sorted(_breakers.items())}
+
+
+def reset() -> None:
+    _breakers.clear()
+
+
+def _clamp_timeout(request: httpx.Request, limit: float) -> None:
+    timeout = request.extensions.get("timeout") or {}
+    request.extensions = {
+        **request.extensions,
+        "timeout": {key: limit if value is None else min(value, limit)
+                    for key, value in {"connect": None, "read": None, "write": None, "pool": None, **timeout}.items()},
+    }
+
+
+class CircuitBreakerTransport(httpx.AsyncBaseTransport):
+    """ ครอบ transport จริง: เช็ค breaker ของ host ก่อนยิง แล้วบันทึกผล (5xx / 429 / timeout = พลาด) """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        breaker = get_breaker(request.url.host)
+        limit = deadline.cap(breaker.config.timeout)
+        if limit <= 0:
+            raise deadline.DeadlineExceeded(f"ไม่เหลือเวลาเรียก {request.url.host}")
+        breaker.before_call()
+        _clamp_timeout(request, limit)
+        started = time.monotonic()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except httpx.TimeoutException:
+            if limit < breaker.config.timeout:
+                breaker.release()       # โดนงบของข้อความตัด ไม่ใช่ upstream ช้าเกินเกณฑ์
+            else:
+                breaker.record(False, time.monotonic() - started)
+            raise
+        except Exception:
+            breaker.record(False, time.monotonic() - started)
+            raise
+        breaker.record(response.status_code < 500 and response.status_code != 429, time.monotonic() - started)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
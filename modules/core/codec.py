@@ -0,0 +1,246 @@
+import json
+import os
+import zlib
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from redis.asyncio import Redis
+from redis.client import NEVER_DECODE
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# ✅ รูปแบบเก็บค่าใน Redis แบบมีเวอร์ชัน (ความจำแชท, cache ของ feed, สรุปไพ่)
+#    [ชนิด 1 byte][การบีบอัด 1 byte][crc32 ของ dictionary 4 byte ถ้าใช้][ข้อมูล]
+#    byte แรกเป็น control char เสมอ ค่าแบบเก่า (JSON / ข้อความธรรมดาที่ยังค้างใน Redis) จึงแยกออกและอ่านได้ตามเดิม
+#    JSON แบบใหม่เก็บภาษาไทยเป็น UTF-8 ตรง ๆ (3 byte/ตัว) ไม่ใช่ \uXXXX (6 byte/ตัว) แบบ json.dumps เดิม
+#    ค่าที่ยาวเกิน COMPRESS_ABOVE บีบอัดด้วย shared dictionary (คำ / โครง JSON ที่ซ้ำกันข้ามผู้ใช้)
+#    msgpack / zstd เปิดผ่าน env เท่านั้น: ทุก process ที่อ่าน Redis เดียวกันต้องมีไลบรารีนั้นก่อนเปิด
+
+KIND_TEXT = 0x01
+KIND_JSON = 0x02
+KIND_MSGPACK = 0x03
+KINDS = (KIND_TEXT, KIND_JSON, KIND_MSGPACK)
+
+PLAIN = 0x00
+DEFLATE = 0x01     # raw deflate (zlib ไม่มี header / checksum)
+ZSTD = 0x02
+WITH_DICT = 0x80
+
+SERIALIZER = os.getenv("STORAGE_SERIALIZER", "json")       # json | msgpack
+COMPRESSION = os.getenv("STORAGE_COMPRESSION", "zlib")     # zlib | zstd | none
+COMPRESS_ABOVE = int(os.getenv("STORAGE_COMPRESS_ABOVE", "160"))   # byte
+COMPRESS_LEVEL = 6
+MAX_DECODED = 8 * 1024 * 1024      # กัน decompression bomb
+DICT_SIZE = 16 * 1024
+
+# dictionary ตั้งต้น (ยังไม่ได้ train): โครง JSON ของ turn แชท + คำที่บอทใช้บ่อย คำที่บ่อยสุดไว้ท้าย (ระยะอ้างอิงสั้นสุด)
+DEFAULT_DICTIONARY = (
+    "ราคาทองคำแท่ง ทองรูปพรรณ รับซื้อ ขายออก บาทละ ราคาน้ำมันวันนี้ แก๊สโซฮอล์ 95 91 E20 ดีเซล ลิตรละ "
+    "ผลสลากกินแบ่งรัฐบาล รางวัลที่ 1 เลขหน้า 3 ตัว เลขท้าย 2 ตัว อัตราแลกเปลี่ยน ดอลลาร์ ยูโร เยน "
+    "พยากรณ์อากาศ อุณหภูมิ ฝนตก ความชื้น องศาเซลเซียส ข่าววันนี้ ไพ่ทาโรต์ ความรัก การงาน การเงิน สุขภาพ "
+    "ตัวอย่างเช่น นอกจากนี้ อย่างไรก็ตาม เพราะว่า ดังนั้น ขึ้นอยู่กับ ควรจะ สามารถ ต้องการ เกี่ยวกับ "
+    "ถ้าอยากรู้เพิ่มเติม ถามต่อได้เลย ขอบคุณที่ถาม ลองดู แนะนำว่า สรุปคือ ข้อมูลล่าสุด "
+    "ได้เลยจ้า พี่หลาม ครับ ค่ะ นะครับ นะคะ ของ ที่ และ ให้ ได้ ไม่ มี เป็น ใน จะ ว่า แล้ว ก็ "
+    '**\\n\\n- 1. 2. 3. ","response":"'
+    '{"question":"'
+).encode()
+
+Raw = Union[bytes, str]
+
+
+def dictionary_id(data: bytes) -> int:
+    return zlib.crc32(data)
+
+
+def _load_dictionaries() -> List[bytes]:
+    """ STORAGE_DICT=ไฟล์ใหม่,ไฟล์เก่า,... ตัวแรกใช้เขียน ทุกตัวใช้อ่าน (เปลี่ยน dictionary ได้โดยข้อมูลเก่ายังอ่านได้) """
+    paths = [path.strip() for path in os.getenv("STORAGE_DICT", "").split(",") if path.strip()]
+    loaded = []
+    for path in paths:
+        with open(path, "rb") as f:
+            loaded.append(f.read())
+    return loaded + [DEFAULT_DICTIONARY]
+
+
+_dictionaries: Dict[int, bytes] = {}
+_write_dictionary: Optional[bytes] = None
+_zstd_compressors: Dict[int, Any] = {}
+_zstd_decompressors: Dict[int, Any] = {}
+
+
+def use_dictionaries(dictionaries: Iterable[bytes]) -> None:
+    """ ตั้ง dictionary ที่ใช้ (ตัวแรกใช้เขียน) """
+    global _write_dictionary
+    dictionaries = list(dictionaries)
+    _dictionaries.clear()
+    _zstd_compressors.clear()
+    _zstd_decompressors.clear()
+    for data in dictionaries:
+        _dictionaries[dictionary_id(data)] = data
+    _write_dictionary = dictionaries[0] if dictionaries else None
+
+
+use_dictionaries(_load_dictionaries())
+
+
+# 🔹 บีบอัด
+def _zstd_dict(data: bytes):
+    return zstandard.ZstdCompressionDict(data, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+
+
+def _compress(payload: bytes, method: int, zdict: Optional[bytes]) -> bytes:
+    if method == ZSTD:
+        key = dictionary_id(zdict) if zdict else 0
+        compressor = _zstd_compressors.get(key)
+        if compressor is None:
+            compressor = zstandard.ZstdCompressor(
+                level=3, dict_data=_zstd_dict(zdict) if zdict else None, write_checksum=False, write_dict_id=False
+            )
+            _zstd_compressors[key] = compressor
+        return compressor.compress(payload)
+    if zdict:
+        compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, -15, 9, zlib.Z_DEFAULT_STRATEGY, zdict)
+    else:
+        compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, -15)
+    return compressor.compress(payload) + compressor.flush()
+
+
+def _decompress(blob: bytes, method: int, zdict: Optional[bytes]) -> bytes:
+    if method == ZSTD:
+        if zstandard is None:
+            raise ValueError("ค่านี้บีบอัดด้วย zstd แต่ไม่ได้ติดตั้ง zstandard")
+        key = dictionary_id(zdict) if zdict else 0
+        decompressor = _zstd_decompressors.get(key)
+        if decompressor is None:
+            decompressor = zstandard.ZstdDecompressor(dict_data=_zstd_dict(zdict) if zdict else None)
+            _zstd_decompressors[key] = decompressor
+        try:
+            return decompressor.decompress(blob, max_output_size=MAX_DECODED)
+        except zstandard.ZstdError as e:
+            raise ValueError(f"zstd เสีย: {e}") from e
+    if method != DEFLATE:
+        raise ValueError(f"ไม่รู้จักการบีบอัดแบบ {method}")
+    decompressor = zlib.decompressobj(-15, zdict=zdict) if zdict else zlib.decompressobj(-15)
+    try:
+        payload = decompressor.decompress(blob, MAX_DECODED)
+    except zlib.error as e:
+        raise ValueError(f"deflate เสีย: {e}") from e
+    if decompressor.unconsumed_tail:
+        raise ValueError("ค่าที่คลายแล้วใหญ่เกิน MAX_DECODED")
+    return payload
+
+
+def _frame(kind: int, payload: bytes) -> bytes:
+    if len(payload) > COMPRESS_ABOVE and COMPRESSION != "none":
+        method = ZSTD if COMPRESSION == "zstd" and zstandard is not None else DEFLATE
+        zdict = _write_dictionary
+        blob = _compress(payload, method, zdict)
+        header = bytes((kind, method | WITH_DICT)) + dictionary_id(zdict).to_bytes(4, "big") if zdict \
+            else bytes((kind, method))
+        if len(header) + len(blob) < len(payload) + 2:
+            return header + blob
+    return bytes((kind, PLAIN)) + payload
+
+
+def _unframe(raw: bytes) -> tuple:
+    """ (ชนิด, ข้อมูลที่คลายแล้ว) """
+    if len(raw) < 2:
+        raise ValueError("ค่าสั้นเกินกว่าจะมี header")
+    kind, flags = raw[0], raw[1]
+    method = flags & ~WITH_DICT
+    if method == PLAIN:
+        return kind, raw[2:]
+    zdict = None
+    body = raw[2:]
+    if flags & WITH_DICT:
+        dict_id = int.from_bytes(raw[2:6], "big")
+        zdict = _dictionaries.get(dict_id)
+        if zdict is None:
+            raise ValueError(f"ไม่มี dictionary {dict_id:08x} (ตั้ง STORAGE_DICT ให้ครบ)")
+        body = raw[6:]
+    return kind, _decompress(body, method, zdict)
+
+
+def _is_framed(raw: bytes) -> bool:
+    return bool(raw) and raw[0] in KINDS
+
+
+# 🔹 API
+def encode_json(value: Any) -> bytes:
+    """ dict / list → bytes สำหรับเก็บลง Redis """
+    if SERIALIZER == "msgpack" and msgpack is not None:
+        return _frame(KIND_MSGPACK, msgpack.packb(value, use_bin_type=True))
+    return _frame(KIND_JSON, json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode())
+
+
+def decode_json(raw: Raw) -> Any:
+    """ อ่านได้ทั้งรูปแบบใหม่และ JSON แบบเดิม raise ValueError ถ้าอ่านไม่ได้ """
+    if isinstance(raw, str) or not _is_framed(raw):
+        return json.loads(raw)
+    kind, payload = _unframe(raw)
+    if kind == KIND_MSGPACK:
+        if msgpack is None:
+            raise ValueError("ค่านี้เป็น msgpack แต่ไม่ได้ติดตั้ง msgpack")
+        try:
+            return msgpack.unpackb(payload, raw=False)
+        except Exception as e:
+            raise ValueError(f"msgpack เสีย: {e}") from e
+    if kind != KIND_JSON:
+        raise ValueError(f"ค่านี้ไม่ใช่ JSON (ชนิด {kind})")
+    return json.loads(payload)
+
+
+def encode_text(value: str) -> bytes:
+    return _frame(KIND_TEXT, value.encode())
+
+
+def decode_text(raw: Raw) -> str:
+    if isinstance(raw, str):
+        return raw
+    if not _is_framed(raw):
+        return raw.decode()
+    kind, payload = _unframe(raw)
+    if kind != KIND_TEXT:
+        raise ValueError(f"ค่านี้ไม่ใช่ข้อความ (ชนิด {kind})")
+    return payload.decode()
+
+
+# 🔹 อ่านจาก Redis แบบไม่ decode (client หลักตั้ง decode_responses=True แต่ค่าที่บีบอัดไม่ใช่ UTF-8)
+async def get_raw(redis_instance: Redis, key: str) -> Optional[bytes]:
+    return await redis_instance.execute_command("GET", key, **{NEVER_DECODE: True})
+
+
+async def lrange_raw(redis_instance: Redis, key: str, start: int, end: int) -> List[bytes]:
+    return await redis_instance.execute_command("LRANGE", key, start, end, **{NEVER_DECODE: True})
+
+
+# 🔹 train dictionary จากข้อมูลจริง
+def train_dictionary(samples: Iterable[bytes], size: int = DICT_SIZE, segment: int = 24) -> bytes:
+    """
+    เลือกช่วง byte ยาว segment ที่เจอในหลายตัวอย่างที่สุด (นับตัวอย่างละครั้ง) ต่อกันจนได้ขนาด size
+    ช่วงที่บ่อยที่สุดอยู่ท้าย dictionary (deflate อ้างอิงระยะใกล้ได้ถูกกว่า)
+    """
+    counts: Counter = Counter()
+    for sample in samples:
+        counts.update({sample[i:i + segment] for i in range(0, len(sample) - segment + 1)})
+
+    chosen: List[bytes] = []
+    covered = bytearray()
+    half = segment // 2
+    for chunk, count in counts.most_common():
+        if count < 2 or len(covered) >= size:
+            break
+        # ช่วงที่เลื่อนจากช่วงที่เลือกไปแล้วแค่ไม่กี่ byte ไม่ช่วยอะไรเพิ่ม
+        if chunk[:half] in covered or chunk[half:] in covered:
+            continue
+        chosen.append(chunk)
+        covered += chunk
+    return b"".join(reversed(chosen))[-size:]
@@ -0,0 +1,67 @@
+import asyncio
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Iterator, Optional, TypeVar
+
+# ✅ งบเวลาต่อข้อความ (deadline) ส่งต่อทุกขั้นผ่าน contextvar ไม่ต้องเพิ่ม parameter ทุกฟังก์ชัน
+#    ขั้นไหนก็ได้เวลาไม่เกินที่เหลือ: HTTP ขาออก (circuit_breaker transport) และ OpenAI บีบ timeout ตามนี้เอง
+#    ขั้นเสริม (ค้นเว็บ อากาศ) เช็ค stage_budget ก่อน ถ้าเหลือไม่พอให้ข้ามไป เก็บเวลาไว้ให้ขั้นที่ขาดไม่ได้ (LLM)
+
+T = TypeVar("T")
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """ งบเวลาของข้อความหมดก่อนขั้นนี้เสร็จ """
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[float]:
+    """ with deadline(20): ... ซ้อนกันได้ (ใช้ตัวที่หมดก่อน) """
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        at = min(at, current)
+    token = _deadline.set(at)
+    try:
+        yield at
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """ วินาทีที่เหลือ (ติดลบได้) None = ไม่มี deadline """
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+def cap(seconds: float) -> float:
+    """ timeout ของขั้นหนึ่ง: ไม่เกิน seconds และไม่เกินเวลาที่เหลือ """
+    left = remaining()
+    return seconds if left is None else max(0.0, min(seconds, left))
+
+
+def stage_budget(seconds: float, reserve: float = 0.0, minimum: float = 0.0) -> float:
+    """
+    เวลาให้ขั้นเสริม โดยกันไว้ reserve วินาทีให้ขั้นหลังจากนี้ คืน 0 ถ้าเหลือน้อยกว่า minimum (= ข้ามขั้นนี้)
+    """
+    left = remaining()
+    if left is None:
+        return seconds
+    budget = min(seconds, left - reserve)
+    return budget if budget > 0 and budget >= minimum else 0.0
+
+
+async def within(awaitable: Awaitable[T], seconds: float) -> T:
+    """ รอไม่เกิน cap(seconds) raise DeadlineExceeded ถ้าเกิน """
+    timeout = cap(seconds)
+    if timeout <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded("หมดเวลาของข้อความนี้แล้ว")
+    try:
+        return await asyncio.wait_for(awaitable, timeout)
+    except asyncio.TimeoutError as e:
+        raise DeadlineExceeded(f"เกิน {timeout:.2f}s") from e
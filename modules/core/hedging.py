@@ -0,0 +1,121 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional
+
+import httpx
+
+from modules.core.metrics import percentile
+
+# ✅ hedged request: GET ที่ช้ากว่าปกติ (เกิน p90 ล่าสุดของ host นั้น) ยิงซ้ำอีกตัว ใช้ตัวที่ตอบก่อน ยกเลิกอีกตัว
+#    ตัด tail latency (p99) ของ upstream ที่ช้าเป็นพัก ๆ โดยยิงเพิ่มแค่ ~10% ของ request
+#    ใช้เฉพาะ method ที่ยิงซ้ำได้ไม่มีผลข้างเคียง และเฉพาะ host ที่อยู่ใน HEDGED
+
+HEDGE_METHODS = frozenset({"GET", "HEAD"})
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    quantile: float = 90.0       # ยิงตัวที่สองเมื่อช้ากว่า percentile นี้ของ latency ล่าสุด
+    initial_delay: float = 1.0   # วินาที ตอนยังมีตัวอย่างไม่พอ
+    min_delay: float = 0.05
+    min_samples: int = 20
+    max_inflight: int = 8        # hedge ค้างพร้อมกันสูงสุด (upstream ช้าทั้งระบบ ไม่ยิงซ้ำถล่มเพิ่ม)
+
+
+HEDGED: Dict[str, HedgePolicy] = {
+    "www.googleapis.com": HedgePolicy(),        # Google CSE
+    "api.openweathermap.org": HedgePolicy(),
+    "news.google.com": HedgePolicy(initial_delay=2.0),
+}
+
+
+class HostLatency:
+    def __init__(self):
+        self.samples: Deque[float] = deque(maxlen=200)
+        self.hedged = 0
+        self.wins = 0          # ตัวที่ยิงซ้ำตอบก่อน
+        self.inflight = 0
+
+    def delay(self, policy: HedgePolicy) -> float:
+        if len(self.samples) < policy.min_samples:
+            return policy.initial_delay
+        return max(policy.min_delay, percentile(sorted(self.samples), policy.quantile))
+
+
+_hosts: Dict[str, HostLatency] = {}
+
+
+def snapshot() -> Dict[str, dict]:
+    return {
+        host: {
+            "hedged": stats.hedged,
+            "wins": stats.wins,
+            "delay_ms": round(stats.delay(HEDGED.get(host, HedgePolicy())) * 1e3, 1),
+            "samples": len(stats.samples),
+        }
+        for host, stats in sorted(_hosts.items())
+    }
+
+
+def reset() -> None:
+    _hosts.clear()
+
+
+async def _discard(task: asyncio.Task) -> None:
+    """ ยกเลิก / ปิด response ของตัวที่แพ้ """
+    if not task.done():
+        task.cancel()
+    try:
+        response = await task
+    except BaseException:
+        return
+    await response.aclose()
+
+
+class HedgingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, transport: httpx.AsyncBaseTransport, policies: Optional[Dict[str, HedgePolicy]] = None):
+        self._transport = transport
+        self._policies = HEDGED if policies is None else policies
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        policy = self._policies.get(request.url.host)
+        if policy is None or request.method not in HEDGE_METHODS:
+            return await self._transport.handle_async_request(request)
+
+        stats = _hosts.setdefault(request.url.host, HostLatency())
+        started = time.monotonic()
+        first = asyncio.ensure_future(self._transport.handle_async_request(request))
+        tasks = [first]
+        winner = None
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=stats.delay(policy))
+            if not done and stats.inflight < policy.max_inflight:
+                stats.hedged += 1
+                stats.inflight += 1
+                tasks.append(asyncio.ensure_future(self._transport.handle_async_request(request)))
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                    elif winner is None:
+                        winner = task
+            if winner is None:
+                raise error
+            # เก็บเวลาที่ผู้เรียกรอจริง (ตัวที่ hedge จะนานกว่า delay เสมอ เกณฑ์จึงไม่ไหลต่ำลงเรื่อย ๆ)
+            stats.samples.append(time.monotonic() - started)
+            stats.wins += winner is not first
+            return winner.result()
+        finally:
+            if len(tasks) > 1:
+                stats.inflight -= 1
+            for task in tasks:
+                if task is not winner:
+                    await _discard(task)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,23 @@
+import importlib
+from typing import Any, Callable, Iterable
+
+
+def lazy_function(module_path: str, name: str) -> Callable[..., Any]:
+    """ คืนฟังก์ชันตัวแทน ที่จะ import โมดูลจริงตอนถูกเรียกครั้งแรกเท่านั้น """
+    target = None
+
+    def call(*args, **kwargs):
+        nonlocal target
+        if target is None:
+            target = getattr(importlib.import_module(module_path), name)
+        return target(*args, **kwargs)
+
+    call.__name__ = name
+    call.__qualname__ = name
+    return call
+
+
+def preload(module_paths: Iterable[str]) -> None:
+    """ import โมดูลล่วงหน้า (ใช้ตอน warm-up หลังบอทพร้อมแล้ว) """
+    for path in module_paths:
+        importlib.import_module(path)
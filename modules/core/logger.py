@@ -1,8 +1,171 @@
+import atexit
+import contextvars
+import copy
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, Optional, Tuple
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(levelname)s: %(message)s",
-    handlers=[logging.StreamHandler()]
-)
+# ✅ log ไม่บล็อก event loop: เธรดที่เรียก log แค่ใส่ record ลงคิว เธรดเบื้องหลังเป็นคน format + เขียน stderr
+#    (stderr / docker log ช้าหรือเต็ม บอทยังตอบต่อได้ คิวเต็มก็ทิ้ง record ไม่รอ)
+#    เขียนแบบ lazy: logger.info("ดึง %s ไม่ได้: %r", name, e) ถ้าระดับ log ไม่ผ่านจะไม่ format เลย
+#    จุดที่ log ถี่ (ทุกข้อความ) ส่ง extra=sample(n) ให้ log แค่ 1 ใน n ครั้ง และทุกจุดระดับ INFO ลงมาถูกจำกัด
+#    ไม่เกิน LOG_SITE_LIMIT ครั้ง/วินาที/จุด จำนวนที่ข้ามไปแปะไว้กับบรรทัดถัดไปของจุดนั้น
+#    LOG_FORMAT=json ได้ JSON บรรทัดละ record พร้อม cid (id ของข้อความ Discord ที่กำลังตอบ ตามไปถึง worker)
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")      # text / json
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_SITE_LIMIT = int(os.getenv("LOG_SITE_LIMIT", "50"))   # ครั้ง/วินาที ต่อบรรทัดที่เรียก log (0 = ไม่จำกัด)
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s%(cid_tag)s: %(message)s"
+
+# ✅ id ของงานที่กำลังทำ (ข้อความ / interaction / job) ติดไปกับทุก record ใน task เดียวกัน
+correlation_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("correlation_id", default=None)
+
+
+@contextmanager
+def log_context(cid) -> Iterator[str]:
+    """ with log_context(message.id): ทุก log ข้างใน (รวม task ที่สร้างจากข้างใน) ได้ cid นี้ """
+    token = correlation_id.set(str(cid))
+    try:
+        yield str(cid)
+    finally:
+        correlation_id.reset(token)
+
+
+def sample(every: int) -> Dict[str, int]:
+    """ logger.info("...", extra=sample(100)) = log 1 ใน 100 ครั้งของจุดนี้ (ครั้งแรกเสมอ) """
+    return {"sample": every}
+
+
+class _Stats:
+    def __init__(self):
+        self.queued = 0
+        self.dropped = 0       # คิวเต็ม
+        self.sampled_out = 0   # ถูก sample / rate limit ทิ้ง
+
+
+_stats = _Stats()
+
+
+def stats() -> Dict[str, int]:
+    return {"queued": _stats.queued, "dropped": _stats.dropped, "sampled_out": _stats.sampled_out}
+
+
+class SiteSampler(logging.Filter):
+    """ sample / จำกัดอัตราแยกตามจุดที่เรียก log (ไฟล์ + บรรทัด) WARNING ขึ้นไปผ่านเสมอ """
+
+    def __init__(self, limit: int = LOG_SITE_LIMIT):
+        super().__init__()
+        self.limit = limit
+        self._sites: Dict[Tuple[str, int], list] = {}   # site → [นับทั้งหมด, วินาทีปัจจุบัน, นับในวินาทีนี้, ข้ามไป]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        every = getattr(record, "sample", 0)
+        if not every and not self.limit:
+            return True
+        now = int(time.monotonic())
+        with self._lock:
+            site = self._sites.setdefault((record.pathname, record.lineno), [0, now, 0, 0])
+            site[0] += 1
+            if site[1] != now:
+                site[1], site[2] = now, 0
+            keep = (not every or (site[0] - 1) % every == 0) and (not self.limit or site[2] < self.limit)
+            if not keep:
+                site[3] += 1
+                _stats.sampled_out += 1
+                return False
+            site[2] += 1
+            if site[3]:
+                record.suppressed, site[3] = site[3], 0
+        return True
+
+
+class CorrelationFilter(logging.Filter):
+    """ ติด cid จาก contextvar (ต้องรันในเธรด / task ที่เรียก log ไม่ใช่ในเธรดที่เขียน) """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.cid = correlation_id.get()
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # ประกอบแค่ข้อความ (args อาจถูกแก้ทีหลัง) เวลา / JSON / traceback ไป format ในเธรดที่เขียน
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            _stats.queued += 1
+        except queue.Full:
+            _stats.dropped += 1
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        cid = getattr(record, "cid", None)
+        record.cid_tag = f" [{cid}]" if cid else ""
+        text = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        return f"{text} (+{suppressed} ครั้งที่ข้ามไป)" if suppressed else text
+
+
+# field มาตรฐานของ LogRecord ที่ไม่ต้องใส่ใน JSON ซ้ำ (ที่เหลือคือ extra=... ของผู้เรียก)
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message", "asctime", "cid", "cid_tag", "suppressed", "sample",
+}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "site": f"{record.module}:{record.lineno}",
+        }
+        cid = getattr(record, "cid", None)
+        if cid:
+            entry["cid"] = cid
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            entry["suppressed"] = suppressed
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def _setup() -> logging.handlers.QueueListener:
+    stream = logging.StreamHandler(sys.stderr)
+    stream.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else TextFormatter(TEXT_FORMAT))
+    handler = NonBlockingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    handler.addFilter(CorrelationFilter())
+    handler.addFilter(SiteSampler())     # ทุก logger รวม httpx / discord ที่ log ทุก request
+    logging.basicConfig(level=LOG_LEVEL, handlers=[handler])
+    listener = logging.handlers.QueueListener(handler.queue, stream, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)   # เขียน record ที่ค้างในคิวให้หมดก่อนปิด
+    return listener
+
+
+_listener = _setup()
 logger = logging.getLogger("pheelarm")
@@ -0,0 +1,79 @@
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, List
+
+# ✅ จับเวลาแต่ละขั้นของการตอบข้อความ (เก็บใน process, ถูกพอจะเปิดไว้ตลอด)
+#    เก็บแค่ตัวอย่างล่าสุด MAX_SAMPLES ค่าต่อขั้น ไม่ให้หน่วยความจำโตไปเรื่อย ๆ
+
+MAX_SAMPLES = 10000
+
+
+class StageStats:
+    __slots__ = ("count", "total", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.samples: Deque[float] = deque(maxlen=MAX_SAMPLES)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.samples.append(seconds)
+
+
+_stages: Dict[str, StageStats] = {}
+
+
+def record(stage: str, seconds: float) -> None:
+    stats = _stages.get(stage)
+    if stats is None:
+        stats = _stages[stage] = StageStats()
+    stats.add(seconds)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """ with timed("openai"): ... ใช้ได้ทั้งโค้ด sync และคร่อม await """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - started)
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """ nearest-rank percentile จาก list ที่เรียงแล้ว (q = 0..100) """
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(q / 100 * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """ สรุปเป็นมิลลิวินาที: count / mean / p50 / p90 / p99 / max """
+    values = sorted(samples)
+    if not values:
+        return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p90_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values) * 1e3, 2),
+        "p50_ms": round(percentile(values, 50) * 1e3, 2),
+        "p90_ms": round(percentile(values, 90) * 1e3, 2),
+        "p99_ms": round(percentile(values, 99) * 1e3, 2),
+        "max_ms": round(values[-1] * 1e3, 2),
+    }
+
+
+def snapshot() -> Dict[str, Dict[str, float]]:
+    report = {}
+    for stage, stats in sorted(_stages.items()):
+        report[stage] = summarize(list(stats.samples))
+        report[stage]["count"] = stats.count
+    return report
+
+
+def reset() -> None:
+    _stages.clear()
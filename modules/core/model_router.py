@@ -0,0 +1,247 @@
+import asyncio
+import os
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from modules.core import deadline
+from modules.core.logger import logger
+from modules.core.metrics import summarize
+from modules.core.openai_client import get_client
+
+# ✅ เลือกโมเดล + parameter ตามประเภทงาน แทนการ hardcode gpt-4o-mini ทุกจุด
+#    classify  ตัดสินใจสั้น ๆ (should_search) ต้องเร็ว
+#    summary   สรุปข่าว / ไพ่ / เรียบเรียงอากาศ
+#    chat      แชททั่วไป
+#    complex   คำถามที่ต้องคิดเยอะ (วิเคราะห์ เปรียบเทียบ คำนวณ โค้ด หรือยาวมาก) ใช้โมเดลใหญ่กว่า
+#    แต่ละประเภทมีโมเดลเรียงลำดับไว้: ตัวแรกยังไม่ตอบเกิน failover_after (+ per_token × max_tokens) → ยิงตัวถัดไปคู่ขนาน
+#    ใช้ตัวที่ตอบก่อน (ไม่ stream จึงต้องรอทั้งคำตอบ คำตอบยาวได้เวลารอมากขึ้นตามงบ token ไม่ยิงตัวสำรองเสียเงินเปล่า)
+#    ตัวแรกพลาด → ตัวถัดไปทันที (ไม่รอ retry ของ SDK) โมเดลที่พลาด/ช้าบ่อยช่วงหลัง ถูกเลื่อนไปท้ายแถวจนสถิติดีขึ้น
+#    เปลี่ยนได้จาก env: MODEL_ROUTES="complex=gpt-4.1,gpt-4o-mini@10;classify=gpt-4.1-nano,gpt-4o-mini"
+
+CLASSIFY = "classify"
+SUMMARY = "summary"
+CHAT = "chat"
+COMPLEX = "complex"
+
+
+@dataclass(frozen=True)
+class Route:
+    models: Tuple[str, ...]
+    failover_after: float          # วินาที ตัวก่อนหน้ายังไม่ตอบ → ยิงตัวถัดไปคู่ขนาน
+    timeout: float = 30.0          # ต่อครั้ง (ไม่เกินเวลาที่เหลือของข้อความ)
+    params: Dict[str, Any] = field(default_factory=dict)   # ค่า default ของประเภทนี้ ผู้เรียกส่งมาเองทับได้
+    per_token: float = 0.0         # วินาทีที่รอเพิ่มต่อ max_tokens หนึ่ง token (เวลาสร้างคำตอบของโมเดลที่ช้าแต่ปกติ)
+
+    def failover_delay(self, max_tokens: Optional[int]) -> float:
+        return self.failover_after + self.per_token * (max_tokens or 0)
+
+
+ROUTES: Dict[str, Route] = {
+    CLASSIFY: Route(("gpt-4o-mini", "gpt-4.1-nano"), failover_after=1.5, timeout=5.0,
+                    params={"temperature": 0, "max_tokens": 5}),
+    SUMMARY: Route(("gpt-4o-mini", "gpt-4.1-mini"), failover_after=3.0, params={"max_tokens": 500}, per_token=0.015),
+    CHAT: Route(("gpt-4o-mini", "gpt-4.1-mini"), failover_after=3.0, per_token=0.015),     # 400 token → 9s
+    COMPLEX: Route(("gpt-4o", "gpt-4o-mini"), failover_after=5.0, per_token=0.025),
+}
+
+
+@dataclass(frozen=True)
+class HealthPolicy:
+    window: int = 50               # ผลล่าสุดกี่ครั้งต่อโมเดล
+    window_seconds: float = 120.0  # ผลที่เก่ากว่านี้ไม่นับ (โมเดลที่ถูกเลื่อนไปท้ายแถวกลับมาได้เองเมื่อสถิติหมดอายุ)
+    min_calls: int = 5
+    bad_rate: float = 0.5          # (พลาด + ช้าเกิน failover_after) / ทั้งหมด ถึงเท่านี้ → ไม่ใช้เป็นตัวแรก
+
+
+HEALTH = HealthPolicy()
+
+# ✅ กฎแยกแชทธรรมดากับคำถามที่ต้องคิดเยอะ
+COMPLEX_HINTS = re.compile(
+    r"วิเคราะห์|เปรียบเทียบ|คำนวณ|พิสูจน์|สมการ|ข้อดีข้อเสีย|วางแผน|ทีละขั้น|เขียนโค้ด|โค้ด|แก้บั๊ก|อัลกอริทึม"
+    r"|code|debug|algorithm|analy[sz]e|compare|calculate|prove|step by step",
+    re.IGNORECASE,
+)
+COMPLEX_MIN_CHARS = int(os.getenv("COMPLEX_MIN_CHARS", "280"))
+
+
+def chat_class(question: str) -> str:
+    """ chat / complex ตามกฎข้างบน """
+    if len(question) >= COMPLEX_MIN_CHARS or COMPLEX_HINTS.search(question):
+        return COMPLEX
+    return CHAT
+
+
+def parse_routes(raw: Optional[str], base: Dict[str, Route]) -> Dict[str, Route]:
+    """ "chat=gpt-4o-mini,gpt-4.1-mini@5;complex=gpt-4.1" → ROUTES ที่ถูกแทนเฉพาะประเภทที่ระบุ """
+    routes = dict(base)
+    for part in (raw or "").split(";"):
+        name, _, spec = part.strip().partition("=")
+        if not spec:
+            continue
+        if name not in routes:
+            logger.warning("⚠️ MODEL_ROUTES: ไม่รู้จักประเภท %r", name)
+            continue
+        models, _, after = spec.partition("@")
+        names = tuple(m.strip() for m in models.split(",") if m.strip())
+        route = replace(routes[name], models=names or routes[name].models)
+        routes[name] = replace(route, failover_after=float(after)) if after else route
+    return routes
+
+
+ROUTES = parse_routes(os.getenv("MODEL_ROUTES"), ROUTES)
+
+
+class ModelStats:
+    def __init__(self):
+        self._results: Deque[Tuple[float, bool]] = deque(maxlen=HEALTH.window)   # (เวลา, ดีไหม)
+        self.latencies: Deque[float] = deque(maxlen=500)
+        self.calls = 0
+        self.errors = 0
+        self.slow = 0
+        self.wins = 0          # ตอบก่อนตอนที่ยิงคู่ขนาน / ตอบแทนตัวที่พลาด
+
+    def record(self, ok: bool, seconds: float, slow: bool = False) -> None:
+        self.calls += 1
+        self.errors += not ok
+        self.slow += slow
+        if ok and not slow:
+            self.latencies.append(seconds)
+        self._results.append((time.monotonic(), ok and not slow))
+
+    def healthy(self, policy: Optional[HealthPolicy] = None) -> bool:
+        policy = policy or HEALTH
+        since = time.monotonic() - policy.window_seconds
+        recent = [good for at, good in self._results if at >= since]
+        if len(recent) < policy.min_calls:
+            return True
+        return recent.count(False) / len(recent) < policy.bad_rate
+
+
+_models: Dict[str, ModelStats] = {}
+_routed: Dict[str, int] = {}
+_failovers: Dict[str, int] = {}
+
+
+def _stats(model: str) -> ModelStats:
+    return _models.setdefault(model, ModelStats())
+
+
+def candidates(request_class: str) -> List[str]:
+    """ ลำดับโมเดลที่จะลองของประเภทนี้: ตัวที่สถิติดีก่อน (คงลำดับเดิม) ตัวที่พลาด/ช้าบ่อยไว้ท้าย """
+    models = ROUTES[request_class].models
+    healthy = [m for m in models if _stats(m).healthy()]
+    return healthy + [m for m in models if m not in healthy]
+
+
+def snapshot() -> Dict[str, Any]:
+    return {
+        "routed": dict(sorted(_routed.items())),
+        "failovers": dict(sorted(_failovers.items())),
+        "models": {
+            model: {
+                "calls": stats.calls, "errors": stats.errors, "slow": stats.slow, "wins": stats.wins,
+                "healthy": stats.healthy(), **summarize(list(stats.latencies)),
+            }
+            for model, stats in sorted(_models.items())
+        },
+    }
+
+
+def reset() -> None:
+    _models.clear()
+    _routed.clear()
+    _failovers.clear()
+
+
+def _model_fault(error: BaseException) -> bool:
+    """ ความผิดของฝั่งโมเดล (ล่ม / 5xx / 429 / timeout) ไม่ใช่ request เราผิด (4xx) """
+    status = getattr(error, "status_code", None)
+    return status is None or status >= 500 or status == 429
+
+
+async def _attempt(model: str, messages: list, params: dict, timeout: float, retries: Optional[int]):
+    client = get_client()
+    options = {"timeout": timeout} if retries is None else {"timeout": timeout, "max_retries": retries}
+    started = time.monotonic()
+    try:
+        response = await client.with_options(**options).chat.completions.create(
+            model=model, messages=messages, **params
+        )
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        if _model_fault(e):
+            _stats(model).record(False, time.monotonic() - started)
+        raise
+    _stats(model).record(True, time.monotonic() - started)
+    return response
+
+
+async def complete(request_class: str, messages: list, **params):
+    """
+    chat.completions.create ผ่าน route ของ request_class (params ของผู้เรียกทับค่า default ของ route)
+    คืน ChatCompletion ของโมเดลที่ตอบก่อน (ดูว่าใครตอบจาก response.model) raise error สุดท้ายถ้าพลาดทุกตัว
+    """
+    route = ROUTES[request_class]
+    order = candidates(request_class)
+    params = {**route.params, **params}
+    failover_after = route.failover_delay(params.get("max_tokens"))
+    _routed[request_class] = _routed.get(request_class, 0) + 1
+
+    tasks: Dict[asyncio.Future, Tuple[str, float]] = {}
+    winner: Optional[asyncio.Future] = None
+    error: Optional[BaseException] = None
+
+    def launch(index: int) -> None:
+        model = order[index]
+        last = index == len(order) - 1
+        # ยังมีตัวสำรอง: ไม่ให้ SDK retry เอง (สลับไปตัวถัดไปเร็วกว่า)
+        task = asyncio.ensure_future(
+            _attempt(model, messages, params, deadline.cap(route.timeout), None if last else 0)
+        )
+        tasks[task] = (model, time.monotonic())
+
+    launch(0)
+    launched = 1
+    try:
+        pending = set(tasks)
+        while pending:
+            more = launched < len(order)
+            done, pending = await asyncio.wait(
+                pending, timeout=failover_after if more else None, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    winner = task
+                    break
+                error = task.exception()
+                logger.warning("⚠️ %s (%s) พลาด: %r", tasks[task][0], request_class, error)
+            if winner is not None:
+                break
+            if more and (not done or not pending):
+                # ช้าเกิน failover_after หรือพลาดหมดแล้ว → ยิงตัวถัดไป (ตัวเดิมที่ยังรออยู่ก็ยังมีสิทธิ์ชนะ)
+                reason = "ช้า" if not done else "พลาด"
+                logger.info("🔀 %s: %s %s → %s", request_class, order[launched - 1], reason, order[launched])
+                _failovers[request_class] = _failovers.get(request_class, 0) + 1
+                launch(launched)
+                launched += 1
+                pending = {t for t in tasks if not t.done()}
+        if winner is None:
+            raise error
+        if launched > 1:
+            _stats(tasks[winner][0]).wins += 1
+        return winner.result()
+    finally:
+        for task, (model, started) in tasks.items():
+            if task.done():
+                if task is not winner and not task.cancelled():
+                    task.exception()
+                continue
+            task.cancel()
+            if winner is not None and started < tasks[winner][1]:
+                # แพ้ตัวที่ยิงทีหลัง = ช้ากว่า failover_after แน่นอน นับเป็นช้า
+                # ตัวที่ยิงทีหลังผู้ชนะแล้วถูกยกเลิก (ได้เวลาน้อยกว่า) / ถูกยกเลิกจากข้างนอก ไม่นับ
+                _stats(model).record(True, time.monotonic() - started, slow=True)
@@ -1,4 +1,13 @@
-from openai import AsyncOpenAI
-import os
+from modules.core.app_context import get_context
 
-client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+def get_client():
+    """ AsyncOpenAI ตัวเดียวของ process (สร้างตอนใช้ครั้งแรก อยู่ใน AppContext) """
+    return get_context().openai
+
+
+def __getattr__(name):
+    # รองรับโค้ดเดิมที่ใช้ `from modules.core.openai_client import client`
+    if name == "client":
+        return get_client()
+    raise AttributeError(name)
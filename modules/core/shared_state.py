@@ -0,0 +1,188 @@
+import asyncio
+import secrets
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from redis.asyncio import Redis
+from redis.exceptions import WatchError
+
+from modules.core import codec
+from modules.core.logger import logger
+
+# ✅ state ที่ต้องแชร์ข้าม process (หลาย shard) เก็บใน Redis ทั้งหมด
+#    ถ้าไม่มี Redis จะถอยไปใช้ค่าใน process แทน (โหมด process เดียว)
+
+_local_feeds: Dict[str, Tuple[float, str]] = {}
+_local_locks: Dict[str, asyncio.Lock] = {}
+_last_good: Dict[str, Tuple[float, str]] = {}     # name → (time.time() ที่ดึงสำเร็จ, ค่า)
+
+FEED_LOCK_TTL = 15      # วินาที: เวลาสูงสุดที่ process หนึ่งถือสิทธิ์ดึง feed
+FEED_WAIT_STEP = 0.2    # วินาที: รอ process อื่นดึงเสร็จ ทีละกี่วินาที
+LAST_GOOD_TTL = 7 * 86400   # เก็บค่าล่าสุดที่ดึงสำเร็จไว้เสิร์ฟตอนต้นทางล่ม (นานกว่า TTL ของ cache มาก)
+STALE_WAIT = 1.0        # วินาที: process อื่นดึงอยู่นานเกินนี้ (ต้นทางน่าจะช้า) ตอบค่าเก่าไปก่อน
+
+
+async def claim_message(redis_instance: Optional[Redis], message_id: int, ttl: int = 300) -> bool:
+    """ กันข้อความเดียวถูกประมวลผลซ้ำ (เช่นตอน shard reconnect) คืน True ถ้าเราได้สิทธิ์ """
+    if redis_instance is None:
+        return True
+    try:
+        return bool(await redis_instance.set(f"dedup:msg:{message_id}", 1, nx=True, ex=ttl))
+    except Exception as e:
+        logger.warning("⚠️ Redis dedup ล้มเหลว ปล่อยผ่าน: %s", e)
+        return True
+
+
+async def allow_rate(redis_instance: Optional[Redis], key: str, limit: int, window: int) -> bool:
+    """ rate limit แบบ fixed window ที่ใช้ร่วมกันทุก process """
+    if redis_instance is None or limit <= 0:
+        return True
+    bucket = f"ratelimit:{key}:{int(time.time()) // window}"
+    try:
+        pipe = redis_instance.pipeline()
+        pipe.incr(bucket)
+        pipe.expire(bucket, window)
+        count, _ = await pipe.execute()
+        return count <= limit
+    except Exception as e:
+        logger.warning("⚠️ Redis rate limit ล้มเหลว ปล่อยผ่าน: %s", e)
+        return True
+
+
+def stale_note(age: float) -> str:
+    minutes = int(age // 60)
+    if minutes < 60:
+        when = f"{max(minutes, 1)} นาที"
+    elif minutes < 24 * 60:
+        when = f"{minutes // 60} ชั่วโมง"
+    else:
+        when = f"{minutes // (24 * 60)} วัน"
+    return f"⚠️ แหล่งข้อมูลไม่ตอบตอนนี้ ข้อมูลนี้เมื่อ {when}ที่แล้ว"
+
+
+async def _stale_value(redis_instance: Optional[Redis], name: str) -> Optional[str]:
+    """ ค่าล่าสุดที่เคยดึงได้ (ของ process ไหนก็ได้) พร้อมหมายเหตุว่าเก่าแค่ไหน None ถ้าไม่เคยมี """
+    entry = _last_good.get(name)
+    if redis_instance is not None:
+        try:
+            raw = await codec.get_raw(redis_instance, f"feed:last:{name}")
+            if raw is not None:
+                data = codec.decode_json(raw)
+                if entry is None or data["ts"] > entry[0]:
+                    entry = (data["ts"], data["value"])
+        except Exception as e:
+            logger.warning("⚠️ อ่านค่าล่าสุดของ feed '%s' ไม่ได้: %s", name, e)
+    if entry is None:
+        return None
+    return f"{entry[1]}\n\n{stale_note(time.time() - entry[0])}"
+
+
+async def _serve_stale(redis_instance: Optional[Redis], name: str, error: str) -> str:
+    """ ต้นทางล่ม / circuit เปิดอยู่: ตอบค่าเก่าแทนข้อความ ❌ ถ้ามี """
+    value = await _stale_value(redis_instance, name)
+    if value is None:
+        return error
+    logger.info("🕰️ feed '%s' ดึงไม่ได้ ใช้ค่าล่าสุดที่มีแทน: %s", name, error[:120])
+    return value
+
+
+async def _release_lock(redis_instance: Redis, lock_key: str, token: str) -> None:
+    """ ลบ lock เฉพาะเมื่อยังเป็นของเรา (ถือนานเกิน TTL จน process อื่นได้ lock ต่อไปแล้ว ห้ามลบของเขา) """
+    try:
+        async with redis_instance.pipeline(transaction=True) as pipe:
+            await pipe.watch(lock_key)
+            if await pipe.get(lock_key) == token:
+                pipe.multi()
+                pipe.delete(lock_key)
+                await pipe.execute()
+    except WatchError:
+        pass     # lock เปลี่ยนมือระหว่างเช็ค = ไม่ใช่ของเราแล้ว
+    except Exception as e:
+        logger.warning("⚠️ ปล่อย %s ไม่ได้ (รอหมดอายุเอง): %s", lock_key, e)
+
+
+async def _cached_feed_local(name: str, ttl: int, fetch: Callable[[], Awaitable[str]], stale: bool = False) -> str:
+    entry = _local_feeds.get(name)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+
+    lock = _local_locks.setdefault(name, asyncio.Lock())
+    async with lock:
+        entry = _local_feeds.get(name)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        value = await fetch()
+        if value.startswith("❌"):
+            return await _serve_stale(None, name, value) if stale else value
+        _local_feeds[name] = (time.monotonic() + ttl, value)
+        if stale:
+            _last_good[name] = (time.time(), value)
+        return value
+
+
+async def cached_feed(
+    redis_instance: Optional[Redis],
+    name: str,
+    ttl: int,
+    fetch: Callable[[], Awaitable[str]],
+    stale: bool = False,
+) -> str:
+    """
+    cache ผลของ feed (ทอง น้ำมัน หวย ข่าว ฯลฯ) ร่วมกันทุก process
+    ใช้ lock ใน Redis ให้ดึงจากต้นทางแค่ process เดียว ที่เหลือรอแล้วอ่านจาก cache
+    ค่าใน Redis เข้ารหัสด้วย codec (feed ยาวถูกบีบอัด) ค่าข้อความแบบเดิมยังอ่านได้
+    stale=True: ดึงไม่ได้ (ได้ข้อความ ❌) ให้ตอบค่าล่าสุดที่เคยดึงได้พร้อมหมายเหตุว่าเก่าแค่ไหนแทน
+    """
+    if redis_instance is None:
+        return await _cached_feed_local(name, ttl, fetch, stale)
+
+    key = f"feed:{name}"
+    lock_key = f"lock:feed:{name}"
+    token = secrets.token_hex(8)    # ค่าใน lock = เจ้าของ ปล่อยได้เฉพาะคนที่ถือ token นี้
+    acquired = False
+    try:
+        cached = await codec.get_raw(redis_instance, key)
+        if cached is not None:
+            return codec.decode_text(cached)
+
+        deadline = time.monotonic() + FEED_LOCK_TTL
+        stale_at = time.monotonic() + STALE_WAIT if stale else deadline
+        while True:
+            acquired = bool(await redis_instance.set(lock_key, token, nx=True, ex=FEED_LOCK_TTL))
+            if acquired or time.monotonic() > deadline:
+                break      # หมดเวลารอ = ดึงเองโดยไม่ถือ lock (และไม่ลบ lock ของคนอื่น)
+            if time.monotonic() > stale_at:
+                value = await _stale_value(redis_instance, name)
+                if value is not None:
+                    return value
+                stale_at = deadline     # ไม่เคยมีค่าเก่า รอต่อ
+            await asyncio.sleep(FEED_WAIT_STEP)
+            cached = await codec.get_raw(redis_instance, key)
+            if cached is not None:
+                return codec.decode_text(cached)
+        if acquired:
+            # คนที่ถือ lock ก่อนหน้าอาจเพิ่งเขียน cache แล้วปล่อย lock ระหว่างรอบรอ → อ่านซ้ำก่อนดึงเอง
+            cached = await codec.get_raw(redis_instance, key)
+            if cached is not None:
+                await _release_lock(redis_instance, lock_key, token)
+                return codec.decode_text(cached)
+    except Exception as e:
+        logger.warning("⚠️ Redis feed cache '%s' ใช้ไม่ได้ ดึงตรง: %s", name, e)
+        if acquired:
+            await _release_lock(redis_instance, lock_key, token)
+        return await _cached_feed_local(name, ttl, fetch, stale)
+
+    try:
+        value = await fetch()
+        if value.startswith("❌"):
+            return await _serve_stale(redis_instance, name, value) if stale else value
+        pipe = redis_instance.pipeline(transaction=False)
+        pipe.set(key, codec.encode_text(value), ex=ttl)
+        if stale:
+            _last_good[name] = (time.time(), value)
+            pipe.set(f"feed:last:{name}", codec.encode_json({"ts": time.time(), "value": value}), ex=LAST_GOOD_TTL)
+        await pipe.execute()
+        return value
+    finally:
+        if acquired:
+            await _release_lock(redis_instance, lock_key, token)
@@ -0,0 +1,177 @@
+import contextvars
+import gzip
+import hashlib
+import hmac
+import itertools
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, List, Optional
+
+from modules.core.logger import logger
+
+# ✅ บันทึก traffic จริง (เปิดเมื่อตั้ง TRAFFIC_CAPTURE_PATH) ไว้ replay ด้วย benchmarks/replay.py
+#    ไฟล์เป็น JSON Lines ต่อท้ายไปเรื่อย ๆ เขียนทีละก้อนเป็น gzip member (gzip.open อ่านต่อกันได้ทั้งไฟล์)
+#
+#    {"e":"msg","id":1,"ts":0.0,"u":"9f2c…","topic":"gold","text":"ราคาทองวันนี้"}
+#    {"e":"up","msg":1,"ts":0.01,"host":"api.chnwt.dev","path":"/thai-gold-api/latest","status":200,"ms":85.2,"type":"application/json","body":"…"}
+#    {"e":"done","msg":1,"ts":0.1,"ms":96.0}
+
+CAPTURE_PATH = os.getenv("TRAFFIC_CAPTURE_PATH")
+# ✅ key ของ HMAC ที่ hash user id ไม่ตั้งไว้ = สุ่มใหม่ทุกครั้งที่เปิดบอท (อยู่ในหน่วยความจำ ไม่เขียนลงไฟล์)
+#    ไม่งั้น key ว่างใครก็ hash id ที่รู้แล้วเทียบกับไฟล์ได้ ตั้งเองเมื่ออยากให้ hash ตรงกันข้ามการรีสตาร์ท (เก็บเป็นความลับ)
+CAPTURE_SALT = os.getenv("TRAFFIC_CAPTURE_SALT") or secrets.token_hex(32)
+FLUSH_EVERY = 200          # event
+FLUSH_INTERVAL = 2.0       # วินาที
+MAX_BODY_BYTES = 64 * 1024
+
+# ✅ ข้อความที่กำลังประมวลผลอยู่ (ผูก upstream call กับข้อความ และใช้ตอน replay)
+current_message: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar("current_message", default=None)
+
+_MENTION = re.compile(r"<[@#][!&]?\d+>")
+_URL = re.compile(r"https?://\S+")
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+")
+_PHONE = re.compile(r"(?<!\d)0\d{1,2}[- ]?\d{3}[- ]?\d{4}(?!\d)")
+_LONG_NUMBER = re.compile(r"\d{10,}")
+
+
+def anonymize_text(text: str) -> str:
+    """ ตัด mention / ลิงก์ / อีเมล / เบอร์โทร / เลขยาว ๆ (บัตรประชาชน บัญชี) ออก เก็บแค่รูปประโยคไว้ replay """
+    text = _MENTION.sub("<@user>", text)
+    text = _URL.sub("<url>", text)
+    text = _EMAIL.sub("<email>", text)
+    text = _PHONE.sub("<phone>", text)
+    return _LONG_NUMBER.sub("<number>", text)
+
+
+def anonymize_id(value: int) -> str:
+    return hmac.new(CAPTURE_SALT.encode(), str(value).encode(), hashlib.sha256).hexdigest()[:16]
+
+
+class TrafficRecorder:
+    def __init__(self, path: str):
+        self.path = path
+        self._started = time.monotonic()
+        self._ids = itertools.count(1)
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _now(self) -> float:
+        return round(time.monotonic() - self._started, 4)
+
+    def _append(self, event: Dict) -> None:
+        line = json.dumps(event, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= FLUSH_EVERY or time.monotonic() - self._last_flush > FLUSH_INTERVAL:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._buffer:
+            return
+        data = gzip.compress(("\n".join(self._buffer) + "\n").encode("utf-8"))
+        self._buffer.clear()
+        self._last_flush = time.monotonic()
+        try:
+            with open(self.path, "ab") as f:
+                f.write(data)
+        except OSError as e:
+            logger.warning("⚠️ เขียน traffic capture ไม่ได้: %s", e)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def record_message(self, user_id: int, text: str, topic: Optional[str]) -> int:
+        message_id = next(self._ids)
+        self._append({
+            "e": "msg", "id": message_id, "ts": self._now(),
+            "u": anonymize_id(user_id), "topic": topic, "text": anonymize_text(text),
+        })
+        return message_id
+
+    def record_done(self, message_id: int, seconds: float) -> None:
+        self._append({"e": "done", "msg": message_id, "ts": self._now(), "ms": round(seconds * 1e3, 2)})
+
+    def record_upstream(
+        self, host: str, path: str, status: int, seconds: float, content_type: str, body: Optional[str]
+    ) -> None:
+        self._append({
+            "e": "up", "msg": current_message.get(), "ts": self._now(),
+            "host": host, "path": path, "status": status, "ms": round(seconds * 1e3, 2),
+            "type": content_type, "body": body,
+        })
+
+
+_recorder: Optional[TrafficRecorder] = TrafficRecorder(CAPTURE_PATH) if CAPTURE_PATH else None
+
+
+def get_recorder() -> Optional[TrafficRecorder]:
+    return _recorder
+
+
+@contextmanager
+def _capture(recorder: TrafficRecorder, user_id: int, text: str, topic: Optional[str]) -> Iterator[int]:
+    message_id = recorder.record_message(user_id, text, topic)
+    token = current_message.set(message_id)
+    started = time.perf_counter()
+    try:
+        yield message_id
+    finally:
+        recorder.record_done(message_id, time.perf_counter() - started)
+        current_message.reset(token)
+
+
+def capture_message(user_id: int, text: str, topic: Optional[str]):
+    """ with capture_message(...): ครอบการตอบข้อความหนึ่ง (ไม่ได้เปิด capture = ไม่ทำอะไร) """
+    if _recorder is None:
+        return nullcontext()
+    return _capture(_recorder, user_id, text, topic)
+
+
+async def _on_request(request) -> None:
+    request.extensions["capture_started"] = time.perf_counter()
+
+
+async def _on_response(response) -> None:
+    recorder = _recorder
+    if recorder is None:
+        return
+    request = response.request
+    started = request.extensions.get("capture_started", time.perf_counter())
+    content_type = response.headers.get("content-type", "")
+    body = None
+    if "event-stream" not in content_type:
+        # stream ปล่อยไว้ให้ผู้เรียกอ่านเอง ไม่งั้นจะกลายเป็นรอทั้งก้อน
+        raw = await response.aread()
+        body = raw[:MAX_BODY_BYTES].decode("utf-8", errors="replace")
+    recorder.record_upstream(
+        request.url.host, request.url.path, response.status_code,
+        time.perf_counter() - started, content_type.split(";")[0], body,
+    )
+
+
+def http_event_hooks() -> Dict[str, list]:
+    """ event_hooks สำหรับ httpx.AsyncClient ที่ AppContext สร้าง (ว่างถ้าไม่ได้เปิด capture) """
+    if _recorder is None:
+        return {}
+    return {"request": [_on_request], "response": [_on_response]}
+
+
+def close() -> None:
+    if _recorder is not None:
+        _recorder.flush()
+
+
+def read_events(path: str) -> Iterator[Dict]:
+    """ อ่านไฟล์ capture (gzip หลาย member ต่อกัน) ทีละ event """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
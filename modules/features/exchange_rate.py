@@ -1,26 +1,21 @@
 import httpx
+from typing import Optional
 
-CURRENCIES = ["USD", "EUR", "JPY", "CNY"]
-
-async def get_exchange_rate() -> str:
-    url = "https://open.er-api.com/v6/latest/THB"
-    try:
-        async with httpx.AsyncClient() as client:
-            res = await client.get(url, timeout=10)
-            res.raise_for_status()
-            data = res.json()
+from modules.core.app_context import get_context
+from modules.fx.rates import get_rate_table
 
-            if data.get("result") != "success":
-                return "❌ พี่หลามดึงอัตราแลกเปลี่ยนไม่ได้"
+CURRENCIES = ["USD", "EUR", "JPY", "CNY"]
 
-            rates = data.get("rates", {})
-            result = []
-            for cur in CURRENCIES:
-                rate = rates.get(cur)
-                if rate:
-                    result.append(f"💱 1 THB ≈ {rate:.2f} {cur}")
+async def get_exchange_rate(client: Optional[httpx.AsyncClient] = None) -> str:
+    # ✅ ใช้ตารางอัตราแลกเปลี่ยนชุดเดียวกับตัวแปลงเงิน (modules/fx) ไม่ดึงซ้ำ
+    table = await get_rate_table(get_context().redis, client)
+    if table is None:
+        return "❌ พี่หลามดึงอัตราแลกเปลี่ยนไม่ได้"
 
-            return "📊 อัตราแลกเปลี่ยนวันนี้ (THB):\n" + "\n".join(result)
+    result = []
+    for cur in CURRENCIES:
+        rate = table.rates.get(cur)
+        if rate:
+            result.append(f"💱 1 THB ≈ {rate:.2f} {cur}")
 
-    except Exception as e:
-        return f"❌ พี่หลามดึงอัตราแลกเปลี่ยนไม่ได้ ({e})"
+    return "📊 อัตราแลกเปลี่ยนวันนี้ (THB):\n" + "\n".join(result)
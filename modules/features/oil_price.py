@@ -1,8 +1,12 @@
 import httpx
 import json
 from datetime import datetime
+from typing import Optional
 import pytz
 
+from modules.core.app_context import get_context
+from modules.timeseries.store import record_snapshot
+
 thai_days = {
     "Monday": "จันทร์",
     "Tuesday": "อังคาร",
@@ -28,46 +32,52 @@ thai_months = {
     "December": "ธันวาคม"
 }
 
-async def get_oil_price_today() -> str:
+async def get_oil_price_today(client: Optional[httpx.AsyncClient] = None) -> str:
     url = "https://oil-price.bangchak.co.th/ApiOilPrice2/th"
     try:
-        async with httpx.AsyncClient() as client:
-            res = await client.get(url, timeout=10)
-            res.raise_for_status()
-            data = res.json()
+        client = client or get_context().http
+        res = await client.get(url, timeout=10)
+        res.raise_for_status()
+        data = res.json()
 
-            if not isinstance(data, list) or not data:
-                return "❌ โครงสร้างข้อมูลผิดปกติ"
+        if not isinstance(data, list) or not data:
+            return "❌ โครงสร้างข้อมูลผิดปกติ"
 
-            oil_list_raw = data[0].get("OilList")
-            if not oil_list_raw:
-                return "❌ ไม่พบรายการราคาน้ำมัน"
+        oil_list_raw = data[0].get("OilList")
+        if not oil_list_raw:
+            return "❌ ไม่พบรายการราคาน้ำมัน"
 
-            oil_list = json.loads(oil_list_raw)
+        oil_list = json.loads(oil_list_raw)
 
-            target_names = {
-                "แก๊สโซฮอล์ 95 S EVO": "แก๊สโซฮอล์ 95",
-                "แก๊สโซฮอล์ 91 S EVO": "แก๊สโซฮอล์ 91",
-                "ไฮดีเซล S": "ดีเซล"
-            }
+        target_names = {
+            "แก๊สโซฮอล์ 95 S EVO": "แก๊สโซฮอล์ 95",
+            "แก๊สโซฮอล์ 91 S EVO": "แก๊สโซฮอล์ 91",
+            "ไฮดีเซล S": "ดีเซล"
+        }
+        series_names = {
+            "แก๊สโซฮอล์ 95 S EVO": "oil:gasohol95",
+            "แก๊สโซฮอล์ 91 S EVO": "oil:gasohol91",
+            "ไฮดีเซล S": "oil:diesel",
+        }
 
-            result = []
-            for item in oil_list:
-                raw_name = item.get("OilName", "")
-                if raw_name in target_names:
-                    display_name = target_names[raw_name]
-                    price = item.get("PriceToday", "-")
-                    result.append(f"⛽ {display_name}: {price} บาท/ลิตร")
+        result = []
+        for item in oil_list:
+            raw_name = item.get("OilName", "")
+            if raw_name in target_names:
+                display_name = target_names[raw_name]
+                price = item.get("PriceToday", "-")
+                record_snapshot(series_names[raw_name], price)
+                result.append(f"⛽ {display_name}: {price} บาท/ลิตร")
 
-            if not result:
-                return "❌ ไม่พบข้อมูลราคาน้ำมันที่ต้องการ"
+        if not result:
+            return "❌ ไม่พบข้อมูลราคาน้ำมันที่ต้องการ"
 
-            today = datetime.now(pytz.timezone("Asia/Bangkok"))
-            day_thai = thai_days[today.strftime("%A")]
-            month_thai = thai_months[today.strftime("%B")]
-            thai_date = today.strftime(f"วัน{day_thai}ที่ %-d {month_thai} %Y")
+        today = datetime.now(pytz.timezone("Asia/Bangkok"))
+        day_thai = thai_days[today.strftime("%A")]
+        month_thai = thai_months[today.strftime("%B")]
+        thai_date = today.strftime(f"วัน{day_thai}ที่ %-d {month_thai} %Y")
 
-            return f"📅 ราคาน้ำมันประจำ{thai_date}\n" + "\n".join(result)
+        return f"📅 ราคาน้ำมันประจำ{thai_date}\n" + "\n".join(result)
 
     except Exception as e:
         return f"❌ พี่หลามดึงราคาน้ำมันไม่ได้ตอนนี้ ลองใหม่อีกทีนะ ({e})"
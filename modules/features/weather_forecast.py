@@ -1,34 +1,77 @@
-import httpx
 import os
+import re
+from typing import List, Optional
+from redis.asyncio import Redis
+
+from modules.core.logger import logger
+from modules.weather.gazetteer import Place, extract_places, lookup_place
+from modules.weather.forecast_cache import fetch_by_name, fetch_many
+from modules.weather.renderer import render_many, render_weather
 
 API_KEY = os.getenv("OPENWEATHER_API_KEY")
 
-async def get_weather(city: str) -> str:
+DEFAULT_CITY = "กรุงเทพมหานคร"
+MAX_CITIES_PER_QUESTION = 5
+
+# ✅ ชื่อที่ gazetteer ไม่รู้จัก ให้ OpenWeather หาจากชื่อก่อน
+#    ตามหลัง อำเภอ / จังหวัด / ตำบล / เขต = ตั้งใจบอกสถานที่แน่ ๆ หาไม่เจอตอบว่าไม่รู้จัก (ไม่ตอบอากาศกรุงเทพแทน)
+#    ตามหลัง ที่ / แถว / in / at อาจเป็นคำธรรมดา ("ที่สุด", "ที่ทำงาน") หาไม่เจอก็ใช้ค่า default ตามเดิม
+PLACE_MARKER = re.compile(r"(?:อำเภอ|จังหวัด|ตำบล|เขต|อ\.|จ\.)\s*([^\s\d?!.,]+)")
+PLACE_HINT = re.compile(r"(?:ที่|แถว|\b(?:in|at)\b)\s*([a-z][a-z ]*[a-z]|[^\s\d?!.,]+)", re.IGNORECASE)
+NOT_PLACE = re.compile(
+    r"วันนี้|พรุ่งนี้|ตอนนี้|ช่วงนี้|เมื่อวาน|อากาศ|ฝน|ร้อน|หนาว|เย็น|เป็นไง|เป็นยังไง|ยังไง|บ้าง|ไหม|มั้ย|หน่อย"
+    r"|ครับ|ค่ะ|คะ|นะ|จ้า|today|tomorrow|now",
+    re.IGNORECASE,
+)
+NOT_PLACE_WORDS = {"นี่", "นี้", "นั่น", "โน่น", "ไหน", "สุด", "บ้าน"}
+UNKNOWN_PLACE = "❌ พี่หลามไม่รู้จักสถานที่ \"{name}\" ลองพิมพ์ชื่อจังหวัดหรืออำเภอดูนะ"
+
+
+def resolve_places(text: str, default: Optional[str] = DEFAULT_CITY) -> List[Place]:
+    """ หาสถานที่จากข้อความ ถ้าไม่เจอเลยใช้ค่า default """
+    places = extract_places(text)[:MAX_CITIES_PER_QUESTION]
+    if not places and default:
+        fallback = lookup_place(default)
+        if fallback:
+            places = [fallback]
+    return places
+
+
+def place_name(pattern: re.Pattern, text: str) -> Optional[str]:
+    """ ชื่อที่ตามหลังคำบอกสถานที่ ("อากาศ อ.แม่แจ่มวันนี้" → "แม่แจ่ม") หรือ None """
+    for match in pattern.finditer(text):
+        name = NOT_PLACE.split(match.group(1), 1)[0].strip()
+        if len(name) >= 2 and name not in NOT_PLACE_WORDS:
+            return name
+    return None
+
+
+async def get_weather_for_text(
+    text: str, redis_instance: Optional[Redis] = None, default: Optional[str] = DEFAULT_CITY
+) -> str:
+    """
+    ตอบสภาพอากาศของทุกเมืองที่อยู่ในข้อความ (ดึงพร้อมกัน)
+    default=None = ข้อความทั้งหมดคือชื่อสถานที่ (เช่น /weather place) หาไม่เจอก็ตอบว่าไม่รู้จัก
+    """
     if not API_KEY:
         return "❌ ยังไม่ได้ตั้งค่า API key ของ OpenWeatherMap"
 
-    url = (
-        f"https://api.openweathermap.org/data/2.5/weather"
-        f"?q={city}&appid={API_KEY}&units=metric&lang=th"
-    )
-    try:
-        async with httpx.AsyncClient() as client:
-            res = await client.get(url, timeout=10)
-            res.raise_for_status()
-            data = res.json()
-
-            weather = data["weather"][0]["description"]
-            temp = data["main"]["temp"]
-            humidity = data["main"]["humidity"]
-            wind = data["wind"]["speed"]
-
-            return (
-                f"📍 สภาพอากาศวันนี้ที่ {city.title()}\n"
-                f"🌤️ {weather}\n"
-                f"🌡️ อุณหภูมิ: {temp}°C\n"
-                f"💧 ความชื้น: {humidity}%\n"
-                f"💨 ลม: {wind} m/s"
-            )
-
-    except Exception as e:
-        return f"❌ พี่หลามดึงพยากรณ์อากาศไม่ได้ ({e})"
+    if not extract_places(text):
+        explicit = place_name(PLACE_MARKER, text) if default else text.strip()
+        name = explicit or place_name(PLACE_HINT, text)
+        if name:
+            try:
+                found = await fetch_by_name(name, API_KEY, redis_instance)
+            except Exception as e:
+                logger.warning("⚠️ หาอากาศจากชื่อ %r ไม่ได้: %s", name, e)
+                if explicit:
+                    return f"❌ พี่หลามดึงพยากรณ์อากาศ {name} ไม่ได้"
+                found = None
+            if found:
+                place, data = found
+                return render_weather(place.display_name, data)
+            if explicit:
+                return UNKNOWN_PLACE.format(name=explicit)
+    places = resolve_places(text, default)
+    results = await fetch_many(places, API_KEY, redis_instance)
+    return render_many(list(zip(places, results)))
@@ -0,0 +1,71 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+# ✅ สกุลเงินที่คนไทยถามบ่อย: ชื่อไทย / ชื่ออังกฤษ / สัญลักษณ์ / รหัส ISO → รหัส ISO
+#    รหัส ISO อื่น ๆ ที่อยู่ในตารางอัตราแลกเปลี่ยน (เช่น "chf", "aed") ก็ใช้ได้ผ่าน ISO_PATTERN
+
+
+@dataclass(frozen=True)
+class Currency:
+    code: str
+    name: str              # ชื่อไทยที่ใช้ตอนตอบ
+    aliases: tuple = ()
+    symbol: str = ""
+    decimals: int = 2
+
+
+CURRENCIES = [
+    Currency("THB", "บาท", ("บาท", "เงินบาท", "เงินไทย", "baht"), "฿"),
+    Currency("USD", "ดอลลาร์สหรัฐ", ("ดอลลาร์สหรัฐ", "ดอลลาร์", "ดอลล่าร์", "ดอลล่า", "ดอล", "us dollar", "dollar", "dollars", "buck", "bucks"), "$"),
+    Currency("EUR", "ยูโร", ("ยูโร", "euro", "euros"), "€"),
+    Currency("JPY", "เยน", ("เยน", "yen"), "¥", 0),
+    Currency("CNY", "หยวน", ("หยวน", "yuan", "rmb", "renminbi")),
+    Currency("GBP", "ปอนด์", ("ปอนด์สเตอร์ลิง", "ปอนด์", "pound", "pounds", "sterling"), "£"),
+    Currency("KRW", "วอน", ("วอน", "won"), "₩", 0),
+    Currency("HKD", "ดอลลาร์ฮ่องกง", ("ดอลลาร์ฮ่องกง", "hong kong dollar")),
+    Currency("SGD", "ดอลลาร์สิงคโปร์", ("ดอลลาร์สิงคโปร์", "singapore dollar")),
+    Currency("TWD", "ดอลลาร์ไต้หวัน", ("ดอลลาร์ไต้หวัน", "taiwan dollar")),
+    Currency("AUD", "ดอลลาร์ออสเตรเลีย", ("ดอลลาร์ออสเตรเลีย", "ดอลลาร์ออส", "australian dollar")),
+    Currency("NZD", "ดอลลาร์นิวซีแลนด์", ("ดอลลาร์นิวซีแลนด์", "new zealand dollar")),
+    Currency("CAD", "ดอลลาร์แคนาดา", ("ดอลลาร์แคนาดา", "canadian dollar")),
+    Currency("CHF", "ฟรังก์สวิส", ("ฟรังก์สวิส", "ฟรังก์", "swiss franc", "franc")),
+    Currency("MYR", "ริงกิต", ("ริงกิต", "ringgit")),
+    Currency("IDR", "รูเปียห์", ("รูเปียห์", "rupiah"), "", 0),
+    Currency("VND", "ดอง", ("ดองเวียดนาม", "ดอง", "dong"), "₫", 0),
+    Currency("LAK", "กีบ", ("กีบ", "kip"), "₭", 0),
+    Currency("MMK", "จ๊าด", ("จ๊าด", "kyat"), "", 0),
+    Currency("KHR", "เรียล", ("เรียลกัมพูชา", "เรียล", "riel"), "", 0),
+    Currency("PHP", "เปโซฟิลิปปินส์", ("เปโซ", "peso"), "₱"),
+    Currency("INR", "รูปี", ("รูปี", "rupee", "rupees"), "₹"),
+    Currency("AED", "ดีแรห์ม", ("ดีแรห์ม", "dirham")),
+    Currency("RUB", "รูเบิล", ("รูเบิล", "ruble", "rouble"), "₽"),
+]
+BY_CODE: Dict[str, Currency] = {currency.code: currency for currency in CURRENCIES}
+
+ALIASES: Dict[str, str] = {}
+for _currency in CURRENCIES:
+    ALIASES[_currency.code.lower()] = _currency.code
+    for _alias in _currency.aliases:
+        ALIASES[_alias] = _currency.code
+SYMBOLS: Dict[str, str] = {c.symbol: c.code for c in CURRENCIES if c.symbol}
+
+# ชื่อยาวก่อน ("ดอลลาร์ฮ่องกง" ต้องไม่ถูกตัดเหลือ "ดอลลาร์") / ภาษาอังกฤษห้ามติดตัวอักษรอื่น
+_ALIAS_ALTERNATION = "|".join(re.escape(alias) for alias in sorted(ALIASES, key=len, reverse=True))
+CURRENCY_PATTERN = re.compile(rf"(?<![a-z])(?:{_ALIAS_ALTERNATION})(?![a-z])", re.IGNORECASE)
+ISO_PATTERN = re.compile(r"(?<![a-z])[a-z]{3}(?![a-z])", re.IGNORECASE)
+SYMBOL_PATTERN = re.compile("|".join(re.escape(symbol) for symbol in SYMBOLS))
+
+
+def currency_code(word: str) -> Optional[str]:
+    return ALIASES.get(word.lower()) or SYMBOLS.get(word)
+
+
+def currency_name(code: str) -> str:
+    currency = BY_CODE.get(code)
+    return currency.name if currency else code
+
+
+def currency_decimals(code: str) -> int:
+    currency = BY_CODE.get(code)
+    return currency.decimals if currency else 2
@@ -0,0 +1,158 @@
+import re
+from dataclasses import dataclass
+from typing import Collection, List, NamedTuple, Optional, Tuple
+
+from modules.fx.currencies import BY_CODE, CURRENCY_PATTERN, ISO_PATTERN, SYMBOL_PATTERN, currency_code
+
+# ✅ แยก "จำนวนเงิน + สกุลเงิน" ออกจากข้อความไทย/อังกฤษ
+#    "100 ดอลลาร์กี่บาท", "$25.5 เป็นเยน", "USD 1,200 to eur", "10, 20, 35 ยูโร เทียบ ดอลลาร์ เยน", "2 แสนวอน"
+
+NUMBER_PATTERN = re.compile(
+    r"(?<![\d.,])(\d{1,3}(?:,\d{3})+|\d+)(\.\d+)?(?!\d|[.,]\d)\s*(k(?![a-z])|พัน|หมื่น|แสน|ล้าน)?"
+    r"(?!\s*(?:วัน|สัปดาห์|อาทิตย์|เดือน|ปี|ชม|ชั่วโมง|นาที|%|days?\b|weeks?\b|months?\b|years?\b))",
+    re.IGNORECASE,
+)
+MULTIPLIERS = {"k": 1e3, "พัน": 1e3, "หมื่น": 1e4, "แสน": 1e5, "ล้าน": 1e6}
+# ระหว่างจำนวนเงินในรายการเดียวกัน ("10, 20 และ 30 ดอลลาร์")
+LIST_SEPARATOR = re.compile(r"\s*(?:,|、|/|\+|และ|กับ|หรือ|and|or)?\s*", re.IGNORECASE)
+DEFAULT_TARGETS = ("USD", "EUR", "JPY", "CNY")
+MAX_AMOUNTS = 50
+
+
+class _Token(NamedTuple):
+    start: int
+    end: int
+    kind: str              # "number" / "currency" / "symbol"
+    value: object
+
+
+@dataclass(frozen=True)
+class FxQuery:
+    amounts: Tuple[float, ...]
+    source: str
+    targets: Tuple[str, ...]
+    explicit_amount: bool  # False = ผู้ใช้ไม่ได้พิมพ์จำนวน (ใช้ 1 หน่วย)
+
+
+def parse_number(match: re.Match) -> float:
+    whole, fraction, multiplier = match.groups()
+    value = float(whole.replace(",", "") + (fraction or ""))
+    return value * MULTIPLIERS.get((multiplier or "").lower(), 1)
+
+
+def _tokens(text: str, codes: Collection[str]) -> List[_Token]:
+    tokens = [_Token(m.start(), m.end(), "number", parse_number(m)) for m in NUMBER_PATTERN.finditer(text)]
+    taken = []
+    for match in CURRENCY_PATTERN.finditer(text):
+        tokens.append(_Token(match.start(), match.end(), "currency", currency_code(match.group())))
+        taken.append((match.start(), match.end()))
+    for match in ISO_PATTERN.finditer(text):
+        code = match.group().upper()
+        if code in codes and not any(s <= match.start() < e for s, e in taken):
+            tokens.append(_Token(match.start(), match.end(), "currency", code))
+    for match in SYMBOL_PATTERN.finditer(text):
+        tokens.append(_Token(match.start(), match.end(), "symbol", currency_code(match.group())))
+    return sorted(tokens)
+
+
+def parse_fx_query(text: str, codes: Optional[Collection[str]] = None) -> Optional[FxQuery]:
+    """
+    หาสกุลต้นทาง (ตัวที่มีจำนวนเงินติดอยู่) กับสกุลปลายทาง (ที่เหลือ) คืน None ถ้าไม่มีสกุลเงินในข้อความ
+    codes = รหัส ISO ที่ตารางอัตราแลกเปลี่ยนรู้จัก (รหัสที่ไม่มีชื่อไทยก็ใช้ได้ เช่น "chf", "aed")
+    """
+    codes = BY_CODE if codes is None else codes
+    source: Optional[str] = None
+    amounts: List[float] = []
+    mentions: List[str] = []
+    pending: List[float] = []          # จำนวนที่ยังไม่รู้สกุล (รอคำถัดไป)
+    opened: Optional[str] = None       # สกุลที่รอจำนวนตามหลัง ("$100", "USD 500")
+    previous_end = 0
+
+    def attach(code: str, values: List[float]) -> bool:
+        nonlocal source
+        if source is None:
+            source = code
+        if code != source:
+            return False
+        amounts.extend(values)
+        return True
+
+    for token in _tokens(text, codes):
+        if token.start < previous_end:
+            continue                   # ซ้อนกับ token ก่อนหน้า
+        gap = text[previous_end:token.start]
+        adjacent = not gap.strip()
+        if token.kind == "number":
+            if opened and adjacent:
+                attach(opened, [token.value])
+                pending = []
+            else:
+                if pending and not LIST_SEPARATOR.fullmatch(gap):
+                    pending = []
+                pending.append(token.value)
+            opened = None
+        elif pending and adjacent:
+            # "100 ดอลลาร์" / "100$"
+            if not attach(token.value, pending):
+                mentions.append(token.value)
+            pending = []
+            opened = None
+        else:
+            if token.kind == "currency":
+                mentions.append(token.value)
+            opened = token.value
+            pending = []
+        previous_end = token.end
+
+    if source is None:
+        if not mentions:
+            return None
+        source = mentions[0]
+    explicit = bool(amounts)
+    targets = list(dict.fromkeys(code for code in mentions if code != source))
+    if not targets:
+        if source != "THB":
+            targets = ["THB"]
+        elif explicit:
+            targets = list(DEFAULT_TARGETS)
+        else:
+            return None            # "ค่าเงินบาทวันนี้" → ให้ตอบด้วยตารางอัตราแลกเปลี่ยนปกติ
+    return FxQuery(tuple(amounts[:MAX_AMOUNTS]) or (1.0,), source, tuple(targets), explicit)
+
+
+def resolve_currency(word: str, codes: Optional[Collection[str]] = None) -> Optional[str]:
+    """ "usd" / "ดอลลาร์" / "$" / "chf" (ถ้าตารางมี) → รหัส ISO """
+    codes = BY_CODE if codes is None else codes
+    word = word.strip()
+    code = currency_code(word)
+    if code is None and word.upper() in codes:
+        code = word.upper()
+    return code
+
+
+def build_fx_query(
+    amount: Optional[str], source: Optional[str], targets: Optional[str], codes: Optional[Collection[str]] = None
+) -> FxQuery:
+    """ FxQuery จากช่องของ slash command (/fx amount from to) ข้อมูลผิดโยน ValueError พร้อมข้อความที่ส่งให้ผู้ใช้ได้ """
+    codes = BY_CODE if codes is None else codes
+    amounts = [parse_number(match) for match in NUMBER_PATTERN.finditer(amount or "")]
+    if amount and not amounts:
+        raise ValueError(f"❌ อ่านจำนวนเงิน {amount!r} ไม่ออก ลองแบบ 100 หรือ 10, 20, 1.5k")
+    if len(amounts) > MAX_AMOUNTS:
+        raise ValueError(f"❌ แปลงได้ครั้งละไม่เกิน {MAX_AMOUNTS} จำนวน")
+
+    source_code = resolve_currency(source, codes) if source else "USD"
+    if source_code is None:
+        raise ValueError(f"❌ ไม่รู้จักสกุลเงิน {source!r}")
+    target_codes = []
+    for word in re.split(r"[,\s]+", targets or ""):
+        if not word:
+            continue
+        code = resolve_currency(word, codes)
+        if code is None:
+            raise ValueError(f"❌ ไม่รู้จักสกุลเงิน {word!r}")
+        if code != source_code:
+            target_codes.append(code)
+    if not target_codes:
+        target_codes = ["THB"] if source_code != "THB" else list(DEFAULT_TARGETS)
+    return FxQuery(tuple(amounts) or (1.0,), source_code, tuple(dict.fromkeys(target_codes)), bool(amounts))
@@ -0,0 +1,104 @@
+import json
+import time
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional
+
+import httpx
+from redis.asyncio import Redis
+
+from modules.core.app_context import get_context
+from modules.core.logger import logger
+from modules.core.shared_state import cached_feed
+from modules.timeseries.store import record_snapshot
+
+# ✅ ตารางอัตราแลกเปลี่ยนทั้งตาราง (ฐาน THB ~160 สกุล) ดึงครั้งเดียวแล้วใช้ร่วมกัน:
+#    Redis (feed:fx_table ผ่าน cached_feed ทุก shard ใช้ชุดเดียวกัน) + สำเนาที่ parse แล้วใน process
+#    แปลงเงิน = คูณตัวคูณเดียวต่อคู่สกุล ไม่ต้องเรียก API หรือ GPT
+
+RATES_URL = "https://open.er-api.com/v6/latest/THB"
+RATE_TTL = 600
+RETRY_AFTER = 30
+TRACKED = ("USD", "EUR", "JPY", "CNY")      # เก็บลง time series ไว้ตอบแนวโน้ม
+
+
+@dataclass(frozen=True)
+class RateTable:
+    rates: Dict[str, float]                  # หน่วยของสกุลนั้นต่อ 1 บาท
+    updated: str = ""
+    codes: frozenset = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "codes", frozenset(self.rates))
+
+    def rate(self, source: str, target: str) -> float:
+        """ 1 source = ? target """
+        return self.rates[target] / self.rates[source]
+
+    def convert(self, amount: float, source: str, target: str) -> float:
+        return amount * self.rate(source, target)
+
+    def convert_many(self, amounts: Iterable[float], source: str, targets: Iterable[str]) -> Dict[str, array]:
+        """ แปลงทุกจำนวนไปทุกสกุลปลายทาง: หาตัวคูณครั้งเดียวต่อสกุล แล้วคูณทั้งคอลัมน์ """
+        column = amounts if isinstance(amounts, array) else array("d", amounts)
+        result = {}
+        for target in targets:
+            factor = self.rate(source, target)
+            result[target] = array("d", [amount * factor for amount in column])
+        return result
+
+    def to_json(self) -> str:
+        return json.dumps({"updated": self.updated, "rates": self.rates}, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, raw: str) -> "RateTable":
+        data = json.loads(raw)
+        return cls({code: float(rate) for code, rate in data["rates"].items() if rate}, data.get("updated", ""))
+
+
+async def fetch_rate_table(client: Optional[httpx.AsyncClient] = None) -> str:
+    """ ดึงทั้งตาราง คืน JSON แบบย่อ (หรือข้อความ ❌ ซึ่ง cached_feed จะไม่ cache) """
+    try:
+        client = client or get_context().http
+        res = await client.get(RATES_URL, timeout=10)
+        res.raise_for_status()
+        data = res.json()
+        if data.get("result") != "success" or not data.get("rates"):
+            return "❌ พี่หลามดึงอัตราแลกเปลี่ยนไม่ได้"
+
+        table = RateTable({code: float(rate) for code, rate in data["rates"].items() if rate},
+                          data.get("time_last_update_utc", "").replace(" +0000", " UTC"))
+        for code in TRACKED:
+            if code in table.rates:
+                record_snapshot(f"fx:{code}", 1 / table.rates[code])   # เก็บเป็นบาทต่อ 1 หน่วย
+        return table.to_json()
+    except Exception as e:
+        return f"❌ พี่หลามดึงอัตราแลกเปลี่ยนไม่ได้ ({e})"
+
+
+_table: Optional[RateTable] = None
+_expires_at = 0.0
+
+
+async def get_rate_table(
+    redis_instance: Optional[Redis] = None, client: Optional[httpx.AsyncClient] = None
+) -> Optional[RateTable]:
+    """ ตารางล่าสุด (ในเครื่องก่อน แล้ว Redis แล้วค่อย API) คืน None ถ้าดึงไม่ได้และไม่เคยมีตาราง """
+    global _table, _expires_at
+    if _table is not None and time.monotonic() < _expires_at:
+        return _table
+
+    raw = await cached_feed(redis_instance, "fx_table", RATE_TTL, lambda: fetch_rate_table(client))
+    if raw.startswith("❌"):
+        logger.warning("⚠️ %s", raw)
+        if _table is not None:
+            _expires_at = time.monotonic() + RETRY_AFTER   # ใช้ตารางเก่าไปก่อน ไม่ยิง API ทุกข้อความ
+        return _table
+    try:
+        _table = RateTable.from_json(raw)
+    except (ValueError, KeyError, TypeError) as e:
+        logger.warning("⚠️ ตารางอัตราแลกเปลี่ยนใน cache เสีย: %s", e)
+        return _table
+    # Redis ถือ TTL ของจริง ในเครื่องเก็บไว้สั้นกว่าเพื่อให้ทัน shard อื่นที่ดึงใหม่
+    _expires_at = time.monotonic() + RATE_TTL / 10
+    return _table
@@ -0,0 +1,56 @@
+from typing import List
+
+from modules.fx.currencies import currency_decimals, currency_name
+from modules.fx.parser import FxQuery
+from modules.fx.rates import RateTable
+
+# ✅ สรุปผลแปลงเงินเป็นข้อความ Discord (ไม่ผ่าน GPT)
+
+MAX_LINES = 30
+
+
+def format_amount(value: float, code: str) -> str:
+    decimals = currency_decimals(code)
+    if 0 < abs(value) < 1:
+        decimals = max(decimals, 4)        # 1 บาท = 0.0294 USD ไม่ใช่ 0.03
+    return f"{value:,.{decimals}f}"
+
+
+def _label(code: str) -> str:
+    name = currency_name(code)
+    return name if name == code else f"{name} ({code})"
+
+
+def render_conversion(query: FxQuery, table: RateTable) -> str:
+    missing = [code for code in (query.source, *query.targets) if code not in table.rates]
+    targets = [code for code in query.targets if code in table.rates]
+    if query.source in missing or not targets:
+        return f"❌ พี่หลามไม่มีอัตราแลกเปลี่ยนของ {', '.join(missing)}"
+
+    converted = table.convert_many(query.amounts, query.source, targets)
+    lines: List[str] = []
+    if len(query.amounts) == 1:
+        amount = query.amounts[0]
+        lines.append(f"💱 {format_amount(amount, query.source)} {_label(query.source)}")
+        for code in targets:
+            lines.append(f"= **{format_amount(converted[code][0], code)}** {_label(code)}")
+    else:
+        lines.append(f"💱 แปลง {query.source} → {', '.join(targets)}")
+        for i, amount in enumerate(query.amounts[:MAX_LINES]):
+            parts = " · ".join(f"{format_amount(converted[code][i], code)} {code}" for code in targets)
+            lines.append(f"• {format_amount(amount, query.source)} {query.source} = {parts}")
+        if len(query.amounts) > MAX_LINES:
+            lines.append(f"… และอีก {len(query.amounts) - MAX_LINES} จำนวน")
+        parts = " · ".join(f"{format_amount(sum(converted[code]), code)} {code}" for code in targets)
+        lines.append(f"รวม {format_amount(sum(query.amounts), query.source)} {query.source} = {parts}")
+
+    if len(targets) > 1 or (query.source != "THB" and targets != ["THB"]):
+        # เทียบหลายสกุล / ข้ามสกุล: บอกอัตราเทียบบาทของทุกตัวด้วย
+        rates = " · ".join(f"1 {code} = {format_amount(table.rate(code, 'THB'), 'THB')} บาท"
+                           for code in dict.fromkeys([query.source, *targets]) if code != "THB")
+        lines.append(f"📊 {rates}")
+    if missing:
+        lines.append(f"⚠️ ไม่มีอัตราของ {', '.join(missing)}")
+    updated = f" ณ {table.updated}" if table.updated else ""
+    lines.append(f"🕒 อัตรากลาง{updated} (ยังไม่รวมค่าธรรมเนียม / ส่วนต่างของร้านแลกเงิน)")
+    return "\n".join(lines)
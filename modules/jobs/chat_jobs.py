@@ -0,0 +1,115 @@
+import json
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from modules.core.logger import logger
+
+# ✅ คิวงานแชท (Redis Streams): gateway ใส่งาน → worker หลายตัวแย่งกันทำผ่าน consumer group
+STREAM_KEY = "jobs:chat"
+GROUP = "chat-workers"
+STREAM_MAXLEN = 10000
+LOCK_TTL = 120            # วินาที: worker ถือสิทธิ์ทำงานชิ้นหนึ่งได้นานสุดเท่านี้
+DONE_TTL = 86400          # วินาที: จำว่างานไหนตอบไปแล้ว กันตอบซ้ำตอน redelivery
+
+
+@dataclass
+class ChatJob:
+    message_id: int
+    channel_id: int
+    user_id: int
+    text: str
+    enqueued_at: float
+
+    def to_fields(self) -> Dict[str, str]:
+        return {"job": json.dumps(asdict(self), ensure_ascii=False)}
+
+    @classmethod
+    def from_fields(cls, fields: Dict[str, str]) -> "ChatJob":
+        return cls(**json.loads(fields["job"]))
+
+
+async def ensure_group(redis_instance: Redis) -> None:
+    try:
+        await redis_instance.xgroup_create(STREAM_KEY, GROUP, id="0", mkstream=True)
+    except ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+async def enqueue_chat_job(redis_instance: Redis, message_id: int, channel_id: int, user_id: int, text: str) -> str:
+    job = ChatJob(message_id, channel_id, user_id, text, time.time())
+    return await redis_instance.xadd(
+        STREAM_KEY, job.to_fields(), maxlen=STREAM_MAXLEN, approximate=True
+    )
+
+
+async def read_jobs(
+    redis_instance: Redis, consumer: str, count: int = 1, block_ms: int = 5000
+) -> List[Tuple[str, ChatJob]]:
+    """ ดึงงานใหม่ที่ยังไม่มี worker ไหนรับ (block รอได้) """
+    response = await redis_instance.xreadgroup(
+        GROUP, consumer, {STREAM_KEY: ">"}, count=count, block=block_ms
+    )
+    jobs = []
+    for _, entries in response or []:
+        for entry_id, fields in entries:
+            jobs.append((entry_id, ChatJob.from_fields(fields)))
+    return jobs
+
+
+async def claim_stale_jobs(
+    redis_instance: Redis, consumer: str, min_idle_ms: int = LOCK_TTL * 1000, count: int = 10
+) -> List[Tuple[str, ChatJob]]:
+    """ รับงานที่ worker อื่นรับไปแล้วแต่ไม่ ack นานเกินไป (เช่น worker ตาย) → at-least-once """
+    _, entries, _ = await redis_instance.xautoclaim(
+        STREAM_KEY, GROUP, consumer, min_idle_time=min_idle_ms, start_id="0-0", count=count
+    )
+    return [(entry_id, ChatJob.from_fields(fields)) for entry_id, fields in entries if fields]
+
+
+async def begin_job(redis_instance: Redis, job: ChatJob, consumer: str) -> bool:
+    """ คืน False ถ้างานนี้ตอบไปแล้ว หรือมี worker อื่นกำลังทำอยู่ """
+    if await redis_instance.exists(f"jobs:done:{job.message_id}"):
+        return False
+    return bool(await redis_instance.set(f"jobs:lock:{job.message_id}", consumer, nx=True, ex=LOCK_TTL))
+
+
+async def mark_done(redis_instance: Redis, job: ChatJob) -> None:
+    """ ตอบผู้ใช้ไปแล้ว: ตั้งทันทีหลังโพสต์ ก่อนงานเก็บกวาดอื่น redelivery จะได้ข้ามไม่ตอบซ้ำ """
+    await redis_instance.set(f"jobs:done:{job.message_id}", 1, ex=DONE_TTL)
+
+
+async def finish_job(redis_instance: Redis, entry_id: str, job: ChatJob) -> None:
+    pipe = redis_instance.pipeline()
+    pipe.set(f"jobs:done:{job.message_id}", 1, ex=DONE_TTL)
+    pipe.delete(f"jobs:lock:{job.message_id}")
+    pipe.xack(STREAM_KEY, GROUP, entry_id)
+    await pipe.execute()
+
+
+async def release_job(redis_instance: Redis, job: ChatJob) -> None:
+    """ ทำไม่สำเร็จ: ปล่อย lock ไว้ให้ redelivery หยิบไปทำใหม่ (ไม่ ack) """
+    await redis_instance.delete(f"jobs:lock:{job.message_id}")
+
+
+async def skip_job(redis_instance: Redis, entry_id: str) -> None:
+    await redis_instance.xack(STREAM_KEY, GROUP, entry_id)
+
+
+async def queue_metrics(redis_instance: Redis) -> Dict[str, Optional[int]]:
+    """ ความลึกคิว: จำนวนใน stream, งานที่รับไปแล้วยังไม่ ack, งานที่ยังไม่มีใครรับ (lag) """
+    metrics: Dict[str, Optional[int]] = {"length": None, "pending": None, "lag": None, "consumers": None}
+    try:
+        metrics["length"] = await redis_instance.xlen(STREAM_KEY)
+        for group in await redis_instance.xinfo_groups(STREAM_KEY):
+            if group.get("name") == GROUP:
+                metrics["pending"] = group.get("pending")
+                metrics["lag"] = group.get("lag")
+                metrics["consumers"] = group.get("consumers")
+    except Exception as e:
+        logger.warning("⚠️ อ่าน metrics ของคิวไม่ได้: %s", e)
+    return metrics
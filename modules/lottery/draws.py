@@ -0,0 +1,106 @@
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+# ✅ ผลสลากหนึ่งงวดแบบกะทัดรัด: ต่อรางวัลเก็บเลขเป็น int (6 หลัก / 3 หลัก / 2 หลัก)
+#    อ่านจาก JSON ของ lotto.api.rayriffy.com (/latest, /lotto/{id}) และเก็บลง Redis เป็นสตริงตัวเลขต่อกัน
+
+
+@dataclass(frozen=True)
+class Tier:
+    key: str           # ชื่อสั้นที่ใช้ในโค้ด / ที่เก็บ
+    api_id: str        # id ใน JSON ของ API
+    label: str
+    reward: int        # บาทต่อใบ (ใช้ถ้า API ไม่ได้ส่งมา)
+    digits: int        # จำนวนหลักของเลขรางวัล
+
+
+PRIZE_TIERS = [
+    Tier("first", "prizeFirst", "รางวัลที่ 1", 6_000_000, 6),
+    Tier("near", "prizeFirstNear", "รางวัลข้างเคียงรางวัลที่ 1", 100_000, 6),
+    Tier("second", "prizeSecond", "รางวัลที่ 2", 200_000, 6),
+    Tier("third", "prizeThird", "รางวัลที่ 3", 80_000, 6),
+    Tier("fourth", "prizeForth", "รางวัลที่ 4", 40_000, 6),
+    Tier("fifth", "prizeFifth", "รางวัลที่ 5", 20_000, 6),
+]
+RUNNING_TIERS = [
+    Tier("front3", "runningNumberFrontThree", "เลขหน้า 3 ตัว", 4_000, 3),
+    Tier("back3", "runningNumberBackThree", "เลขท้าย 3 ตัว", 4_000, 3),
+    Tier("back2", "runningNumberBackTwo", "เลขท้าย 2 ตัว", 2_000, 2),
+]
+TIERS: Dict[str, Tier] = {tier.key: tier for tier in PRIZE_TIERS + RUNNING_TIERS}
+MAX_DRAWS = 48             # เก็บ/ตรวจย้อนหลังได้กี่งวด (~2 ปี)
+_BY_API_ID = {tier.api_id: tier for tier in TIERS.values()}
+
+
+@dataclass
+class Draw:
+    id: str                                   # วันที่งวดแบบ DDMMYYYY (พ.ศ.) เหมือน id ของ API
+    date: str                                 # ข้อความวันที่ภาษาไทยจาก API
+    numbers: Dict[str, Tuple[int, ...]] = field(default_factory=dict)   # tier key → เลขรางวัล
+    rewards: Dict[str, int] = field(default_factory=dict)               # tier key → บาท (ถ้าต่างจากค่า default)
+
+    @property
+    def sort_key(self) -> Tuple[int, int, int]:
+        return int(self.id[4:]), int(self.id[2:4]), int(self.id[:2])
+
+    def reward(self, tier: str) -> int:
+        return self.rewards.get(tier, TIERS[tier].reward)
+
+    def format_number(self, tier: str, number: int) -> str:
+        return f"{number:0{TIERS[tier].digits}d}"
+
+    def to_compact(self) -> str:
+        """ {"id","date","n":{tier: "123456654321"},"r":{tier: บาท}} เลขทุกตัวความยาวคงที่เลยต่อกันได้ """
+        packed = {
+            tier: "".join(self.format_number(tier, n) for n in numbers)
+            for tier, numbers in self.numbers.items()
+        }
+        data = {"id": self.id, "date": self.date, "n": packed}
+        if self.rewards:
+            data["r"] = self.rewards
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def from_compact(cls, raw: str) -> "Draw":
+        data = json.loads(raw)
+        numbers = {}
+        for tier, digits in data["n"].items():
+            width = TIERS[tier].digits
+            numbers[tier] = tuple(int(digits[i:i + width]) for i in range(0, len(digits), width))
+        return cls(data["id"], data["date"], numbers, {k: int(v) for k, v in data.get("r", {}).items()})
+
+
+def _reward(raw) -> int:
+    try:
+        return int(float(str(raw).replace(",", "")))
+    except (TypeError, ValueError):
+        return 0
+
+
+def parse_draw(response: dict, draw_id: str = "") -> Draw:
+    """ แปลง response["response"] ของ API เป็น Draw (id มาจาก endpoint ถ้าไม่ได้ส่งมา) """
+    draw_id = draw_id or str(response.get("endpoint", "")).rstrip("/").rsplit("/", 1)[-1]
+    if not (len(draw_id) == 8 and draw_id.isdigit()):
+        raise ValueError(f"draw id ไม่ถูกต้อง: {draw_id!r}")
+
+    draw = Draw(draw_id, response.get("date", ""))
+    for entry in list(response.get("prizes", [])) + list(response.get("runningNumbers", [])):
+        tier = _BY_API_ID.get(entry.get("id"))
+        if tier is None:
+            continue
+        numbers = tuple(int(n) for n in entry.get("number", []) if str(n).isdigit() and len(str(n)) == tier.digits)
+        if numbers:
+            draw.numbers[tier.key] = numbers
+        reward = _reward(entry.get("reward"))
+        if reward and reward != tier.reward:
+            draw.rewards[tier.key] = reward
+    if "first" not in draw.numbers:
+        raise ValueError(f"งวด {draw_id} ไม่มีรางวัลที่ 1")
+    return draw
+
+
+def latest_draws(draws: List[Draw]) -> List[Draw]:
+    """ ใหม่ → เก่า ไม่ซ้ำ id """
+    unique = {draw.id: draw for draw in draws}
+    return sorted(unique.values(), key=lambda d: d.sort_key, reverse=True)
@@ -0,0 +1,84 @@
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from modules.lottery.draws import PRIZE_TIERS, Draw, latest_draws
+
+# ✅ index ข้ามทุกงวด: เลข → [(ลำดับงวด, รางวัล)] ทุกรางวัล 6 หลักรวมใน dict เดียว
+#    ส่วนเลขหน้า 3 / ท้าย 3 / ท้าย 2 index ด้วยเลขที่ตัดจากสลาก ตรวจสลาก 1 ใบกับทุกงวด = lookup 4 ครั้ง
+
+TICKET_PATTERN = re.compile(r"(?<!\d)\d{6}(?!\d)")
+MAX_TICKETS_PER_MESSAGE = 100
+
+Hit = Tuple[int, str]          # (ลำดับงวด 0 = ล่าสุด, tier key)
+
+
+@dataclass(frozen=True)
+class Win:
+    draw: Draw
+    tier: str
+    reward: int
+
+
+def parse_tickets(text: str, limit: int = MAX_TICKETS_PER_MESSAGE) -> List[str]:
+    """ เลข 6 หลักทุกตัวในข้อความ ไม่ซ้ำ เรียงตามที่พิมพ์มา """
+    seen = dict.fromkeys(TICKET_PATTERN.findall(text))
+    return list(seen)[:limit]
+
+
+class LotteryIndex:
+    def __init__(self, draws: List[Draw]):
+        self.draws = latest_draws(draws)
+        self.full: Dict[int, List[Hit]] = defaultdict(list)
+        self.front3: Dict[int, List[Hit]] = defaultdict(list)
+        self.back3: Dict[int, List[Hit]] = defaultdict(list)
+        self.back2: Dict[int, List[Hit]] = defaultdict(list)
+        for position, draw in enumerate(self.draws):
+            for tier in PRIZE_TIERS:
+                for number in draw.numbers.get(tier.key, ()):
+                    self.full[number].append((position, tier.key))
+            for tier_key, index in (("front3", self.front3), ("back3", self.back3), ("back2", self.back2)):
+                for number in draw.numbers.get(tier_key, ()):
+                    index[number].append((position, tier_key))
+        # ใช้ .get ตอนตรวจ จะได้ไม่สร้าง key ว่างเพิ่ม
+        self.full, self.front3, self.back3, self.back2 = (
+            dict(self.full), dict(self.front3), dict(self.back3), dict(self.back2)
+        )
+
+    def __len__(self) -> int:
+        return len(self.draws)
+
+    def hits(self, ticket: int) -> List[Hit]:
+        empty: List[Hit] = []
+        return (
+            self.full.get(ticket, empty)
+            + self.front3.get(ticket // 1000, empty)
+            + self.back3.get(ticket % 1000, empty)
+            + self.back2.get(ticket % 100, empty)
+        )
+
+    def check(self, ticket: str, last_draws: Optional[int] = None) -> List[Win]:
+        """ รางวัลทั้งหมดที่สลากใบนี้ถูกใน last_draws งวดล่าสุด (None = ทุกงวดที่มี) """
+        limit = len(self.draws) if last_draws is None else last_draws
+        hits = [(position, tier) for position, tier in self.hits(int(ticket)) if position < limit]
+        # งวดใหม่ก่อน ในงวดเดียวกันรางวัลใหญ่ก่อน
+        hits.sort(key=lambda hit: (hit[0], -self.draws[hit[0]].reward(hit[1])))
+        return [Win(self.draws[position], tier, self.draws[position].reward(tier)) for position, tier in hits]
+
+    def check_many(self, tickets: List[str], last_draws: Optional[int] = None) -> Dict[str, List[Win]]:
+        return {ticket: self.check(ticket, last_draws) for ticket in tickets}
+
+
+DRAW_COUNT_PATTERN = re.compile(r"(?<!\d)(\d{1,2})\s*งวด")
+ALL_DRAWS_PATTERN = re.compile(r"ทุกงวด|ย้อนหลังทั้งหมด")
+
+
+def parse_draw_count(text: str, all_draws: int) -> int:
+    """ "ย้อนหลัง 6 งวด" → 6, "ทุกงวด" → all_draws, ไม่บอก → งวดล่าสุดงวดเดียว """
+    if ALL_DRAWS_PATTERN.search(text):
+        return all_draws
+    match = DRAW_COUNT_PATTERN.search(text)
+    if match:
+        return max(1, min(all_draws, int(match.group(1))))
+    return 1
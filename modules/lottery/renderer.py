@@ -0,0 +1,38 @@
+from typing import Dict, List
+
+from modules.lottery.draws import TIERS
+from modules.lottery.index import Win
+
+# ✅ สรุปผลตรวจสลากเป็นข้อความ Discord (ไม่ผ่าน GPT)
+
+MAX_LOSING_LISTED = 20
+
+
+def render_check(results: Dict[str, List[Win]], draws_checked: List[str]) -> str:
+    if not draws_checked:
+        return "❌ พี่หลามยังไม่มีผลสลากให้ตรวจตอนนี้ ลองใหม่อีกทีนะ"
+
+    if len(draws_checked) == 1:
+        header = f"🎫 ตรวจสลาก {len(results)} ใบ งวด {draws_checked[0]}"
+    else:
+        header = f"🎫 ตรวจสลาก {len(results)} ใบ ย้อนหลัง {len(draws_checked)} งวด ({draws_checked[-1]} – {draws_checked[0]})"
+    lines = [header]
+
+    total = 0
+    losing = []
+    for ticket, wins in results.items():
+        if not wins:
+            losing.append(ticket)
+            continue
+        for win in wins:
+            total += win.reward
+            when = f" (งวด {win.draw.date})" if len(draws_checked) > 1 else ""
+            lines.append(f"🎉 {ticket} ถูก{TIERS[win.tier].label} {win.reward:,} บาท{when}")
+
+    if losing:
+        shown = ", ".join(losing[:MAX_LOSING_LISTED])
+        more = f" และอีก {len(losing) - MAX_LOSING_LISTED} ใบ" if len(losing) > MAX_LOSING_LISTED else ""
+        lines.append(f"😢 ไม่ถูกรางวัล: {shown}{more}")
+    if total:
+        lines.append(f"💰 รวม {total:,} บาท")
+    return "\n".join(lines)
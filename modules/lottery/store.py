@@ -0,0 +1,133 @@
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+import httpx
+from redis.asyncio import Redis
+
+from modules.core.app_context import get_context
+from modules.core.logger import logger
+from modules.lottery.draws import MAX_DRAWS, Draw, latest_draws, parse_draw
+from modules.lottery.index import LotteryIndex
+
+# ✅ ผลสลากย้อนหลังเก็บในเครื่อง (+ Redis hash lotto:draws ให้ทุก shard ใช้ชุดเดียวกัน)
+#    ดึงจาก API เฉพาะงวดที่ยังไม่มี และไม่เกินทุก SYNC_INTERVAL วินาที
+
+API_BASE = "https://lotto.api.rayriffy.com"
+REDIS_KEY = "lotto:draws"
+SYNC_INTERVAL = 600
+MAX_LIST_PAGES = 5
+FETCH_CONCURRENCY = 4
+
+
+class DrawStore:
+    def __init__(self, max_draws: int = MAX_DRAWS):
+        self.max_draws = max_draws
+        self._draws: Dict[str, Draw] = {}
+        self._index: Optional[LotteryIndex] = None
+        self._loaded = False
+        self._synced_at = float("-inf")
+        self._lock: Optional[asyncio.Lock] = None
+
+    def __len__(self) -> int:
+        return len(self._draws)
+
+    @property
+    def index(self) -> LotteryIndex:
+        if self._index is None:
+            self._index = LotteryIndex(list(self._draws.values()))
+        return self._index
+
+    def add(self, draws: List[Draw]) -> List[Draw]:
+        """ เพิ่ม/แทนที่งวด คืนงวดที่เปลี่ยนจริง (เก็บแค่ max_draws งวดล่าสุด) """
+        changed = [draw for draw in draws if self._draws.get(draw.id) != draw]
+        if not changed:
+            return []
+        for draw in changed:
+            self._draws[draw.id] = draw
+        kept = latest_draws(list(self._draws.values()))[: self.max_draws]
+        self._draws = {draw.id: draw for draw in kept}
+        self._index = None
+        return [draw for draw in changed if draw.id in self._draws]
+
+    async def load(self, redis_instance: Optional[Redis]) -> None:
+        if redis_instance is None:
+            return
+        raw = await redis_instance.hgetall(REDIS_KEY)
+        draws = []
+        for draw_id, value in (raw or {}).items():
+            try:
+                draws.append(Draw.from_compact(value))
+            except (ValueError, KeyError) as e:
+                logger.warning("⚠️ ข้อมูลงวด %s ใน Redis เสีย: %s", draw_id, e)
+        self.add(draws)
+
+    async def save(self, redis_instance: Optional[Redis], draws: List[Draw]) -> None:
+        if redis_instance is None or not draws:
+            return
+        await redis_instance.hset(REDIS_KEY, mapping={draw.id: draw.to_compact() for draw in draws})
+
+    async def _list_ids(self, client: httpx.AsyncClient, count: int) -> List[str]:
+        ids: List[str] = []
+        for page in range(1, MAX_LIST_PAGES + 1):
+            response = await client.get(f"{API_BASE}/list/{page}", timeout=10)
+            response.raise_for_status()
+            entries = response.json().get("response") or []
+            ids.extend(str(entry["id"]) for entry in entries if entry.get("id"))
+            if len(ids) >= count or not entries:
+                break
+        return ids[:count]
+
+    async def _fetch(self, client: httpx.AsyncClient, draw_id: str, semaphore: asyncio.Semaphore) -> Optional[Draw]:
+        async with semaphore:
+            try:
+                response = await client.get(f"{API_BASE}/lotto/{draw_id}", timeout=10)
+                response.raise_for_status()
+                return parse_draw(response.json()["response"], draw_id)
+            except Exception as e:
+                logger.warning("⚠️ ดึงผลสลากงวด %s ไม่ได้: %s", draw_id, e)
+                return None
+
+    async def sync(self, redis_instance: Optional[Redis], count: int, client: Optional[httpx.AsyncClient] = None) -> int:
+        """ ดึงงวดที่ยังไม่มีใน count งวดล่าสุด คืนจำนวนงวดที่ได้เพิ่ม """
+        client = client or get_context().http
+        await self.load(redis_instance)
+        missing = [draw_id for draw_id in await self._list_ids(client, count) if draw_id not in self._draws]
+        semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+        fetched = await asyncio.gather(*(self._fetch(client, draw_id, semaphore) for draw_id in missing))
+        added = self.add([draw for draw in fetched if draw is not None])
+        await self.save(redis_instance, added)
+        self._synced_at = time.monotonic()
+        if added:
+            logger.info("🎫 เพิ่มผลสลาก %s งวด (มีทั้งหมด %s งวด)", len(added), len(self._draws))
+        return len(added)
+
+    async def ensure(
+        self, redis_instance: Optional[Redis], count: int = 1, client: Optional[httpx.AsyncClient] = None
+    ) -> LotteryIndex:
+        """ index ที่มีอย่างน้อย count งวดล่าสุด (ถ้า API ล่มก็ใช้เท่าที่มี) """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self._loaded:
+                try:
+                    await self.load(redis_instance)
+                except Exception as e:
+                    logger.warning("⚠️ โหลดผลสลากจาก Redis ไม่ได้: %s", e)
+                self._loaded = True
+            stale = time.monotonic() - self._synced_at > SYNC_INTERVAL
+            if stale or len(self._draws) < min(count, self.max_draws):
+                try:
+                    await self.sync(redis_instance, min(max(count, 1), self.max_draws), client)
+                except Exception as e:
+                    # กันยิง API ซ้ำทุกข้อความตอน API ล่ม
+                    self._synced_at = time.monotonic() - SYNC_INTERVAL + 60
+                    logger.warning("⚠️ sync ผลสลากไม่สำเร็จ ใช้ข้อมูลเท่าที่มี: %s", e)
+        return self.index
+
+
+_store = DrawStore()
+
+
+def get_store() -> DrawStore:
+    return _store
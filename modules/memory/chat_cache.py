@@ -0,0 +1,95 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+# ✅ L1 ของความจำแชท: ประวัติล่าสุดของผู้ใช้ที่คุยอยู่ เก็บในเครื่องแบบ LRU จำกัดด้วยขนาดรวมเป็น byte
+#    (ผู้ใช้คุยยาวกินที่มากกว่า จำกัดด้วยจำนวนคนอย่างเดียวคุมหน่วยความจำไม่ได้)
+
+ENTRY_OVERHEAD = 256       # byte โดยประมาณของ object / dict ต่อผู้ใช้
+
+
+@dataclass
+class ChatEntry:
+    turns: List[dict] = field(default_factory=list)     # เก่า → ใหม่
+    sizes: List[int] = field(default_factory=list)      # byte ในหน่วยความจำโดยประมาณของแต่ละ turn
+    complete: bool = False     # True = มีทุก turn ล่าสุดที่ Redis มี (ไม่เกิน keep_turns)
+    fresh_until: float = 0.0   # หลังจากนี้ควรอ่าน Redis ใหม่ (กันพลาด invalidate)
+    expires_at: float = 0.0    # ตรงกับ TTL ของ key ใน Redis (นับจากเขียนครั้งล่าสุด)
+
+    @property
+    def size(self) -> int:
+        return ENTRY_OVERHEAD + sum(self.sizes)
+
+
+class ChatHistoryCache:
+    def __init__(self, max_bytes: int, keep_turns: int, fresh_ttl: float, expire_ttl: float):
+        self.max_bytes = max_bytes
+        self.keep_turns = keep_turns
+        self.fresh_ttl = fresh_ttl
+        self.expire_ttl = expire_ttl
+        self._entries: "OrderedDict[int, ChatEntry]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, user_id: int, allow_stale: bool = False) -> Optional[ChatEntry]:
+        """ entry ที่ยังใช้ได้ (allow_stale=True ตอน Redis ล่ม: เอาที่มีแม้เลยเวลา fresh หรือไม่ครบ) """
+        entry = self._entries.get(user_id)
+        now = time.monotonic()
+        if entry is not None and entry.expires_at < now:
+            self.invalidate(user_id)
+            entry = None
+        if entry is None or not (allow_stale or (entry.complete and entry.fresh_until >= now)):
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return entry
+
+    def put(self, user_id: int, turns: List[dict], sizes: List[int], complete: bool = True) -> ChatEntry:
+        """ แทนที่ทั้งก้อน (หลังอ่านจาก Redis) """
+        now = time.monotonic()
+        entry = ChatEntry(
+            turns[-self.keep_turns:], sizes[-self.keep_turns:], complete, now + self.fresh_ttl, now + self.expire_ttl
+        )
+        self._replace(user_id, entry)
+        return entry
+
+    def append(self, user_id: int, turn: dict, size: int, complete_if_new: bool = False) -> ChatEntry:
+        """ เพิ่ม turn ใหม่ ถ้ายังไม่มี entry จะได้ entry ที่ไม่ครบ (ยังไม่รู้ว่า Redis มีอะไรก่อนหน้า) """
+        now = time.monotonic()
+        old = self._entries.get(user_id) or ChatEntry(complete=complete_if_new, fresh_until=now + self.fresh_ttl)
+        entry = ChatEntry(
+            (old.turns + [turn])[-self.keep_turns:],
+            (old.sizes + [size])[-self.keep_turns:],
+            old.complete,
+            old.fresh_until,
+            now + self.expire_ttl,
+        )
+        self._replace(user_id, entry)
+        return entry
+
+    def _replace(self, user_id: int, entry: ChatEntry) -> None:
+        old = self._entries.pop(user_id, None)
+        if old is not None:
+            self.bytes -= old.size
+        self._entries[user_id] = entry
+        self.bytes += entry.size
+        while self.bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= evicted.size
+            self.evictions += 1
+
+    def invalidate(self, user_id: int) -> None:
+        entry = self._entries.pop(user_id, None)
+        if entry is not None:
+            self.bytes -= entry.size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.bytes = 0
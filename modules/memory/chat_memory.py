@@ -1,26 +1,224 @@
+import asyncio
+import os
 import re
-import json
-from typing import List, Optional
+import sys
+import time
+from typing import Dict, List, Optional
 from redis.asyncio import Redis
 
+from modules.core import codec
+from modules.core.logger import logger
+from modules.memory import invalidation
+from modules.memory.chat_cache import ChatEntry, ChatHistoryCache
 from modules.utils.token_counter import count_tokens  # ✅ นับ token ได้
 from modules.utils.cleaner import clean_output_text   # ✅ เก็บ raw แต่เวลาสร้าง context จะ clean เบา ๆ
 
-# ✅ เก็บแชทลง Redis (raw ไม่ clean ก่อนเก็บ)
-async def store_chat(redis_instance: Redis, user_id: int, message: dict) -> None:
-    key = f"chat:{user_id}"
-    await redis_instance.rpush(key, json.dumps(message))
-    await redis_instance.expire(key, 86400)
+# ✅ ความจำแชทสองชั้น: L1 ในเครื่อง (ผู้ใช้ที่คุยอยู่อ่านไม่ต้องวิ่งไป Redis) + Redis list chat:{user_id} (write-through)
+#    Redis ช้า/ล่ม → โหมด degraded: อ่าน/เขียนใน L1 ไปก่อน ข้อความที่เขียนไม่ได้พักไว้แล้วส่งตามเมื่อ Redis กลับมา
+#    ไม่มี Redis เลย → ใช้ L1 อย่างเดียว (process เดียว)
+#    แต่ละ turn ใน Redis เข้ารหัสด้วย modules.core.codec (บีบอัด + dictionary) ค่า JSON แบบเดิมยังอ่านได้
+
+CHAT_KEY = "chat:{user_id}"
+CHAT_TTL = 86400
+INVALIDATE_CHANNEL = "chat:invalidate"
+KEEP_TURNS = 20            # ในเครื่องเก็บกี่ turn ล่าสุดต่อคน (context ใช้ไม่เกินนี้)
+REDIS_MAX_TURNS = 200      # ตัด list ใน Redis ไม่ให้โตไม่จำกัด
+L1_MAX_BYTES = int(os.getenv("CHAT_L1_MAX_BYTES", str(32 * 1024 * 1024)))
+L1_FRESH_TTL = 600.0       # วินาที อ่าน Redis ใหม่อย่างน้อยทุกเท่านี้ (กันพลาด invalidate ตอน pub/sub หลุด)
+READ_TIMEOUT = float(os.getenv("CHAT_REDIS_TIMEOUT", "0.25"))
+WRITE_TIMEOUT = 1.0
+RETRY_AFTER = 5.0          # Redis พลาดแล้ว ไม่ลองใหม่ภายในกี่วินาที (ไม่ให้ทุกข้อความรอ timeout)
+MAX_PENDING = 50           # ข้อความค้างส่งต่อคนสูงสุดระหว่าง Redis ล่ม
+
+_cache = ChatHistoryCache(L1_MAX_BYTES, KEEP_TURNS, L1_FRESH_TTL, CHAT_TTL)
+_pending: Dict[int, List[bytes]] = {}   # user_id → turn (เข้ารหัสแล้ว) ที่ยังไม่ได้เขียนลง Redis
+_inflight: Dict[int, asyncio.Future] = {}
+_stale_loads = set()                    # user ที่มีการเขียนระหว่างกำลังโหลด (ผลโหลดไม่ครบ ไม่เก็บเข้า L1)
+_retry_at = 0.0
+_reconcile_task: Optional[asyncio.Task] = None
+
+
+def _invalidate(user_id: str) -> None:
+    if user_id.isdigit():
+        _cache.invalidate(int(user_id))
+
+
+invalidation.register(INVALIDATE_CHANNEL, _invalidate, _cache.clear)
+
+
+def get_cache() -> ChatHistoryCache:
+    return _cache
+
+
+def is_degraded() -> bool:
+    return time.monotonic() < _retry_at
+
+
+def memory_stats() -> dict:
+    return {
+        "entries": len(_cache),
+        "bytes": _cache.bytes,
+        "hits": _cache.hits,
+        "misses": _cache.misses,
+        "evictions": _cache.evictions,
+        "pending": sum(len(items) for items in _pending.values()),
+        "degraded": is_degraded(),
+    }
+
+
+def _mark_down(action: str, error: Exception) -> None:
+    global _retry_at
+    if not is_degraded():
+        logger.warning("⚠️ %sความจำแชทใน Redis ไม่ได้ (%r) ใช้ความจำในเครื่องไปก่อน %.0fs", action, error, RETRY_AFTER)
+    _retry_at = time.monotonic() + RETRY_AFTER
+
+
+def _turn_size(turn) -> int:
+    """ ขนาดในหน่วยความจำโดยประมาณ (ใช้คุมขนาด L1 ค่าใน Redis บีบอัดแล้วเล็กกว่านี้มาก) """
+    if isinstance(turn, dict):
+        return sys.getsizeof(turn) + sum(sys.getsizeof(value) for value in turn.values())
+    return sys.getsizeof(turn)
+
+
+def _parse(raw_messages: List[bytes]) -> tuple:
+    turns, sizes = [], []
+    for raw in raw_messages:
+        try:
+            turn = codec.decode_json(raw)
+        except ValueError:
+            continue
+        turns.append(turn)
+        sizes.append(_turn_size(turn))
+    return turns, sizes
+
+
+async def _load(redis_instance: Redis, user_id: int) -> ChatEntry:
+    raw_messages = await asyncio.wait_for(
+        codec.lrange_raw(redis_instance, CHAT_KEY.format(user_id=user_id), -KEEP_TURNS, -1), READ_TIMEOUT
+    )
+    # ข้อความที่ยังค้างส่ง (Redis ยังไม่มี) ต่อท้ายให้ด้วย
+    turns, sizes = _parse(list(raw_messages) + _pending.get(user_id, []))
+    if user_id in _stale_loads:
+        return ChatEntry(turns, sizes)
+    return _cache.put(user_id, turns, sizes)
+
+
+async def _read_entry(redis_instance: Optional[Redis], user_id: int) -> Optional[ChatEntry]:
+    """ ประวัติของผู้ใช้จาก L1 (ไม่มี/เก่าเกินค่อยอ่าน Redis ครั้งเดียว แม้หลาย coroutine ขอพร้อมกัน) """
+    entry = _cache.get(user_id)
+    if entry is not None:
+        return entry
+    if redis_instance is None or is_degraded():
+        return _cache.get(user_id, allow_stale=True)
+
+    pending = _inflight.get(user_id)
+    if pending is None:
+        pending = asyncio.ensure_future(_load(redis_instance, user_id))
+        _inflight[user_id] = pending
+        pending.add_done_callback(lambda _: (_inflight.pop(user_id, None), _stale_loads.discard(user_id)))
+    try:
+        entry = await asyncio.shield(pending)
+    except Exception as e:
+        _mark_down("อ่าน", e)
+        return _cache.get(user_id, allow_stale=True)
+    _schedule_reconcile(redis_instance)
+    return entry
+
+
+def _queue_pending(user_id: int, raw: bytes) -> None:
+    items = _pending.setdefault(user_id, [])
+    items.append(raw)
+    del items[:-MAX_PENDING]
+
+
+def _write(pipe, user_id: int, raw_messages: List[bytes]) -> None:
+    key = CHAT_KEY.format(user_id=user_id)
+    pipe.rpush(key, *raw_messages)
+    pipe.ltrim(key, -REDIS_MAX_TURNS, -1)
+    pipe.expire(key, CHAT_TTL)
+    pipe.publish(INVALIDATE_CHANNEL, invalidation.message_for(user_id))
+
+
+async def reconcile(redis_instance: Redis) -> int:
+    """ เขียนข้อความที่ค้างระหว่าง Redis ล่มลง Redis คืนจำนวนข้อความที่ส่งได้ """
+    if not _pending:
+        return 0
+    batch = {user_id: list(items) for user_id, items in _pending.items()}
+    pipe = redis_instance.pipeline(transaction=False)
+    for user_id, items in batch.items():
+        _write(pipe, user_id, items)
+    await asyncio.wait_for(pipe.execute(), WRITE_TIMEOUT)
+    for user_id, items in batch.items():
+        left = _pending.get(user_id, [])[len(items):]
+        if left:
+            _pending[user_id] = left
+        else:
+            _pending.pop(user_id, None)
+    count = sum(len(items) for items in batch.values())
+    logger.info("🔁 เขียนแชทที่ค้าง %s ข้อความ (%s คน) ลง Redis แล้ว", count, len(batch))
+    return count
+
+
+def _schedule_reconcile(redis_instance: Redis) -> None:
+    global _reconcile_task
+    if not _pending or (_reconcile_task is not None and not _reconcile_task.done()):
+        return
+
+    async def run():
+        try:
+            await reconcile(redis_instance)
+        except Exception as e:
+            _mark_down("เขียนข้อความค้างของ", e)
+
+    _reconcile_task = asyncio.create_task(run())
+
+
+# ✅ เก็บแชท (raw ไม่ clean ก่อนเก็บ): L1 ทันที แล้ว write-through ลง Redis
+async def store_chat(redis_instance: Optional[Redis], user_id: int, message: dict) -> None:
+    _cache.append(user_id, message, _turn_size(message), complete_if_new=redis_instance is None)
+    if user_id in _inflight:
+        _stale_loads.add(user_id)
+    if redis_instance is None:
+        return
+    raw = codec.encode_json(message)
+    if is_degraded():
+        _queue_pending(user_id, raw)
+        return
+    if user_id in _pending:
+        # ยังมีข้อความเก่าของคนนี้ค้างส่ง: ต่อท้ายคิวแล้วส่งตามลำดับ (ห้าม RPUSH ตัวใหม่แซงตัวที่ค้าง)
+        _queue_pending(user_id, raw)
+        while user_id in _pending and not is_degraded():
+            _schedule_reconcile(redis_instance)
+            await asyncio.shield(_reconcile_task)
+        return
+
+    try:
+        pipe = redis_instance.pipeline(transaction=False)
+        _write(pipe, user_id, [raw])
+        await asyncio.wait_for(pipe.execute(), WRITE_TIMEOUT)
+    except Exception as e:
+        _mark_down("เขียน", e)
+        _queue_pending(user_id, raw)
+        return
+    _schedule_reconcile(redis_instance)
 
 # ✅ ดึงแชทย้อนหลัง
-async def get_chat_history(redis_instance: Redis, user_id: int, limit: int = 20) -> List[dict]:
-    key = f"chat:{user_id}"
-    raw_messages = await redis_instance.lrange(key, -limit, -1)
-    return [json.loads(m) for m in raw_messages]
+async def get_chat_history(redis_instance: Optional[Redis], user_id: int, limit: int = 20) -> List[dict]:
+    if limit > KEEP_TURNS and redis_instance is not None and not is_degraded():
+        # ขอย้อนหลังเกินที่ L1 เก็บ อ่าน Redis ตรง ๆ
+        try:
+            raw_messages = await asyncio.wait_for(
+                codec.lrange_raw(redis_instance, CHAT_KEY.format(user_id=user_id), -limit, -1), READ_TIMEOUT
+            )
+            return _parse(list(raw_messages))[0]
+        except Exception as e:
+            _mark_down("อ่าน", e)
+    entry = await _read_entry(redis_instance, user_id)
+    return entry.turns[-limit:] if entry else []
 
 # ✅ สร้าง context แบบ "เหมือน ChatGPT" (คุม token limit ฉลาด)
 async def build_chat_context_smart(
-    redis_instance: Redis,
+    redis_instance: Optional[Redis],
     user_id: int,
     new_input: str,
     *,
@@ -28,41 +226,42 @@ async def build_chat_context_smart(
     model: str = "gpt-4o-mini",
     max_tokens_context: int = 600,
     initial_limit: int = 6,
+    history_tokens: Optional[int] = None,
 ) -> List[dict]:
-    messages = [{"role": "system", "content": system_prompt}]
+    """
+    system + ประวัติแชทล่าสุดที่ใส่ได้ในงบ + ข้อความใหม่
+    history_tokens = งบของประวัติแชทโดยตรง (จาก context_planner) ถ้าไม่ระบุใช้ max_tokens_context - system - ข้อความใหม่
+    """
+    system = {"role": "system", "content": system_prompt}
+    user = {"role": "user", "content": new_input}
+    if history_tokens is None:
+        history_tokens = max_tokens_context - count_tokens([system, user], model=model)
+    if initial_limit <= 0 or history_tokens <= 0:
+        return [system, user]
+
     history = await get_chat_history(redis_instance, user_id, limit=initial_limit)
 
-    for entry in history:
+    # เก็บคู่ถาม-ตอบจากใหม่ไปเก่าจนเต็มงบ (นับ token ทีละคู่ครั้งเดียว)
+    kept: List[dict] = []
+    used = 0
+    for entry in reversed(history):
         q = entry.get("question")
         r = entry.get("response")
-        if q and r:
-            messages.append({"role": "user", "content": q})
-            messages.append({"role": "assistant", "content": r})
-
-    messages.append({"role": "user", "content": new_input})
-
-    # ตัด context ถ้า token เกิน (ลบเป็นคู่ เพื่อรักษาคู่คำถาม-ตอบ)
-    while True:
-        token_used = count_tokens(messages, model=model)
-        if token_used <= max_tokens_context or len(messages) <= 3:
-            break
-        if len(messages) > 3:
-            messages.pop(1)  # ลบ user เก่า
-            messages.pop(1)  # ลบ assistant เก่า
-        else:
+        if not (q and r):
+            continue
+        pair = [{"role": "user", "content": q}, {"role": "assistant", "content": r}]
+        cost = count_tokens(pair, model=model) - 3
+        if used + cost > history_tokens:
             break
+        kept = pair + kept
+        used += cost
 
-    return messages
+    return [system] + kept + [user]
 
 # ✅ ดึงข้อความล่าสุด
-async def get_previous_message(redis_instance: Redis, user_id: int) -> Optional[str]:
-    key = f"chat:{user_id}"
-    raw_messages = await redis_instance.lrange(key, -1, -1)
-    if not raw_messages:
-        return None
-
-    try:
-        last = json.loads(raw_messages[0])
-        return last.get("question")
-    except Exception:
+async def get_previous_message(redis_instance: Optional[Redis], user_id: int) -> Optional[str]:
+    entry = await _read_entry(redis_instance, user_id)
+    if not entry or not entry.turns:
         return None
+    last = entry.turns[-1]
+    return last.get("question") if isinstance(last, dict) else None
@@ -0,0 +1,167 @@
+import hashlib
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from modules.nlp.message_matcher import is_weather_question
+from modules.utils.query_utils import is_about_bot, is_greeting
+from modules.utils.token_counter import count_text_tokens, truncate_to_tokens
+
+# ✅ วางแผน context ต่อประเภทข้อความ: ควรพกประวัติแชทกี่คู่ / ใส่ข้อมูลเสริม (ผลค้นเว็บ, อากาศ, คำถามก่อนหน้า) ได้กี่ token
+#    ข้อมูลเสริมทุกก้อนแชร์งบเดียวกัน ตามลำดับความสำคัญ งบที่เหลือยกให้ประวัติแชท
+
+
+@dataclass(frozen=True)
+class ContextBudget:
+    history_turns: int         # จำนวนคู่ถาม-ตอบย้อนหลังที่ดึงมาพิจารณา
+    history_tokens: int        # งบ token ของประวัติแชท
+    injected_tokens: int       # งบ token รวมของข้อมูลเสริมทุกก้อน
+    include_previous: bool     # แนบคำถามก่อนหน้าไหม
+    search: bool               # ควรถามโมเดลว่าต้องค้นเว็บไหม
+
+
+BUDGETS = {
+    "greeting": ContextBudget(history_turns=0, history_tokens=0, injected_tokens=0, include_previous=False, search=False),
+    "about_bot": ContextBudget(history_turns=1, history_tokens=120, injected_tokens=0, include_previous=False, search=False),
+    "followup": ContextBudget(history_turns=6, history_tokens=500, injected_tokens=500, include_previous=True, search=True),
+    "weather": ContextBudget(history_turns=2, history_tokens=200, injected_tokens=350, include_previous=False, search=False),
+    "chat": ContextBudget(history_turns=4, history_tokens=350, injected_tokens=600, include_previous=False, search=True),
+}
+
+# คำที่บอกว่าเป็นคำถามต่อเนื่องจากเรื่องเดิม
+FOLLOWUP_HINTS = re.compile(
+    r"^(แล้ว|ต่อ|และ|ส่วน|งั้น|ถ้างั้น|อันนั้น|อันนี้|ที่ว่า|เมื่อกี้|มัน|เขา|ข้อ\s*\d|and\b|what about|how about)"
+    r"|(เมื่อกี้|ที่พูดมา|ที่บอก|อันเมื่อกี้|ต่อจากนี้|เพิ่มเติม|อธิบายต่อ|ขยายความ)",
+    re.IGNORECASE,
+)
+SHORT_FOLLOWUP_CHARS = 12
+
+
+@dataclass
+class ContextBlock:
+    name: str
+    text: str = ""
+    items: List[str] = field(default_factory=list)   # ถ้ามี จะใส่ทีละรายการจนเต็มงบ (เช่นผลค้นเว็บ)
+    tokens: int = 0
+    truncated: bool = False
+
+
+@dataclass
+class ContextPlan:
+    message_class: str
+    budget: ContextBudget
+    blocks: List[ContextBlock] = field(default_factory=list)
+    injected_used: int = 0
+
+    @property
+    def history_tokens(self) -> int:
+        # งบข้อมูลเสริมที่ไม่ได้ใช้ ยกให้ประวัติแชท
+        return self.budget.history_tokens + max(0, self.budget.injected_tokens - self.injected_used)
+
+
+def is_followup(text: str, previous_question: Optional[str]) -> bool:
+    if not previous_question:
+        return False
+    stripped = text.strip()
+    return bool(FOLLOWUP_HINTS.search(stripped)) or len(stripped) <= SHORT_FOLLOWUP_CHARS
+
+
+def classify_message(text: str, previous_question: Optional[str] = None) -> str:
+    if is_greeting(text) and len(text) <= 40:
+        return "greeting"
+    if is_about_bot(text):
+        return "about_bot"
+    if is_followup(text, previous_question):
+        return "followup"
+    if is_weather_question(text):
+        return "weather"
+    return "chat"
+
+
+def plan_context(text: str, previous_question: Optional[str] = None) -> ContextPlan:
+    message_class = classify_message(text, previous_question)
+    return ContextPlan(message_class, BUDGETS[message_class])
+
+
+def pack_search_results(results: List[str], max_tokens: int, model: str = "gpt-4o-mini") -> str:
+    """ เอาทีละรายการจนเต็มงบ (ไม่ตัดกลางรายการ ยกเว้นรายการแรกที่ยาวเกินงบเอง) """
+    lines, used = [], 0
+    for result in results:
+        tokens = count_text_tokens(result, model) + 1
+        if used + tokens > max_tokens:
+            if not lines:
+                lines.append(truncate_to_tokens(result, max_tokens, model))
+            break
+        lines.append(result)
+        used += tokens
+    return "\n".join(lines)
+
+
+def pack_blocks(plan: ContextPlan, blocks: List[ContextBlock], model: str = "gpt-4o-mini") -> List[ContextBlock]:
+    """
+    ใส่ข้อมูลเสริมตามลำดับที่ส่งมา (สำคัญสุดก่อน) ให้รวมกันไม่เกินงบ injected_tokens
+    ก้อนที่ล้นจะถูกตัดให้พอดีงบที่เหลือ ถ้าเหลือน้อยเกินไปก็ทิ้งไปเลย
+    """
+    remaining = plan.budget.injected_tokens
+    packed = []
+    for block in blocks:
+        if remaining <= 0:
+            break
+        if block.items:
+            block.text = pack_search_results(block.items, remaining, model)
+            block.truncated = block.text != "\n".join(block.items)
+        if not block.text:
+            continue
+        tokens = count_text_tokens(block.text, model)
+        if tokens > remaining:
+            if remaining < 24:
+                continue
+            block.text = truncate_to_tokens(block.text, remaining, model)
+            block.truncated = True
+            tokens = count_text_tokens(block.text, model)
+        block.tokens = tokens
+        remaining -= tokens
+        packed.append(block)
+    plan.blocks = packed
+    plan.injected_used = plan.budget.injected_tokens - remaining
+    return packed
+
+
+def drop_repeated_previous(plan: ContextPlan, history: List[Dict[str, str]]) -> bool:
+    """ ตัดก้อน "คำถามก่อนหน้า" ทิ้งถ้าประวัติแชทที่ใส่ไปมีคำถามนั้นอยู่แล้ว (คืน True ถ้าตัด) """
+    previous = next((b for b in plan.blocks if b.name == "previous"), None)
+    if previous is None or previous.truncated:
+        return False
+    if not any(m["role"] == "user" and m["content"] == previous.text for m in history):
+        return False
+    plan.blocks.remove(previous)
+    plan.injected_used -= previous.tokens
+    return True
+
+
+def prompt_cache_key(scope: str, system_prompt: str, user_id: int) -> str:
+    """
+    key คงที่ต่อ (system prompt, ผู้ใช้): request ที่ขึ้นต้นเหมือนกัน (persona + ประวัติแชทของคนเดียวกัน)
+    ถูกส่งไปเครื่องเดียวกันฝั่ง OpenAI จะได้ใช้ prompt cache ซ้ำ เปลี่ยน persona เมื่อไหร่ key ก็เปลี่ยนตาม
+    """
+    digest = hashlib.sha1(system_prompt.encode("utf-8")).hexdigest()[:8]
+    return f"pheelarm:{scope}:{digest}:{user_id}"
+
+
+def render_user_message(question: str, blocks: List[ContextBlock], footer: str = "") -> str:
+    """
+    ข้อมูลเสริม + คำถาม + footer (เวลา / ความยาวคำตอบ) ทุกอย่างที่เปลี่ยนทุกข้อความอยู่ในข้อความ user สุดท้าย
+    ส่วนหน้า (system + ประวัติแชท) จะได้เหมือนเดิมทุก byte และใช้ prompt cache ได้
+    """
+    parts = []
+    for block in blocks:
+        if block.name == "previous":
+            parts.append(f"ต่อจากที่ก่อนหน้านี้ถามว่า: \"{block.text}\"")
+        elif block.name == "search":
+            parts.append(f"ข้อมูลจากการค้นหาเว็บ:\n{block.text}")
+        elif block.name == "weather":
+            parts.append(f"🌦️ ข้อมูลสภาพอากาศ:\n{block.text}")
+        else:
+            parts.append(block.text)
+    message = "\n\n".join(parts) + f"\n\nคำถาม: {question}" if parts else question
+    return f"{message}\n\n{footer}" if footer else message
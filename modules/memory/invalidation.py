@@ -0,0 +1,71 @@
+import asyncio
+import uuid
+from typing import Callable, Dict, Optional, Tuple
+
+from redis.asyncio import Redis
+
+from modules.core.logger import logger
+
+# ✅ pub/sub กลางสำหรับ cache ในเครื่องที่ต้องลบของเก่าเมื่อ process อื่น (shard / worker) เขียนทับ
+#    แต่ละ cache ลงทะเบียน channel ของตัวเอง ข้อความคือ "<PROCESS_ID>:<key>" (ข้อความของตัวเองไม่ต้องลบ)
+
+PROCESS_ID = uuid.uuid4().hex[:12]
+LISTENER_RETRY = 5.0
+
+# channel → (ลบ key เดียว, ล้างทั้งหมดตอนต่อใหม่เพราะอาจพลาดข้อความไประหว่างหลุด)
+_channels: Dict[str, Tuple[Callable[[str], None], Callable[[], None]]] = {}
+_listener: Optional[asyncio.Task] = None
+
+
+def register(channel: str, invalidate: Callable[[str], None], reset: Callable[[], None]) -> None:
+    _channels[channel] = (invalidate, reset)
+
+
+def message_for(key) -> str:
+    """ payload ที่ publish (ใส่ใน pipeline เดียวกับการเขียนได้: pipe.publish(channel, message_for(key))) """
+    return f"{PROCESS_ID}:{key}"
+
+
+async def _listen(redis_instance: Redis) -> None:
+    while True:
+        pubsub = redis_instance.pubsub()
+        try:
+            await pubsub.subscribe(*_channels)
+            for _, reset in _channels.values():
+                reset()
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                handlers = _channels.get(str(message.get("channel")))
+                origin, _, key = str(message["data"]).partition(":")
+                if handlers and origin != PROCESS_ID:
+                    handlers[0](key)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("⚠️ cache invalidation หลุด จะลองใหม่: %s", e)
+            await asyncio.sleep(LISTENER_RETRY)
+        finally:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+
+def start_invalidation_listener(redis_instance: Optional[Redis]) -> None:
+    global _listener
+    if redis_instance is None or not _channels or (_listener is not None and not _listener.done()):
+        return
+    _listener = asyncio.create_task(_listen(redis_instance))
+
+
+async def stop_invalidation_listener() -> None:
+    global _listener
+    if _listener is None:
+        return
+    _listener.cancel()
+    try:
+        await _listener
+    except (asyncio.CancelledError, Exception):
+        pass
+    _listener = None
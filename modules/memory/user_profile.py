@@ -0,0 +1,182 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import tzinfo
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import pytz
+from redis.asyncio import Redis
+
+from modules.core.logger import logger
+from modules.memory import invalidation
+
+# ✅ ค่าตั้งต่อผู้ใช้ (timezone, โทนที่ชอบ, ความยาวคำตอบ) เก็บใน Redis hash profile:{user_id}
+#    อ่านผ่าน LRU ในเครื่อง (มี TTL) ข้อความปกติจึงไม่ต้องวิ่งไป Redis เลย
+#    เขียนเมื่อไหร่ประกาศผ่าน pub/sub ให้ทุก process (shard / worker) ลบของเก่าทิ้ง
+
+DEFAULT_TIMEZONE = "Asia/Bangkok"
+PROFILE_KEY = "profile:{user_id}"
+LEGACY_TIMEZONE_KEY = "timezone:{user_id}"
+LEGACY_REPLY_SCALE_KEY = "reply_len:{user_id}"
+PROFILE_TTL = 90 * 86400
+INVALIDATE_CHANNEL = "profile:invalidate"
+
+CACHE_SIZE = 10_000
+CACHE_TTL = 300.0          # วินาที กันกรณีพลาดข้อความ invalidate (เช่น pub/sub หลุด)
+
+
+@dataclass(frozen=True)
+class UserProfile:
+    timezone: str = DEFAULT_TIMEZONE
+    tone: Optional[str] = None
+    reply_scale: float = 1.0
+
+    @property
+    def tzinfo(self) -> tzinfo:
+        return get_tzinfo(self.timezone)
+
+
+DEFAULT_PROFILE = UserProfile()
+_FIELDS = {"timezone": str, "tone": str, "reply_scale": float}
+
+
+@lru_cache(maxsize=512)
+def get_tzinfo(name: str) -> tzinfo:
+    """ pytz.timezone() ครั้งเดียวต่อชื่อ ชื่อผิดใช้เวลาไทย """
+    try:
+        return pytz.timezone(name)
+    except pytz.UnknownTimeZoneError:
+        logger.warning("⚠️ ไม่รู้จัก timezone %r ใช้ %s แทน", name, DEFAULT_TIMEZONE)
+        return pytz.timezone(DEFAULT_TIMEZONE)
+
+
+def _parse(raw: dict) -> UserProfile:
+    values = {}
+    for name, cast in _FIELDS.items():
+        if raw.get(name) not in (None, ""):
+            try:
+                values[name] = cast(raw[name])
+            except ValueError:
+                logger.warning("⚠️ profile field %s=%r ใช้ไม่ได้", name, raw[name])
+    return replace(DEFAULT_PROFILE, **values)
+
+
+class UserProfileCache:
+    """ LRU + TTL ในเครื่อง: user_id → (UserProfile, หมดอายุเมื่อ) """
+
+    def __init__(self, max_size: int = CACHE_SIZE, ttl: float = CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, Tuple[UserProfile, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> Optional[UserProfile]:
+        entry = self._entries.get(user_id)
+        if entry is None or entry[1] < time.monotonic():
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, user_id: int, profile: UserProfile) -> None:
+        self._entries[user_id] = (profile, time.monotonic() + self.ttl)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache = UserProfileCache()
+_inflight: dict = {}
+
+
+def _invalidate(user_id: str) -> None:
+    if user_id.isdigit():
+        _cache.invalidate(int(user_id))
+
+
+invalidation.register(INVALIDATE_CHANNEL, _invalidate, _cache.clear)
+
+
+def get_cache() -> UserProfileCache:
+    return _cache
+
+
+async def _load(redis_instance: Redis, user_id: int) -> UserProfile:
+    # hash ใหม่ + key เดิมก่อนมี profile (timezone:{id}, reply_len:{id}) ใน round trip เดียว
+    pipe = redis_instance.pipeline(transaction=False)
+    pipe.hgetall(PROFILE_KEY.format(user_id=user_id))
+    pipe.get(LEGACY_TIMEZONE_KEY.format(user_id=user_id))
+    pipe.get(LEGACY_REPLY_SCALE_KEY.format(user_id=user_id))
+    raw, legacy_tz, legacy_scale = await pipe.execute()
+    raw = dict(raw or {})
+    if legacy_tz and "timezone" not in raw:
+        raw["timezone"] = legacy_tz
+    if legacy_scale and "reply_scale" not in raw:
+        raw["reply_scale"] = legacy_scale
+    return _parse(raw)
+
+
+async def get_profile(redis_instance: Optional[Redis], user_id: int) -> UserProfile:
+    """ profile ของผู้ใช้จาก cache ในเครื่อง (ไม่มีค่อยอ่าน Redis ครั้งเดียว แม้หลาย coroutine ขอพร้อมกัน) """
+    profile = _cache.get(user_id)
+    if profile is not None:
+        return profile
+    if redis_instance is None:
+        return DEFAULT_PROFILE
+
+    pending = _inflight.get(user_id)
+    if pending is None:
+        pending = asyncio.ensure_future(_load(redis_instance, user_id))
+        _inflight[user_id] = pending
+        pending.add_done_callback(lambda _: _inflight.pop(user_id, None))
+    try:
+        profile = await asyncio.shield(pending)
+    except Exception as e:
+        logger.warning("⚠️ อ่าน profile ของ %s ไม่ได้: %s", user_id, e)
+        return DEFAULT_PROFILE
+    _cache.put(user_id, profile)
+    return profile
+
+
+async def update_profile(redis_instance: Optional[Redis], user_id: int, **changes) -> UserProfile:
+    """ แก้ค่าบาง field แล้วบอกทุก process ให้ลบ cache ของผู้ใช้คนนี้ """
+    unknown = set(changes) - set(_FIELDS)
+    if unknown:
+        raise ValueError(f"unknown profile fields: {', '.join(sorted(unknown))}")
+    if "timezone" in changes:
+        changes["timezone"] = get_tzinfo(changes["timezone"]).zone
+
+    profile = replace(await get_profile(redis_instance, user_id), **changes)
+    _cache.put(user_id, profile)
+    if redis_instance is None:
+        return profile
+
+    key = PROFILE_KEY.format(user_id=user_id)
+    mapping = {name: value for name, value in changes.items() if value is not None}
+    removed = [name for name, value in changes.items() if value is None]
+    try:
+        pipe = redis_instance.pipeline(transaction=True)
+        if mapping:
+            pipe.hset(key, mapping=mapping)
+        if removed:
+            pipe.hdel(key, *removed)
+        pipe.expire(key, PROFILE_TTL)
+        pipe.publish(INVALIDATE_CHANNEL, invalidation.message_for(user_id))
+        await pipe.execute()
+    except Exception as e:
+        _cache.invalidate(user_id)
+        logger.warning("⚠️ บันทึก profile ของ %s ไม่ได้: %s", user_id, e)
+    return profile
@@ -1,6 +1,29 @@
 import re
 from typing import Optional, Dict, List
-from modules.core.logger import logger
+from modules.core.logger import logger, sample
+
+# ✅ คำถามอากาศต้องมีเจตนาถามอากาศจริง ไม่ใช่แค่มีคำว่า "อากาศ" / "ฟ้า" อยู่ในประโยค
+#    (ค่าไฟฟ้า, สีฟ้า, กองทัพอากาศ, ท่าอากาศยาน, เครื่องปรับอากาศ ไม่ใช่คำถามอากาศ)
+WEATHER_PATTERNS = [
+    r"สภาพอากาศ",
+    r"พยากรณ์อากาศ",
+    r"(?<!กองทัพ)(?<!ทาง)(?<!ปรับ)อากาศ(?!ยาน).{0,30}?(วันนี้|พรุ่งนี้|ตอนนี้|ช่วงนี้|เป็นไง|เป็นยังไง|ยังไง|ร้อน|หนาว|เย็น|ดีไหม)",
+    r"ฝน(จะ)?ตก",
+    r"อุณหภูมิ(?!ร่างกาย)",
+    r"ฟ้า(ร้อง|ผ่า|มืด|ครึ้ม|หลัว)",
+    r"\bweather\b",
+]
+WEATHER_INTENT = re.compile("|".join(WEATHER_PATTERNS), re.IGNORECASE)
+
+# ✅ ต่อท้ายชื่อสินค้าเมื่อถามแนวโน้ม: ต้องเป็นวลีราคาจริง ("ทองขึ้นไหม", "น้ำมันลงอีกแล้ว", "ทอง 30 วัน")
+#    ไม่ใช่แค่มีคำว่า ขึ้น / ลง ตามหลัง ("ไปทองหล่อลงสถานีไหน", "ใส่น้ำมันลงกระทะ")
+TREND_SUFFIX = (
+    r"\s*((ขึ้น|ลง)\s*(หรือ|ไหม|มั้ย|อีก|แล้ว|เยอะ|กี่|\d)"
+    r"|แนวโน้ม|ย้อนหลัง|\d+\s*วัน|(เดือน|สัปดาห์|อาทิตย์|ปี)(นี้|ที่แล้ว|ก่อน))"
+)
+
+# ✅ จำนวนเงินต้องติดกับสกุลเงิน ("100 ดอลลาร์", "2 แสนวอน") ตัวเลขที่อยู่ห่างออกไป ("ปี 2024 เกาหลีใช้เงินวอน") ไม่นับ
+CURRENCY_WORDS = r"(ดอลลาร์|ดอลล่าร์|ยูโร|เยน|หยวน|ปอนด์|วอน|ริงกิต|usd|eur|jpy|cny|gbp|krw|dollars?|euros?|yen|yuan)"
 
 # 🔍 รวม pattern ที่ compile แล้วสำหรับการ match หัวข้อ
 TOPIC_PATTERNS: Dict[str, List[re.Pattern]] = {
@@ -8,41 +31,44 @@ TOPIC_PATTERNS: Dict[str, List[re.Pattern]] = {
     for topic, patterns in {
         "oil": [
             r"ราคาน้ำมัน",
-            r"น้ำมัน.*วันนี้",
-            r"น้ำมันเท่าไหร่",
-            r"ตอนนี้.*น้ำมัน",
+            r"น้ำมัน\s*(วันนี้|ตอนนี้|ล่าสุด|เท่าไหร่|ลิตรละ)",
             r"เบนซิน",
-            r"ดีเซล"
+            r"ดีเซล",
+            rf"น้ำมัน{TREND_SUFFIX}",
+            r"แนวโน้ม(ราคา)?น้ำมัน"
         ],
         "gold": [
             r"ราคาทอง",
-            r"ทอง.*วันนี้",
-            r"ทองขึ้น",
-            r"ทองลง",
+            r"ทอง(คำ)?\s*(วันนี้|ตอนนี้|ล่าสุด)",
             r"ทองคำแท่ง",
-            r"gold"
+            rf"ทอง(คำ|รูปพรรณ)?{TREND_SUFFIX}",
+            r"แนวโน้ม(ราคา)?ทอง",
+            r"\bgold\b"
         ],
         "lotto": [
             r"(ตรวจ(ผล)?(หวย|สลากกินแบ่ง))",
             r"(หวย|สลากกินแบ่ง).*(งวด|วันนี้|ล่าสุด|ออก.*อะไร)",
             r"(เลข(เด็ด|ออก|ดัง))",
             r"(ผลหวย|ผลสลาก)",
+            r"(?<!\d)\d{6}(?!\d).*(ถูก|รางวัล|หวย|สลาก)",
+            r"(ถูก|รางวัล|หวย|สลาก).*(?<!\d)\d{6}(?!\d)",
         ],
         "exchange": [
             r"แลกเงิน",
             r"อัตราแลกเปลี่ยน",
             r"ค่าเงิน",
             r"เรทเงิน",
+            rf"(ดอลลาร์|ยูโร|เยน|หยวน){TREND_SUFFIX}",
+            rf"\d[\d,.]*\s*(k|พัน|หมื่น|แสน|ล้าน)?\s*{CURRENCY_WORDS}",
+            r"[$€£¥₩]\s*\d.*(เป็น|กี่|เทียบ|to\b|in\b)",
+            r"(ดอลลาร์|ยูโร|เยน|หยวน|ปอนด์|วอน|usd|eur|jpy|cny|gbp).*(กี่บาท|เป็นบาท|เป็นเงินไทย|thb|baht)",
+            r"\b(usd|eur|jpy|cny|gbp|krw)\s*\d",
+            r"[$€£¥₩]\s*\d.*(บาท|thb|baht)",
+            r"\d.*(บาท|thb|baht).*(เป็น|กี่|เทียบ|to|in)\s*(ดอลลาร์|ยูโร|เยน|หยวน|ปอนด์|วอน|usd|eur|jpy|cny|gbp|krw)",
+            r"(แปลงเงิน|แปลงค่าเงิน|convert)",
             r"exchange"
         ],
-        "weather": [
-            r"อากาศ",
-            r"พยากรณ์อากาศ",
-            r"ฝนตก",
-            r"อุณหภูมิ",
-            r"ฟ้า",
-            r"weather"
-        ],
+        "weather": WEATHER_PATTERNS,
         "global_news": [
             r"ข่าวต่างประเทศ",
             r"ข่าวจากต่างประเทศ",
@@ -66,20 +92,26 @@ TOPIC_PATTERNS: Dict[str, List[re.Pattern]] = {
             r"ไพ่ทาโร่",
             r"ดูไพ่",
             r"ดูไพ่ยิปซี",
-            r"ดูไพ่ทาโร่"
+            r"ดูไพ่ทาโร่",
+            r"ไพ่ประจำวัน",
+            r"เซลติกครอส",
+            r"celtic cross"
         ]
     }.items()
 }
 
+def is_weather_question(text: str) -> bool:
+    return bool(WEATHER_INTENT.search(text))
+
 # ✅ ฟังก์ชันจับหัวข้อจากข้อความ
 def match_topic(text: str) -> Optional[str]:
     text = text.strip()
     for topic, patterns in TOPIC_PATTERNS.items():
         for pattern in patterns:
             if pattern.search(text):
-                logger.info(f"✅ หัวข้อที่ match: '{topic}' ด้วย pattern '{pattern.pattern}'")
+                logger.info("✅ หัวข้อที่ match: '%s' ด้วย pattern '%s'", topic, pattern.pattern, extra=sample(20))
                 return topic
-    logger.info("❌ ไม่พบหัวข้อที่ match กับข้อความ")
+    logger.info("❌ ไม่พบหัวข้อที่ match กับข้อความ", extra=sample(100))   # แชททั่วไปทุกข้อความ
     return None
 
 # ✅ DEBUG: ยืนยันว่าไฟล์โหลดสำเร็จ
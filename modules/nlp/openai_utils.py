@@ -1,6 +1,6 @@
 from typing import Optional
 from modules.core.logger import logger
-from modules.core.openai_client import client
+from modules.core.model_router import SUMMARY, complete
 from modules.utils.cleaner import clean_output_text
 
 # ✅ สรุปข้อความทั่วไปด้วย GPT
@@ -21,16 +21,17 @@ async def summarize_with_gpt(text: str) -> str:
 
     try:
         logger.info("🔮 เริ่มสรุปข้อความด้วย GPT")
-        response = await client.chat.completions.create(
-            model="gpt-4o-mini",
+        response = await complete(
+            SUMMARY,
             messages=messages,
             max_tokens=500,
-            temperature=0.7
+            temperature=0.7,
+            prompt_cache_key="pheelarm:summarize",
         )
         result = response.choices[0].message.content.strip()
         return clean_output_text(result)
     except Exception as e:
-        logger.error(f"❌ สรุปข้อความด้วย GPT ล้มเหลว: {e}")
+        logger.error("❌ สรุปข้อความด้วย GPT ล้มเหลว: %s", e)
         return "⚠️ พี่หลามสรุปไม่ได้ตอนนี้ ขออภัยจ้า"
 
 # ✅ สรุปคำทำนายไพ่ยิปซีแบบกระชับ โดยใช้ GPT
@@ -55,15 +56,46 @@ async def summarize_tarot_reading(text: str, topic: str) -> str:
     ]
 
     try:
-        logger.info(f"🔮 เริ่มสรุปคำทำนายไพ่ยิปซี หัวข้อ: '{topic}' ด้วย GPT")
-        response = await client.chat.completions.create(
-            model="gpt-4o-mini",
+        logger.info("🔮 เริ่มสรุปคำทำนายไพ่ยิปซี หัวข้อ: '%s' ด้วย GPT", topic)
+        response = await complete(
+            SUMMARY,
             messages=messages,
             max_tokens=500,
-            temperature=0.6
+            temperature=0.6,
+            prompt_cache_key="pheelarm:tarot_summary",
         )
         result = response.choices[0].message.content.strip()
         return clean_output_text(result)
     except Exception as e:
-        logger.error(f"❌ สรุปคำทำนายไพ่ยิปซีด้วย GPT ล้มเหลว: {e}")
+        logger.error("❌ สรุปคำทำนายไพ่ยิปซีด้วย GPT ล้มเหลว: %s", e)
         return "⚠️ แม่หมอขอพักแป๊บนึง ลองใหม่อีกครั้งนะลูก"
+
+# ✅ เรียบเรียงรายงานอากาศ (จาก template) ใหม่ให้เป็นภาษาพูดของพี่หลาม
+async def rephrase_weather_report(report: str, question: str) -> Optional[str]:
+    messages = [
+        {
+            "role": "system",
+            "content": (
+                "คุณคือ 'พี่หลาม' เล่าสภาพอากาศแบบเป็นกันเอง สั้น ๆ ไม่เกิน 3-4 บรรทัด "
+                "ใช้เฉพาะตัวเลขที่ให้มา ห้ามแต่งข้อมูลเพิ่ม"
+            )
+        },
+        {
+            "role": "user",
+            "content": f"คำถาม: {question}\n\nข้อมูลอากาศ:\n{report}"
+        }
+    ]
+
+    try:
+        response = await complete(
+            SUMMARY,
+            messages=messages,
+            max_tokens=250,
+            temperature=0.6,
+            prompt_cache_key="pheelarm:weather_rephrase",
+        )
+        result = response.choices[0].message.content.strip()
+        return clean_output_text(result)
+    except Exception as e:
+        logger.error("❌ เรียบเรียงรายงานอากาศด้วย GPT ล้มเหลว: %s", e)
+        return None
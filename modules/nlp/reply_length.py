@@ -0,0 +1,115 @@
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from redis.asyncio import Redis
+
+from modules.memory.user_profile import update_profile
+from modules.utils.query_utils import is_about_bot, is_greeting
+
+# ✅ นโยบายความยาวคำตอบ: เลือก max_tokens + คำสั่งเรื่องความยาวในพรอมต์ จากประเภทคำถาม ห้อง และความชอบของผู้ใช้
+#    output token คือเวลาที่ผู้ใช้รอเกือบทั้งหมด คำถามส่วนใหญ่ตอบ 2-3 ประโยคก็พอ
+
+@dataclass(frozen=True)
+class ReplyLength:
+    kind: str          # brief / normal / detailed
+    max_tokens: int
+    hint: str          # ใส่ท้ายข้อความ user สุดท้าย (ไม่ใส่ใน system prompt จะได้ไม่ทำให้ prompt cache พัง)
+
+
+BASE_TOKENS = {"brief": 150, "normal": 400, "detailed": 900}
+MIN_TOKENS = 80
+MAX_TOKENS = 1800      # เท่ากับค่า default เดิมของ get_openai_response
+
+HINTS = [
+    (200, "📏 ตอบสั้น ๆ 1-2 ประโยค"),
+    (500, "📏 ตอบกระชับ ไม่เกิน 1 ย่อหน้า"),
+    (1000, "📏 ตอบได้ละเอียดพอประมาณ ไม่เกิน 3 ย่อหน้าหรือ 6 ข้อ"),
+    (MAX_TOKENS, "📏 ตอบละเอียดได้ แต่ให้จบครบในคำตอบเดียว"),
+]
+
+DETAILED_HINTS = re.compile(
+    r"อธิบาย|ขั้นตอน|วิธี|เปรียบเทียบ|ข้อดี|ข้อเสีย|ยกตัวอย่าง|เขียนโค้ด|โค้ด|code|script|บทความ|เรียงความ"
+    r"|แผน|รายละเอียด|ทีละข้อ|ทั้งหมด|explain|step|compare|how to",
+    re.IGNORECASE,
+)
+BRIEF_QUESTION_CHARS = 25
+
+# คำที่ผู้ใช้บอกความยาวที่อยากได้ในข้อความนั้นเลย (ครั้งเดียว ไม่จำ)
+WANTS_SHORTER = re.compile(r"สั้น ?ๆ|สรุปสั้น|เอาแค่|แค่คำเดียว|tl;?dr", re.IGNORECASE)
+WANTS_LONGER = re.compile(r"ขยายความ|อธิบายต่อ|ละเอียดกว่านี้|ละเอียดขึ้น|more detail", re.IGNORECASE)
+# คำติเรื่องความยาวของคำตอบก่อนหน้า: อย่างเดียวที่ใช้เรียนรู้ความชอบ (คำทั่วไปอย่าง "เพิ่มเติม" ไม่นับ)
+TOO_LONG = re.compile(r"ยาวไป|ยาวเกิน|สั้นกว่านี้|สั้นลงหน่อย|too long", re.IGNORECASE)
+TOO_SHORT = re.compile(r"สั้นไป|สั้นเกิน|ยาวกว่านี้|ยาวขึ้นหน่อย|too short", re.IGNORECASE)
+
+# ✅ ความยาวต่อห้อง: REPLY_LENGTH_CHANNELS="1350812185001066538=short,1409151929296224386=long"
+CHANNEL_SCALES = {"short": 0.6, "normal": 1.0, "long": 1.5}
+
+# ✅ ความชอบของผู้ใช้ (เรียนรู้จากที่เขาติว่าคำตอบก่อนหน้ายาวไป/สั้นไป) เก็บเป็นตัวคูณใน profile (UserProfile.reply_scale)
+PREFERENCE_STEP = 1.25
+PREFERENCE_RANGE = (0.5, 2.0)
+
+
+def parse_channel_scales(raw: Optional[str]) -> Dict[int, float]:
+    scales = {}
+    for part in (raw or "").split(","):
+        channel, _, size = part.strip().partition("=")
+        if channel.isdigit() and size in CHANNEL_SCALES:
+            scales[int(channel)] = CHANNEL_SCALES[size]
+    return scales
+
+
+CHANNEL_LENGTH = parse_channel_scales(os.getenv("REPLY_LENGTH_CHANNELS"))
+
+
+def classify_question(text: str) -> str:
+    stripped = text.strip()
+    if DETAILED_HINTS.search(stripped):
+        return "detailed"
+    if WANTS_LONGER.search(stripped) or TOO_SHORT.search(stripped):
+        return "normal"     # "ขยายความหน่อย" / "สั้นไป" สั้นแต่อยากได้คำตอบยาว
+    if (is_greeting(stripped) and len(stripped) <= 40) or is_about_bot(stripped):
+        return "brief"
+    if len(stripped) <= BRIEF_QUESTION_CHARS:
+        return "brief"
+    return "normal"
+
+
+def length_hint(max_tokens: int) -> str:
+    for limit, hint in HINTS:
+        if max_tokens <= limit:
+            return hint
+    return HINTS[-1][1]
+
+
+def choose_reply_length(text: str, channel_id: Optional[int] = None, user_scale: float = 1.0) -> ReplyLength:
+    """ user_scale = ตัวคูณที่เรียนรู้แล้ว (รวมขั้นที่เพิ่งขยับจากคำติในข้อความนี้) คำขอครั้งเดียวคูณเพิ่มเฉพาะเมื่อไม่ใช่คำติ """
+    kind = classify_question(text)
+    scale = CHANNEL_LENGTH.get(channel_id, 1.0) * user_scale
+    if not (TOO_LONG.search(text) or TOO_SHORT.search(text)):
+        if WANTS_SHORTER.search(text):
+            scale *= 0.5
+        elif WANTS_LONGER.search(text) and kind != "detailed":
+            scale *= 2.0
+    max_tokens = max(MIN_TOKENS, min(MAX_TOKENS, round(BASE_TOKENS[kind] * scale)))
+    return ReplyLength(kind, max_tokens, length_hint(max_tokens))
+
+
+async def learn_user_preference(
+    redis_instance: Optional[Redis], user_id: int, text: str, scale: float, replied_before: bool = True
+) -> float:
+    """ ผู้ใช้ติว่าคำตอบก่อนหน้ายาวไป/สั้นไป → ขยับตัวคูณของเขาทีละขั้น คืนค่าใหม่ """
+    if not replied_before:
+        return scale
+    if TOO_LONG.search(text):
+        new_scale = scale / PREFERENCE_STEP
+    elif TOO_SHORT.search(text):
+        new_scale = scale * PREFERENCE_STEP
+    else:
+        return scale
+    low, high = PREFERENCE_RANGE
+    new_scale = round(max(low, min(high, new_scale)), 3)
+    if new_scale != scale:
+        await update_profile(redis_instance, user_id, reply_scale=new_scale)
+    return new_scale
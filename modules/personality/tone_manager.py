@@ -1,10 +1,7 @@
-import os
-from redis.asyncio import from_url
+from modules.core.app_context import get_context
 from modules.utils.cleaner import clean_output_text
 from modules.core.logger import logger
 
-redis_instance = from_url(os.getenv("REDIS_URL"), decode_responses=True)
-
 # ✅ system prompt ใหม่: สั้น กระชับ แต่คงบุคลิกพี่หลาม
 async def process_message(user_id: int, text: str) -> str:
     base_prompt = (
@@ -20,7 +17,7 @@ async def process_message(user_id: int, text: str) -> str:
 # ✅ ฟังก์ชันสร้างตาราง context (ไม่ต้องแก้)
 async def create_table():
     try:
-        async with bot.pool.acquire() as con:
+        async with get_context().db.acquire() as con:
             await con.execute("""
                 CREATE TABLE IF NOT EXISTS context (
                     id BIGINT PRIMARY KEY,
@@ -29,4 +26,4 @@ async def create_table():
             """)
             logger.info("✅ ตรวจสอบและสร้างตาราง context แล้ว")
     except Exception as e:
-        logger.error(f'เกิดข้อผิดพลาดในการสร้างตาราง: {e}')
+        logger.error("เกิดข้อผิดพลาดในการสร้างตาราง: %s", e)
@@ -1 +1 @@
-from .tarot_reading import draw_cards_and_interpret_by_topic
+# Init for package
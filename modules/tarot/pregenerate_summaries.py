@@ -0,0 +1,145 @@
+"""
+สร้างสรุปคำทำนายล่วงหน้า (offline) แล้วเขียนลง tarot_summaries.json
+    --singles     ไพ่ใบเดียวทุกใบทุกหัวข้อ (624 ชุด ครบทุกแบบ)
+    --from-redis  ชุดที่บอทเคยสร้างตอนใช้งานจริง (tarot:summary:*) ลงไฟล์ ไม่เรียก GPT ซ้ำ
+ชุด 3 ใบมี ≈ 2.43 ล้านชุด สร้างล่วงหน้าไม่คุ้ม (ดู summary_cache)
+
+ตัวอย่าง:
+    python -m modules.tarot.pregenerate_summaries --singles
+    python -m modules.tarot.pregenerate_summaries --from-redis
+"""
+import argparse
+import asyncio
+import json
+import os
+from dataclasses import replace
+from typing import Dict, List, Optional, Tuple
+
+from redis.asyncio import Redis
+
+from modules.core import codec
+from modules.core.app_context import AppContext, ResourceConfig, set_context
+from modules.core.logger import logger
+from modules.nlp.openai_utils import summarize_tarot_reading
+from modules.tarot.summary_cache import REDIS_PREFIX, SUMMARIES_PATH, combo_key
+from modules.tarot.tarot_card import TOPICS, TarotCard
+from modules.tarot.tarot_deck import get_card, get_deck
+from modules.tarot.tarot_reading import build_summary_input
+
+
+def parse_key(key: str) -> Optional[Tuple[str, List[Tuple[TarotCard, bool]]]]:
+    topic, _, raw_cards = key.partition("|")
+    cards = []
+    for part in raw_cards.split(","):
+        name, _, orientation = part.rpartition(":")
+        card = get_card(name)
+        if card is None or orientation not in ("U", "R"):
+            return None
+        cards.append((card, orientation == "R"))
+    if topic not in TOPICS or not cards:
+        return None
+    return topic, cards
+
+
+async def cached_summaries(redis_instance: Optional[Redis]) -> Dict[str, str]:
+    """ สรุปที่บอทสร้างแล้วเก็บใน Redis ระหว่างใช้งานจริง (combo key → สรุป) """
+    if redis_instance is None:
+        logger.warning("⚠️ ต่อ Redis ไม่ได้ ข้าม --from-redis")
+        return {}
+    summaries = {}
+    async for redis_key in redis_instance.scan_iter(match=f"{REDIS_PREFIX}*", count=500):
+        raw = await codec.get_raw(redis_instance, redis_key)
+        if raw is not None:
+            summaries[redis_key[len(REDIS_PREFIX):]] = codec.decode_text(raw)
+    return summaries
+
+
+def single_card_combos() -> List[str]:
+    return [
+        combo_key(topic, [(card.name, is_reversed)])
+        for topic in TOPICS
+        for card in get_deck()
+        for is_reversed in (False, True)
+    ]
+
+
+def _write(path: str, summaries: Dict[str, str]) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(summaries, f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+async def pregenerate(
+    keys: List[str], path: str, concurrency: int, known: Optional[Dict[str, str]] = None
+) -> int:
+    """ known = สรุปที่มีอยู่แล้ว (เช่นจาก Redis) รวมลงไฟล์โดยไม่เรียก GPT คืนจำนวนชุดที่เพิ่มในไฟล์ """
+    try:
+        with open(path, encoding="utf-8") as f:
+            summaries: Dict[str, str] = json.load(f)
+    except FileNotFoundError:
+        summaries = {}
+    imported = 0
+    for key, summary in (known or {}).items():
+        if key not in summaries and parse_key(key) is not None:
+            summaries[key] = summary
+            imported += 1
+    if imported:
+        logger.info("📥 รวมสรุปที่มีอยู่แล้ว %s ชุด", imported)
+
+    todo = [key for key in dict.fromkeys(keys) if key not in summaries]
+    logger.info("🔮 ต้องสร้างสรุปใหม่ %s ชุด (มีอยู่แล้ว %s)", len(todo), len(summaries))
+
+    semaphore = asyncio.Semaphore(concurrency)
+    created = 0
+
+    async def worker(key: str):
+        nonlocal created
+        parsed = parse_key(key)
+        if parsed is None:
+            logger.warning("⚠️ ข้าม key ที่อ่านไม่ออก: %s", key)
+            return
+        topic, cards = parsed
+        async with semaphore:
+            summary = await summarize_tarot_reading(build_summary_input(topic, cards), topic)
+        if summary.startswith("⚠️"):
+            return
+        summaries[key] = summary
+        created += 1
+        if created % 50 == 0:
+            _write(path, summaries)
+            logger.info("💾 บันทึกแล้ว %s/%s", created, len(todo))
+
+    await asyncio.gather(*(worker(key) for key in todo))
+    _write(path, summaries)
+    return imported + created
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="pre-generate สรุปคำทำนายไพ่ยิปซี")
+    parser.add_argument("--singles", action="store_true", help="สร้างสรุปของไพ่ใบเดียวทุกใบทุกหัวข้อ")
+    parser.add_argument("--from-redis", action="store_true", help="export สรุปที่บอทสร้างไว้ใน Redis ลงไฟล์")
+    parser.add_argument("--redis-url", default=os.getenv("REDIS_URL", "redis://localhost"))
+    parser.add_argument("--output", default=SUMMARIES_PATH)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    if not (args.singles or args.from_redis):
+        parser.error("ต้องระบุ --singles และ/หรือ --from-redis")
+
+    context = set_context(AppContext(replace(ResourceConfig.from_env(), redis_url=args.redis_url)))
+    try:
+        known: Dict[str, str] = {}
+        if args.from_redis:
+            await context.start()
+            known = await cached_summaries(context.redis)
+        keys = single_card_combos() if args.singles else []
+
+        added = await pregenerate(keys, args.output, args.concurrency, known)
+        logger.info("✅ เพิ่มสรุป %s ชุด → %s", added, args.output)
+    finally:
+        await context.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,128 @@
+import hashlib
+import re
+from array import array
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Optional, Tuple
+
+from modules.tarot.tarot_card import TOPICS
+
+MASK64 = (1 << 64) - 1
+MAX_CARDS = 10
+
+
+@dataclass(frozen=True)
+class Spread:
+    key: str
+    name: str
+    positions: Tuple[str, ...]
+
+    @property
+    def size(self) -> int:
+        return len(self.positions)
+
+
+DAILY = Spread("daily", "ไพ่ประจำวัน", ("ไพ่ประจำวัน",))
+THREE_CARD = Spread("three", "อดีต-ปัจจุบัน-อนาคต", ("อดีต", "ปัจจุบัน", "อนาคต"))
+CELTIC_CROSS = Spread(
+    "celtic",
+    "เซลติกครอส",
+    (
+        "สถานการณ์ตอนนี้",
+        "สิ่งท้าทาย",
+        "รากฐานของเรื่อง",
+        "อดีตที่เพิ่งผ่าน",
+        "เป้าหมายที่เป็นไปได้",
+        "อนาคตอันใกล้",
+        "ตัวคุณเอง",
+        "คนรอบข้าง",
+        "ความหวังและความกลัว",
+        "ผลลัพธ์",
+    ),
+)
+
+
+def custom_spread(n: int) -> Spread:
+    """ สเปรด N ใบที่ผู้ใช้เลือกเอง (1 ถึง MAX_CARDS ใบ) """
+    n = max(1, min(MAX_CARDS, n))
+    if n == 1:
+        return DAILY
+    if n == 3:
+        return THREE_CARD
+    return Spread(f"n{n}", f"{n} ใบ", tuple(f"ใบที่ {i}" for i in range(1, n + 1)))
+
+
+class SplitMix64:
+    """ PRNG 64 บิต (SplitMix64) สั้น เร็ว และให้ผลเดิมเสมอเมื่อ seed เดิม """
+    __slots__ = ("state",)
+
+    def __init__(self, seed: int = 0):
+        self.state = seed & MASK64
+
+    def next(self) -> int:
+        self.state = (self.state + 0x9E3779B97F4A7C15) & MASK64
+        z = self.state
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+        return z ^ (z >> 31)
+
+
+def daily_seed(user_id: int, day: date, spread_key: str, topic: Optional[str]) -> int:
+    """ seed ของผู้ใช้ในวันนั้น: ถามซ้ำวันเดียวกัน สเปรดเดิม หัวข้อเดิม ได้ไพ่ชุดเดิม """
+    raw = f"{user_id}|{day.isoformat()}|{spread_key}|{topic or ''}".encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "little")
+
+
+class SpreadEngine:
+    """
+    จั่วไพ่ด้วย partial Fisher-Yates บน permutation ที่จองไว้ครั้งเดียว
+    แล้วสลับคืนหลังจั่ว ไม่ต้องสร้าง list ของสำรับใหม่ทุกครั้ง
+    """
+    __slots__ = ("_perm", "_swaps", "_rng")
+
+    def __init__(self, deck_size: int):
+        if deck_size > 255:
+            raise ValueError("SpreadEngine รองรับสำรับไม่เกิน 255 ใบ")
+        self._perm = array("B", range(deck_size))
+        self._swaps = array("B", bytes(deck_size))
+        self._rng = SplitMix64()
+
+    def draw(self, k: int, seed: int) -> List[Tuple[int, bool]]:
+        perm, swaps, rng = self._perm, self._swaps, self._rng
+        n = len(perm)
+        if not 0 < k <= n:
+            raise ValueError(f"จั่วได้ 1 ถึง {n} ใบ (ขอ {k})")
+
+        rng.state = seed & MASK64
+        result = []
+        for i in range(k):
+            r = rng.next()
+            j = i + (r >> 1) % (n - i)
+            swaps[i] = j
+            perm[i], perm[j] = perm[j], perm[i]
+            result.append((perm[i], bool(r & 1)))  # บิตต่ำสุด = กลับหัวไหม
+
+        # ✅ สลับคืนให้ perm กลับเป็นลำดับตั้งต้น (ผลจึงขึ้นกับ seed อย่างเดียว)
+        for i in range(k - 1, -1, -1):
+            j = swaps[i]
+            perm[i], perm[j] = perm[j], perm[i]
+        return result
+
+
+_SPREAD_COUNT = re.compile(r"(\d+)\s*ใบ")
+
+
+def parse_spread_request(text: str) -> Tuple[Spread, Optional[str]]:
+    """ อ่านสเปรดและหัวข้อจากข้อความ เช่น "เปิดไพ่ 5 ใบ เรื่องการงาน", "ไพ่ประจำวัน" """
+    lowered = text.lower()
+    topic = next((t for t in TOPICS if t in lowered), None)
+
+    if "เซลติก" in lowered or "celtic" in lowered:
+        return CELTIC_CROSS, topic
+    if "ประจำวัน" in lowered or "รายวัน" in lowered or "daily" in lowered:
+        return DAILY, topic
+
+    match = _SPREAD_COUNT.search(lowered)
+    if match:
+        return custom_spread(int(match.group(1))), topic
+    return THREE_CARD, topic
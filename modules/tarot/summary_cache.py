@@ -0,0 +1,96 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from redis.asyncio import Redis
+
+from modules.core import codec
+from modules.core.logger import logger
+
+# ไฟล์สรุปที่ pre-generate ไว้ล่วงหน้า (สร้างด้วย python -m modules.tarot.pregenerate_summaries)
+#    ครอบคลุมไพ่ใบเดียวได้ทั้งหมด (78 ใบ × 2 ทิศ × 4 หัวข้อ = 624 ชุด) แต่ชุด 3 ใบมี C(78,3) × 8 × 4 ≈ 2.43 ล้านชุด
+#    จั่วสุ่มเท่ากันทุกชุด pre-generate ไว้ N ชุดได้ hit ≈ N / 2.43 ล้าน (1,000 ชุด ≈ 0.04%) ไม่คุ้มนับสถิติทุกครั้งที่เปิดไพ่
+#    ชุดหลายใบจึงพึ่ง cache ตอนใช้งาน (L1 → Redis) + export ชุดที่เคยสร้างแล้วลงไฟล์ (--from-redis)
+SUMMARIES_PATH = os.getenv(
+    "TAROT_SUMMARIES_PATH",
+    os.path.join(os.path.dirname(__file__), "tarot_summaries.json"),
+)
+L1_MAX_ENTRIES = int(os.getenv("TAROT_SUMMARY_L1_SIZE", "2048"))
+REDIS_TTL = 30 * 86400
+REDIS_PREFIX = "tarot:summary:"
+
+_l1: "OrderedDict[str, str]" = OrderedDict()
+_file_store: Optional[Dict[str, str]] = None
+_file_lock = threading.Lock()
+
+
+def combo_key(topic: str, cards: Iterable[Tuple[str, bool]]) -> str:
+    """ key ของชุดไพ่: หัวข้อ + (ชื่อไพ่, กลับหัวไหม) เรียงแล้ว ไม่สนลำดับที่จั่ว """
+    parts = sorted(f"{name}:{'R' if is_reversed else 'U'}" for name, is_reversed in cards)
+    return f"{topic}|{','.join(parts)}"
+
+
+def _load_file_store() -> Dict[str, str]:
+    global _file_store
+    if _file_store is None:
+        with _file_lock:
+            if _file_store is None:
+                try:
+                    with open(SUMMARIES_PATH, encoding="utf-8") as f:
+                        _file_store = json.load(f)
+                    logger.info("🔮 โหลดสรุปไพ่ที่เตรียมไว้ %s ชุด", len(_file_store))
+                except FileNotFoundError:
+                    _file_store = {}
+                except Exception as e:
+                    logger.warning("⚠️ อ่าน %s ไม่ได้: %s", SUMMARIES_PATH, e)
+                    _file_store = {}
+    return _file_store
+
+
+def _remember(key: str, summary: str) -> None:
+    _l1[key] = summary
+    _l1.move_to_end(key)
+    while len(_l1) > L1_MAX_ENTRIES:
+        _l1.popitem(last=False)
+
+
+def get_local(key: str) -> Optional[str]:
+    """ หาใน memory หรือไฟล์ pre-generate (ไม่แตะ network) """
+    summary = _l1.get(key)
+    if summary is not None:
+        _l1.move_to_end(key)
+        return summary
+
+    summary = _load_file_store().get(key)
+    if summary is not None:
+        _remember(key, summary)
+    return summary
+
+
+async def get_summary(redis_instance: Optional[Redis], key: str) -> Optional[str]:
+    summary = get_local(key)
+    if summary is not None or redis_instance is None:
+        return summary
+
+    try:
+        raw = await codec.get_raw(redis_instance, f"{REDIS_PREFIX}{key}")
+        summary = codec.decode_text(raw) if raw is not None else None
+    except Exception as e:
+        logger.warning("⚠️ อ่านสรุปไพ่จาก Redis ไม่ได้: %s", e)
+        return None
+
+    if summary:
+        _remember(key, summary)
+    return summary
+
+
+async def store_summary(redis_instance: Optional[Redis], key: str, summary: str) -> None:
+    _remember(key, summary)
+    if redis_instance is None:
+        return
+    try:
+        await redis_instance.set(f"{REDIS_PREFIX}{key}", codec.encode_text(summary), ex=REDIS_TTL)
+    except Exception as e:
+        logger.warning("⚠️ เก็บสรุปไพ่ลง Redis ไม่ได้: %s", e)
@@ -1,14 +1,36 @@
-from dataclasses import dataclass
-from typing import Optional
-
-@dataclass
-class TarotCard:
-    name: str
-    upright_meaning: str
-    reversed_meaning: str
-    arcana: str  # "Major" หรือ "Minor"
-    suit: Optional[str] = None  # เฉพาะ Minor Arcana
-    number: Optional[int] = None
-
-    def get_meaning(self, is_reversed: bool) -> str:
-        return self.reversed_meaning if is_reversed else self.upright_meaning
+from typing import Dict, Optional, Tuple
+
+# ลำดับหัวข้อที่ใช้เก็บความหมายในไฟล์ tarot_deck.json (index ตรงกัน)
+TOPICS: Tuple[str, ...] = ("ความรัก", "การงาน", "การเงิน", "สุขภาพ")
+TOPIC_INDEX: Dict[str, int] = {topic: i for i, topic in enumerate(TOPICS)}
+
+
+class TarotCard:
+    __slots__ = ("index", "name", "arcana", "suit", "number", "upright", "reversed")
+
+    def __init__(
+        self,
+        index: int,
+        name: str,
+        arcana: str,  # "Major" หรือ "Minor"
+        suit: Optional[str],  # เฉพาะ Minor Arcana
+        number: Optional[int],
+        upright: Tuple[str, ...],  # ความหมายตามลำดับ TOPICS
+        reversed: Tuple[str, ...],
+    ):
+        self.index = index
+        self.name = name
+        self.arcana = arcana
+        self.suit = suit
+        self.number = number
+        self.upright = upright
+        self.reversed = reversed
+
+    def get_meaning(self, topic: str, is_reversed: bool = False) -> Optional[str]:
+        i = TOPIC_INDEX.get(topic)
+        if i is None:
+            return None
+        return self.reversed[i] if is_reversed else self.upright[i]
+
+    def __repr__(self) -> str:
+        return f"TarotCard({self.index}, {self.name!r})"
@@ -0,0 +1,43 @@
+import json
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from modules.tarot.tarot_card import TOPICS, TarotCard
+
+DECK_PATH = os.path.join(os.path.dirname(__file__), "tarot_deck.json")
+
+_cards: Optional[Tuple[TarotCard, ...]] = None
+_name_index: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def _load() -> Tuple[TarotCard, ...]:
+    with open(DECK_PATH, encoding="utf-8") as f:
+        raw = json.load(f)
+
+    if tuple(raw["topics"]) != TOPICS:
+        raise ValueError(f"ลำดับหัวข้อใน {DECK_PATH} ไม่ตรงกับ TOPICS")
+
+    cards = tuple(
+        TarotCard(i, name, arcana, suit, number, tuple(upright), tuple(reversed_))
+        for i, (name, arcana, suit, number, upright, reversed_) in enumerate(raw["cards"])
+    )
+    _name_index.update({card.name.lower(): card.index for card in cards})
+    return cards
+
+
+def get_deck() -> Tuple[TarotCard, ...]:
+    """ คืนไพ่ทั้งสำรับ (โหลดจากไฟล์ครั้งแรกที่เรียก แล้วใช้ซ้ำทั้ง process) """
+    global _cards
+    if _cards is None:
+        with _lock:
+            if _cards is None:
+                _cards = _load()
+    return _cards
+
+
+def get_card(name: str) -> Optional[TarotCard]:
+    cards = get_deck()
+    i = _name_index.get(name.strip().lower())
+    return cards[i] if i is not None else None
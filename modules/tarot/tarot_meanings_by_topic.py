@@ -1,470 +0,0 @@
-TAROT_MEANINGS_BY_TOPIC = {
-    "The Fool": {
-        "ความรัก": "มีความสัมพันธ์ที่สดใส หรือเริ่มต้นใหม่แบบไม่คาดคิด",
-        "การงาน": "โอกาสใหม่ในงาน หรือเสี่ยงเริ่มธุรกิจของตัวเอง",
-        "การเงิน": "ใช้จ่ายแบบไม่ยั้งคิด แต่ก็อาจได้โชคลาภจากความบังเอิญ",
-        "สุขภาพ": "ร่างกายแข็งแรงแต่ควรระวังอุบัติเหตุเล็กน้อย"
-    },
-    "The Magician": {
-        "ความรัก": "มีเสน่ห์ ดึงดูดใจคนรอบข้าง เริ่มต้นความสัมพันธ์ได้ดี",
-        "การงาน": "ใช้ทักษะส่วนตัวให้เกิดประโยชน์ งานก้าวหน้า",
-        "การเงิน": "มีโอกาสหาเงินได้จากความสามารถของตัวเอง",
-        "สุขภาพ": "สุขภาพแข็งแรง หากเจ็บป่วยจะสามารถควบคุมอาการได้ดี"
-    },
-    "The High Priestess": {
-        "ความรัก": "อาจมีความลับในความสัมพันธ์ ใช้สัญชาตญาณนำทาง",
-        "การงาน": "เหมาะกับงานเบื้องหลัง งานวางแผน ใช้ความคิดลึกซึ้ง",
-        "การเงิน": "มีรายได้จากช่องทางลับหรือเงียบ ๆ เช่น ออนไลน์ หรือ passive income",
-        "สุขภาพ": "ภายนอกดูดี แต่ควรตรวจสุขภาพภายใน หรือฮอร์โมน"
-    },
-    "The Empress": {
-        "ความรัก": "เต็มไปด้วยความรัก ความเอาใจใส่ อาจมีข่าวดีเรื่องการตั้งครรภ์",
-        "การงาน": "งานที่เกี่ยวกับการดูแล ศิลปะ หรือความงามจะโดดเด่น",
-        "การเงิน": "การเงินมั่นคง มีโอกาสเพิ่มรายได้จากครอบครัวหรือความคิดสร้างสรรค์",
-        "สุขภาพ": "สุขภาพแข็งแรง โดยเฉพาะด้านผู้หญิงหรือภาวะเจริญพันธุ์"
-    },
-    "The Emperor": {
-        "ความรัก": "อาจดูเย็นชาแต่มั่นคง จริงจังกับความสัมพันธ์",
-        "การงาน": "ประสบความสำเร็จในการบริหารหรือเป็นผู้นำ",
-        "การเงิน": "การวางแผนด้านการเงินที่มั่นคง การลงทุนที่ยั่งยืน",
-        "สุขภาพ": "สุขภาพแข็งแรงจากวินัยดี แต่ควรดูแลความเครียดจากความรับผิดชอบ"
-    },
-    "The Hierophant": {
-        "ความรัก": "ความสัมพันธ์แบบจริงจัง ยึดมั่นในประเพณีหรือความเหมาะสม",
-        "การงาน": "เหมาะกับสายงานที่ต้องใช้จรรยาบรรณ เช่น การศึกษา ศาสนา",
-        "การเงิน": "มั่นคงแต่ไม่หวือหวา ควรวางแผนระยะยาว",
-        "สุขภาพ": "อยู่ในเกณฑ์ดี แต่ควรหมั่นตรวจสุขภาพประจำ"
-    },
-    "The Lovers": {
-        "ความรัก": "ความสัมพันธ์แน่นแฟ้น หรือการตัดสินใจครั้งสำคัญในความรัก",
-        "การงาน": "การเลือกเส้นทางที่ต้องใช้หัวใจนำทาง",
-        "การเงิน": "ตัดสินใจด้านการเงินที่ต้องคุยกับคนอื่น หรือมีหุ้นส่วน",
-        "สุขภาพ": "สภาวะทางใจมีผลต่อร่างกาย"
-    },
-    "The Chariot": {
-        "ความรัก": "ความสัมพันธ์มั่นคง หากมีปัญหาจะสามารถผ่านพ้นได้ด้วยพลังใจ",
-        "การงาน": "ความสำเร็จที่ได้จากความมุ่งมั่นและวินัยสูง",
-        "การเงิน": "วางแผนการเงินอย่างมั่นคงและเดินหน้าได้ดี",
-        "สุขภาพ": "แข็งแรงดี โดยเฉพาะระบบกล้ามเนื้อหรือการฟื้นตัว"
-    },
-    "Strength": {
-        "ความรัก": "เข้าใจกันด้วยใจ มีความเมตตาในความสัมพันธ์",
-        "การงาน": "ผ่านอุปสรรคด้วยความอดทนและความเชื่อมั่น",
-        "การเงิน": "ควบคุมรายจ่ายได้ดี อดทนกับการเก็บออม",
-        "สุขภาพ": "ฟื้นตัวดีจากโรคภัย มีพลังใจสูง"
-    },
-    "The Hermit": {
-        "ความรัก": "อาจมีความเหงา หรือกำลังทบทวนความรู้สึกตัวเอง",
-        "การงาน": "เหมาะกับงานวิจัย งานวิเคราะห์ หรือช่วงเวลาที่ต้องถอยออกมาคิด",
-        "การเงิน": "ควรเก็บเงินเงียบ ๆ อย่าเปิดเผยหรือลงทุนเสี่ยง",
-        "สุขภาพ": "ต้องพักผ่อนให้มาก ระวังเรื่องระบบประสาทหรือจิตใจ"
-    },
-    "Wheel of Fortune": {
-        "ความรัก": "ความรักเปลี่ยนแปลงแบบไม่คาดคิด เจอคนใหม่ หรือความสัมพันธ์พลิกผัน",
-        "การงาน": "โอกาสทองหรือความเปลี่ยนแปลงในงานที่นำไปสู่การเติบโต",
-        "การเงิน": "มีโชคทางการเงิน หรือโอกาสที่พลิกชีวิต",
-        "สุขภาพ": "อาการเจ็บป่วยอาจเปลี่ยนแปลงอย่างรวดเร็ว ฟื้นตัวไว"
-    },
-    "Justice": {
-        "ความรัก": "ความสัมพันธ์ต้องยึดหลักเหตุผลและความเท่าเทียม",
-        "การงาน": "งานเกี่ยวกับกฎหมาย เอกสาร หรือความถูกต้องจะเด่น",
-        "การเงิน": "การจัดการเงินต้องโปร่งใส ระวังปัญหากฎหมายการเงิน",
-        "สุขภาพ": "ต้องตรวจเช็คอย่างละเอียด ระวังปัญหาเกี่ยวกับไตหรือฮอร์โมน"
-    },
-    "The Hanged Man": {
-        "ความรัก": "อาจรู้สึกติดขัดหรือจำเป็นต้องเสียสละเพื่อความสัมพันธ์",
-        "การงาน": "ชะลอการตัดสินใจ รอเวลาเหมาะสมก่อนลงมือ",
-        "การเงิน": "ยังไม่ใช่ช่วงควรลงทุน อาจต้องอดทนรอจังหวะ",
-        "สุขภาพ": "ควรพักผ่อนหรือเปลี่ยนมุมมองต่อสุขภาพของตน"
-    },
-    "Death": {
-        "ความรัก": "จบความสัมพันธ์เดิมเพื่อเริ่มใหม่ อาจเจ็บแต่จำเป็น",
-        "การงาน": "การเปลี่ยนสายงาน หรือเปลี่ยนบทบาทในงาน",
-        "การเงิน": "เคลียร์หนี้ หรือทิ้งพฤติกรรมเสียเงินเดิม ๆ",
-        "สุขภาพ": "การเปลี่ยนวิถีชีวิต อาจต้องฟื้นฟูหลังเจ็บหนัก"
-    },
-    "Temperance": {
-        "ความรัก": "ความสัมพันธ์มั่นคงจากการประนีประนอมและเข้าใจกัน",
-        "การงาน": "ทำงานเป็นทีมได้ดี ค่อยเป็นค่อยไปอย่างมั่นคง",
-        "การเงิน": "ควรรักษาสมดุลระหว่างรายรับรายจ่าย",
-        "สุขภาพ": "สุขภาพดีจากการดูแลแบบพอดี ไม่สุดโต่ง"
-    },
-    "The Devil": {
-        "ความรัก": "ความสัมพันธ์ที่ผูกมัด หรือความหลงใหลที่เกินพอดี",
-        "การงาน": "ทำงานหนักเกินไป หรือมีพันธะที่ทำให้เครียด",
-        "การเงิน": "ติดหนี้ หรือเสพติดการใช้จ่าย",
-        "สุขภาพ": "ระวังพฤติกรรมทำลายสุขภาพ เช่น ติดของหวาน เหล้า บุหรี่"
-    },
-    "The Tower": {
-        "ความรัก": "เหตุการณ์พลิกผัน ทะเลาะกันรุนแรง หรือจบกะทันหัน",
-        "การงาน": "การเปลี่ยนแปลงที่ไม่คาดคิด เช่น โดนเด้ง เปลี่ยนงาน",
-        "การเงิน": "สูญเสียทรัพย์กะทันหัน เช่น ค่ารักษา ค่าซ่อมแซม",
-        "สุขภาพ": "เจ็บป่วยฉับพลัน หรืออุบัติเหตุ"
-    },
-    "The Star": {
-        "ความรัก": "มีความหวังใหม่ ความสัมพันธ์เยียวยาได้",
-        "การงาน": "โอกาสดีในการแสดงศักยภาพ มีแรงบันดาลใจ",
-        "การเงิน": "ได้เงินจากสิ่งที่เรารัก หรือหวังไว้สักพักแล้ว",
-        "สุขภาพ": "กำลังใจดี ร่างกายค่อย ๆ ฟื้นตัว"
-    },
-    "The Moon": {
-        "ความรัก": "ความสัมพันธ์ไม่ชัดเจน มีความสับสนหรือปิดบังกัน",
-        "การงาน": "ไม่ควรตัดสินใจตอนนี้ มีบางอย่างซ่อนอยู่",
-        "การเงิน": "ระวังการถูกหลอก หรือข้อมูลด้านการเงินไม่ครบ",
-        "สุขภาพ": "ปัญหาสุขภาพเรื้อรัง หรือด้านจิตใจ"
-    },
-    "The Sun": {
-        "ความรัก": "ความสัมพันธ์เต็มไปด้วยความสุข ความจริงใจ และพลังบวก",
-        "การงาน": "ความสำเร็จที่เด่นชัด การได้รับการยอมรับ",
-        "การเงิน": "การเงินดี รายได้เพิ่มหรือมีโชคก้อนใหญ่",
-        "สุขภาพ": "สุขภาพแข็งแรง กระปรี้กระเปร่า"
-    },
-    "Judgement": {
-        "ความรัก": "โอกาสในการคืนดีกัน หรือเริ่มต้นใหม่อย่างเข้าใจ",
-        "การงาน": "การทบทวนงานในอดีตและตัดสินใจสำคัญ",
-        "การเงิน": "การปลดหนี้ หรือฟื้นตัวจากวิกฤตการเงิน",
-        "สุขภาพ": "ฟื้นตัวจากอาการเจ็บป่วย หรือได้รับการวินิจฉัยที่ชัดเจน"
-    },
-    "The World": {
-        "ความรัก": "ความสัมพันธ์สมบูรณ์ มีการพัฒนาร่วมกัน",
-        "การงาน": "ประสบความสำเร็จในเป้าหมาย หรือปิดโปรเจกต์ได้ดี",
-        "การเงิน": "มีรายได้หลายทาง การเงินมั่นคง",
-        "สุขภาพ": "สุขภาพแข็งแรง ปลอดภัยจากโรคภัย"
-    },
-    "Ace of Wands": {
-        "ความรัก": "เริ่มต้นความรักครั้งใหม่ หรือจุดประกายความรู้สึก",
-        "การงาน": "ไอเดียใหม่ โอกาสดีในงานที่เราหลงใหล",
-        "การเงิน": "โอกาสสร้างรายได้ใหม่ หรือเริ่มต้นลงทุน",
-        "สุขภาพ": "พลังชีวิตดี สุขภาพกระปรี้กระเปร่า"
-    },
-    "Two of Wands": {
-        "ความรัก": "คิดถึงอนาคตของความสัมพันธ์ อาจอยู่ห่างกันแต่ยังสื่อสารกันได้ดี",
-        "การงาน": "การวางแผนล่วงหน้า มีโอกาสเติบโตหากกล้าตัดสินใจ",
-        "การเงิน": "อยู่ในช่วงวางแผนการเงิน ต้องตัดสินใจเรื่องลงทุน",
-        "สุขภาพ": "สุขภาพดี แต่อย่าประมาทเรื่องอาหารหรือออกกำลังกาย"
-    },
-    "Three of Wands": {
-        "ความรัก": "ความรักมีแนวโน้มพัฒนาในอนาคต อาจมีการเดินทางร่วมกัน",
-        "การงาน": "เห็นผลลัพธ์จากความพยายาม มีโอกาสขยายงาน",
-        "การเงิน": "ผลตอบแทนจากการลงทุนเริ่มปรากฏ หรือมีรายได้จากต่างประเทศ",
-        "สุขภาพ": "แข็งแรงดี โดยเฉพาะระบบย่อยอาหาร"
-    },
-    "Four of Wands": {
-        "ความรัก": "ความสัมพันธ์มั่นคง มีการเฉลิมฉลอง อาจหมายถึงแต่งงาน",
-        "การงาน": "ประสบความสำเร็จในโปรเจกต์ มีความมั่นคงในองค์กร",
-        "การเงิน": "มีรายได้มั่นคง หรือได้รับรางวัลจากความสำเร็จ",
-        "สุขภาพ": "สุขภาพดีมาก เหมาะแก่การพักผ่อนหรือท่องเที่ยว"
-    },
-    "Five of Wands": {
-        "ความรัก": "มีปากเสียงหรือการแข่งขันในความสัมพันธ์",
-        "การงาน": "เจอความขัดแย้งในที่ทำงาน ต้องใช้สติและความเข้าใจ",
-        "การเงิน": "รายจ่ายมาก ต้องระวังความขัดแย้งเรื่องเงินกับผู้อื่น",
-        "สุขภาพ": "เครียดง่าย ควรออกกำลังหรือหาวิธีระบายอารมณ์"
-    },
-    "Six of Wands": {
-        "ความรัก": "ได้รับการยอมรับจากคนรักหรือคนรอบข้าง",
-        "การงาน": "ประสบความสำเร็จ ได้รับการยอมรับจากผู้คน",
-        "การเงิน": "รายได้ดีจากความสำเร็จหรือผลงานที่ผ่านมา",
-        "สุขภาพ": "สุขภาพโดยรวมดี แต่อาจเหนื่อยจากภาระหน้าที่"
-    },
-    "Seven of Wands": {
-        "ความรัก": "ต้องปกป้องความสัมพันธ์จากสิ่งรอบตัว",
-        "การงาน": "เจอความท้าทาย ต้องยืนหยัดในสิ่งที่เชื่อ",
-        "การเงิน": "ปกป้องทรัพย์สินหรือแนวทางการใช้เงินของตน",
-        "สุขภาพ": "แข็งแรง แต่ต้องระวังโรคที่เรื้อรังหรือกำเริบ"
-    },
-    "Eight of Wands": {
-        "ความรัก": "ความสัมพันธ์พัฒนาเร็ว หรือมีข่าวดีเกี่ยวกับความรัก",
-        "การงาน": "โปรเจกต์เดินหน้าเร็ว มีการสื่อสารคล่องตัว",
-        "การเงิน": "การเงินคล่อง มีรายได้เข้ามาหลายทาง",
-        "สุขภาพ": "ร่างกายกระฉับกระเฉง เหมาะแก่การเดินทาง"
-    },
-    "Nine of Wands": {
-        "ความรัก": "เคยเจ็บมาก่อน เลยระแวง ต้องใช้เวลากลับมาเชื่อใจ",
-        "การงาน": "ผ่านอะไรมามาก แต่ยังยืนหยัดได้ อาจเหนื่อยล้า",
-        "การเงิน": "ระมัดระวังการใช้เงิน เพราะเคยมีบทเรียน",
-        "สุขภาพ": "ควรพักผ่อน ระวังโรคเรื้อรังหรือภาวะสะสม"
-    },
-    "Ten of Wands": {
-        "ความรัก": "รู้สึกหนักใจกับความสัมพันธ์ อาจเพราะภาระที่มากเกินไป",
-        "การงาน": "งานหนักมาก ควรแบ่งงานหรือขอความช่วยเหลือ",
-        "การเงิน": "ภาระหนี้สินหรือค่าใช้จ่ายที่ต้องแบกไว้",
-        "สุขภาพ": "เครียด ปวดหลัง หรือภาวะเหนื่อยล้าเรื้อรัง"
-    },
-    "Page of Wands": {
-        "ความรัก": "มีคนใหม่เข้ามาในชีวิต หรือเริ่มคุยกับใครบางคน",
-        "การงาน": "ข่าวดีเรื่องงาน การเริ่มต้นสิ่งใหม่",
-        "การเงิน": "โอกาสใหม่ทางการเงิน อาจมีโชคเล็ก ๆ น้อย ๆ",
-        "สุขภาพ": "สุขภาพแข็งแรง กระตือรือร้น"
-    },
-    "Knight of Wands": {
-        "ความรัก": "รักแบบรวดเร็ว ตื่นเต้น หรือมีคนเจ้าชู้เข้ามา",
-        "การงาน": "มีแรงบันดาลใจสูง พร้อมลุยทุกโอกาส",
-        "การเงิน": "การใช้เงินเร็ว แต่ก็มีโอกาสหารายได้ไว",
-        "สุขภาพ": "พลังดี แต่ระวังอุบัติเหตุจากความรีบ"
-    },
-    "Queen of Wands": {
-        "ความรัก": "เป็นคนมีเสน่ห์ มั่นใจในความรัก",
-        "การงาน": "เป็นผู้นำที่ดีในสายงาน สร้างแรงบันดาลใจ",
-        "การเงิน": "บริหารเงินเก่ง มีรายได้จากหลายด้าน",
-        "สุขภาพ": "แข็งแรง จิตใจมั่นคง"
-    },
-    "King of Wands": {
-        "ความรัก": "คนรักที่มั่นคงและเป็นผู้นำ",
-        "การงาน": "มีวิสัยทัศน์ นำทีมเก่ง",
-        "การเงิน": "มั่นคงทางการเงิน มีฐานะที่ดี",
-        "สุขภาพ": "สุขภาพดีจากการดูแลอย่างมีวินัย"
-    },
-    "Ace of Cups": {
-        "ความรัก": "ความรักใหม่เริ่มต้น หรือความสัมพันธ์เดิมลึกซึ้งขึ้น",
-        "การงาน": "ได้รับแรงบันดาลใจใหม่ ทำงานด้วยความสุข",
-        "การเงิน": "ได้เงินจากสิ่งที่เรารักหรือมีความสุขกับสิ่งที่ทำ",
-        "สุขภาพ": "สุขภาพจิตดี มีความสงบใจ"
-    },
-    "Two of Cups": {
-        "ความรัก": "ความสัมพันธ์สมดุล เข้าอกเข้าใจกันดี",
-        "การงาน": "การเป็นคู่หูที่ดี ร่วมงานราบรื่น",
-        "การเงิน": "ร่วมมือกับคนอื่นทางการเงิน เช่น หุ้นส่วน",
-        "สุขภาพ": "สุขภาพดี เพราะใจสบาย มีคนดูแลกัน"
-    },
-    "Three of Cups": {
-        "ความรัก": "ช่วงเวลาแห่งความสุข สนุกสนานกับคนรักหรือเพื่อนฝูง",
-        "การงาน": "ฉลองความสำเร็จ ร่วมมือในทีมดี",
-        "การเงิน": "มีรายได้พิเศษจากกิจกรรมสังคมหรือเพื่อนฝูง",
-        "สุขภาพ": "สุขภาพดี มีพลังจากสังคมที่อบอุ่น"
-    },
-    "Four of Cups": {
-        "ความรัก": "รู้สึกเฉย ๆ เบื่อกับความสัมพันธ์ที่มี",
-        "การงาน": "หมดแรงบันดาลใจในงาน ต้องหาเป้าหมายใหม่",
-        "การเงิน": "ยังไม่มีแรงจูงใจในการจัดการเงิน",
-        "สุขภาพ": "ระวังภาวะซึมเศร้า เบื่ออาหาร ขาดแรงใจ"
-    },
-    "Five of Cups": {
-        "ความรัก": "เสียใจจากความรักเก่า หรือความผิดหวัง",
-        "การงาน": "ผิดหวังกับผลงานหรือผลลัพธ์ที่ไม่เป็นไปตามหวัง",
-        "การเงิน": "เสียเงินจากความประมาท หรือการลงทุนที่ผิดพลาด",
-        "สุขภาพ": "อารมณ์เศร้าส่งผลต่อสุขภาพโดยรวม"
-    },
-    "Six of Cups": {
-        "ความรัก": "คิดถึงรักเก่า หรือพบเจอคนรักในอดีต",
-        "การงาน": "ทำงานที่คุ้นเคย งานเก่ากลับมา หรือทำร่วมกับครอบครัว",
-        "การเงิน": "มีรายได้จากงานที่คุ้นเคย หรือผู้ใหญ่ให้การช่วยเหลือ",
-        "สุขภาพ": "สุขภาพโดยรวมดี หากมีปัญหาอาจเกี่ยวกับอดีต"
-    },
-    "Seven of Cups": {
-        "ความรัก": "มีหลายทางเลือกในความรัก แต่ยังไม่ชัดเจน",
-        "การงาน": "มีไอเดียเยอะ แต่ยังขาดการโฟกัส",
-        "การเงิน": "ฝันถึงโอกาสทางการเงิน แต่ยังไม่ลงมือจริงจัง",
-        "สุขภาพ": "ระวังการใช้ยาเกินเหตุ หรือความสับสนในการรักษา"
-    },
-    "Eight of Cups": {
-        "ความรัก": "ตัดใจจากความรักที่ไม่เติมเต็ม",
-        "การงาน": "เดินออกจากงานเดิมที่ไม่พัฒนา",
-        "การเงิน": "ตัดรายจ่ายที่ไม่จำเป็น หรือเลิกพฤติกรรมเสียเงิน",
-        "สุขภาพ": "ฟื้นฟูร่างกายด้วยการเปลี่ยนวิถีชีวิต"
-    },
-    "Nine of Cups": {
-        "ความรัก": "สมหวังในความรัก หรือมีความสุขกับตัวเอง",
-        "การงาน": "พึงพอใจกับงานที่ทำ หรือได้รับผลสำเร็จ",
-        "การเงิน": "มีเงินใช้สบาย ได้สิ่งที่ต้องการ",
-        "สุขภาพ": "สุขภาพดี และมีความพึงพอใจในชีวิต"
-    },
-    "Ten of Cups": {
-        "ความรัก": "ความรักสมบูรณ์ ครอบครัวอบอุ่น",
-        "การงาน": "มีความสุขกับงานที่มั่นคงและอบอุ่น",
-        "การเงิน": "การเงินมั่นคง มีความสุขกับสิ่งที่มี",
-        "สุขภาพ": "สุขภาพแข็งแรง เพราะจิตใจดี"
-    },
-    "Page of Cups": {
-        "ความรัก": "มีคนแอบชอบ หรือมีข่าวดีเรื่องความรัก",
-        "การงาน": "มีโอกาสใหม่เกี่ยวกับงานสร้างสรรค์",
-        "การเงิน": "ได้รับเงินแบบไม่คาดฝัน เช่น ของขวัญหรือโบนัส",
-        "สุขภาพ": "สุขภาพดีขึ้นโดยเฉพาะเรื่องอารมณ์"
-    },
-    "Knight of Cups": {
-        "ความรัก": "มีคนเข้ามาอย่างโรแมนติก หรือมีข่าวดีเรื่องความสัมพันธ์",
-        "การงาน": "มีโอกาสใหม่ในงานที่เกี่ยวกับการสื่อสาร ศิลปะ หรือบริการ",
-        "การเงิน": "รายได้จากงานสร้างสรรค์หรือจากความสัมพันธ์",
-        "สุขภาพ": "สุขภาพดีขึ้น แต่อย่าใจอ่อนกับสิ่งยั่วยุ"
-    },
-    "Queen of Cups": {
-        "ความรัก": "เข้าใจและใส่ใจคนรักเป็นอย่างดี",
-        "การงาน": "งานด้านจิตวิทยา บริการ หรืองานที่ต้องใช้ความเข้าใจคน",
-        "การเงิน": "มีเงินเก็บจากการบริหารอารมณ์และความรอบคอบ",
-        "สุขภาพ": "สุขภาพจิตดี ส่งผลต่อร่างกายที่แข็งแรง"
-    },
-    "King of Cups": {
-        "ความรัก": "รักมั่นคงแต่ไม่แสดงออกมาก เป็นคนที่ควบคุมอารมณ์เก่ง",
-        "การงาน": "บริหารงานได้ดี โดยเฉพาะงานด้านอารมณ์และบริการ",
-        "การเงิน": "มั่นคงทางอารมณ์ ช่วยควบคุมรายจ่ายได้ดี",
-        "สุขภาพ": "ควบคุมโรคเรื้อรังได้ดี หรือฟื้นตัวจากปัญหาด้านจิตใจ"
-    },
-    "Ace of Swords": {
-        "ความรัก": "ตัดสินใจในเรื่องความรักอย่างเด็ดขาด อาจเริ่มต้นใหม่หรือเคลียร์ใจ",
-        "การงาน": "เริ่มโปรเจกต์ที่ต้องใช้ความคิดชัดเจนหรือการวิเคราะห์",
-        "การเงิน": "มีไอเดียในการจัดการการเงินชัดเจนมากขึ้น",
-        "สุขภาพ": "ฟื้นตัวได้จากการผ่าตัดหรือเริ่มต้นดูแลสุขภาพจริงจัง"
-    },
-    "Two of Swords": {
-        "ความรัก": "ลังเล ไม่รู้จะเลือกทางไหนดี หรือมีเรื่องที่ยังไม่เปิดเผย",
-        "การงาน": "มีทางเลือกในงาน ต้องตัดสินใจ แต่ยังไม่กล้าเลือก",
-        "การเงิน": "รายรับรายจ่ายยังไม่สมดุล ต้องตัดสินใจจัดการ",
-        "สุขภาพ": "ปัญหาสุขภาพที่ซ่อนอยู่ ต้องกล้าตรวจและยอมรับ"
-    },
-    "Three of Swords": {
-        "ความรัก": "เจ็บปวด ผิดหวัง หรืออกหัก",
-        "การงาน": "ความขัดแย้งในที่ทำงาน หรือไม่พอใจผลลัพธ์งาน",
-        "การเงิน": "สูญเสียเงิน หรือเจ็บปวดจากการตัดสินใจผิดพลาดทางการเงิน",
-        "สุขภาพ": "ปัญหาหัวใจ ความเครียด หรืออารมณ์ที่ส่งผลต่อร่างกาย"
-    },
-    "Four of Swords": {
-        "ความรัก": "ช่วงพักใจ หรือห่างจากกันชั่วคราว",
-        "การงาน": "พักจากงาน หรืออยู่ในช่วงรอผล",
-        "การเงิน": "พักแผนการเงินไว้ก่อน อย่ารีบร้อน",
-        "สุขภาพ": "ควรพักผ่อน ฟื้นฟูร่างกาย หรืออยู่ระหว่างพักรักษาตัว"
-    },
-    "Five of Swords": {
-        "ความรัก": "ทะเลาะกัน คำพูดบาดใจ หรือมีการหักหลัง",
-        "การงาน": "ขัดแย้งกับคนในที่ทำงาน หรือมีความรู้สึกพ่ายแพ้",
-        "การเงิน": "ระวังโดนโกงหรือเสียเปรียบในการทำธุรกรรม",
-        "สุขภาพ": "อารมณ์ร้อนส่งผลเสีย หรือการตัดสินใจผิดด้านสุขภาพ"
-    },
-    "Six of Swords": {
-        "ความรัก": "ผ่านปัญหาแล้วกำลังจะดีขึ้น อาจเดินทางไปด้วยกัน",
-        "การงาน": "เริ่มฟื้นจากช่วงแย่ ๆ มีแนวโน้มดีขึ้น",
-        "การเงิน": "ค่อย ๆ ดีขึ้นจากปัญหาก่อนหน้า แต่ยังต้องระวัง",
-        "สุขภาพ": "สุขภาพเริ่มดีขึ้นหลังการพักฟื้น"
-    },
-    "Seven of Swords": {
-        "ความรัก": "มีการซ่อนบางอย่าง หรือไม่เปิดเผยความรู้สึก",
-        "การงาน": "มีเล่ห์เหลี่ยมหรือเจอคนไม่น่าไว้วางใจ",
-        "การเงิน": "ระวังโดนขโมยเงิน หรือทำบัญชีไม่โปร่งใส",
-        "สุขภาพ": "อาจมีโรคซ่อนเร้น หรือไม่เปิดเผยความผิดปกติ"
-    },
-    "Eight of Swords": {
-        "ความรัก": "รู้สึกติดกับดักในความสัมพันธ์ กลัวที่จะเปลี่ยนแปลง",
-        "การงาน": "รู้สึกถูกจำกัดทางเลือก หรือเครียดจากงานมากเกินไป",
-        "การเงิน": "ไม่กล้าตัดสินใจเกี่ยวกับการเงิน กลัวความเสี่ยง",
-        "สุขภาพ": "สุขภาพจิตเครียดหรือรู้สึกถูกจำกัดด้วยโรคเรื้อรัง"
-    },
-    "Nine of Swords": {
-        "ความรัก": "วิตกกังวลกับความรัก อาจฝันร้ายหรือระแวง",
-        "การงาน": "เครียดมากกับงาน หรือกลัวความล้มเหลว",
-        "การเงิน": "กังวลมากเรื่องเงิน อาจเป็นหนี้หรือรายจ่ายล้น",
-        "สุขภาพ": "นอนไม่หลับ ภาวะเครียด หรือปัญหาสุขภาพจิต"
-    },
-    "Ten of Swords": {
-        "ความรัก": "จบความสัมพันธ์แบบเจ็บปวด หรือถูกหักหลัง",
-        "การงาน": "เจอทางตันในงาน หรือถูกกีดกันอย่างเจ็บปวด",
-        "การเงิน": "เสียเงินก้อนใหญ่ หรือการเงินถึงจุดต่ำสุด",
-        "สุขภาพ": "ภาวะเจ็บป่วยรุนแรง ต้องการการพักฟื้นยาว"
-    },
-    "Page of Swords": {
-        "ความรัก": "จับตาดูคนรัก อาจมีความสงสัยหรือยังไม่ไว้ใจ",
-        "การงาน": "เริ่มงานใหม่ด้วยความกระตือรือร้น แต่ยังระวังมาก",
-        "การเงิน": "ศึกษาเรื่องการเงินก่อนตัดสินใจลงทุน",
-        "สุขภาพ": "แข็งแรงดี แต่ชอบคิดมากเกินไป"
-    },
-    "Knight of Swords": {
-        "ความรัก": "พูดตรงไปตรงมา อาจทำให้ทะเลาะได้ง่าย",
-        "การงาน": "เดินหน้าลุยงานเต็มที่ บางครั้งขาดความรอบคอบ",
-        "การเงิน": "การใช้เงินเร็ว หรือกล้าลงทุนแบบไม่คิดมาก",
-        "สุขภาพ": "สุขภาพโดยรวมดี แต่ระวังอุบัติเหตุเล็ก ๆ"
-    },
-    "Queen of Swords": {
-        "ความรัก": "รักอย่างมีเหตุผล ไม่แสดงความรู้สึกมาก",
-        "การงาน": "ใช้สติปัญญาในการบริหารงานได้ดี",
-        "การเงิน": "วางแผนเก่ง ใช้เหตุผลในการตัดสินใจเรื่องเงิน",
-        "สุขภาพ": "สุขภาพดี เพราะควบคุมอารมณ์และระวังตัว"
-    },
-    "King of Swords": {
-        "ความรัก": "วางตัวเป็นผู้ใหญ่ในความสัมพันธ์ บางครั้งดูเย็นชา",
-        "การงาน": "ผู้นำที่เด็ดขาด ใช้เหตุผลเหนืออารมณ์",
-        "การเงิน": "วางแผนการเงินอย่างมีระบบ เข้มงวดกับรายจ่าย",
-        "สุขภาพ": "สุขภาพดี แต่เครียดจากการทำงานหนัก"
-    },
-    "Ace of Pentacles": {
-        "ความรัก": "เริ่มต้นความสัมพันธ์ที่มั่นคง อาจหมายถึงการสร้างครอบครัว",
-        "การงาน": "โอกาสใหม่ด้านงานที่ให้ผลตอบแทนดี เช่น งานประจำหรือธุรกิจ",
-        "การเงิน": "มีรายได้เข้ามา โชคด้านการเงิน",
-        "สุขภาพ": "สุขภาพแข็งแรง มีโอกาสรักษาหายจากโรค"
-    },
-    "Two of Pentacles": {
-        "ความรัก": "พยายามบาลานซ์เวลาและความสัมพันธ์ อาจยุ่งเกินไป",
-        "การงาน": "ต้องจัดการหลายหน้าที่พร้อมกัน ต้องบริหารเวลาให้ดี",
-        "การเงิน": "หมุนเงินได้ดี แต่ยังไม่มั่นคง",
-        "สุขภาพ": "ต้องปรับสมดุลระหว่างพักผ่อนกับภาระงาน"
-    },
-    "Three of Pentacles": {
-        "ความรัก": "พัฒนาไปพร้อมกัน พูดคุยปรับความเข้าใจกันดี",
-        "การงาน": "ทำงานร่วมกับผู้อื่นอย่างมีประสิทธิภาพ",
-        "การเงิน": "รายได้จากงานร่วมมือหรือทีมเวิร์ก",
-        "สุขภาพ": "แข็งแรง และฟื้นตัวได้ดีเมื่อได้รับการดูแลร่วม"
-    },
-    "Four of Pentacles": {
-        "ความรัก": "ยึดติดเกินไป หรือไม่กล้าเปิดใจ",
-        "การงาน": "ไม่กล้าเปลี่ยนแปลง หวงตำแหน่งหรือไอเดีย",
-        "การเงิน": "เก็บเงินมาก แต่ไม่กล้าลงทุน",
-        "สุขภาพ": "สุขภาพโดยรวมดี แต่กังวลเกินไป"
-    },
-    "Five of Pentacles": {
-        "ความรัก": "รู้สึกโดดเดี่ยว หรือถูกทอดทิ้ง",
-        "การงาน": "ช่วงยากลำบาก หรือเสี่ยงตกงาน",
-        "การเงิน": "ขาดรายได้ มีภาระหนี้ หรือภาวะขัดสน",
-        "สุขภาพ": "เจ็บป่วยเรื้อรัง หรืออ่อนแอจากปัญหาใจ"
-    },
-    "Six of Pentacles": {
-        "ความรัก": "มีการให้และรับอย่างสมดุล",
-        "การงาน": "ได้รับความช่วยเหลือจากเพื่อนร่วมงานหรือผู้ใหญ่",
-        "การเงิน": "ได้รับเงินสนับสนุน หรือช่วยเหลือผู้อื่น",
-        "สุขภาพ": "สุขภาพดีขึ้นจากการรักษาแบบเอื้อเฟื้อ"
-    },
-    "Seven of Pentacles": {
-        "ความรัก": "รอผลจากความสัมพันธ์ หรือกำลังคิดทบทวน",
-        "การงาน": "เห็นผลลัพธ์จากความพยายาม ต้องอดทนอีกหน่อย",
-        "การเงิน": "กำลังเก็บออม หรือรอผลตอบแทนจากการลงทุน",
-        "สุขภาพ": "กำลังฟื้นฟู ต้องใช้เวลา อย่ารีบร้อน"
-    },
-    "Eight of Pentacles": {
-        "ความรัก": "ใส่ใจและพยายามปรับปรุงความสัมพันธ์",
-        "การงาน": "ขยัน ตั้งใจพัฒนาทักษะในงาน",
-        "การเงิน": "รายได้จากความขยันและฝีมือ",
-        "สุขภาพ": "ดูแลสุขภาพแบบมีวินัย เห็นผลดี"
-    },
-    "Nine of Pentacles": {
-        "ความรัก": "รักตัวเอง มีเสน่ห์ และอาจมีคนสนใจ",
-        "การงาน": "ประสบความสำเร็จ มีชื่อเสียงจากงาน",
-        "การเงิน": "มั่นคงมาก ใช้จ่ายสบาย มีทรัพย์สิน",
-        "สุขภาพ": "สุขภาพดีจากการดูแลตัวเองดี"
-    },
-    "Ten of Pentacles": {
-        "ความรัก": "ครอบครัวมั่นคง รุ่นสู่รุ่น มีความรักระยะยาว",
-        "การงาน": "ทำธุรกิจกับครอบครัว หรือมีฐานะมั่นคงมาก",
-        "การเงิน": "การเงินแข็งแรง มีมรดก หรือทรัพย์สินถาวร",
-        "สุขภาพ": "สุขภาพดี มีคนดูแลใกล้ชิด"
-    },
-    "Page of Pentacles": {
-        "ความรัก": "เริ่มรู้จักใครใหม่ ๆ ที่มีศักยภาพเป็นคู่ชีวิต",
-        "การงาน": "เริ่มต้นงานใหม่ หรือศึกษางานที่ให้ผลในอนาคต",
-        "การเงิน": "มีรายได้เริ่มต้น หรือวางแผนการเงินได้ดี",
-        "สุขภาพ": "สุขภาพดี แต่ต้องหมั่นศึกษาแนวทางดูแลตัวเอง"
-    },
-    "Knight of Pentacles": {
-        "ความรัก": "ความสัมพันธ์มั่นคง เดินช้าแต่ชัวร์",
-        "การงาน": "ขยัน อดทน ก้าวหน้าช้าแต่มั่นคง",
-        "การเงิน": "มีวินัยทางการเงิน อาจไม่มากแต่แน่นอน",
-        "สุขภาพ": "แข็งแรงเพราะมีวินัยและดูแลต่อเนื่อง"
-    },
-    "Queen of Pentacles": {
-        "ความรัก": "ดูแลครอบครัวดี เป็นคนที่ให้ความมั่นคง",
-        "การงาน": "ทำงานเก่ง บริหารงานและบ้านได้ดี",
-        "การเงิน": "มั่นคงมาก รายได้จากหลายทาง",
-        "สุขภาพ": "สุขภาพดี รู้จักสมดุลชีวิต"
-    },
-    "King of Pentacles": {
-        "ความรัก": "มั่นคงและดูแลคนรักดี เป็นหัวหน้าครอบครัว",
-        "การงาน": "ประสบความสำเร็จในการบริหารเงินและงาน",
-        "การเงิน": "มั่งคั่ง มีรายได้แน่นหนาและมีการลงทุน",
-        "สุขภาพ": "สุขภาพแข็งแรง เพราะการดำเนินชีวิตที่มั่นคง"
-    }
-}
@@ -1,33 +1,129 @@
-import random
-from modules.tarot.tarot_meanings_by_topic import TAROT_MEANINGS_BY_TOPIC
-from modules.nlp.openai_utils import summarize_tarot_reading
-
-def draw_multiple_cards(n=3):
-    all_card_names = list(TAROT_MEANINGS_BY_TOPIC.keys())
-    selected_names = random.sample(all_card_names, k=n)
-    return [(name, random.choice([True, False])) for name in selected_names]
-
-async def draw_cards_and_interpret_by_topic(topic: str) -> str:
-    cards = draw_multiple_cards(3)
-
-    card_blocks = []
-    gpt_input_lines = []
-
-    for name, is_reversed in cards:
-        card_data = TAROT_MEANINGS_BY_TOPIC.get(name, {})
-        meaning = card_data.get(topic, "❌ ไม่พบคำทำนายในหัวข้อนี้")
-        direction = "กลับหัว" if is_reversed else "ปกติ"
-
-        card_blocks.append(
-            f"🔹 **{name}** ({direction})\n💬 _{meaning}_"
-        )
-        gpt_input_lines.append(f"{name} ({direction}): {meaning}")
-
-    reading_text = "\n".join(gpt_input_lines)
-    summary = await summarize_tarot_reading(reading_text, topic)
-
-    return (
-        f"🔮 **คำทำนายเรื่อง {topic} ของคุณ:**\n\n"
-        f"🃏 ไพ่ที่คุณได้:\n\n" + "\n\n".join(card_blocks) + "\n\n"
-        f"📝 **สรุปคำทำนาย:**\n{summary}"
-    )
+import random
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from redis.asyncio import Redis
+
+from modules.tarot.tarot_card import TOPICS, TarotCard
+from modules.tarot.tarot_deck import get_deck
+from modules.tarot.spreads import THREE_CARD, Spread, SpreadEngine
+from modules.tarot import summary_cache
+from modules.nlp.openai_utils import summarize_tarot_reading
+
+SUMMARY_PENDING = "⏳ แม่หมอกำลังสรุปคำทำนายให้อยู่นะ..."
+
+
+_engine: Optional[SpreadEngine] = None
+
+
+@dataclass
+class TarotReading:
+    topic: Optional[str]  # None = ไพ่ประจำวันแบบดูทุกหัวข้อ (ไม่ต้องสรุป)
+    cards: List[Tuple[TarotCard, bool]]  # (ไพ่, กลับหัวไหม) ตามลำดับตำแหน่งในสเปรด
+    key: str
+    summary: Optional[str] = None
+    spread: Spread = THREE_CARD
+
+
+def _get_engine() -> SpreadEngine:
+    global _engine
+    if _engine is None:
+        _engine = SpreadEngine(len(get_deck()))
+    return _engine
+
+
+def draw_multiple_cards(n=3, seed: Optional[int] = None):
+    """ จั่ว n ใบ ถ้าให้ seed มาจะได้ผลเดิมทุกครั้ง """
+    deck = get_deck()
+    if seed is None:
+        seed = random.getrandbits(64)
+    return [(deck[i], is_reversed) for i, is_reversed in _get_engine().draw(n, seed)]
+
+
+def _direction(is_reversed: bool) -> str:
+    return "กลับหัว" if is_reversed else "ปกติ"
+
+
+def _meaning(card: TarotCard, topic: str, is_reversed: bool) -> str:
+    return card.get_meaning(topic, is_reversed) or "❌ ไม่พบคำทำนายในหัวข้อนี้"
+
+
+def create_reading(
+    topic: Optional[str],
+    spread: Spread = THREE_CARD,
+    seed: Optional[int] = None,
+) -> TarotReading:
+    """ จั่วไพ่ตามสเปรด + หา summary ที่มีอยู่แล้วใน memory/ไฟล์ (ไม่เรียก GPT) """
+    cards = draw_multiple_cards(spread.size, seed)
+    if topic is None:
+        return TarotReading(None, cards, "", "", spread)
+
+    key = summary_cache.combo_key(topic, ((card.name, rev) for card, rev in cards))
+    return TarotReading(topic, cards, key, summary_cache.get_local(key), spread)
+
+
+def build_summary_input(topic: str, cards: List[Tuple[TarotCard, bool]]) -> str:
+    # เรียงไพ่ให้ตรงกับ cache key เพื่อให้ GPT ได้ input เดียวกันไม่ว่าจะจั่วลำดับไหน
+    ordered = sorted(cards, key=lambda c: (c[0].name, c[1]))
+    return "\n".join(
+        f"{card.name} ({_direction(rev)}): {_meaning(card, topic, rev)}"
+        for card, rev in ordered
+    )
+
+
+async def summarize_reading(reading: TarotReading, redis_instance: Optional[Redis] = None) -> str:
+    """ เติม summary: cache (memory → ไฟล์ → Redis) ก่อน ถ้าไม่มีค่อยเรียก GPT """
+    if reading.topic is None:
+        return ""
+
+    if reading.summary:
+        return reading.summary
+
+    summary = await summary_cache.get_summary(redis_instance, reading.key)
+    if not summary:
+        summary = await summarize_tarot_reading(
+            build_summary_input(reading.topic, reading.cards), reading.topic
+        )
+        # ข้อความ error จาก summarize_tarot_reading ขึ้นต้นด้วย ⚠️ ไม่ต้อง cache
+        if not summary.startswith("⚠️"):
+            await summary_cache.store_summary(redis_instance, reading.key, summary)
+
+    reading.summary = summary
+    return summary
+
+
+def _card_block(reading: TarotReading, position: str, card: TarotCard, rev: bool) -> str:
+    header = f"🔹 {position}: **{card.name}** ({_direction(rev)})"
+    if reading.topic is not None:
+        return f"{header}\n💬 _{_meaning(card, reading.topic, rev)}_"
+
+    meanings = "\n".join(f"💬 {topic}: _{_meaning(card, topic, rev)}_" for topic in TOPICS)
+    return f"{header}\n{meanings}"
+
+
+def render_summary(reading: TarotReading) -> str:
+    return f"📝 **สรุปคำทำนาย:**\n{reading.summary or SUMMARY_PENDING}"
+
+
+def render_reading(reading: TarotReading, include_summary: bool = True) -> str:
+    card_blocks = [
+        _card_block(reading, position, card, rev)
+        for position, (card, rev) in zip(reading.spread.positions, reading.cards)
+    ]
+
+    if reading.topic is None:
+        return f"🌅 **{reading.spread.name}ของคุณ:**\n\n" + "\n\n".join(card_blocks)
+
+    content = (
+        f"🔮 **คำทำนายเรื่อง {reading.topic} ของคุณ ({reading.spread.name}):**\n\n"
+        f"🃏 ไพ่ที่คุณได้:\n\n" + "\n\n".join(card_blocks)
+    )
+    if include_summary:
+        content += "\n\n" + render_summary(reading)
+    return content
+
+
+async def draw_cards_and_interpret_by_topic(topic: str, redis_instance: Optional[Redis] = None) -> str:
+    reading = create_reading(topic)
+    await summarize_reading(reading, redis_instance)
+    return render_reading(reading)
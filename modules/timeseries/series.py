@@ -0,0 +1,172 @@
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from itertools import accumulate, islice
+from typing import Optional, Tuple
+
+# ✅ time series แบบ columnar: เวลา (epoch วินาที) กับค่า แยกกันเป็น array('d') สองคอลัมน์
+#    query หา index ด้วย bisect แล้วใช้ index ที่อัปเดตตอน append:
+#    - prefix sum → ค่าเฉลี่ยช่วงไหนก็ได้ O(1)
+#    - min/max ต่อบล็อกละ BLOCK จุด → min/max ช่วงไหนก็ได้ดูแค่ ~2 บล็อกปลาย + สรุปของบล็อกตรงกลาง
+
+BLOCK = 256
+
+
+@dataclass(frozen=True)
+class WindowStats:
+    count: int
+    start_ts: float        # เวลาของจุดอ้างอิง (จุดสุดท้ายก่อนเริ่มช่วง ถ้ามี)
+    end_ts: float
+    first: float
+    last: float
+    low: float
+    high: float
+    mean: float
+
+    @property
+    def change(self) -> float:
+        return self.last - self.first
+
+    @property
+    def change_pct(self) -> float:
+        return self.change / self.first * 100 if self.first else 0.0
+
+
+class TimeSeries:
+    def __init__(self, name: str, times: Optional[array] = None, values: Optional[array] = None):
+        self.name = name
+        self.times = array("d")
+        self.values = array("d")
+        self._prefix = array("d", [0.0])      # _prefix[i] = ผลรวมของ values[:i]
+        self._block_min = array("d")
+        self._block_max = array("d")
+        if times is not None and values is not None:
+            self.extend(times, values)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def append(self, ts: float, value: float) -> None:
+        if self.times and ts < self.times[-1]:
+            raise ValueError(f"{self.name}: เวลาต้องเรียงจากเก่าไปใหม่ ({ts} < {self.times[-1]})")
+        position = len(self.values)
+        self.times.append(ts)
+        self.values.append(value)
+        self._prefix.append(self._prefix[-1] + value)
+        if position % BLOCK == 0:
+            self._block_min.append(value)
+            self._block_max.append(value)
+        else:
+            block = position // BLOCK
+            if value < self._block_min[block]:
+                self._block_min[block] = value
+            if value > self._block_max[block]:
+                self._block_max[block] = value
+
+    def extend(self, times: array, values: array) -> None:
+        """ ต่อท้ายทีละหลายจุด (ตอนโหลดจากไฟล์) สร้าง prefix sum / บล็อกใหม่เฉพาะส่วนที่เพิ่ม """
+        if len(times) != len(values):
+            raise ValueError(f"{self.name}: จำนวนเวลากับค่าไม่เท่ากัน")
+        if not len(times):
+            return
+        if self.times and times[0] < self.times[-1]:
+            raise ValueError(f"{self.name}: เวลาต้องเรียงจากเก่าไปใหม่ ({times[0]} < {self.times[-1]})")
+        start = len(self.values)
+        self.times.extend(times)
+        self.values.extend(values)
+        self._prefix.extend(islice(accumulate(values, initial=self._prefix[-1]), 1, None))
+
+        first_block = start // BLOCK
+        del self._block_min[first_block:]
+        del self._block_max[first_block:]
+        view = memoryview(self.values)
+        for offset in range(first_block * BLOCK, len(view), BLOCK):
+            chunk = view[offset:offset + BLOCK]
+            self._block_min.append(min(chunk))
+            self._block_max.append(max(chunk))
+
+    def _range(self, start: int, end: int, pick, blocks: array) -> float:
+        """ min/max ของ values[start:end] โดยใช้สรุปของบล็อกที่อยู่เต็มในช่วง """
+        values = memoryview(self.values)
+        first_block = -(-start // BLOCK)
+        last_block = end // BLOCK
+        if first_block >= last_block:
+            return pick(values[start:end])
+        parts = [pick(blocks[first_block:last_block])]
+        if start < first_block * BLOCK:
+            parts.append(pick(values[start:first_block * BLOCK]))
+        if last_block * BLOCK < end:
+            parts.append(pick(values[last_block * BLOCK:end]))
+        return pick(parts)
+
+    def mean(self, start: int, end: int) -> float:
+        return (self._prefix[end] - self._prefix[start]) / (end - start)
+
+    def trailing_mean(self, points: int, end: Optional[int] = None) -> float:
+        """ ค่าเฉลี่ยของ points จุดสุดท้าย (ถึง index end) """
+        end = len(self.values) if end is None else end
+        return self.mean(max(0, end - points), end)
+
+    @property
+    def latest(self) -> Optional[Tuple[float, float]]:
+        return (self.times[-1], self.values[-1]) if self.times else None
+
+    def index_at(self, ts: float) -> int:
+        """ จำนวนจุดที่เวลา <= ts """
+        return bisect_right(self.times, ts)
+
+    def value_at(self, ts: float) -> Optional[Tuple[float, float]]:
+        """ จุดล่าสุดที่เวลา <= ts """
+        i = bisect_right(self.times, ts) - 1
+        return (self.times[i], self.values[i]) if i >= 0 else None
+
+    def _bounds(self, since: float, until: Optional[float] = None) -> Tuple[int, int]:
+        start = bisect_left(self.times, since)
+        end = len(self.times) if until is None else bisect_right(self.times, until)
+        return start, end
+
+    def window(self, since: float, until: Optional[float] = None) -> memoryview:
+        start, end = self._bounds(since, until)
+        return memoryview(self.values)[start:end]
+
+    def stats(self, seconds: float, now: Optional[float] = None) -> Optional[WindowStats]:
+        """
+        สรุปช่วง seconds ล่าสุด: ใช้จุดสุดท้ายก่อนเริ่มช่วงเป็นจุดตั้งต้น (ข้อมูลห่าง ๆ ก็ยังเทียบได้)
+        คืน None ถ้ามีไม่ถึง 2 จุด
+        """
+        now = time.time() if now is None else now
+        since = now - seconds
+        start, end = self._bounds(since, now)
+        if start > 0:
+            start -= 1
+        if end - start < 2:
+            return None
+        return WindowStats(
+            count=end - start,
+            start_ts=self.times[start],
+            end_ts=self.times[end - 1],
+            first=self.values[start],
+            last=self.values[end - 1],
+            low=self._range(start, end, min, self._block_min),
+            high=self._range(start, end, max, self._block_max),
+            mean=self.mean(start, end),
+        )
+
+    def delta(self, seconds: float, now: Optional[float] = None) -> Optional[float]:
+        """ ค่าล่าสุด − ค่า ณ seconds ที่แล้ว """
+        now = time.time() if now is None else now
+        current = self.value_at(now)
+        before = self.value_at(now - seconds)
+        if current is None or before is None:
+            return None
+        return current[1] - before[1]
+
+    def moving_average(self, points: int, since: float = float("-inf")) -> array:
+        """ ค่าเฉลี่ยเคลื่อนที่ points จุด ของทุกจุดตั้งแต่ since (จาก prefix sum ไม่ต้องบวกซ้ำ) """
+        start, end = self._bounds(since)
+        prefix = self._prefix
+        return array("d", (
+            (prefix[i + 1] - prefix[max(start, i + 1 - points)]) / min(points, i + 1 - start)
+            for i in range(start, end)
+        ))
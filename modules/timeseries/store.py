@@ -0,0 +1,172 @@
+import math
+import mmap
+import os
+import re
+import time
+from array import array
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:       # Windows (เครื่อง dev) ไม่มี flock ใช้ได้แค่ process เดียว
+    fcntl = None
+
+from modules.core.logger import logger
+from modules.timeseries.series import TimeSeries
+
+# ✅ เก็บทุก snapshot ที่ดึงมา (ทอง / น้ำมัน / ค่าเงิน) ลงไฟล์ต่อ instrument: <name>.ts
+#    แต่ละจุดเป็น record (เวลา, ค่า) float64 คู่กัน (byte order ของเครื่อง) ต่อกันเฉย ๆ
+#    → numpy.memmap(path, dtype=[("t", "f8"), ("v", "f8")]) อ่านได้ตรง ๆ
+#    หลาย process (shard) เขียนไฟล์เดียวกันได้: เขียนทีละ record ด้วย write ครั้งเดียวภายใต้ flock
+#    (เวลากับค่าไม่มีทางสลับคู่ และเช็คลำดับเวลากับจุดล่าสุดในไฟล์ก่อนเขียน) ตอน query อ่านเฉพาะ record ที่เพิ่ม
+#    record ที่เสีย (เวลาย้อน / ไม่ใช่ตัวเลข) ข้ามไป เศษท้ายไฟล์ที่เขียนไม่ครบไม่อ่าน และตัดทิ้งตอนเขียนครั้งถัดไป
+
+TIMESERIES_DIR = os.getenv("TIMESERIES_DIR", os.path.join("data", "timeseries"))
+MIN_INTERVAL = 60.0        # ค่าเท่าเดิมภายในกี่วินาทีถือว่าเป็น snapshot ซ้ำ ไม่ต้องเก็บ
+ITEM_SIZE = array("d").itemsize
+RECORD_SIZE = 2 * ITEM_SIZE
+
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def _read_records(path: str, offset_records: int = 0) -> array:
+    """ record ที่ครบแล้วตั้งแต่ offset_records (array แบบ t0, v0, t1, v1, ...) """
+    records = array("d")
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return records
+    end = size - size % RECORD_SIZE   # ตัดเศษที่อาจเขียนไม่ครบ
+    if end <= offset_records * RECORD_SIZE:
+        return records
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            records.frombytes(mapped[offset_records * RECORD_SIZE:end])
+    return records
+
+
+def _read_column(path: str) -> array:
+    """ ไฟล์คอลัมน์เดี่ยวแบบเดิม (<name>.t / <name>.v) ใช้ตอนย้ายข้อมูลเก่า """
+    column = array("d")
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return column
+    column.frombytes(data[:len(data) - len(data) % ITEM_SIZE])
+    return column
+
+
+class SeriesStore:
+    def __init__(self, directory: str = TIMESERIES_DIR):
+        self.directory = directory
+        self._series: Dict[str, TimeSeries] = {}
+        self._offsets: Dict[str, int] = {}     # name → อ่าน record ในไฟล์ไปแล้วกี่ตัว (รวมตัวที่ข้าม)
+
+    def _base(self, name: str) -> str:
+        return os.path.join(self.directory, _SAFE_NAME.sub("_", name.replace(":", ".")))
+
+    def _path(self, name: str) -> str:
+        return self._base(name) + ".ts"
+
+    def _refresh(self, series: TimeSeries) -> None:
+        offset = self._offsets.get(series.name, 0)
+        records = _read_records(self._path(series.name), offset)
+        if not records:
+            return
+        times, values = array("d"), array("d")
+        last = series.times[-1] if len(series) else -math.inf
+        skipped = 0
+        for i in range(0, len(records), 2):
+            ts, value = records[i], records[i + 1]
+            if not (math.isfinite(ts) and math.isfinite(value)) or ts < last:
+                skipped += 1
+                continue
+            times.append(ts)
+            values.append(value)
+            last = ts
+        if skipped:
+            logger.warning("⚠️ time series %s: ข้าม record ที่เสีย %s จุด", series.name, skipped)
+        self._offsets[series.name] = offset + len(records) // 2
+        series.extend(times, values)
+
+    def _migrate(self, name: str) -> None:
+        """ ไฟล์คู่ .t / .v แบบเดิม → .ts (ทำครั้งเดียว ตอนยังไม่มี .ts) """
+        base = self._base(name)
+        times, values = _read_column(base + ".t"), _read_column(base + ".v")
+        count = min(len(times), len(values))
+        if not count:
+            return
+        records = array("d")
+        last = -math.inf
+        for ts, value in zip(times[:count], values[:count]):
+            if ts >= last:
+                records.extend((ts, value))
+                last = ts
+        with open(self._path(name), "ab") as f:
+            if f.tell() == 0:
+                f.write(records.tobytes())
+        for path in (base + ".t", base + ".v"):
+            os.remove(path)
+        logger.info("🔁 ย้าย time series %s เป็นไฟล์เดียว (%s จุด)", name, len(records) // 2)
+
+    def series(self, name: str) -> TimeSeries:
+        """ series ในหน่วยความจำ (อ่านส่วนที่ process อื่นเขียนเพิ่มด้วย) """
+        series = self._series.get(name)
+        if series is None:
+            series = self._series[name] = TimeSeries(name)
+            if not os.path.exists(self._path(name)) and os.path.exists(self._base(name) + ".t"):
+                try:
+                    self._migrate(name)
+                except OSError as e:
+                    logger.warning("⚠️ ย้าย time series %s ไม่ได้: %s", name, e)
+        try:
+            self._refresh(series)
+        except (OSError, ValueError) as e:
+            logger.warning("⚠️ อ่าน time series %s ไม่ได้: %s", name, e)
+        return series
+
+    def record(self, name: str, value: float, ts: Optional[float] = None) -> bool:
+        """ เพิ่ม snapshot (ข้ามถ้าค่าเท่าจุดล่าสุดและห่างกันไม่ถึง MIN_INTERVAL) คืน True ถ้าเก็บจริง """
+        series = self.series(name)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self._path(name), "ab") as f:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX)     # ปลดเองตอนปิดไฟล์
+                size = f.seek(0, os.SEEK_END)
+                if size % RECORD_SIZE:
+                    f.truncate(size - size % RECORD_SIZE)   # เศษจาก writer ที่ตายกลางทาง ไม่งั้น record ต่อจากนี้เหลื่อมหมด
+                # ถือ lock แล้ว: อ่านจุดที่ process อื่นเพิ่งเขียน เทียบกับจุดล่าสุดจริงในไฟล์
+                self._refresh(series)
+                if ts is None:
+                    ts = time.time()    # เอาเวลาหลังได้ lock ไม่งั้น shard ที่รอ lock อยู่ได้เวลาเก่ากว่าจุดที่เพิ่งเขียน
+                latest = series.latest
+                if latest is not None and (ts < latest[0] or (latest[1] == value and ts - latest[0] < MIN_INTERVAL)):
+                    return False
+                f.write(array("d", [ts, value]).tobytes())
+                f.flush()
+            self._refresh(series)
+        except (OSError, ValueError) as e:
+            logger.warning("⚠️ เขียน time series %s ไม่ได้: %s", name, e)
+            return False
+        return True
+
+
+_store: Optional[SeriesStore] = None
+
+
+def get_store() -> SeriesStore:
+    global _store
+    if _store is None:
+        _store = SeriesStore()
+    return _store
+
+
+def record_snapshot(name: str, value) -> None:
+    """ ใช้ใน feature ตอนดึงราคาได้: รับ "41,250.00" / 41250 / "-" (ค่าที่ไม่ใช่ตัวเลขข้ามไป) """
+    try:
+        number = float(str(value).replace(",", ""))
+    except ValueError:
+        return
+    get_store().record(name, number)
@@ -0,0 +1,132 @@
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+from modules.memory.user_profile import DEFAULT_TIMEZONE, get_tzinfo
+from modules.timeseries.series import TimeSeries, WindowStats
+from modules.timeseries.store import SeriesStore, get_store
+
+# ✅ ตอบคำถามแนวโน้ม ("ทองขึ้นหรือลง", "น้ำมันเดือนนี้", "ดอลลาร์ 30 วัน") จาก time series ในเครื่อง ไม่ผ่าน GPT
+
+
+@dataclass(frozen=True)
+class Instrument:
+    name: str          # ชื่อ series ใน store
+    topic: str         # หัวข้อของ message_matcher
+    label: str
+    unit: str
+    keywords: tuple = ()
+    decimals: int = 2
+
+
+INSTRUMENTS = [
+    Instrument("gold:bar_sell", "gold", "ทองคำแท่งขายออก", "บาท", ("ขาย",), 0),
+    Instrument("gold:bar_buy", "gold", "ทองคำแท่งรับซื้อ", "บาท", ("รับซื้อ", "ซื้อ"), 0),
+    Instrument("oil:gasohol95", "oil", "แก๊สโซฮอล์ 95", "บาท/ลิตร", ("95",)),
+    Instrument("oil:gasohol91", "oil", "แก๊สโซฮอล์ 91", "บาท/ลิตร", ("91",)),
+    Instrument("oil:diesel", "oil", "ดีเซล", "บาท/ลิตร", ("ดีเซล", "diesel")),
+    Instrument("fx:USD", "exchange", "ดอลลาร์สหรัฐ (USD)", "บาท", ("usd", "ดอลลาร์", "ดอล")),
+    Instrument("fx:EUR", "exchange", "ยูโร (EUR)", "บาท", ("eur", "ยูโร")),
+    Instrument("fx:JPY", "exchange", "เยน (JPY)", "บาท", ("jpy", "เยน"), 4),
+    Instrument("fx:CNY", "exchange", "หยวน (CNY)", "บาท", ("cny", "หยวน")),
+]
+# ถ้าไม่ได้ระบุ ตอบตัวไหน
+DEFAULTS = {"gold": ["gold:bar_sell"], "oil": ["oil:gasohol95", "oil:gasohol91", "oil:diesel"], "exchange": ["fx:USD"]}
+
+DAY = 86400.0
+TREND_WORDS = re.compile(
+    r"ขึ้น|ลง|แนวโน้ม|เทรนด์|trend|ย้อนหลัง|สัปดาห์|อาทิตย์|เดือน|ปีนี้|\d+\s*วัน|เมื่อวาน|เทียบ|กราฟ|สูงสุด|ต่ำสุด|เฉลี่ย",
+    re.IGNORECASE,
+)
+WINDOW_PATTERN = re.compile(r"(\d+)\s*(วัน|สัปดาห์|อาทิตย์|เดือน|ปี)")
+UNIT_SECONDS = {"วัน": DAY, "สัปดาห์": 7 * DAY, "อาทิตย์": 7 * DAY, "เดือน": 30 * DAY, "ปี": 365 * DAY}
+FLAT_PCT = 0.1             # เปลี่ยนน้อยกว่านี้ (%) ถือว่าทรงตัว
+MOVING_AVERAGE_POINTS = 5
+
+
+def is_trend_question(text: str) -> bool:
+    return bool(TREND_WORDS.search(text))
+
+
+def parse_window(text: str) -> float:
+    """ ช่วงเวลาที่ถาม (วินาที) ไม่ระบุ = 7 วัน """
+    match = WINDOW_PATTERN.search(text)
+    if match:
+        return int(match.group(1)) * UNIT_SECONDS[match.group(2)]
+    if "เมื่อวาน" in text or "วันนี้" in text:
+        return DAY
+    for word in ("ปี", "เดือน", "สัปดาห์", "อาทิตย์"):
+        if word in text:
+            return UNIT_SECONDS[word]
+    return 7 * DAY
+
+
+def window_label(seconds: float) -> str:
+    days = round(seconds / DAY)
+    if days <= 1:
+        return "24 ชั่วโมงที่ผ่านมา"
+    if days % 365 == 0:
+        return f"{days // 365} ปีที่ผ่านมา" if days > 365 else "1 ปีที่ผ่านมา"
+    if days % 30 == 0:
+        return f"{days // 30} เดือนที่ผ่านมา"
+    if days % 7 == 0:
+        return f"{days // 7} สัปดาห์ที่ผ่านมา"
+    return f"{days} วันที่ผ่านมา"
+
+
+def pick_instruments(topic: str, text: str) -> List[Instrument]:
+    lowered = text.lower()
+    candidates = [i for i in INSTRUMENTS if i.topic == topic]
+    chosen = [i for i in candidates if any(k in lowered for k in i.keywords)]
+    if chosen:
+        return chosen
+    names = DEFAULTS.get(topic, [])
+    return [i for i in candidates if i.name in names]
+
+
+def _fmt(value: float, instrument: Instrument) -> str:
+    return f"{value:,.{instrument.decimals}f}"
+
+
+def _when(ts: float) -> str:
+    return datetime.fromtimestamp(ts, get_tzinfo(DEFAULT_TIMEZONE)).strftime("%d/%m %H:%M")
+
+
+def render_instrument(instrument: Instrument, series: TimeSeries, stats: WindowStats) -> str:
+    if abs(stats.change_pct) < FLAT_PCT:
+        direction = f"➡️ ทรงตัว ({stats.change:+,.{instrument.decimals}f} {instrument.unit})"
+    elif stats.change > 0:
+        direction = f"📈 ขึ้น {_fmt(stats.change, instrument)} {instrument.unit} (+{stats.change_pct:.2f}%)"
+    else:
+        direction = f"📉 ลง {_fmt(-stats.change, instrument)} {instrument.unit} ({stats.change_pct:.2f}%)"
+
+    lines = [
+        f"**{instrument.label}**",
+        f"{direction} จาก {_fmt(stats.first, instrument)} ({_when(stats.start_ts)}) "
+        f"→ {_fmt(stats.last, instrument)} ({_when(stats.end_ts)})",
+        f"ต่ำสุด {_fmt(stats.low, instrument)} · สูงสุด {_fmt(stats.high, instrument)} · "
+        f"เฉลี่ย {_fmt(stats.mean, instrument)} {instrument.unit} ({stats.count} จุด)",
+    ]
+    if stats.count > MOVING_AVERAGE_POINTS:
+        average = series.trailing_mean(MOVING_AVERAGE_POINTS, series.index_at(stats.end_ts))
+        side = "เหนือ" if stats.last > average else "ต่ำกว่า" if stats.last < average else "เท่ากับ"
+        lines.append(f"ราคาล่าสุดอยู่{side}ค่าเฉลี่ย {MOVING_AVERAGE_POINTS} จุดล่าสุด ({_fmt(average, instrument)})")
+    return "\n".join(lines)
+
+
+def answer_trend(topic: str, text: str, store: Optional[SeriesStore] = None, now: Optional[float] = None) -> Optional[str]:
+    """ ข้อความตอบคำถามแนวโน้ม หรือ None ถ้ายังเก็บข้อมูลไม่พอ (ให้ผู้เรียกไปใช้ราคาล่าสุดแทน) """
+    store = store or get_store()
+    now = time.time() if now is None else now
+    seconds = parse_window(text)
+    sections = []
+    for instrument in pick_instruments(topic, text):
+        series = store.series(instrument.name)
+        stats = series.stats(seconds, now)
+        if stats is not None:
+            sections.append(render_instrument(instrument, series, stats))
+    if not sections:
+        return None
+    return f"📊 ช่วง {window_label(seconds)}\n\n" + "\n\n".join(sections)
@@ -119,3 +119,20 @@ def format_response_markdown(text: str) -> str:
     formatted_text = re.sub(r'\*\*(.+?)\*\*', r'**\1**', formatted_text)
 
     return formatted_text.strip()
+
+# ✅ คำตอบที่โดนตัดเพราะชน max_tokens: ตัดกลับไปจบที่ประโยคสุดท้ายที่สมบูรณ์
+SENTENCE_END = re.compile(r'[.!?…。](?=\s|$)|\n|(?<=[ก-๙])\s+(?=[^\sๆ])|(?:ครับ|ค่ะ|คะ|นะ|จ้า|จ้ะ)(?=\s|$)')
+
+def trim_to_sentence(text: str, min_keep: float = 0.5) -> str:
+    """ ตัดท้ายที่ขาดกลางประโยคทิ้ง ถ้าจุดตัดอยู่ก่อน min_keep ของข้อความ ใส่ "…" ต่อท้ายแทน """
+    text = text.rstrip()
+    cut = 0
+    for match in SENTENCE_END.finditer(text):
+        cut = match.end()
+    if cut < len(text) * min_keep:
+        trimmed = text + "…"
+    else:
+        trimmed = text[:cut].rstrip()
+    if trimmed.count("```") % 2:
+        trimmed += "\n```"
+    return trimmed
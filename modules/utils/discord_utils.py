@@ -1,5 +1,10 @@
+import re
+from typing import List
+
 import discord
 
+from modules.utils.cleaner import clean_output_text
+
 async def send_message_to_channel(bot: discord.Client, channel_id: int, message: str):
     """
     ส่งข้อความไปยังห้อง Discord โดยรับ bot จากภายนอก (ไม่ import main)
@@ -10,3 +15,37 @@ async def send_message_to_channel(bot: discord.Client, channel_id: int, message:
             await channel.send(message)
     except Exception as e:
         print(f"[ERROR] ไม่สามารถส่งข้อความไปยัง Discord Channel: {e}")
+
+def split_message(content: str, limit: int = 2000) -> List[str]:
+    """
+    แบ่งข้อความยาวเป็นหลายก้อน (ตัดตามย่อหน้า) ให้แต่ละก้อนไม่เกิน limit ตัวอักษร
+    """
+    chunks = re.split(r'(?<=\n\n)', content)
+    parts = []
+    current_chunk = ""
+
+    for paragraph in chunks:
+        if len(current_chunk) + len(paragraph) < limit:
+            current_chunk += paragraph
+        else:
+            if current_chunk:
+                parts.append(current_chunk.strip())
+            current_chunk = paragraph
+
+    if current_chunk.strip():
+        parts.append(current_chunk.strip())
+    return parts
+
+def format_reply(content: str) -> str:
+    """
+    clean คำตอบของบอท + แปลงลิงก์ให้ Discord ไม่ทำ embed
+    """
+    content = clean_output_text(content)
+
+    # ลบ markdown [text](url) -> text <url>
+    content = re.sub(r'\[([^\]]+)\]\((https?://[^\)]+)\)', r'\1 <\2>', content)
+    # ลบลิงก์เปล่า ๆ
+    content = re.sub(r'(?<!<)(https?://\S+)(?!>)', r'<\1>', content)
+    # ลบ ** เดี่ยว ๆ ที่หลงมา
+    content = re.sub(r'(?<!\*)\*\*(?!\*)', '', content)
+    return content
@@ -1,6 +1,10 @@
 import re
-from modules.core.openai_client import client as openai_client
+from typing import Optional
+
+from modules.core import deadline
+from modules.core.model_router import CHAT, complete
 from modules.core.logger import logger
+from modules.utils.cleaner import trim_to_sentence
 
 # 🔧 Keywords ใช้ได้
 COMMON_GREETINGS = [
@@ -26,39 +30,65 @@ def is_about_bot(text: str) -> bool:
 
 async def get_openai_response(
     messages: list,
-    model: str = "gpt-4o-mini",
+    request_class: str = CHAT,
     max_tokens: int = 1800,
     temperature: float = 0.6,
     top_p: float = 1.0,
     frequency_penalty: float = 0.2,
     presence_penalty: float = 0.3,
+    usage_label: str = "",
+    trim_incomplete: bool = False,
+    prompt_cache_key: Optional[str] = None,
 ) -> str:
     try:
-        response = await openai_client.chat.completions.create(
-            model=model,
+        extra = {"prompt_cache_key": prompt_cache_key} if prompt_cache_key else {}
+        # ✅ โมเดลเลือกโดย model_router ตามประเภทงาน (สลับไปตัวสำรองเองถ้าตัวแรกช้า / พลาด)
+        request = complete(
+            request_class,
             messages=messages,
             max_tokens=max_tokens,
             temperature=temperature,
             top_p=top_p,
             frequency_penalty=frequency_penalty,
             presence_penalty=presence_penalty,
+            **extra,
         )
+        # ✅ อยู่ใต้ deadline ของข้อความ (generate_reply) ได้เวลาแค่ที่เหลือ รวม retry ของ SDK ด้วย
+        left = deadline.remaining()
+        response = await (deadline.within(request, left) if left is not None else request)
+
+        finish_reason = response.choices[0].finish_reason if response.choices else None
 
-        # ✅ log token usage (ถ้ามี usage object)
+        # ✅ log token usage (ถ้ามี usage object) เทียบกับงบ max_tokens ที่ให้ไป
         if hasattr(response, "usage") and response.usage:
             input_tokens = response.usage.prompt_tokens
             output_tokens = response.usage.completion_tokens
             total_tokens = response.usage.total_tokens
-            logger.info(f"🧮 Token Usage → Input: {input_tokens} | Output: {output_tokens} | Total: {total_tokens}")
+            details = getattr(response.usage, "prompt_tokens_details", None)
+            cached_tokens = (getattr(details, "cached_tokens", None) or 0) if details else 0
+            label = f" [{usage_label} {response.model}]" if usage_label else f" [{response.model}]"
+            logger.info(
+                "🧮 Token Usage%s → Input: %s (cached %s) | Output: %s/%s (%.0f%%) | Total: %s | finish: %s",
+                label, input_tokens, cached_tokens, output_tokens, max_tokens,
+                100 * output_tokens / max_tokens, total_tokens, finish_reason,
+                extra={"model": response.model, "tokens_in": input_tokens, "tokens_cached": cached_tokens,
+                       "tokens_out": output_tokens},
+            )
 
         # ✅ ดึง content ออกอย่างปลอดภัย
         if response.choices and response.choices[0].message and response.choices[0].message.content:
             content = response.choices[0].message.content.strip()
+            if trim_incomplete and finish_reason == "length":
+                # ✅ ชนงบ max_tokens กลางประโยค ตัดกลับไปจบที่ประโยคที่สมบูรณ์
+                content = trim_to_sentence(content)
             return content
         else:
             logger.warning("⚠️ No valid choices returned from OpenAI")
             return "⚠️ พี่หลามงงเลย ตอบไม่ได้จริง ๆ จ้า"
 
+    except deadline.DeadlineExceeded as e:
+        logger.error("⏱️ GPT ตอบไม่ทันเวลา: %s", e)
+        return "⚠️ พี่หลามคิดนานเกินไป ลองถามใหม่อีกทีนะครับ"
     except Exception as e:
-        logger.error(f"❌ GPT Error: {e}")
+        logger.error("❌ GPT Error: %s", e)
         return "⚠️ พี่หลามขัดข้องชั่วคราว ขออภัยด้วยครับ"
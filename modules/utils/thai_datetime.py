@@ -1,7 +1,8 @@
 from datetime import datetime
-import pytz
 from redis.asyncio import Redis
 
+from modules.memory.user_profile import DEFAULT_TIMEZONE, get_profile, get_tzinfo
+
 # แปลงชื่อวันและเดือนเป็นภาษาไทย
 thai_days = ["วันจันทร์", "วันอังคาร", "วันพุธ", "วันพฤหัสบดี", "วันศุกร์", "วันเสาร์", "วันอาทิตย์"]
 thai_months = [
@@ -19,13 +20,10 @@ def format_thai_datetime(dt: datetime) -> str:
     return f"{day_name}ที่ {day} {month} {year} เวลา {time_str} น."
 
 def get_thai_datetime_now() -> str:
-    tz = pytz.timezone("Asia/Bangkok")
-    now = datetime.now(tz)
+    now = datetime.now(get_tzinfo(DEFAULT_TIMEZONE))
     return format_thai_datetime(now)
 
 async def get_thai_datetime_by_user(redis_instance: Redis, user_id: int) -> str:
     """ คืนค่าเวลาตาม timezone ของผู้ใช้ (ถ้าไม่กำหนดจะใช้ Asia/Bangkok) """
-    zone = await redis_instance.get(f"timezone:{user_id}") or "Asia/Bangkok"
-    tz = pytz.timezone(zone)
-    now = datetime.now(tz)
-    return format_thai_datetime(now)
+    profile = await get_profile(redis_instance, user_id)
+    return format_thai_datetime(datetime.now(profile.tzinfo))
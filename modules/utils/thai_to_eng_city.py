@@ -1,3 +1,5 @@
+from modules.weather.gazetteer import lookup_place
+
 THAI_TO_ENGLISH_CITY = {
     "กรุงเทพ": "Bangkok",
     "กรุงเทพฯ": "Bangkok",
@@ -17,9 +19,32 @@ THAI_TO_ENGLISH_CITY = {
     "หาดใหญ่": "Hat Yai",
     "พัทยา": "Pattaya",
     # เพิ่มจังหวัดอื่น ๆ ได้ตามต้องการ
+    # ✅ ต่างประเทศที่คนถามบ่อย (ชื่อประเทศ → เมืองหลวง / เมืองหลัก ให้ OpenWeather หาเจอ)
+    "ญี่ปุ่น": "Tokyo",
+    "โตเกียว": "Tokyo",
+    "โอซาก้า": "Osaka",
+    "เกาหลี": "Seoul",
+    "โซล": "Seoul",
+    "จีน": "Beijing",
+    "ปักกิ่ง": "Beijing",
+    "เซี่ยงไฮ้": "Shanghai",
+    "ฮ่องกง": "Hong Kong",
+    "ไต้หวัน": "Taipei",
+    "ไทเป": "Taipei",
+    "สิงคโปร์": "Singapore",
+    "เวียดนาม": "Hanoi",
+    "ลาว": "Vientiane",
+    "ลอนดอน": "London",
+    "ปารีส": "Paris",
+    "นิวยอร์ก": "New York",
 }
 
 
 def convert_thai_to_english_city(city_name: str) -> str:
     city_name = city_name.strip()
-    return THAI_TO_ENGLISH_CITY.get(city_name, city_name)
+    if city_name in THAI_TO_ENGLISH_CITY:
+        return THAI_TO_ENGLISH_CITY[city_name]
+
+    # ✅ ไม่อยู่ใน mapping ด้านบน → ลองหาใน gazetteer จังหวัด/อำเภอ
+    place = lookup_place(city_name)
+    return place.en if place else city_name
@@ -1,11 +1,55 @@
-import tiktoken
+import time
+from typing import Dict, List, Tuple
+
+from modules.core.logger import logger
+
+RETRY_AFTER = 30.0         # วินาที โหลด BPE ไม่ได้แล้วรอก่อนลองใหม่ (เท่าตัวทุกครั้งที่พลาดซ้ำ)
+MAX_RETRY_AFTER = 600.0
+
+_encodings: Dict[str, object] = {}
+_failures: Dict[str, Tuple[int, float]] = {}   # model → (พลาดติดกันกี่ครั้ง, ลองใหม่ได้เมื่อ)
+
+class ApproxEncoding:
+    """ ใช้แทน tiktoken ตอนโหลด BPE ไม่ได้ (เช่นเครื่องไม่มีเน็ตและไม่มี cache) ประมาณ 4 byte ต่อ token """
+
+    def encode(self, text: str) -> List[int]:
+        return [0] * ((len(text.encode("utf-8")) + 3) // 4)
+
+_APPROX = ApproxEncoding()
+
+def get_encoding(model: str = "gpt-4o-mini"):
+    """
+    โหลด tokenizer ครั้งเดียวต่อ model (import tiktoken ตอนใช้ครั้งแรก)
+    โหลดไม่ได้ใช้การประมาณไปก่อน แต่ไม่จำไว้ถาวร ลองโหลดใหม่เมื่อครบเวลา backoff
+    """
+    encoding = _encodings.get(model)
+    if encoding is not None:
+        return encoding
+    failures, retry_at = _failures.get(model, (0, 0.0))
+    if time.monotonic() < retry_at:
+        return _APPROX
+    import tiktoken
+    try:
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")  # fallback encoding
+    except Exception as e:
+        delay = min(MAX_RETRY_AFTER, RETRY_AFTER * 2 ** failures)
+        _failures[model] = (failures + 1, time.monotonic() + delay)
+        logger.warning("⚠️ โหลด tokenizer ของ %s ไม่ได้ ใช้การประมาณแทน ลองใหม่ใน %.0fs: %s", model, delay, e)
+        return _APPROX
+    _failures.pop(model, None)
+    _encodings[model] = encoding
+    return encoding
+
+def warm_tokenizer(model: str = "gpt-4o-mini") -> None:
+    """ โหลด BPE ล่วงหน้า ข้อความแรกจะได้ไม่ต้องรอ """
+    get_encoding(model).encode("warm up")
 
 # นับจำนวน token ที่ใช้ใน messages list
 def count_tokens(messages: list, model: str = "gpt-4o-mini") -> int:
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        encoding = tiktoken.get_encoding("cl100k_base")  # fallback encoding
+    encoding = get_encoding(model)
 
     tokens_per_message = 3  # แต่ละ message มี overhead ประมาณ 3 token
     tokens_per_name = 1     # ถ้ามี name= ใน message ต้องบวกเพิ่ม
@@ -18,4 +62,28 @@ def count_tokens(messages: list, model: str = "gpt-4o-mini") -> int:
             if key == "name":
                 num_tokens += tokens_per_name
     num_tokens += 3  # เพิ่ม system prompt ตรง start / end
-    return num_tokens
\ No newline at end of file
+    return num_tokens
+
+# นับ token ของข้อความเดียว (ไม่รวม overhead ของ message)
+def count_text_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    return len(get_encoding(model).encode(text))
+
+# ตัดข้อความให้เหลือไม่เกิน max_tokens โดยพยายามตัดที่ขึ้นบรรทัด/เว้นวรรค
+def truncate_to_tokens(text: str, max_tokens: int, model: str = "gpt-4o-mini") -> str:
+    if max_tokens <= 0:
+        return ""
+    encoding = get_encoding(model)
+    tokens = encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+
+    keep = max_tokens - 1  # เผื่อ "…" ท้ายข้อความ
+    if isinstance(encoding, ApproxEncoding):
+        cut = text.encode("utf-8")[: keep * 4].decode("utf-8", errors="ignore")
+    else:
+        cut = encoding.decode(tokens[:keep], errors="ignore")
+
+    boundary = max(cut.rfind("\n"), cut.rfind(" "))
+    if boundary > len(cut) // 2:
+        cut = cut[:boundary]
+    return cut.rstrip() + "…"
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from redis.asyncio import Redis
+
+from modules.core.app_context import get_context
+from modules.core.logger import logger
+from modules.utils.thai_to_eng_city import convert_thai_to_english_city
+from modules.weather.gazetteer import Place
+
+OPENWEATHER_URL = "https://api.openweathermap.org/data/2.5/weather"
+WEATHER_CACHE_TTL = float(os.getenv("WEATHER_CACHE_TTL", "600"))  # วินาที
+
+CacheKey = Tuple[float, float]
+UNKNOWN_NAME_TTL = 3600.0   # วินาที ชื่อที่ OpenWeather ไม่รู้จัก ไม่ถามซ้ำภายในเท่านี้
+
+# ✅ cache ต่อพิกัด: key → (หมดอายุเมื่อ, ข้อมูลดิบจาก OpenWeather)
+_cache: Dict[CacheKey, Tuple[float, dict]] = {}
+# ✅ request ที่กำลังวิ่งอยู่ กันยิงซ้ำตอนหลายคนถามที่เดียวกันพร้อมกัน
+_inflight: Dict[CacheKey, asyncio.Future] = {}
+# ✅ ชื่อที่หาจาก OpenWeather แล้วไม่เจอ → หมดอายุเมื่อ
+_unknown_names: Dict[str, float] = {}
+
+
+def _cache_key(place: Place) -> CacheKey:
+    # ปัดพิกัดเหลือ 2 ตำแหน่ง (~1 กม.) ให้ชื่อเรียกต่างกันแต่ที่เดียวกันใช้ cache ร่วม
+    return (round(place.lat, 2), round(place.lon, 2))
+
+
+def get_cached(place: Place) -> Optional[dict]:
+    """ คืนข้อมูลจาก cache ถ้ายังไม่หมดอายุ (ไม่ยิง network) """
+    entry = _cache.get(_cache_key(place))
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+async def _fetch(place: Place, api_key: str) -> dict:
+    params = {
+        "lat": place.lat,
+        "lon": place.lon,
+        "appid": api_key,
+        "units": "metric",
+        "lang": "th",
+    }
+    res = await get_context().http.get(OPENWEATHER_URL, params=params, timeout=10)
+    res.raise_for_status()
+    return res.json()
+
+
+async def _get_shared(redis_instance: Optional[Redis], key: CacheKey) -> Optional[dict]:
+    if redis_instance is None:
+        return None
+    try:
+        raw = await redis_instance.get(f"weather:{key[0]},{key[1]}")
+        return json.loads(raw) if raw else None
+    except Exception as e:
+        logger.warning("⚠️ อ่าน weather cache จาก Redis ไม่ได้: %s", e)
+        return None
+
+
+async def _set_shared(redis_instance: Optional[Redis], key: CacheKey, data: dict) -> None:
+    if redis_instance is None:
+        return
+    try:
+        await redis_instance.set(
+            f"weather:{key[0]},{key[1]}", json.dumps(data), ex=int(WEATHER_CACHE_TTL)
+        )
+    except Exception as e:
+        logger.warning("⚠️ เก็บ weather cache ลง Redis ไม่ได้: %s", e)
+
+
+async def fetch_current(place: Place, api_key: str, redis_instance: Optional[Redis] = None) -> dict:
+    """ ดึงสภาพอากาศปัจจุบันของสถานที่ ใช้ cache (ใน process → Redis) ก่อน ถ้าไม่มีค่อยยิง OpenWeather """
+    cached = get_cached(place)
+    if cached is not None:
+        return cached
+
+    key = _cache_key(place)
+    shared = await _get_shared(redis_instance, key)
+    if shared is not None:
+        _cache[key] = (time.monotonic() + WEATHER_CACHE_TTL, shared)
+        return shared
+
+    pending = _inflight.get(key)
+    while pending is not None:
+        try:
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            if not pending.cancelled():
+                raise          # ตัวเราเองถูกยกเลิก
+            # ตัวที่ยิงอยู่ถูกยกเลิก (เช่นหมดงบเวลาของข้อความนั้น) ไม่ใช่ความผิดของเรา → ยิงเองหรือรอตัวใหม่
+            pending = _inflight.get(key)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        data = await _fetch(place, api_key)
+        _cache[key] = (time.monotonic() + WEATHER_CACHE_TTL, data)
+        await _set_shared(redis_instance, key, data)
+        future.set_result(data)
+        return data
+    except Exception as e:
+        future.set_exception(e)
+        # กัน "Future exception was never retrieved" ถ้าไม่มีใครรออยู่
+        future.exception()
+        raise
+    finally:
+        # ถูกยกเลิกกลางทาง (CancelledError ไม่ใช่ Exception) ต้องปลดคนที่รออยู่ด้วย ไม่งั้นค้างตลอดไป
+        if not future.done():
+            future.cancel()
+        _inflight.pop(key, None)
+
+
+async def fetch_many(
+    places: List[Place], api_key: str, redis_instance: Optional[Redis] = None
+) -> List[Optional[dict]]:
+    """ ดึงหลายสถานที่พร้อมกัน (concurrent) ตัวไหนพังคืน None แทน """
+    results = await asyncio.gather(
+        *(fetch_current(place, api_key, redis_instance) for place in places),
+        return_exceptions=True,
+    )
+
+    output = []
+    for place, result in zip(places, results):
+        if isinstance(result, Exception):
+            logger.warning("⚠️ ดึงอากาศ %s ไม่ได้: %s", place.name, result)
+            output.append(None)
+        else:
+            output.append(result)
+    return output
+
+
+async def fetch_by_name(
+    name: str, api_key: str, redis_instance: Optional[Redis] = None
+) -> Optional[Tuple[Place, dict]]:
+    """
+    ชื่อที่ gazetteer ไม่รู้จัก (เมืองต่างประเทศ / อำเภอที่ไม่มีในไฟล์) → ให้ OpenWeather หาจากชื่อ (แปลงเป็นอังกฤษก่อน)
+    คืน (สถานที่, ข้อมูลดิบ) หรือ None ถ้า OpenWeather ไม่รู้จักชื่อนี้ ดึงไม่ได้ด้วยเหตุอื่น raise
+    """
+    query = convert_thai_to_english_city(name)
+    if _unknown_names.get(query.lower(), 0.0) > time.monotonic():
+        return None
+    params = {"q": query, "appid": api_key, "units": "metric", "lang": "th"}
+    res = await get_context().http.get(OPENWEATHER_URL, params=params, timeout=10)
+    if res.status_code == 404:
+        _unknown_names[query.lower()] = time.monotonic() + UNKNOWN_NAME_TTL
+        return None
+    res.raise_for_status()
+    data = res.json()
+    place = Place(data.get("name") or name, data.get("name") or query, data["coord"]["lat"], data["coord"]["lon"], "city")
+    key = _cache_key(place)
+    _cache[key] = (time.monotonic() + WEATHER_CACHE_TTL, data)
+    await _set_shared(redis_instance, key, data)
+    return place, data
@@ -0,0 +1,142 @@
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+PLACES_PATH = os.path.join(os.path.dirname(__file__), "places_th.json")
+
+# คำนำหน้าที่ใช้กับชื่อที่เป็นคำสามัญด้วย (เช่น "เลย", "ตาก") ต้องมีนำหน้าถึงจะนับว่าเป็นสถานที่
+STRICT_PREFIXES = ("จังหวัด", "จ.", "เมือง")
+
+_END = "\0"
+
+
+@dataclass(frozen=True)
+class Place:
+    name: str          # ชื่อไทยหลัก
+    en: str            # ชื่ออังกฤษ (ใช้กับ OpenWeather ตอน fallback)
+    lat: float
+    lon: float
+    kind: str          # "province" หรือ "district"
+    province: Optional[str] = None
+
+    @property
+    def display_name(self) -> str:
+        if self.kind == "district" and self.province:
+            return f"{self.name} ({self.province})"
+        return self.name
+
+
+@dataclass
+class _Gazetteer:
+    places: List[Place] = field(default_factory=list)
+    by_name: Dict[str, Place] = field(default_factory=dict)
+    trie: dict = field(default_factory=dict)
+
+
+_gazetteer: Optional[_Gazetteer] = None
+_lock = threading.Lock()
+
+
+def _insert(trie: dict, key: str, place: Place) -> None:
+    node = trie
+    for ch in key:
+        node = node.setdefault(ch, {})
+    node[_END] = place
+
+
+def _build() -> _Gazetteer:
+    with open(PLACES_PATH, encoding="utf-8") as f:
+        rows = json.load(f)
+
+    gaz = _Gazetteer()
+    for row in rows:
+        place = Place(
+            name=row["name"],
+            en=row["en"],
+            lat=row["lat"],
+            lon=row["lon"],
+            kind=row.get("kind", "province"),
+            province=row.get("province"),
+        )
+        gaz.places.append(place)
+
+        keys = [place.name, *row.get("aliases", [])]
+        for key in keys:
+            key = key.lower()
+            gaz.by_name.setdefault(key, place)
+            if row.get("strict") and not key.isascii():
+                for prefix in STRICT_PREFIXES:
+                    _insert(gaz.trie, prefix + key, place)
+            else:
+                _insert(gaz.trie, key, place)
+        gaz.by_name.setdefault(place.en.lower(), place)
+
+    return gaz
+
+
+def get_gazetteer() -> _Gazetteer:
+    """ โหลด gazetteer ครั้งแรกที่ถูกเรียกใช้ (lazy) แล้วเก็บไว้ทั้ง process """
+    global _gazetteer
+    if _gazetteer is None:
+        with _lock:
+            if _gazetteer is None:
+                _gazetteer = _build()
+    return _gazetteer
+
+
+def lookup_place(name: str) -> Optional[Place]:
+    """ หา Place จากชื่อเต็ม/ชื่อย่อ/ชื่ออังกฤษ (ไม่สนตัวพิมพ์) """
+    if not name:
+        return None
+    return get_gazetteer().by_name.get(name.strip().lower())
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isascii() and ch.isalnum()
+
+
+def _find_all(text: str) -> List[Tuple[int, int, Place]]:
+    trie = get_gazetteer().trie
+    lowered = text.lower()
+    matches = []
+    i = 0
+    n = len(lowered)
+
+    while i < n:
+        node = trie
+        best = None
+        j = i
+        while j < n and lowered[j] in node:
+            node = node[lowered[j]]
+            j += 1
+            if _END in node:
+                best = (j, node[_END])
+
+        if best:
+            end, place = best
+            # ชื่อภาษาอังกฤษต้องเป็นคำเต็ม ไม่ใช่ส่วนหนึ่งของคำอื่น
+            if lowered[i:end].isascii() and (
+                (i > 0 and _is_word_char(lowered[i - 1]))
+                or (end < n and _is_word_char(lowered[end]))
+            ):
+                i += 1
+                continue
+            matches.append((i, end, place))
+            i = end
+        else:
+            i += 1
+
+    return matches
+
+
+def extract_places(text: str) -> List[Place]:
+    """ ดึงชื่อสถานที่ทั้งหมดจากข้อความอิสระ (longest-match) ตามลำดับที่พบ ไม่ซ้ำ """
+    seen = set()
+    places = []
+    for _, _, place in _find_all(text):
+        if place.name not in seen:
+            seen.add(place.name)
+            places.append(place)
+    return places
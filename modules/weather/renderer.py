@@ -0,0 +1,75 @@
+from typing import List, Optional, Tuple
+
+from modules.weather.gazetteer import Place
+
+# ✅ emoji ตามกลุ่มรหัสสภาพอากาศของ OpenWeather (https://openweathermap.org/weather-conditions)
+def _condition_emoji(code: int) -> str:
+    if 200 <= code < 300:
+        return "⛈️"
+    if 300 <= code < 600:
+        return "🌧️"
+    if 600 <= code < 700:
+        return "❄️"
+    if 700 <= code < 800:
+        return "🌫️"
+    if code == 800:
+        return "☀️"
+    if code in (801, 802):
+        return "⛅"
+    return "☁️"
+
+
+def _advice(code: int, temp: float, feels_like: float, humidity: int, wind: float) -> Optional[str]:
+    if 200 <= code < 300:
+        return "มีพายุฝนฟ้าคะนอง เลี่ยงที่โล่งแจ้งไว้ก่อนนะ"
+    if 300 <= code < 600:
+        return "ฝนมา พกร่มติดตัวไว้ด้วย"
+    if code in (711, 721, 731, 751, 761, 762):
+        return "ฝุ่น/หมอกควันเยอะ ใส่แมสก์ด้วยนะ"
+    if feels_like >= 40:
+        return "ร้อนจัดมาก ดื่มน้ำเยอะ ๆ เลี่ยงแดดช่วงเที่ยง"
+    if feels_like >= 35:
+        return "ร้อนอบอ้าว ดื่มน้ำบ่อย ๆ"
+    if temp <= 18:
+        return "อากาศเย็น หยิบเสื้อกันหนาวไปด้วย"
+    if wind >= 10:
+        return "ลมแรง ระวังของปลิว"
+    if humidity >= 85:
+        return "ชื้นมาก อาจมีฝนได้ เตรียมร่มไว้ไม่เสียหาย"
+    return None
+
+
+def render_weather(place_name: str, data: dict) -> str:
+    """ แปลงข้อมูลดิบจาก OpenWeather เป็นข้อความภาษาไทยแบบ template (ไม่ใช้ LLM) """
+    condition = data["weather"][0]
+    code = int(condition.get("id", 800))
+    main = data["main"]
+    temp = main["temp"]
+    feels_like = main.get("feels_like", temp)
+    humidity = main["humidity"]
+    wind = data.get("wind", {}).get("speed", 0)
+
+    lines = [
+        f"📍 สภาพอากาศตอนนี้ที่ {place_name}",
+        f"{_condition_emoji(code)} {condition['description']}",
+        f"🌡️ อุณหภูมิ: {temp:.1f}°C (รู้สึกเหมือน {feels_like:.1f}°C)",
+    ]
+    if "temp_min" in main and "temp_max" in main:
+        lines.append(f"📈 ต่ำสุด/สูงสุด: {main['temp_min']:.1f}°C / {main['temp_max']:.1f}°C")
+    lines.append(f"💧 ความชื้น: {humidity}%")
+    lines.append(f"💨 ลม: {wind} m/s")
+
+    tip = _advice(code, temp, feels_like, humidity, wind)
+    if tip:
+        lines.append(f"💡 {tip}")
+    return "\n".join(lines)
+
+
+def render_many(results: List[Tuple[Place, Optional[dict]]]) -> str:
+    blocks = []
+    for place, data in results:
+        if data is None:
+            blocks.append(f"❌ พี่หลามดึงพยากรณ์อากาศ {place.display_name} ไม่ได้")
+        else:
+            blocks.append(render_weather(place.display_name, data))
+    return "\n\n".join(blocks)
@@ -0,0 +1,170 @@
+"""
+worker สำหรับโหมดแยก gateway/worker: ดึงงานแชทจาก Redis Stream → generate_reply → ตอบกลับผ่าน Discord REST
+
+    CHAT_QUEUE_MODE=1 python main.py        # gateway: แค่เช็คห้อง/หัวข้อ แล้วส่งงานเข้าคิว
+    python worker.py --concurrency 8         # worker: รันกี่ตัวก็ได้ คนละเครื่องก็ได้
+    python worker.py --metrics               # ดูความลึกคิวแล้วออก
+"""
+import argparse
+import asyncio
+import os
+import signal
+import socket
+
+import httpx
+
+import main as app
+from modules.core.logger import log_context, logger
+from modules.jobs.chat_jobs import (
+    ChatJob,
+    begin_job,
+    claim_stale_jobs,
+    ensure_group,
+    finish_job,
+    mark_done,
+    queue_metrics,
+    read_jobs,
+    release_job,
+    skip_job,
+)
+from modules.utils.discord_utils import format_reply, split_message
+
+DISCORD_API = "https://discord.com/api/v10"
+MAX_ATTEMPTS = 3
+METRICS_INTERVAL = 30  # วินาที
+
+_stopping = asyncio.Event()
+
+
+async def discord_post(http: httpx.AsyncClient, path: str, payload: dict = None) -> None:
+    for _ in range(3):
+        res = await http.post(path, json=payload)
+        if res.status_code == 429:
+            await asyncio.sleep(float(res.json().get("retry_after", 1)))
+            continue
+        res.raise_for_status()
+        return
+    raise RuntimeError(f"Discord rate limit ไม่ยอมปล่อย: {path}")
+
+
+async def post_reply(http: httpx.AsyncClient, job: ChatJob, content: str) -> None:
+    for i, part in enumerate(split_message(format_reply(content))):
+        payload = {"content": part}
+        if i == 0:
+            payload["message_reference"] = {
+                "message_id": str(job.message_id),
+                "fail_if_not_exists": False,
+            }
+        await discord_post(http, f"/channels/{job.channel_id}/messages", payload)
+
+
+async def handle_job(http: httpx.AsyncClient, consumer: str, entry_id: str, job: ChatJob) -> None:
+    redis_instance = app.redis_instance
+    if not await begin_job(redis_instance, job, consumer):
+        if await redis_instance.exists(f"jobs:done:{job.message_id}"):
+            await skip_job(redis_instance, entry_id)
+        return
+
+    attempts_key = f"jobs:attempts:{job.message_id}"
+    attempts = await redis_instance.incr(attempts_key)
+    await redis_instance.expire(attempts_key, 3600)
+
+    try:
+        try:
+            await discord_post(http, f"/channels/{job.channel_id}/typing")
+        except Exception:
+            pass
+
+        reply = await app.generate_reply(job.user_id, job.text, job.channel_id)
+        await post_reply(http, job, reply)
+
+    except Exception as e:
+        logger.error("❌ job %s ล้มเหลว (ครั้งที่ %s): %s", job.message_id, attempts, e)
+        if attempts >= MAX_ATTEMPTS:
+            try:
+                await post_reply(http, job, "⚠️ พี่หลามงงเลย ตอบไม่ได้จริง ๆ จ้า")
+            finally:
+                await finish_job(redis_instance, entry_id, job)
+        else:
+            await release_job(redis_instance, job)
+        return
+
+    # ✅ โพสต์คำตอบแล้ว: จากนี้พังอะไรก็ถือว่า ack ห้าม release ให้ทำซ้ำ (ผู้ใช้จะได้คำตอบเดิมสองรอบ)
+    try:
+        await mark_done(redis_instance, job)
+    except Exception as e:
+        logger.error("❌ job %s ตอบแล้วแต่ mark done ไม่ได้: %s", job.message_id, e)
+    try:
+        await app.store_chat(redis_instance, job.user_id, {
+            "question": job.text,
+            "response": reply
+        })
+    except Exception as e:
+        logger.warning("⚠️ job %s ตอบแล้วแต่บันทึกความจำไม่ได้: %s", job.message_id, e)
+    try:
+        await finish_job(redis_instance, entry_id, job)
+    except Exception as e:
+        # lock หมดอายุเอง ส่วน redelivery เจอ jobs:done แล้วข้าม
+        logger.warning("⚠️ job %s ตอบแล้วแต่ ack ไม่ได้: %s", job.message_id, e)
+
+
+async def consume(http: httpx.AsyncClient, consumer: str) -> None:
+    while not _stopping.is_set():
+        try:
+            jobs = await claim_stale_jobs(app.redis_instance, consumer)
+            if not jobs:
+                jobs = await read_jobs(app.redis_instance, consumer, count=1, block_ms=5000)
+            for entry_id, job in jobs:
+                with log_context(job.message_id):   # cid เดียวกับ log ฝั่ง gateway ของข้อความนี้
+                    await handle_job(http, consumer, entry_id, job)
+        except Exception as e:
+            logger.error("❌ %s loop error: %s", consumer, e)
+            await asyncio.sleep(1)
+
+
+async def report_metrics() -> None:
+    while not _stopping.is_set():
+        metrics = await queue_metrics(app.redis_instance)
+        logger.info(
+            "📊 queue length=%s pending=%s lag=%s consumers=%s",
+            metrics["length"], metrics["pending"], metrics["lag"], metrics["consumers"],
+        )
+        try:
+            await asyncio.wait_for(_stopping.wait(), timeout=METRICS_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="worker สำหรับคิวงานแชทของพี่หลาม")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--metrics", action="store_true", help="แสดงความลึกคิวแล้วออก")
+    args = parser.parse_args()
+
+    await app.setup_connection()
+    try:
+        if app.redis_instance is None:
+            logger.error("❌ worker ต้องใช้ Redis")
+            return
+        await ensure_group(app.redis_instance)
+
+        if args.metrics:
+            print(await queue_metrics(app.redis_instance))
+            return
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, _stopping.set)
+
+        prefix = f"{socket.gethostname()}-{os.getpid()}"
+        headers = {"Authorization": f"Bot {app.settings.DISCORD_TOKEN}"}
+        async with httpx.AsyncClient(base_url=DISCORD_API, headers=headers, timeout=15) as http:
+            tasks = [consume(http, f"{prefix}-{i}") for i in range(args.concurrency)]
+            await asyncio.gather(report_metrics(), *tasks)
+    finally:
+        await app.shutdown()
+    logger.info("👋 worker stopped")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())